@@ -0,0 +1,30 @@
+"""Add adaptive polling state to repo_configs
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('repo_configs', sa.Column('next_poll_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('repo_configs', sa.Column('poll_idle_count', sa.Integer(), nullable=True))
+    op.add_column('repo_configs', sa.Column('last_webhook_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_repo_configs_next_poll_at', 'repo_configs', ['next_poll_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_repo_configs_next_poll_at', table_name='repo_configs')
+    op.drop_column('repo_configs', 'last_webhook_at')
+    op.drop_column('repo_configs', 'poll_idle_count')
+    op.drop_column('repo_configs', 'next_poll_at')
@@ -0,0 +1,28 @@
+"""Add finding fingerprints for duplicate suppression
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('review_comments', sa.Column('fingerprint', sa.String(64), nullable=True))
+    op.create_index('ix_review_comments_fingerprint', 'review_comments', ['fingerprint'])
+    op.add_column('reviews', sa.Column('duplicates_suppressed', sa.Integer(), nullable=True, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('reviews', 'duplicates_suppressed')
+    op.drop_index('ix_review_comments_fingerprint', table_name='review_comments')
+    op.drop_column('review_comments', 'fingerprint')
@@ -0,0 +1,40 @@
+"""Add review_checkpoints table for resumable reviews
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('review_checkpoints',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('review_id', sa.Integer(), nullable=False),
+        sa.Column('file_path', sa.String(length=512), nullable=False),
+        sa.Column('category', sa.String(length=64), nullable=False),
+        sa.Column('patch_sha', sa.String(length=64), nullable=True),
+        sa.Column('comments_count', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True),
+                  server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.ForeignKeyConstraint(['review_id'], ['reviews.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('review_id', 'file_path', 'category',
+                            name='uq_review_checkpoint'),
+    )
+    op.create_index('ix_review_comments_review_fingerprint', 'review_comments',
+                    ['review_id', 'fingerprint'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_review_comments_review_fingerprint', table_name='review_comments')
+    op.drop_table('review_checkpoints')
@@ -0,0 +1,39 @@
+"""Add review_shards table for sharded reviews
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('review_shards',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('review_id', sa.Integer(), nullable=False),
+        sa.Column('shard_index', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=32), nullable=True),
+        sa.Column('file_count', sa.Integer(), nullable=True),
+        sa.Column('estimated_tokens', sa.Integer(), nullable=True),
+        sa.Column('files_reviewed', sa.Integer(), nullable=True),
+        sa.Column('comments_posted', sa.Integer(), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['review_id'], ['reviews.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('review_id', 'shard_index', name='uq_review_shard'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('review_shards')
@@ -0,0 +1,42 @@
+"""Add task_errors table for compact, deduplicated task failures
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('task_errors',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('task_name', sa.String(length=255), nullable=False),
+        sa.Column('entity_type', sa.String(length=32), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('fingerprint', sa.String(length=32), nullable=False),
+        sa.Column('error_type', sa.String(length=128), nullable=True),
+        sa.Column('message', sa.String(length=512), nullable=True),
+        sa.Column('location', sa.String(length=255), nullable=True),
+        sa.Column('traceback', sa.Text(), nullable=True),
+        sa.Column('occurrences', sa.Integer(), nullable=True),
+        sa.Column('first_seen_at', sa.DateTime(timezone=True),
+                  server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('last_seen_at', sa.DateTime(timezone=True),
+                  server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('entity_type', 'entity_id', 'fingerprint',
+                            name='uq_task_error'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('task_errors')
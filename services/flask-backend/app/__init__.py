@@ -52,6 +52,7 @@ def create_app(config_class: type = Config) -> Flask:
     from .api.v1.licenses import licenses_bp
     from .api.v1.issue_plans import issue_plans_bp
     from .api.v1.platform_identities import platform_identities_bp
+    from .api.v1.toolchain import toolchain_bp
 
     app.register_blueprint(reviews_bp, url_prefix="/api/v1/reviews")
     app.register_blueprint(webhooks_bp, url_prefix="/api/v1/webhooks")
@@ -62,6 +63,7 @@ def create_app(config_class: type = Config) -> Flask:
     app.register_blueprint(providers_bp, url_prefix="/api/v1/providers")
     app.register_blueprint(analytics_bp, url_prefix="/api/v1/analytics")
     app.register_blueprint(licenses_bp, url_prefix="/api/v1/licenses")
+    app.register_blueprint(toolchain_bp, url_prefix="/api/v1/toolchain")
     app.register_blueprint(issue_plans_bp)
     app.register_blueprint(platform_identities_bp)
 
@@ -82,6 +84,24 @@ def create_app(config_class: type = Config) -> Flask:
         """Readiness check endpoint."""
         return {"status": "ready"}, 200
 
+    # Webhook stream backlog is read from Redis at scrape time
+    from .core.webhook_events import get_event_queue
+    from .metrics import WEBHOOK_DEAD_LETTERS, WEBHOOK_STREAM_BACKLOG
+
+    WEBHOOK_STREAM_BACKLOG.set_function(get_event_queue().backlog)
+    WEBHOOK_DEAD_LETTERS.set_function(get_event_queue().dead_letters)
+
+    # Work lane depth and wait times, also read from Redis at scrape time
+    from .core.scheduling import LANES, register_lane_metrics
+    from .redis_client import get_redis
+
+    register_lane_metrics(get_redis())
+
+    # Redis memory: server total, Celery queues and stored task results
+    from .metrics import register_redis_memory_metrics
+
+    register_redis_memory_metrics(get_redis(), LANES + ("polling", "publish", "ingest"))
+
     # Add Prometheus metrics endpoint
     app.wsgi_app = DispatcherMiddleware(
         app.wsgi_app,
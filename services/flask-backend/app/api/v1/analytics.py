@@ -304,7 +304,7 @@ def get_issues_summary():
         by_category[cat] = count
 
     # Count by status
-    statuses = ["open", "acknowledged", "fixed", "wont_fix", "false_positive"]
+    statuses = ["open", "acknowledged", "fixed", "wont_fix", "false_positive", "failed"]
     by_status = {}
 
     for stat in statuses:
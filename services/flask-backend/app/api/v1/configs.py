@@ -6,6 +6,7 @@ from ...middleware import auth_required, role_required
 from ...models import (
     get_repo_config,
     create_or_update_repo_config,
+    invalidate_repo_config,
     list_repo_configs,
     get_db,
 )
@@ -201,6 +202,7 @@ def delete_repo_configuration(platform: str, repository: str):
     ).delete()
 
     db.commit()
+    invalidate_repo_config(platform, repository)
 
     return jsonify({
         "message": "Configuration deleted successfully",
@@ -228,7 +228,7 @@ def list_issues_by_status():
         query &= db.review_comments.review_id == review_id
 
     # Count by status
-    statuses = ["open", "acknowledged", "fixed", "wont_fix", "false_positive"]
+    statuses = ["open", "acknowledged", "fixed", "wont_fix", "false_positive", "failed"]
     breakdown = {}
 
     for stat in statuses:
@@ -1,8 +1,13 @@
 """Review API Endpoints - POST/GET/retry reviews."""
 
-from flask import Blueprint, g, jsonify, request
+from flask import Blueprint, Response, g, jsonify, request, stream_with_context
 from datetime import datetime
+import threading
 
+import redis
+
+from ...config import Config
+from ...core.review_events import TERMINAL_STATUSES, ReviewEvent, get_review_events
 from ...middleware import auth_required, role_required
 from ...models import (
     create_review,
@@ -13,11 +18,43 @@ from ...models import (
     get_comments_by_review,
     get_detections_by_review,
     get_usage_by_review,
+    get_review_shards,
+    get_task_errors,
     get_db,
 )
 
 reviews_bp = Blueprint("reviews", __name__, url_prefix="/api/v1/reviews")
 
+# Each followed stream holds a server thread while it lasts, so only this
+# many per process may follow; other clients get a replay and poll
+_stream_slots = threading.BoundedSemaphore(max(0, Config.REVIEW_EVENTS_MAX_STREAMS))
+
+
+def _shard_progress(review_id: int) -> dict | None:
+    """Per-shard progress of a sharded review (None if not sharded)."""
+    shards = get_review_shards(review_id)
+    if not shards:
+        return None
+    return {
+        "total": len(shards),
+        "completed": sum(1 for s in shards if s["status"] == "completed"),
+        "failed": sum(1 for s in shards if s["status"] == "failed"),
+        "shards": [
+            {
+                "index": s["shard_index"],
+                "status": s["status"],
+                "file_count": s["file_count"],
+                "estimated_tokens": s["estimated_tokens"],
+                "files_reviewed": s["files_reviewed"],
+                "comments_posted": s["comments_posted"],
+                "error_message": s["error_message"],
+                "started_at": s["started_at"],
+                "completed_at": s["completed_at"],
+            }
+            for s in shards
+        ],
+    }
+
 
 @reviews_bp.route("", methods=["POST"])
 @auth_required
@@ -93,9 +130,83 @@ def get_review(review_id: int):
         "comments": comments,
         "detections": detections,
         "usage": usage,
+        "shards": _shard_progress(review_id),
+        "errors": get_task_errors("review", review_id),
     }), 200
 
 
+@reviews_bp.route("/<int:review_id>/events", methods=["GET"])
+@auth_required
+def stream_review_events(review_id: int):
+    """Stream review progress as Server-Sent Events.
+
+    Clients resume after a reconnect by sending the last event ID they saw
+    in the Last-Event-ID header (or the last_event_id query parameter).
+    Streams are short (REVIEW_EVENTS_MAX_STREAM_SECONDS) and capped per
+    process (REVIEW_EVENTS_MAX_STREAMS); beyond the cap a request replays
+    the events missed so far and ends, and the client reconnects after
+    REVIEW_EVENTS_BUSY_RETRY_MS.
+    """
+    review = get_review_by_id(review_id)
+
+    if not review:
+        return jsonify({"error": "Review not found"}), 404
+
+    try:
+        last_event_id = int(
+            request.headers.get("Last-Event-ID") or request.args.get("last_event_id", 0)
+        )
+    except ValueError:
+        return jsonify({"error": "Last-Event-ID must be an integer"}), 400
+
+    events = get_review_events()
+
+    def generate():
+        following = (
+            review["status"] not in TERMINAL_STATUSES
+            and _stream_slots.acquire(blocking=False)
+        )
+        try:
+            if review["status"] not in TERMINAL_STATUSES and not following:
+                # Busy: catch the client up without holding a thread
+                yield f"retry: {Config.REVIEW_EVENTS_BUSY_RETRY_MS}\n\n"
+                for event in events.history(review_id, last_event_id):
+                    yield event.to_sse()
+                return
+
+            yield "retry: 3000\n\n"
+            if review["status"] in TERMINAL_STATUSES:
+                # Finished: replay what the client missed, then a final snapshot
+                for event in events.history(review_id, last_event_id):
+                    yield event.to_sse()
+                yield ReviewEvent(0, "status", {
+                    "status": review["status"],
+                    "files_reviewed": review["files_reviewed"],
+                    "comments_posted": review["comments_posted"],
+                }).to_sse()
+                return
+
+            for event in events.follow(
+                review_id,
+                after=last_event_id,
+                max_seconds=Config.REVIEW_EVENTS_MAX_STREAM_SECONDS,
+                heartbeat_seconds=Config.REVIEW_EVENTS_HEARTBEAT_SECONDS,
+            ):
+                yield event.to_sse() if event else ": keep-alive\n\n"
+        except redis.RedisError:
+            # Clients fall back to polling GET /api/v1/reviews/<id>
+            yield ReviewEvent(0, "error", {"error": "Event stream unavailable"}).to_sse()
+        finally:
+            if following:
+                _stream_slots.release()
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @reviews_bp.route("", methods=["GET"])
 @auth_required
 def list_all_reviews():
@@ -206,6 +317,8 @@ def get_review_by_external(external_id: str):
         "comments": comments,
         "detections": detections,
         "usage": usage,
+        "shards": _shard_progress(review.get("id")),
+        "errors": get_task_errors("review", review.get("id")),
     }), 200
 
 
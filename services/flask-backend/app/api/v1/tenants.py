@@ -4,7 +4,7 @@ import re
 from flask import Blueprint, jsonify, request
 
 from ...middleware import auth_required, get_current_user, role_required
-from ...models import get_db
+from ...models import get_db, invalidate_tenant_settings
 
 tenants_bp = Blueprint("tenants", __name__, url_prefix="/api/v1/tenants")
 
@@ -289,6 +289,8 @@ def update_tenant(tenant_id: int):
     # Update tenant
     db(db.tenants.id == tenant_id).update(**update_data)
     db.commit()
+    if "settings" in update_data:
+        invalidate_tenant_settings(tenant_id)
 
     # Fetch and return updated tenant
     updated_tenant = db(db.tenants.id == tenant_id).select().first()
@@ -0,0 +1,36 @@
+"""Linter Toolchain Inventory API Endpoints."""
+
+from flask import Blueprint, jsonify
+import redis
+
+from ...core.toolchain import read_inventories
+from ...middleware import auth_required
+from ...redis_client import get_redis
+
+toolchain_bp = Blueprint("toolchain", __name__, url_prefix="/api/v1/toolchain")
+
+
+@toolchain_bp.route("", methods=["GET"])
+@auth_required
+def list_toolchains():
+    """List the linter tools and versions installed on each worker host.
+
+    Workers probe their tools when they start, so a host appears here once
+    one of its worker processes has started.
+    """
+    try:
+        hosts = read_inventories(get_redis())
+    except redis.RedisError:
+        return jsonify({"error": "Toolchain inventory unavailable"}), 503
+
+    missing = sorted({
+        tool["linter"]
+        for host in hosts
+        for tool in host.get("tools", [])
+        if not tool.get("available")
+    })
+    return jsonify({
+        "data": hosts,
+        "total_hosts": len(hosts),
+        "missing_linters": missing,
+    }), 200
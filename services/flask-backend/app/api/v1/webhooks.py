@@ -2,18 +2,16 @@
 
 import hashlib
 import hmac
+import logging
+import time
 from flask import Blueprint, jsonify, request
+from redis.exceptions import RedisError
 
-from ...models import (
-    create_review,
-    get_repo_config,
-    get_db,
-    create_issue_plan,
-    count_issue_plans_today,
-    calculate_monthly_cost,
-    resolve_platform_user,
-)
-from ...middleware.license import check_feature_available, FEATURE_ISSUE_AUTOPILOT
+from ...models import get_repo_config
+from ...core.webhook_events import get_event_queue
+from ...metrics import WEBHOOK_EVENTS_RECEIVED, WEBHOOK_INGEST_SECONDS
+
+logger = logging.getLogger(__name__)
 
 webhooks_bp = Blueprint("webhooks", __name__, url_prefix="/api/v1/webhooks")
 
@@ -53,16 +51,41 @@ def verify_gitlab_signature(payload_body: bytes, signature: str, secret: str) ->
     return hmac.compare_digest(signature, expected_hash)
 
 
+def _accept_event(
+    platform: str, event_type: str, delivery_id: str, repo_name: str, payload_body: bytes
+):
+    """Persist a verified delivery to the event stream and acknowledge it."""
+    try:
+        accepted = get_event_queue().publish(
+            platform, event_type, delivery_id, repo_name, payload_body
+        )
+    except RedisError:
+        logger.exception(f"Failed to enqueue {platform} webhook {delivery_id}")
+        WEBHOOK_EVENTS_RECEIVED.labels(platform, "rejected").inc()
+        # Non-2xx makes the platform redeliver later
+        return jsonify({"error": "Event queue unavailable"}), 503
+
+    WEBHOOK_EVENTS_RECEIVED.labels(platform, "accepted" if accepted else "duplicate").inc()
+    message = "Event accepted" if accepted else "Duplicate delivery"
+    return jsonify({"message": message, "delivery_id": delivery_id}), 202
+
+
 @webhooks_bp.route("/github", methods=["POST"])
 def github_webhook():
-    """GitHub webhook handler."""
+    """GitHub webhook handler.
+
+    Only verifies and persists the delivery; reviews and issue plans are
+    created by the ingest workers.
+    """
+    started = time.perf_counter()
+
     # Get headers
     signature = request.headers.get("X-Hub-Signature-256", "")
     event_type = request.headers.get("X-GitHub-Event", "")
 
     # Get payload
     payload_body = request.get_data()
-    data = request.get_json()
+    data = request.get_json(silent=True)
 
     if not data:
         return jsonify({"error": "Invalid JSON payload"}), 400
@@ -75,132 +98,44 @@ def github_webhook():
     # Get repository config
     repo_config = get_repo_config("github", repo_name)
     if not repo_config:
+        WEBHOOK_EVENTS_RECEIVED.labels("github", "ignored").inc()
         return jsonify({"message": "Repository not configured"}), 200
 
     # Verify signature
     webhook_secret = repo_config.get("webhook_secret", "")
     if webhook_secret and not verify_github_signature(payload_body, signature, webhook_secret):
+        WEBHOOK_EVENTS_RECEIVED.labels("github", "rejected").inc()
         return jsonify({"error": "Invalid signature"}), 401
 
     # Skip if repository is not enabled
     if not repo_config.get("enabled"):
+        WEBHOOK_EVENTS_RECEIVED.labels("github", "ignored").inc()
         return jsonify({"message": "Repository disabled"}), 200
 
-    # Resolve sender to Darwin user (if platform identity mapping exists)
-    sender = data.get("sender", {})
-    sender_login = sender.get("login", "")
-    triggered_by = None
-    if sender_login:
-        darwin_user = resolve_platform_user("github", sender_login)
-        if darwin_user:
-            triggered_by = darwin_user.get("id")
-
-    # Extract tenant/team context from repo config
-    webhook_tenant_id = repo_config.get("tenant_id")
-    webhook_team_id = repo_config.get("team_id")
-    webhook_repo_id = repo_config.get("id")
-
-    # Process pull request events
-    if event_type == "pull_request":
-        pr_data = data.get("pull_request", {})
-        action = data.get("action", "")
-
-        # Trigger review on open if configured
-        if action == "opened" and repo_config.get("review_on_open"):
-            review = create_review(
-                external_id=f"github-{pr_data.get('id')}",
-                platform="github",
-                repository=repo_name,
-                pull_request_id=pr_data.get("number"),
-                pull_request_url=pr_data.get("html_url"),
-                base_sha=data.get("pull_request", {}).get("base", {}).get("sha"),
-                head_sha=data.get("pull_request", {}).get("head", {}).get("sha"),
-                review_type="differential",
-                categories=repo_config.get("default_categories", ["security", "best_practices"]),
-                ai_provider=repo_config.get("default_ai_provider", "claude"),
-                triggered_by=triggered_by,
-                tenant_id=webhook_tenant_id,
-                team_id=webhook_team_id,
-                repo_id=webhook_repo_id,
-            )
-            return jsonify({"message": "Review created", "review_id": review.get("id")}), 202
-
-        # Trigger review on synchronize if configured
-        if action == "synchronize" and repo_config.get("review_on_sync"):
-            review = create_review(
-                external_id=f"github-{pr_data.get('id')}-sync",
-                platform="github",
-                repository=repo_name,
-                pull_request_id=pr_data.get("number"),
-                pull_request_url=pr_data.get("html_url"),
-                base_sha=data.get("pull_request", {}).get("base", {}).get("sha"),
-                head_sha=data.get("pull_request", {}).get("head", {}).get("sha"),
-                review_type="differential",
-                categories=repo_config.get("default_categories", ["security", "best_practices"]),
-                ai_provider=repo_config.get("default_ai_provider", "claude"),
-                triggered_by=triggered_by,
-                tenant_id=webhook_tenant_id,
-                team_id=webhook_team_id,
-                repo_id=webhook_repo_id,
-            )
-            return jsonify({"message": "Review created", "review_id": review.get("id")}), 202
-
-    # Process issue events
-    if event_type == "issues":
-        issue_data = data.get("issue", {})
-        action = data.get("action", "")
-
-        # Only process newly opened issues
-        if action == "opened" and repo_config.get("auto_plan_on_issue"):
-            # Check license feature
-            if not check_feature_available(FEATURE_ISSUE_AUTOPILOT):
-                return jsonify({"message": "Issue autopilot requires license upgrade"}), 403
-
-            # Check rate limits if configured
-            daily_limit = repo_config.get("issue_plan_daily_limit")
-            if daily_limit is not None:
-                today_count = count_issue_plans_today(repo_name)
-                if today_count >= daily_limit:
-                    return jsonify({"message": f"Daily limit exceeded ({daily_limit})"}), 429
-
-            cost_limit = repo_config.get("issue_plan_cost_limit_usd")
-            if cost_limit is not None:
-                monthly_cost = calculate_monthly_cost(repo_name)
-                if monthly_cost >= cost_limit:
-                    return jsonify({"message": f"Monthly cost limit exceeded (${cost_limit})"}), 429
-
-            # Create issue plan
-            plan = create_issue_plan(
-                external_id=f"github-issue-{issue_data.get('id')}",
-                platform="github",
-                repository=repo_name,
-                issue_number=issue_data.get("number"),
-                issue_url=issue_data.get("html_url"),
-                issue_title=issue_data.get("title", ""),
-                issue_body=issue_data.get("body", ""),
-                ai_provider=repo_config.get("issue_plan_provider") or repo_config.get("default_ai_provider", "claude"),
-                ai_model=repo_config.get("issue_plan_model"),
-            )
-
-            # Queue Celery worker task
-            from ...tasks.plan_worker import process_issue_plan
-            process_issue_plan.delay(plan.get("id"))
-
-            return jsonify({"message": "Issue plan created", "plan_id": plan.get("id")}), 202
-
-    return jsonify({"message": "Webhook received"}), 200
+    delivery_id = request.headers.get("X-GitHub-Delivery") or hashlib.sha256(
+        payload_body
+    ).hexdigest()
+    response = _accept_event("github", event_type, delivery_id, repo_name, payload_body)
+    WEBHOOK_INGEST_SECONDS.labels("github").observe(time.perf_counter() - started)
+    return response
 
 
 @webhooks_bp.route("/gitlab", methods=["POST"])
 def gitlab_webhook():
-    """GitLab webhook handler."""
+    """GitLab webhook handler.
+
+    Only verifies and persists the delivery; reviews and issue plans are
+    created by the ingest workers.
+    """
+    started = time.perf_counter()
+
     # Get headers
     signature = request.headers.get("X-Gitlab-Token", "")
     event_type = request.headers.get("X-Gitlab-Event", "")
 
     # Get payload
     payload_body = request.get_data()
-    data = request.get_json()
+    data = request.get_json(silent=True)
 
     if not data:
         return jsonify({"error": "Invalid JSON payload"}), 400
@@ -214,120 +149,26 @@ def gitlab_webhook():
     # Get repository config
     repo_config = get_repo_config("gitlab", repo_name)
     if not repo_config:
+        WEBHOOK_EVENTS_RECEIVED.labels("gitlab", "ignored").inc()
         return jsonify({"message": "Repository not configured"}), 200
 
     # Verify signature (GitLab uses token in header)
     webhook_secret = repo_config.get("webhook_secret", "")
-    if webhook_secret and signature != webhook_secret:
+    if webhook_secret and not hmac.compare_digest(signature, webhook_secret):
+        WEBHOOK_EVENTS_RECEIVED.labels("gitlab", "rejected").inc()
         return jsonify({"error": "Invalid signature"}), 401
 
     # Skip if repository is not enabled
     if not repo_config.get("enabled"):
+        WEBHOOK_EVENTS_RECEIVED.labels("gitlab", "ignored").inc()
         return jsonify({"message": "Repository disabled"}), 200
 
-    # Resolve sender to Darwin user (if platform identity mapping exists)
-    gl_user = data.get("user", {})
-    gl_username = gl_user.get("username", "")
-    triggered_by = None
-    if gl_username:
-        darwin_user = resolve_platform_user("gitlab", gl_username)
-        if darwin_user:
-            triggered_by = darwin_user.get("id")
-
-    # Extract tenant/team context from repo config
-    webhook_tenant_id = repo_config.get("tenant_id")
-    webhook_team_id = repo_config.get("team_id")
-    webhook_repo_id = repo_config.get("id")
-
-    # Process merge request events
-    if event_type == "Merge Request Hook":
-        mr_data = data.get("object_attributes", {})
-        action = mr_data.get("action", "")
-
-        # Trigger review on open if configured
-        if action == "open" and repo_config.get("review_on_open"):
-            review = create_review(
-                external_id=f"gitlab-{mr_data.get('id')}",
-                platform="gitlab",
-                repository=repo_name,
-                pull_request_id=mr_data.get("iid"),
-                pull_request_url=mr_data.get("url"),
-                base_sha=mr_data.get("target_branch"),
-                head_sha=mr_data.get("source_branch"),
-                review_type="differential",
-                categories=repo_config.get("default_categories", ["security", "best_practices"]),
-                ai_provider=repo_config.get("default_ai_provider", "claude"),
-                triggered_by=triggered_by,
-                tenant_id=webhook_tenant_id,
-                team_id=webhook_team_id,
-                repo_id=webhook_repo_id,
-            )
-            return jsonify({"message": "Review created", "review_id": review.get("id")}), 202
-
-        # Trigger review on update if configured
-        if action == "update" and repo_config.get("review_on_sync"):
-            review = create_review(
-                external_id=f"gitlab-{mr_data.get('id')}-update",
-                platform="gitlab",
-                repository=repo_name,
-                pull_request_id=mr_data.get("iid"),
-                pull_request_url=mr_data.get("url"),
-                base_sha=mr_data.get("target_branch"),
-                head_sha=mr_data.get("source_branch"),
-                review_type="differential",
-                categories=repo_config.get("default_categories", ["security", "best_practices"]),
-                ai_provider=repo_config.get("default_ai_provider", "claude"),
-                triggered_by=triggered_by,
-                tenant_id=webhook_tenant_id,
-                team_id=webhook_team_id,
-                repo_id=webhook_repo_id,
-            )
-            return jsonify({"message": "Review created", "review_id": review.get("id")}), 202
-
-    # Process issue events
-    if event_type == "Issue Hook":
-        issue_data = data.get("object_attributes", {})
-        action = issue_data.get("action", "")
-
-        # Only process newly opened issues
-        if action == "open" and repo_config.get("auto_plan_on_issue"):
-            # Check license feature
-            if not check_feature_available(FEATURE_ISSUE_AUTOPILOT):
-                return jsonify({"message": "Issue autopilot requires license upgrade"}), 403
-
-            # Check rate limits if configured
-            daily_limit = repo_config.get("issue_plan_daily_limit")
-            if daily_limit is not None:
-                today_count = count_issue_plans_today(repo_name)
-                if today_count >= daily_limit:
-                    return jsonify({"message": f"Daily limit exceeded ({daily_limit})"}), 429
-
-            cost_limit = repo_config.get("issue_plan_cost_limit_usd")
-            if cost_limit is not None:
-                monthly_cost = calculate_monthly_cost(repo_name)
-                if monthly_cost >= cost_limit:
-                    return jsonify({"message": f"Monthly cost limit exceeded (${cost_limit})"}), 429
-
-            # Create issue plan
-            plan = create_issue_plan(
-                external_id=f"gitlab-issue-{issue_data.get('id')}",
-                platform="gitlab",
-                repository=repo_name,
-                issue_number=issue_data.get("iid"),
-                issue_url=issue_data.get("url"),
-                issue_title=issue_data.get("title", ""),
-                issue_body=issue_data.get("description", ""),
-                ai_provider=repo_config.get("issue_plan_provider") or repo_config.get("default_ai_provider", "claude"),
-                ai_model=repo_config.get("issue_plan_model"),
-            )
-
-            # Queue Celery worker task
-            from ...tasks.plan_worker import process_issue_plan
-            process_issue_plan.delay(plan.get("id"))
-
-            return jsonify({"message": "Issue plan created", "plan_id": plan.get("id")}), 202
-
-    return jsonify({"message": "Webhook received"}), 200
+    delivery_id = request.headers.get("X-Gitlab-Event-UUID") or hashlib.sha256(
+        payload_body
+    ).hexdigest()
+    response = _accept_event("gitlab", event_type, delivery_id, repo_name, payload_body)
+    WEBHOOK_INGEST_SECONDS.labels("gitlab").observe(time.perf_counter() - started)
+    return response
 
 
 @webhooks_bp.route("/github/test", methods=["POST"])
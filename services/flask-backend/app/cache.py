@@ -0,0 +1,250 @@
+"""Read-through cache for hot configuration lookups.
+
+Each process keeps a small LRU with a TTL in front of a shared Redis copy.
+Writes invalidate the local entry, delete the Redis copy and broadcast the
+key on a pub/sub channel so every other process drops its local entry too.
+Redis is optional: when it is unreachable the cache degrades to a
+process-local TTL cache and retries Redis after a short back-off.
+"""
+
+from collections import OrderedDict
+import copy
+from datetime import date, datetime
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Any, Callable
+
+import redis
+
+from .metrics import CONFIG_CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "darwin:cache-invalidate"
+REDIS_KEY = "darwin:cache:{name}:{key}"
+ALL_KEYS = "*"
+
+_MISSING = object()
+
+
+def _encode(value: Any) -> str:
+    def default(obj: Any) -> Any:
+        if isinstance(obj, datetime):
+            return {"__datetime__": obj.isoformat()}
+        if isinstance(obj, date):
+            return {"__date__": obj.isoformat()}
+        raise TypeError(f"Cannot cache {type(obj).__name__}")
+
+    return json.dumps(value, default=default)
+
+
+def _decode(raw: bytes | str) -> Any:
+    def hook(obj: dict) -> Any:
+        if "__datetime__" in obj:
+            return datetime.fromisoformat(obj["__datetime__"])
+        if "__date__" in obj:
+            return date.fromisoformat(obj["__date__"])
+        return obj
+
+    return json.loads(raw, object_hook=hook)
+
+
+class ConfigCache:
+    """Per-process TTL LRU backed by Redis, invalidated through pub/sub."""
+
+    _registry: dict[str, "ConfigCache"] = {}
+    _subscriber: Any = None
+    _subscriber_pid: int | None = None
+    _subscriber_lock = threading.Lock()
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int = 1024,
+        ttl_seconds: float = 60.0,
+        redis_client: redis.Redis | None = None,
+        redis_retry_seconds: float = 30.0,
+    ):
+        """Initialize cache.
+
+        Args:
+            name: Cache name (metric label and Redis key prefix)
+            maxsize: Maximum entries kept in process
+            ttl_seconds: Entry lifetime, locally and in Redis
+            redis_client: Shared Redis client, or None for process-local only
+            redis_retry_seconds: Back-off after a Redis error
+        """
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.redis = redis_client
+        self.redis_retry_seconds = redis_retry_seconds
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis_down_until = 0.0
+        ConfigCache._registry[name] = self
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for key, loading it on a miss.
+
+        ``None`` results are cached as well, so unknown keys (e.g. senders
+        without a platform identity) don't hit the database every time.
+        Callers get a copy, so mutating a result never changes the cache.
+
+        Args:
+            key: Cache key
+            loader: Called to fetch the value on a miss
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        value = self._get_local(key)
+        if value is not _MISSING:
+            CONFIG_CACHE_REQUESTS.labels(cache=self.name, result="hit").inc()
+            return copy.deepcopy(value)
+
+        value = self._get_redis(key)
+        if value is not _MISSING:
+            CONFIG_CACHE_REQUESTS.labels(cache=self.name, result="redis_hit").inc()
+            self._set_local(key, value)
+            return copy.deepcopy(value)
+
+        CONFIG_CACHE_REQUESTS.labels(cache=self.name, result="miss").inc()
+        value = loader()
+        self._set_local(key, copy.deepcopy(value))
+        self._set_redis(key, value)
+        return value
+
+    def invalidate(self, key: str = ALL_KEYS) -> None:
+        """Drop a key (or everything) here, in Redis and in other processes."""
+        self._drop_local(key)
+        if not self._redis_available():
+            return
+        try:
+            if key != ALL_KEYS:
+                self.redis.delete(REDIS_KEY.format(name=self.name, key=key))
+            self.redis.publish(
+                INVALIDATION_CHANNEL,
+                json.dumps({"cache": self.name, "key": key, "origin": _origin()}),
+            )
+        except redis.RedisError as e:
+            self._redis_failed(e)
+
+    def _get_local(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def _set_local(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _drop_local(self, key: str) -> None:
+        with self._lock:
+            if key == ALL_KEYS:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def _get_redis(self, key: str) -> Any:
+        if not self._redis_available():
+            return _MISSING
+        self._ensure_subscriber()
+        try:
+            raw = self.redis.get(REDIS_KEY.format(name=self.name, key=key))
+        except redis.RedisError as e:
+            self._redis_failed(e)
+            return _MISSING
+        return _MISSING if raw is None else _decode(raw)
+
+    def _set_redis(self, key: str, value: Any) -> None:
+        if not self._redis_available():
+            return
+        try:
+            payload = _encode(value)
+        except TypeError as e:
+            logger.debug(f"Config cache {self.name}: not sharing {key} ({e})")
+            return
+        try:
+            self.redis.set(
+                REDIS_KEY.format(name=self.name, key=key),
+                payload,
+                ex=max(1, int(self.ttl_seconds)),
+            )
+        except redis.RedisError as e:
+            self._redis_failed(e)
+
+    def _redis_available(self) -> bool:
+        return self.redis is not None and time.monotonic() >= self._redis_down_until
+
+    def _redis_failed(self, error: Exception) -> None:
+        logger.warning(f"Config cache {self.name}: Redis unavailable ({error})")
+        self._redis_down_until = time.monotonic() + self.redis_retry_seconds
+
+    def _ensure_subscriber(self) -> None:
+        """Start the process-wide invalidation listener on first use.
+
+        The listener thread does not survive a fork, so forked workers
+        start their own.
+        """
+        if ConfigCache._subscriber_pid == os.getpid():
+            return
+        with ConfigCache._subscriber_lock:
+            if ConfigCache._subscriber_pid == os.getpid():
+                return
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{INVALIDATION_CHANNEL: _handle_invalidation})
+                ConfigCache._subscriber = pubsub.run_in_thread(
+                    sleep_time=1.0,
+                    daemon=True,
+                    exception_handler=_subscriber_failed,
+                )
+                ConfigCache._subscriber_pid = os.getpid()
+            except redis.RedisError as e:
+                self._redis_failed(e)
+
+
+def _origin() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _handle_invalidation(message: dict) -> None:
+    try:
+        payload = json.loads(message["data"])
+    except (TypeError, ValueError):
+        return
+    if payload.get("origin") == _origin():
+        return
+    cache = ConfigCache._registry.get(payload.get("cache"))
+    if cache is not None:
+        cache._drop_local(payload.get("key", ALL_KEYS))
+
+
+def _subscriber_failed(error: Exception, pubsub: Any, thread: Any) -> None:
+    """Stop the listener and flush local entries; the next lookup restarts it.
+
+    Invalidations published while the listener was down are lost, so local
+    entries can no longer be trusted.
+    """
+    logger.warning(f"Config cache invalidation listener stopped: {error}")
+    thread.stop()
+    pubsub.close()
+    ConfigCache._subscriber = None
+    ConfigCache._subscriber_pid = None
+    for cache in ConfigCache._registry.values():
+        cache._drop_local(ALL_KEYS)
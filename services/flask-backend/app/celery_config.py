@@ -19,6 +19,8 @@ def make_celery(app=None):
     redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
     broker_url = os.getenv("CELERY_BROKER_URL", redis_url)
     result_backend = os.getenv("CELERY_RESULT_BACKEND", redis_url)
+    webhook_interval = float(os.getenv("WEBHOOK_CONSUMER_INTERVAL_SECONDS", "2"))
+    budget_reconcile_minutes = int(os.getenv("PLAN_BUDGET_RECONCILE_MINUTES", "15"))
 
     # Create Celery instance
     celery = Celery(
@@ -28,6 +30,11 @@ def make_celery(app=None):
         include=[
             "app.tasks.review_worker",
             "app.tasks.poll_worker",
+            "app.tasks.publish_worker",
+            "app.tasks.ingest_worker",
+            "app.tasks.plan_worker",
+            # Not tasks: per-host disk upkeep started with each worker
+            "app.tasks.housekeeping",
         ],
     )
 
@@ -42,26 +49,49 @@ def make_celery(app=None):
 
         # Task routing
         task_routes={
+            # Reviews pick their lane when queued (see core.scheduling);
+            # "reviews" is the interactive lane
             "app.tasks.review_worker.*": {"queue": "reviews"},
             "app.tasks.poll_worker.*": {"queue": "polling"},
+            "app.tasks.publish_worker.*": {"queue": "publish"},
+            "app.tasks.ingest_worker.*": {"queue": "ingest"},
+            "app.tasks.plan_worker.*": {"queue": "plans"},
         },
 
+        # Workers drain queues in the order given to -Q, so list lanes
+        # highest priority first
+        broker_transport_options={"queue_order_strategy": "priority"},
+
         # Task execution
         task_acks_late=True,
         task_reject_on_worker_lost=True,
         worker_prefetch_multiplier=1,
 
-        # Result backend
+        # Result backend. Tasks are fire-and-forget: outcomes live in the
+        # database and failures in task_errors, so results are only stored
+        # for tasks that opt in (chord headers). Extended results would
+        # also copy task arguments, such as shard diffs, into Redis.
+        task_ignore_result=True,
         result_expires=3600,  # 1 hour
-        result_extended=True,
+        result_extended=False,
 
         # Beat schedule for periodic tasks
         beat_schedule={
+            # Scheduler tick - per-repo intervals are decided adaptively
             "poll-repositories": {
                 "task": "app.tasks.poll_worker.poll_repositories",
-                "schedule": crontab(
-                    minute=f"*/{os.getenv('DEFAULT_POLLING_INTERVAL_MINUTES', '5')}"
-                ),
+                "schedule": crontab(minute="*"),
+            },
+            # Drain the webhook event stream; ticks expire rather than pile up
+            "consume-webhook-events": {
+                "task": "app.tasks.ingest_worker.consume_webhook_events",
+                "schedule": webhook_interval,
+                "options": {"expires": webhook_interval},
+            },
+            # Correct drift in the Redis issue plan budget counters
+            "reconcile-plan-budgets": {
+                "task": "app.tasks.plan_worker.reconcile_plan_budgets",
+                "schedule": budget_reconcile_minutes * 60.0,
             },
         },
     )
@@ -32,6 +32,25 @@ class Config:
     # CORS
     CORS_ORIGINS = os.getenv("CORS_ORIGINS", "*")
 
+    # Redis (Celery broker, webhook event stream)
+    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+    # Webhook Ingestion (fast-ack event stream)
+    WEBHOOK_DEAD_LETTER_MAXLEN = int(os.getenv("WEBHOOK_DEAD_LETTER_MAXLEN", "100000"))
+    WEBHOOK_DEDUPE_TTL_SECONDS = int(os.getenv("WEBHOOK_DEDUPE_TTL_SECONDS", "86400"))
+    WEBHOOK_MAX_DELIVERIES = int(os.getenv("WEBHOOK_MAX_DELIVERIES", "5"))
+    WEBHOOK_CONSUMER_BATCH_SIZE = int(os.getenv("WEBHOOK_CONSUMER_BATCH_SIZE", "100"))
+    WEBHOOK_CONSUMER_INTERVAL_SECONDS = float(
+        os.getenv("WEBHOOK_CONSUMER_INTERVAL_SECONDS", "2")
+    )
+    # Hold synchronize/update reviews this long so a burst of pushes
+    # collapses into one review of the latest head
+    SYNC_DEBOUNCE_SECONDS = int(os.getenv("SYNC_DEBOUNCE_SECONDS", "30"))
+
+    # Config cache (repo configs, platform identities, installation config)
+    CONFIG_CACHE_TTL_SECONDS = float(os.getenv("CONFIG_CACHE_TTL_SECONDS", "60"))
+    CONFIG_CACHE_MAX_ENTRIES = int(os.getenv("CONFIG_CACHE_MAX_ENTRIES", "1024"))
+
     # AI Provider Configuration
     ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
@@ -46,6 +65,8 @@ class Config:
     GITHUB_WEBHOOK_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET", "")
     GITLAB_TOKEN = os.getenv("GITLAB_TOKEN", "")
     GITLAB_WEBHOOK_SECRET = os.getenv("GITLAB_WEBHOOK_SECRET", "")
+    # Platform clients (one per credential) each worker process keeps open
+    WORKER_MAX_PLATFORM_CLIENTS = int(os.getenv("WORKER_MAX_PLATFORM_CLIENTS", "32"))
 
     # Review Configuration
     MAX_FILES_PER_REVIEW = int(os.getenv("MAX_FILES_PER_REVIEW", "50"))
@@ -74,9 +95,72 @@ class Config:
     ).lower() == "true"
     REVIEW_IAC_ENABLED = os.getenv("REVIEW_IAC_ENABLED", "true").lower() == "true"
 
+    # Polling Configuration (adaptive scheduler)
+    DEFAULT_POLLING_INTERVAL_MINUTES = int(os.getenv("DEFAULT_POLLING_INTERVAL_MINUTES", "5"))
+    POLL_MAX_INTERVAL_MINUTES = int(os.getenv("POLL_MAX_INTERVAL_MINUTES", "240"))
+    POLL_ACTIVITY_WINDOW_HOURS = int(os.getenv("POLL_ACTIVITY_WINDOW_HOURS", "24"))
+    POLL_WEBHOOK_HEALTHY_HOURS = int(os.getenv("POLL_WEBHOOK_HEALTHY_HOURS", "6"))
+    POLL_JITTER_SECONDS = int(os.getenv("POLL_JITTER_SECONDS", "30"))
+
+    # Comment Publishing (publish queue)
+    PUBLISH_MAX_CONCURRENCY = int(os.getenv("PUBLISH_MAX_CONCURRENCY", "4"))
+
+    # Review Scheduling (priority lanes, per-tenant fair share)
+    TENANT_MAX_ACTIVE_REVIEWS = int(os.getenv("TENANT_MAX_ACTIVE_REVIEWS", "4"))
+    TENANT_REVIEW_LEASE_SECONDS = int(os.getenv("TENANT_REVIEW_LEASE_SECONDS", "1800"))
+    TENANT_DEFER_SECONDS = int(os.getenv("TENANT_DEFER_SECONDS", "15"))
+
+    # Sharded reviews: PRs estimated above this many prompt tokens are split
+    # into file-batch shards reviewed in parallel (0 disables sharding)
+    REVIEW_SHARD_TOKEN_BUDGET = int(os.getenv("REVIEW_SHARD_TOKEN_BUDGET", "120000"))
+    REVIEW_MAX_SHARDS = int(os.getenv("REVIEW_MAX_SHARDS", "16"))
+
+    # Review progress events (SSE at /api/v1/reviews/<id>/events)
+    REVIEW_EVENTS_HISTORY = int(os.getenv("REVIEW_EVENTS_HISTORY", "500"))
+    REVIEW_EVENTS_TTL_SECONDS = int(os.getenv("REVIEW_EVENTS_TTL_SECONDS", "86400"))
+    REVIEW_EVENTS_MAX_STREAM_SECONDS = float(os.getenv("REVIEW_EVENTS_MAX_STREAM_SECONDS", "30"))
+    # gunicorn --threads of each web process (passed by the Dockerfile)
+    WEB_THREADS = int(os.getenv("WEB_THREADS", "8"))
+    # Followed streams per web process, each holding one of its threads; the
+    # default leaves half of them to ordinary requests
+    REVIEW_EVENTS_MAX_STREAMS = int(
+        os.getenv("REVIEW_EVENTS_MAX_STREAMS", str(max(1, WEB_THREADS // 2)))
+    )
+    REVIEW_EVENTS_BUSY_RETRY_MS = int(os.getenv("REVIEW_EVENTS_BUSY_RETRY_MS", "5000"))
+    REVIEW_EVENTS_HEARTBEAT_SECONDS = float(os.getenv("REVIEW_EVENTS_HEARTBEAT_SECONDS", "15"))
+
+    # Issue Plan Budgets (Redis counters, reconciled against issue_plans)
+    ISSUE_PLAN_COST_RESERVATION_USD = float(
+        os.getenv("ISSUE_PLAN_COST_RESERVATION_USD", "0.05")
+    )
+    PLAN_BUDGET_RECONCILE_MINUTES = int(os.getenv("PLAN_BUDGET_RECONCILE_MINUTES", "15"))
+
     # Sandbox Configuration
     SANDBOX_BASE_PATH = os.getenv("SANDBOX_BASE_PATH", "/tmp/pr-reviewer")
     SANDBOX_CLEANUP_TIMEOUT = int(os.getenv("SANDBOX_CLEANUP_TIMEOUT", "3600"))
+    # Reaped by one worker per host (see tasks.housekeeping)
+    SANDBOX_REAP_MINUTES = int(os.getenv("SANDBOX_REAP_MINUTES", "10"))
+    # Total sandbox size before new ones are refused (0 = no quota)
+    SANDBOX_MAX_MB = int(os.getenv("SANDBOX_MAX_MB", "0"))
+    # tmpfs mounted per sandbox, needs CAP_SYS_ADMIN (0 = plain directories)
+    SANDBOX_TMPFS_MB = int(os.getenv("SANDBOX_TMPFS_MB", "0"))
+    BLOB_CACHE_MAX_MB = int(os.getenv("BLOB_CACHE_MAX_MB", "512"))
+    BLOB_CACHE_MMAP_THRESHOLD_KB = int(os.getenv("BLOB_CACHE_MMAP_THRESHOLD_KB", "1024"))
+    LINT_CACHE_MAX_MB = int(os.getenv("LINT_CACHE_MAX_MB", "256"))
+    # Blob and lint caches are trimmed to their caps by one worker per host
+    CACHE_TRIM_MINUTES = int(os.getenv("CACHE_TRIM_MINUTES", "5"))
+    # Concurrent linter slots per worker process (0 = the available cores,
+    # split evenly among prefork children)
+    LINTER_SLOTS = int(os.getenv("LINTER_SLOTS", "0"))
+    LINTER_MEMORY_LIMIT_MB = int(os.getenv("LINTER_MEMORY_LIMIT_MB", "2048"))
+    # Repository detection per default-branch tree, in Redis (0 disables)
+    DETECTION_CACHE_TTL_HOURS = int(os.getenv("DETECTION_CACHE_TTL_HOURS", "168"))
+    # How long a review waits for it on a cache miss before going on without
+    DETECTION_WAIT_SECONDS = float(os.getenv("DETECTION_WAIT_SECONDS", "2"))
+    GIT_MIRROR_CACHE_ENABLED = os.getenv("GIT_MIRROR_CACHE_ENABLED", "false").lower() == "true"
+    GIT_MIRROR_CACHE_MAX_MB = int(os.getenv("GIT_MIRROR_CACHE_MAX_MB", "20480"))
+    # Maintained by one worker per host (see tasks.housekeeping)
+    GIT_MIRROR_MAINTENANCE_MINUTES = int(os.getenv("GIT_MIRROR_MAINTENANCE_MINUTES", "60"))
 
     # Encryption Configuration
     CREDENTIAL_ENCRYPTION_KEY = os.getenv("CREDENTIAL_ENCRYPTION_KEY", "")
@@ -0,0 +1,139 @@
+"""Fingerprinting of review findings for duplicate suppression."""
+
+import hashlib
+import posixpath
+import re
+from typing import Iterable
+
+_HUNK_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Hidden marker appended to published comments so fingerprints survive the
+# round trip through the platform
+FINGERPRINT_MARKER = "<!-- darwin:fingerprint={} -->"
+_MARKER_RE = re.compile(r"<!-- darwin:fingerprint=([0-9a-f]{64}) -->")
+
+
+def normalize_path(path: str) -> str:
+    """Normalize a repository path (strip ./ and leading slashes, fold ..)."""
+    normalized = posixpath.normpath(path.replace("\\", "/")).lstrip("/")
+    return "" if normalized == "." else normalized
+
+
+def _normalize_text(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", text).strip().lower()
+
+
+def patch_line_map(patch: str) -> dict[int, str]:
+    """Map new-file line numbers to their content for a unified diff.
+
+    Args:
+        patch: Unified diff of a single file
+
+    Returns:
+        Dict of line number to line content for added and context lines
+    """
+    lines: dict[int, str] = {}
+    line_no = None
+
+    for raw in patch.split("\n"):
+        hunk = _HUNK_RE.match(raw)
+        if hunk:
+            line_no = int(hunk.group(1))
+            continue
+        # Removed lines and "\ No newline" markers don't exist on the new side
+        if line_no is None or raw[:1] not in ("+", " "):
+            continue
+        lines[line_no] = raw[1:]
+        line_no += 1
+
+    return lines
+
+
+def patch_added_lines(patch: str) -> set[int]:
+    """New-file line numbers added or changed by a unified diff.
+
+    Args:
+        patch: Unified diff of a single file
+
+    Returns:
+        Set of line numbers of the "+" lines
+    """
+    return {line_no for line_no, _ in patch_added_rows(patch)}
+
+
+def patch_added_rows(patch: str) -> list[tuple[int, str]]:
+    """Lines added or changed by a unified diff, with their new-file numbers.
+
+    Args:
+        patch: Unified diff of a single file
+
+    Returns:
+        (line number, text without the "+") of each "+" line, in order
+    """
+    added: list[tuple[int, str]] = []
+    line_no = None
+
+    for raw in patch.split("\n"):
+        hunk = _HUNK_RE.match(raw)
+        if hunk:
+            line_no = int(hunk.group(1))
+            continue
+        if line_no is None or raw[:1] not in ("+", " "):
+            continue
+        if raw[:1] == "+":
+            added.append((line_no, raw[1:]))
+        line_no += 1
+
+    return added
+
+
+def finding_fingerprint(
+    file_path: str, category: str, title: str, anchor_line: str | None = None
+) -> str:
+    """Compute a stable fingerprint for a finding.
+
+    The anchor line's content is hashed instead of its number so a finding
+    keeps its fingerprint when unrelated edits shift it up or down.
+
+    Args:
+        file_path: Path of the file the finding is on
+        category: Review category
+        title: Finding title
+        anchor_line: Content of the line the finding is anchored to
+
+    Returns:
+        Hex SHA-256 fingerprint
+    """
+    anchor_hash = (
+        hashlib.sha256(_normalize_text(anchor_line).encode()).hexdigest()
+        if anchor_line is not None
+        else ""
+    )
+    key = "\x1f".join(
+        [normalize_path(file_path), anchor_hash, category.lower(), _normalize_text(title)]
+    )
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def add_fingerprint_marker(body: str, fingerprint: str | None) -> str:
+    """Append the hidden fingerprint marker to a comment body."""
+    if not fingerprint:
+        return body
+    return f"{body}\n\n{FINGERPRINT_MARKER.format(fingerprint)}"
+
+
+def extract_fingerprints(comments: Iterable[dict]) -> dict[str, str]:
+    """Collect fingerprint markers from platform comments.
+
+    Args:
+        comments: Platform comment payloads with ``body`` and ``id``
+
+    Returns:
+        Dict of fingerprint to platform comment ID
+    """
+    found: dict[str, str] = {}
+    for comment in comments:
+        for fingerprint in _MARKER_RE.findall(comment.get("body") or ""):
+            found.setdefault(fingerprint, str(comment.get("id", "")))
+    return found
@@ -0,0 +1,169 @@
+"""Repository detection results, cached per default-branch tree."""
+
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable
+
+import redis
+
+from .detector import CONTENT_READ_BYTES, DetectionResult, LanguageDetector
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored format or detection rules change
+CACHE_FORMAT = "1"
+DETECTION_KEY = "darwin:detection:{format}:{platform}:{repository}:{tree_sha}"
+
+# Concurrent blob reads while detecting a tree listed through the API
+TREE_READ_CONCURRENCY = 8
+
+
+def detection_to_dict(detection: DetectionResult) -> dict[str, Any]:
+    """Repository-level part of a detection (the file mapping is left out)."""
+    return {
+        "languages": detection.languages,
+        "frameworks": detection.frameworks,
+        "iac_tools": detection.iac_tools,
+    }
+
+
+def detection_from_dict(data: dict[str, Any]) -> DetectionResult:
+    """Inverse of detection_to_dict."""
+    return DetectionResult(
+        languages=dict(data.get("languages", {})),
+        frameworks=dict(data.get("frameworks", {})),
+        iac_tools=list(data.get("iac_tools", [])),
+    )
+
+
+async def detect_tree(
+    detector: LanguageDetector,
+    files: list[tuple[str, str]],
+    read_blob: Callable[[str], Awaitable[bytes]],
+) -> DetectionResult:
+    """Detect a repository from its file listing, without a checkout.
+
+    Only the files content indicators look at are downloaded, a few at a
+    time (see LanguageDetector.content_candidates).
+
+    Args:
+        detector: Language detector
+        files: (path, blob SHA) of every file in the tree
+        read_blob: Returns a blob's content given its SHA
+
+    Returns:
+        Detection result
+    """
+    blob_shas = dict(files)
+    semaphore = asyncio.Semaphore(TREE_READ_CONCURRENCY)
+
+    async def read(path: str) -> tuple[str, str]:
+        async with semaphore:
+            try:
+                data = await read_blob(blob_shas[path])
+            except Exception as e:
+                logger.debug(f"Could not read {path} for detection: {e}")
+                return path, ""
+        return path, data[:CONTENT_READ_BYTES].decode("utf-8", errors="replace")
+
+    candidates = detector.content_candidates(list(blob_shas))
+    contents = dict(await asyncio.gather(*(read(path) for path in candidates)))
+    return detector.detect_from_paths(list(blob_shas), contents)
+
+
+class DetectionCache:
+    """Repository detections in Redis, keyed by default-branch tree SHA.
+
+    A repository's languages, frameworks and IaC tools only change when its
+    default branch does, so the detection is computed once per tree and
+    reused by every review until the branch moves. Redis errors are logged
+    and treated as misses.
+    """
+
+    def __init__(self, client: redis.Redis, ttl_seconds: int = 7 * 86400):
+        """Initialize cache.
+
+        Args:
+            client: Redis client
+            ttl_seconds: Lifetime of an entry (trees are replaced, not updated)
+        """
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def key(platform: str, repository: str, tree_sha: str) -> str:
+        return DETECTION_KEY.format(
+            format=CACHE_FORMAT, platform=platform, repository=repository, tree_sha=tree_sha
+        )
+
+    def get(self, platform: str, repository: str, tree_sha: str) -> DetectionResult | None:
+        """Cached detection of a tree, or None on a miss."""
+        key = self.key(platform, repository, tree_sha)
+        try:
+            payload = self.client.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"Detection cache unavailable: {e}")
+            return None
+        if payload is None:
+            return None
+        try:
+            return detection_from_dict(json.loads(payload))
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.debug(f"Ignoring unreadable detection cache entry {key}: {e}")
+            return None
+
+    def put(
+        self, platform: str, repository: str, tree_sha: str, detection: DetectionResult
+    ) -> None:
+        """Store a tree's detection (best effort)."""
+        try:
+            self.client.set(
+                self.key(platform, repository, tree_sha),
+                json.dumps(detection_to_dict(detection)),
+                ex=self.ttl_seconds,
+            )
+        except redis.RedisError as e:
+            logger.warning(f"Could not store detection of {repository}: {e}")
+
+    async def get_or_detect(
+        self,
+        platform: str,
+        repository: str,
+        tree_sha: str,
+        detect: Callable[[], Awaitable[DetectionResult]],
+    ) -> DetectionResult:
+        """Cached detection of a tree, running detect and storing it on a miss.
+
+        Args:
+            platform: Git platform (github, gitlab)
+            repository: Repository name
+            tree_sha: Default-branch tree (or head commit) SHA
+            detect: Computes the detection on a miss
+
+        Returns:
+            Detection result without a file mapping
+        """
+        detection = self.get(platform, repository, tree_sha)
+        if detection is not None:
+            return detection
+        detection = detection_from_dict(detection_to_dict(await detect()))
+        self.put(platform, repository, tree_sha, detection)
+        logger.info(f"Detected {platform}:{repository} at {tree_sha[:12]}")
+        return detection
+
+
+_default_cache: DetectionCache | None = None
+
+
+def get_detection_cache() -> DetectionCache:
+    """Return the process-wide detection cache."""
+    global _default_cache
+    if _default_cache is None:
+        from ..config import Config
+        from ..redis_client import get_redis
+
+        _default_cache = DetectionCache(
+            get_redis(), ttl_seconds=Config.DETECTION_CACHE_TTL_HOURS * 3600
+        )
+    return _default_cache
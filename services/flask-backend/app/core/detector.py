@@ -1,7 +1,23 @@
 from dataclasses import dataclass, field
 from pathlib import Path
+import fnmatch
 import json
+import logging
+import os
 import re
+import time
+
+logger = logging.getLogger(__name__)
+
+# Directories never descended into: VCS metadata, dependencies and caches
+IGNORED_DIRS = frozenset({
+    ".git", ".hg", ".svn", "node_modules", "bower_components", "vendor", "__pycache__",
+    ".venv", "venv", ".tox", ".nox", ".mypy_cache", ".pytest_cache", ".terraform",
+})
+
+# Content indicators read at most this many bytes of at most this many files
+CONTENT_READ_BYTES = 64 * 1024
+MAX_CONTENT_FILES = 20
 
 @dataclass(slots=True)
 class DetectionResult:
@@ -132,7 +148,32 @@ class LanguageDetector:
     }
 
     def __init__(self):
-        pass
+        self._exact, self._suffixes, self._globs, self._any_glob = self._compile_patterns()
+
+    @classmethod
+    def _compile_patterns(
+        cls,
+    ) -> tuple[set[str], dict[str, list[str]], list[tuple[str, re.Pattern]], re.Pattern | None]:
+        """Index indicator file patterns by how they can be matched cheaply.
+
+        Patterns keep fnmatch semantics against the relative path ("*" also
+        matches "/"): plain names are set lookups, "*.ext" patterns suffix
+        lookups, and the rest are regexes behind one combined regex that
+        rules most paths out in a single match.
+        """
+        exact: set[str] = set()
+        suffixes: dict[str, list[str]] = {}
+        globs: list[tuple[str, re.Pattern]] = []
+        indicators = [*cls.FRAMEWORK_INDICATORS.values(), *cls.IAC_INDICATORS.values()]
+        for pattern in sorted({i["file"] for group in indicators for i in group}):
+            if not any(c in pattern for c in "*?["):
+                exact.add(pattern)
+            elif pattern.startswith("*.") and not any(c in pattern[1:] for c in "*?["):
+                suffixes.setdefault(pattern[1:], []).append(pattern)
+            else:
+                globs.append((pattern, re.compile(fnmatch.translate(pattern))))
+        any_glob = re.compile("|".join(regex.pattern for _, regex in globs)) if globs else None
+        return exact, suffixes, globs, any_glob
 
     def detect_from_files(self, files: list[str]) -> DetectionResult:
         """Detect languages and frameworks from a list of file paths."""
@@ -141,7 +182,7 @@ class LanguageDetector:
         # Count languages by extension
         lang_counts: dict[str, int] = {}
         for file_path in files:
-            ext = Path(file_path).suffix.lower()
+            ext = os.path.splitext(file_path)[1].lower()
             if ext in self.LANGUAGE_EXTENSIONS:
                 lang = self.LANGUAGE_EXTENSIONS[ext]
                 lang_counts[lang] = lang_counts.get(lang, 0) + 1
@@ -156,73 +197,140 @@ class LanguageDetector:
 
     def detect_from_directory(self, directory: Path,
                              file_contents: dict[str, str] | None = None) -> DetectionResult:
-        """Detect languages, frameworks, and IaC from a directory."""
-        # Get all files
-        files = [str(f.relative_to(directory)) for f in directory.rglob("*") if f.is_file()]
+        """Detect languages, frameworks, and IaC from a directory.
+
+        The tree is walked once (skipping IGNORED_DIRS) and file contents are
+        only read for content indicators, from the first CONTENT_READ_BYTES of
+        at most MAX_CONTENT_FILES candidates each (file_contents, if given,
+        takes precedence over reading).
+        """
+        start = time.perf_counter()
+        files = self._walk(directory)
+        contents = _ContentProbe(directory, file_contents or {})
+        result = self._detect(files, contents)
+
+        logger.debug(
+            f"Detected {directory} in {(time.perf_counter() - start) * 1000:.0f} ms "
+            f"({len(files)} files, {contents.reads} read)"
+        )
+        return result
+
+    def detect_from_paths(self, files: list[str],
+                          file_contents: dict[str, str] | None = None) -> DetectionResult:
+        """Detect languages, frameworks, and IaC from a repository's file list.
+
+        For trees listed through a platform API rather than checked out:
+        content indicators only see file_contents, which should hold (the
+        start of) the files named by content_candidates.
+        """
+        return self._detect(files, _ContentProbe(None, file_contents or {}))
+
+    def content_candidates(self, files: list[str]) -> list[str]:
+        """Files whose contents detection would look at, in path order."""
+        matches = self._match_indicator_files(files)
+        wanted: set[str] = set()
+        indicators = [*self.FRAMEWORK_INDICATORS.values(), *self.IAC_INDICATORS.values()]
+        for indicator in (i for group in indicators for i in group):
+            if "content" in indicator:
+                wanted.update(_shallowest(matches.get(indicator["file"], [])))
+        return sorted(wanted)
+
+    def _detect(self, files: list[str], contents: "_ContentProbe") -> DetectionResult:
+        """Detect from relative file paths, reading contents through the probe."""
         result = self.detect_from_files(files)
+        matches = self._match_indicator_files(files)
 
         # Detect frameworks
-        result.frameworks = self._detect_frameworks(directory, files, file_contents or {})
+        result.frameworks = self._detect_frameworks(matches, contents)
 
         # Detect IaC tools
-        result.iac_tools = self._detect_iac(directory, files, file_contents or {})
-
+        result.iac_tools = self._detect_iac(matches, contents)
         return result
 
-    def _detect_frameworks(self, directory: Path, files: list[str],
-                          contents: dict[str, str]) -> dict[str, float]:
+    def _walk(self, directory: Path) -> list[str]:
+        """Relative paths of all files under directory, in one scandir pass."""
+        files: list[str] = []
+        stack = [(str(directory), "")]
+        while stack:
+            path, prefix = stack.pop()
+            try:
+                entries = os.scandir(path)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in IGNORED_DIRS:
+                                stack.append((entry.path, f"{prefix}{entry.name}/"))
+                        elif entry.is_file():
+                            files.append(prefix + entry.name)
+                    except OSError:
+                        continue
+        return files
+
+    def _match_indicator_files(self, files: list[str]) -> dict[str, list[str]]:
+        """Files matching each indicator file pattern, in one pass over the list."""
+        matches: dict[str, list[str]] = {}
+        for f in files:
+            if f in self._exact:
+                matches.setdefault(f, []).append(f)
+            dot = f.rfind(".")
+            if dot != -1:
+                for pattern in self._suffixes.get(f[dot:], ()):
+                    matches.setdefault(pattern, []).append(f)
+            if self._any_glob is not None and self._any_glob.match(f):
+                for pattern, regex in self._globs:
+                    if regex.match(f):
+                        matches.setdefault(pattern, []).append(f)
+        return matches
+
+    def _detect_frameworks(self, matches: dict[str, list[str]],
+                          contents: "_ContentProbe") -> dict[str, float]:
         """Detect frameworks based on indicator patterns."""
         frameworks: dict[str, float] = {}
 
         for framework, indicators in self.FRAMEWORK_INDICATORS.items():
-            matches = 0
+            matched = 0
             for indicator in indicators:
-                if self._check_indicator(directory, files, contents, indicator):
-                    matches += 1
+                if self._check_indicator(matches, contents, indicator):
+                    matched += 1
 
-            if matches > 0:
-                confidence = min(1.0, matches / len(indicators) + 0.3)
+            if matched > 0:
+                confidence = min(1.0, matched / len(indicators) + 0.3)
                 frameworks[framework] = round(confidence, 2)
 
         return frameworks
 
-    def _detect_iac(self, directory: Path, files: list[str],
-                   contents: dict[str, str]) -> list[str]:
+    def _detect_iac(self, matches: dict[str, list[str]],
+                   contents: "_ContentProbe") -> list[str]:
         """Detect IaC tools based on indicator patterns."""
         iac_tools: list[str] = []
 
         for tool, indicators in self.IAC_INDICATORS.items():
             for indicator in indicators:
-                if self._check_indicator(directory, files, contents, indicator):
+                if self._check_indicator(matches, contents, indicator):
                     if tool not in iac_tools:
                         iac_tools.append(tool)
                     break
 
         return iac_tools
 
-    def _check_indicator(self, directory: Path, files: list[str],
-                        contents: dict[str, str], indicator: dict) -> bool:
+    def _check_indicator(self, matches: dict[str, list[str]],
+                        contents: "_ContentProbe", indicator: dict) -> bool:
         """Check if an indicator matches."""
-        file_pattern = indicator.get("file", "")
+        candidates = matches.get(indicator.get("file", ""), [])
 
         # Check for file existence with glob pattern
         if indicator.get("exists"):
-            import fnmatch
-            for f in files:
-                if fnmatch.fnmatch(f, file_pattern):
-                    return True
-            return False
+            return bool(candidates)
 
-        # Check for content in file
+        # Check for content in the shallowest matching files
         if "content" in indicator:
-            import fnmatch
             search_text = indicator["content"].lower()
-            for f in files:
-                if fnmatch.fnmatch(f, file_pattern):
-                    # Check cached content or try to read
-                    content = contents.get(f, "").lower()
-                    if search_text in content:
-                        return True
+            for f in _shallowest(candidates):
+                if search_text in contents.get(f):
+                    return True
 
         return False
 
@@ -272,3 +380,60 @@ class LanguageDetector:
                     linters.append(linter)
 
         return linters
+
+
+def merge_detection(base: DetectionResult, changed: DetectionResult) -> DetectionResult:
+    """Combine a repository's detection with that of a change to it.
+
+    Language confidences come from the repository, plus any language only
+    the change has; frameworks keep their higher confidence, IaC tools are
+    the union and the file mapping is the change's.
+    """
+    languages = dict(base.languages)
+    for lang, confidence in changed.languages.items():
+        languages.setdefault(lang, confidence)
+    frameworks = dict(base.frameworks)
+    for framework, confidence in changed.frameworks.items():
+        frameworks[framework] = max(confidence, frameworks.get(framework, 0.0))
+    return DetectionResult(
+        languages=languages,
+        frameworks=frameworks,
+        iac_tools=base.iac_tools + [t for t in changed.iac_tools if t not in base.iac_tools],
+        file_mapping=dict(changed.file_mapping),
+    )
+
+
+def _shallowest(candidates: list[str]) -> list[str]:
+    """The MAX_CONTENT_FILES candidates nearest the repository root."""
+    if len(candidates) > MAX_CONTENT_FILES:
+        candidates = sorted(candidates, key=lambda f: (f.count("/"), f))
+    return candidates[:MAX_CONTENT_FILES]
+
+
+class _ContentProbe:
+    """Lower-cased file heads, read on first use and kept for the detection.
+
+    Without a directory only the provided contents are known.
+    """
+
+    def __init__(self, directory: Path | None, provided: dict[str, str]):
+        self.directory = directory
+        self.provided = provided
+        self.reads = 0
+        self._cache: dict[str, str] = {}
+
+    def get(self, file: str) -> str:
+        if file not in self._cache:
+            if file in self.provided:
+                text = self.provided[file]
+            elif self.directory is None:
+                text = ""
+            else:
+                try:
+                    with open(self.directory / file, "rb") as f:
+                        text = f.read(CONTENT_READ_BYTES).decode("utf-8", errors="replace")
+                    self.reads += 1
+                except OSError:
+                    text = ""
+            self._cache[file] = text.lower()
+        return self._cache[file]
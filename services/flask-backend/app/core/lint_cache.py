@@ -0,0 +1,112 @@
+"""Per-file cache of linter findings, keyed by blob content and linter setup."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+from ..git.blob_cache import BlobCache, git_blob_sha
+from ..linters import BaseLinter, LintIssue
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored format or issue mapping changes
+CACHE_FORMAT = "1"
+
+
+def _config_digest(linter: BaseLinter, repo_path: Path) -> bytes:
+    """Names and blob SHAs of a linter's config files present in the repository."""
+    parts = []
+    for name in linter.config_files:
+        try:
+            content = (repo_path / name).read_bytes()
+        except OSError:
+            continue
+        parts.append(name.encode() + b"\0" + git_blob_sha(content).encode() + b"\0")
+    return b"".join(parts)
+
+
+class LintCache:
+    """Linter issues per (linter, version, config hash, file blob SHA).
+
+    A file's issues are reused whenever the same linter version with the
+    same configuration sees the same blob again, whichever repository,
+    branch or review it is in. Entries are JSON documents stored in a
+    BlobCache under the SHA-256 of their key, so they are shared by every
+    worker process on the host and evicted least recently used first.
+    """
+
+    def __init__(self, store: BlobCache) -> None:
+        """Initialize lint cache.
+
+        Args:
+            store: Content-addressed store for the entries
+        """
+        self.store = store
+
+    async def linter_key(self, linter: BaseLinter, repo_path: Path) -> str:
+        """Identify a linter's setup for a repository: tool, version and config.
+
+        Args:
+            linter: Linter about to run
+            repo_path: Repository root, where its config files are looked up
+
+        Returns:
+            Hex digest covering the linter name, version and config contents
+        """
+        digest = hashlib.sha256()
+        for part in (CACHE_FORMAT, linter.name, await linter.version()):
+            digest.update(part.encode() + b"\0")
+        # Config files are read in a thread, off the event loop
+        digest.update(await asyncio.to_thread(_config_digest, linter, repo_path))
+        return digest.hexdigest()
+
+    def entry_key(self, linter_key: str, content: bytes) -> str:
+        """Cache key of one file's issues."""
+        return hashlib.sha256(f"{linter_key}\0{git_blob_sha(content)}".encode()).hexdigest()
+
+    def get(self, key: str) -> list[LintIssue] | None:
+        """Cached issues of a file (callers set each issue's file path).
+
+        Returns:
+            List of issues (possibly empty), or None on a cache miss
+        """
+        data = self.store.get(key)
+        if data is None:
+            return None
+        try:
+            return [LintIssue(**issue) for issue in json.loads(data)]
+        except (ValueError, TypeError) as e:
+            logger.debug(f"Ignoring unreadable lint cache entry {key}: {e}")
+            return None
+
+    def put(self, key: str, issues: list[LintIssue]) -> None:
+        """Store a file's issues."""
+        try:
+            self.store.put(key, json.dumps([asdict(issue) for issue in issues]).encode())
+        except OSError as e:
+            logger.warning(f"Could not write lint cache entry {key}: {e}")
+
+
+_default_cache: LintCache | None = None
+
+
+def get_lint_cache() -> LintCache | None:
+    """Return the process-wide lint cache, or None if disabled (LINT_CACHE_MAX_MB=0)."""
+    global _default_cache
+    if _default_cache is None:
+        from ..config import Config
+
+        if Config.LINT_CACHE_MAX_MB <= 0:
+            return None
+        _default_cache = LintCache(
+            BlobCache(
+                Path(Config.SANDBOX_BASE_PATH) / "lint-cache",
+                max_bytes=Config.LINT_CACHE_MAX_MB * 1024 * 1024,
+            )
+        )
+    return _default_cache
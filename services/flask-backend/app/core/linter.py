@@ -1,5 +1,5 @@
 from pathlib import Path
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 import asyncio
 from ..linters import (
     BaseLinter,
@@ -13,7 +13,69 @@ from ..linters import (
     GHALinter,
     SecurityLinter,
 )
-from .detector import DetectionResult
+from .dedupe import normalize_path
+from .detector import DetectionResult, LanguageDetector
+from .lint_cache import LintCache
+from .linter_scheduler import LinterScheduler, get_linter_scheduler, shard_files
+from .toolchain import ToolchainRegistry, get_toolchain
+
+# Explicit file lists are linted in shards of at most this many files to
+# keep command lines bounded
+MAX_FILES_PER_RUN = 500
+
+
+def relative_issue_path(path: Path, file: str) -> str:
+    """Path of a linter-reported file relative to the linted root.
+
+    Linters run from the root's parent directory and report paths as given
+    (absolute), relative to that directory, or relative to the root.
+    """
+    root = path.resolve()
+    candidate = Path(file)
+    if not candidate.is_absolute():
+        candidate = path.parent / candidate
+    try:
+        return candidate.resolve().relative_to(root).as_posix()
+    except ValueError:
+        return normalize_path(file)
+
+
+def lint_config_paths(paths: list[str]) -> list[str]:
+    """Linter config files that can apply to the given repository paths.
+
+    A sparse checkout of just the changed files would lint them without the
+    repository's configuration. This lists every registered linter's
+    config file names at the root and in each directory above a path
+    (eslint and golangci-lint look upwards), plus pyproject.toml, which
+    detection and several tools read. Missing files are simply not checked
+    out.
+
+    Args:
+        paths: Repository-relative paths being linted
+
+    Returns:
+        Candidate config paths, without the given paths
+    """
+    names = {"pyproject.toml"}
+    for linter_class in LinterOrchestrator.LINTER_MAP.values():
+        names.update(linter_class.config_files)
+
+    directories = {""}
+    for path in paths:
+        parent = Path(path.lstrip("/")).parent
+        while parent != Path("."):
+            directories.add(parent.as_posix())
+            parent = parent.parent
+
+    given = set(paths)
+    return sorted(
+        config for config in (
+            f"{directory}/{name}" if directory else name
+            for directory in directories
+            for name in names
+        )
+        if config not in given
+    )
 
 
 @dataclass(slots=True)
@@ -23,6 +85,17 @@ class OrchestratorResult:
     errors: int = 0
     warnings: int = 0
 
+    def add(self, lint_result: LintResult) -> None:
+        """Add one linter's result to the totals."""
+        self.results.append(lint_result)
+        self.total_issues += len(lint_result.issues)
+
+        for issue in lint_result.issues:
+            if issue.severity == "error":
+                self.errors += 1
+            elif issue.severity == "warning":
+                self.warnings += 1
+
 
 class LinterOrchestrator:
     LINTER_MAP: dict[str, type[BaseLinter]] = {
@@ -35,8 +108,26 @@ class LinterOrchestrator:
         "security": SecurityLinter,
     }
 
-    def __init__(self):
+    def __init__(
+        self,
+        lint_cache: LintCache | None = None,
+        toolchain: ToolchainRegistry | None = None,
+        scheduler: LinterScheduler | None = None,
+    ):
+        """Initialize orchestrator.
+
+        Args:
+            lint_cache: Per-file cache of linter issues (optional)
+            toolchain: Registry of shared, probed linters (defaults to the
+                process-wide one)
+            scheduler: Admission of linter runs to the host's cores
+                (defaults to the process-wide one)
+        """
         self._linter_cache: dict[str, BaseLinter] = {}
+        self.detector = LanguageDetector()
+        self.lint_cache = lint_cache
+        self.toolchain = toolchain or get_toolchain()
+        self.scheduler = scheduler or get_linter_scheduler()
 
     async def run_linters(
         self,
@@ -45,38 +136,72 @@ class LinterOrchestrator:
         files: list[str] | None = None,
         include_security: bool = True,
     ) -> OrchestratorResult:
-        """Run appropriate linters based on detection result."""
+        """Run appropriate linters based on detection result.
+
+        When files is given, each linter only receives the files in its
+        languages (per ``detection.file_mapping``), and linters with none are
+        skipped instead of linting the whole tree. With a lint cache,
+        cacheable linters always run on an explicit file list (all mapped
+        files when files is None) and only on files not in the cache.
+
+        Linters are started together but each run waits for its slots in
+        the scheduler; long file lists of cacheable (per-file) linters are
+        sharded across slots and the shard results merged.
+        """
         result = OrchestratorResult()
 
         # Get linters to run based on detection
-        linter_names = detection.get_linters_for_result(detection)
+        linter_names = self.detector.get_linters_for_result(detection)
         if include_security and "security" not in linter_names:
             linter_names.append("security")
 
-        # Run linters concurrently
-        tasks = [
-            self.run_single_linter(name, path, files)
-            for name in linter_names
-        ]
+        # Run linters concurrently, as scheduler slots allow
+        tasks = []
+        for name in linter_names:
+            linter = self._get_linter(name)
+            if self.lint_cache is not None and linter is not None and linter.cacheable:
+                linter_files = self._files_for_linter(
+                    name, detection, list(detection.file_mapping) if files is None else files
+                )
+                if linter_files:
+                    tasks.append(self._run_cached(linter, path, linter_files))
+                continue
+            if files is None:
+                tasks.append(self.run_single_linter(name, path))
+                continue
+            linter_files = self._files_for_linter(name, detection, files)
+            if linter_files:
+                tasks.append(
+                    self.run_single_linter(name, path, [str(path / f) for f in linter_files])
+                )
         lint_results = await asyncio.gather(*tasks)
 
         # Process results
         for lint_result in lint_results:
-            result.results.append(lint_result)
-            result.total_issues += len(lint_result.issues)
-
-            for issue in lint_result.issues:
-                if issue.severity == "error":
-                    result.errors += 1
-                elif issue.severity == "warning":
-                    result.warnings += 1
+            result.add(lint_result)
 
         return result
 
+    async def scan_added_lines(
+        self, added: dict[str, list[tuple[int, str]]], config_path: Path | None = None
+    ) -> LintResult:
+        """Scan a change's added lines for secrets (instead of the whole tree).
+
+        Args:
+            added: (line number, text) of each added line, by file path
+            config_path: gitleaks config to apply (optional)
+
+        Returns:
+            LintResult of the security linter, issues keyed by file path
+        """
+        linter = self._get_linter("security")
+        async with self.scheduler.slot(linter.weight):
+            return await linter.scan_added_lines(added, config_path)
+
     async def run_single_linter(
         self, linter_name: str, path: Path, files: list[str] | None = None
     ) -> LintResult:
-        """Run a specific linter."""
+        """Run a specific linter (sharded when it is per-file and files is long)."""
         linter = self._get_linter(linter_name)
         if linter is None:
             return LintResult(
@@ -85,16 +210,149 @@ class LinterOrchestrator:
                 error=f"Unknown linter: {linter_name}",
             )
 
-        return await linter.lint(path, files)
+        if not files:
+            async with self.scheduler.slot(linter.weight):
+                return await linter.lint(path, files)
+        result = LintResult(linter=linter.name, success=True)
+        for _, shard_result in await self._run_shards(linter, path, files):
+            _merge(result, shard_result)
+        return result
+
+    async def _run_shards(
+        self, linter: BaseLinter, path: Path, files: list[str]
+    ) -> list[tuple[list[str], LintResult]]:
+        """Run a linter on a file list, split into shards for per-file linters.
+
+        Args:
+            linter: Linter to run
+            path: Repository root
+            files: Files to lint (passed to the linter as given)
+
+        Returns:
+            Each shard's files with its result, in file order
+        """
+        if linter.cacheable:
+            shards = shard_files(
+                files, self.scheduler.slots // max(1, linter.weight), MAX_FILES_PER_RUN
+            )
+        else:
+            # Whole-package analysis needs all files in one run
+            shards = [files]
+
+        async def run(shard: list[str]) -> LintResult:
+            async with self.scheduler.slot(linter.weight):
+                return await linter.lint(path, shard)
+
+        results = await asyncio.gather(*(run(shard) for shard in shards))
+        return list(zip(shards, results))
+
+    async def _run_cached(
+        self, linter: BaseLinter, path: Path, files: list[str]
+    ) -> LintResult:
+        """Run a linter on the files missing from the lint cache.
+
+        Args:
+            linter: Cacheable linter
+            path: Repository root
+            files: Files to lint, relative to path
+
+        Returns:
+            LintResult with fresh and cached issues and the cache hit counts
+        """
+        # Don't hash files for a tool that isn't there
+        if not await linter.is_available():
+            return await linter.lint(path, [str(path / f) for f in files])
+
+        linter_key = await self.lint_cache.linter_key(linter, path)
+        # Reading and hashing every file is blocking work: keep it off the loop
+        entry_keys, cached, misses = await asyncio.to_thread(
+            self._lookup_cached, linter_key, path, files
+        )
+
+        result = LintResult(
+            linter=linter.name,
+            success=True,
+            cache_hits=len(files) - len(misses),
+            cache_misses=len(misses),
+        )
+        shards = await self._run_shards(linter, path, [str(path / f) for f in misses])
+        for batch, batch_result in shards:
+            _merge(result, batch_result)
+            if batch_result.error:
+                # Not cached: the run may not have covered every file
+                continue
+
+            by_file: dict[str, list[LintIssue]] = {
+                Path(f).relative_to(path).as_posix(): [] for f in batch
+            }
+            for issue in batch_result.issues:
+                file = relative_issue_path(path, issue.file)
+                if file in by_file:
+                    by_file[file].append(replace(issue, file=file))
+            await asyncio.to_thread(self._store_cached, {
+                entry_keys[file]: issues
+                for file, issues in by_file.items()
+                if file in entry_keys
+            })
+
+        result.issues.extend(cached)
+        result.success = result.success and not cached
+        return result
+
+    def _lookup_cached(
+        self, linter_key: str, path: Path, files: list[str]
+    ) -> tuple[dict[str, str], list[LintIssue], list[str]]:
+        """Hash files and look their issues up in the lint cache (blocking).
+
+        Returns:
+            Cache key of each readable file, the cached issues, and the
+            files to lint
+        """
+        entry_keys: dict[str, str] = {}
+        cached: list[LintIssue] = []
+        misses: list[str] = []
+        for file in files:
+            try:
+                entry_keys[file] = self.lint_cache.entry_key(
+                    linter_key, (path / file).read_bytes()
+                )
+            except OSError:
+                misses.append(file)
+                continue
+            issues = self.lint_cache.get(entry_keys[file])
+            if issues is None:
+                misses.append(file)
+            else:
+                # The same blob may live under another path than when cached
+                cached.extend(replace(issue, file=str(path / file)) for issue in issues)
+        return entry_keys, cached, misses
+
+    def _store_cached(self, entries: dict[str, list[LintIssue]]) -> None:
+        """Store fresh issues in the lint cache by entry key (blocking)."""
+        for key, issues in entries.items():
+            self.lint_cache.put(key, issues)
+
+    def _files_for_linter(
+        self, name: str, detection: DetectionResult, files: list[str]
+    ) -> list[str]:
+        """Files (relative to the linted path) handled by a linter."""
+        linter = self._get_linter(name)
+        if linter is None:
+            return []
+        if "all" in linter.languages:
+            return list(files)
+        return [f for f in files if detection.file_mapping.get(f) in linter.languages]
 
     def _get_linter(self, name: str) -> BaseLinter | None:
-        """Get or create linter instance."""
+        """Get linter instance (shared through the toolchain registry)."""
         if name in self._linter_cache:
             return self._linter_cache[name]
+        return self.toolchain.get(name)
 
-        if name not in self.LINTER_MAP:
-            return None
 
-        linter = self.LINTER_MAP[name]()
-        self._linter_cache[name] = linter
-        return linter
+def _merge(result: LintResult, part: LintResult) -> None:
+    """Add one shard's result to the combined result of a linter."""
+    result.execution_time_ms += part.execution_time_ms
+    result.success = result.success and part.success
+    result.issues.extend(part.issues)
+    result.error = result.error or part.error
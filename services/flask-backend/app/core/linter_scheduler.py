@@ -0,0 +1,175 @@
+"""CPU-aware admission of linter subprocesses.
+
+Every linter run in a process takes slots from one shared scheduler before
+it starts its tool, so concurrent reviews can never fork more linter work
+than the host has cores. Heavy tools take several slots (``BaseLinter.weight``)
+and per-file linters split long file lists into shards that run on separate
+slots and are merged afterwards. Memory is capped per subprocess instead
+(``LINTER_MEMORY_LIMIT_MB``, applied by the linters as an rlimit).
+
+The scheduler is per process: with ``--pool threads`` (see tasks.runtime) it
+covers every task of the worker. With prefork each child gets an equal share
+of the cores - the worker's concurrency is recorded when it starts (see
+``share_cores``) - unless ``LINTER_SLOTS`` sets the slots explicitly.
+"""
+
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import asyncio
+import logging
+import math
+import os
+
+logger = logging.getLogger(__name__)
+
+# Below this many files per shard, tool start-up dominates the run time
+MIN_SHARD_FILES = 50
+
+
+# cgroup v2 CPU limit of the container ("<quota> <period>" or "max <period>")
+CGROUP_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+
+# Worker processes sharing this host's cores (the prefork concurrency)
+_processes_sharing_cores = 1
+
+
+def available_cpus() -> int:
+    """Cores this process may run on.
+
+    Honours cgroup cpusets and taskset, and a container's CPU limit (a pod
+    limited to one CPU on a 32-core node gets one).
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open(CGROUP_CPU_MAX) as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus)
+
+
+def share_cores(processes: int) -> None:
+    """Record how many worker processes on this host split its cores.
+
+    Called in the prefork parent before it forks, so every child's default
+    scheduler gets ``available_cpus() // processes`` slots.
+    """
+    global _processes_sharing_cores
+    _processes_sharing_cores = max(1, processes)
+
+
+def default_slots() -> int:
+    """Linter slots of this process: ``LINTER_SLOTS``, else its share of the cores."""
+    from ..config import Config
+
+    if Config.LINTER_SLOTS > 0:
+        return Config.LINTER_SLOTS
+    return max(1, available_cpus() // _processes_sharing_cores)
+
+
+def shard_files(
+    files: list[str], shards: int, max_files: int, min_files: int = MIN_SHARD_FILES
+) -> list[list[str]]:
+    """Split a file list into at most ``shards`` runs of similar size.
+
+    Args:
+        files: Files to lint
+        shards: Preferred number of shards (usually the scheduler's slots)
+        max_files: Largest shard (bounds the command line); may add shards
+        min_files: Smallest worthwhile shard; may remove shards
+
+    Returns:
+        Consecutive slices of files, none empty
+    """
+    if not files:
+        return []
+    size = max(min_files, math.ceil(len(files) / max(1, shards)))
+    size = max(1, min(size, max_files))
+    return [files[start:start + size] for start in range(0, len(files), size)]
+
+
+class LinterScheduler:
+    """Weighted semaphore over the host's cores, served first come first served.
+
+    Waiters are queued in arrival order, so a heavy linter waiting for
+    several slots isn't starved by a stream of light ones.
+    """
+
+    def __init__(self, slots: int | None = None):
+        """Initialize scheduler.
+
+        Args:
+            slots: Concurrent linter slots (defaults to the available cores)
+        """
+        self.slots = max(1, slots or available_cpus())
+        self._in_use = 0
+        self._waiters: deque[tuple[int, asyncio.Future]] = deque()
+
+    @property
+    def in_use(self) -> int:
+        """Slots currently held."""
+        return self._in_use
+
+    @asynccontextmanager
+    async def slot(self, weight: int = 1) -> AsyncIterator[None]:
+        """Hold ``weight`` slots (capped at the total) while running a linter."""
+        weight = max(1, min(weight, self.slots))
+        await self._acquire(weight)
+        try:
+            yield
+        finally:
+            self._release(weight)
+
+    async def _acquire(self, weight: int) -> None:
+        if not self._waiters and self._in_use + weight <= self.slots:
+            self._in_use += weight
+            return
+        future = asyncio.get_running_loop().create_future()
+        entry = (weight, future)
+        self._waiters.append(entry)
+        try:
+            await future
+        except BaseException:
+            if future.done() and not future.cancelled():
+                # Granted just as we were cancelled: hand the slots back
+                self._release(weight)
+            else:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                self._wake()
+            raise
+
+    def _release(self, weight: int) -> None:
+        self._in_use -= weight
+        self._wake()
+
+    def _wake(self) -> None:
+        """Grant slots to queued waiters, in order, while they fit."""
+        while self._waiters:
+            weight, future = self._waiters[0]
+            if future.done():
+                self._waiters.popleft()
+                continue
+            if self._in_use + weight > self.slots:
+                return
+            self._waiters.popleft()
+            self._in_use += weight
+            future.set_result(None)
+
+
+_default_scheduler: LinterScheduler | None = None
+
+
+def get_linter_scheduler() -> LinterScheduler:
+    """Return the process-wide linter scheduler."""
+    global _default_scheduler
+    if _default_scheduler is None:
+        _default_scheduler = LinterScheduler(default_slots())
+        logger.info(f"Linter scheduler: {_default_scheduler.slots} slots")
+    return _default_scheduler
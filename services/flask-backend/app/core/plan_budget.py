@@ -0,0 +1,245 @@
+"""Issue plan budgets tracked in Redis counters.
+
+Each repository has a daily plan counter and a monthly cost ledger. Issue
+webhooks *reserve* budget atomically before creating a plan, so concurrent
+deliveries cannot all pass the check and overshoot the limit; the plan
+worker *commits* the actual cost when the plan finishes. A periodic
+reconciliation rewrites the counters from ``issue_plans`` to correct drift.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+DAY_KEY = "darwin:plan-budget:{repository}:{day}:count"
+MONTH_KEY = "darwin:plan-budget:{repository}:{month}:spent"
+RESERVED_KEY = "darwin:plan-budget:{repository}:{month}:reserved"
+
+DAY_TTL_SECONDS = 2 * 86400
+MONTH_TTL_SECONDS = 40 * 86400
+
+# Costs are stored as integer micro-dollars so INCRBY stays exact
+MICRO = 1_000_000
+
+# KEYS: day count, month spent, month reservations (hash external_id -> micro-USD)
+# ARGV: daily limit (-1 = none), cost limit micro (-1 = none), reservation micro,
+#       external_id, day ttl, month ttl
+_RESERVE_SCRIPT = """
+if redis.call('HEXISTS', KEYS[3], ARGV[4]) == 1 then
+    return 0
+end
+local daily_limit = tonumber(ARGV[1])
+local count = tonumber(redis.call('GET', KEYS[1]) or '0')
+if daily_limit >= 0 and count >= daily_limit then
+    return 1
+end
+local cost_limit = tonumber(ARGV[2])
+if cost_limit >= 0 then
+    local committed = tonumber(redis.call('GET', KEYS[2]) or '0')
+    for _, amount in ipairs(redis.call('HVALS', KEYS[3])) do
+        committed = committed + tonumber(amount)
+    end
+    if committed >= cost_limit then
+        return 2
+    end
+end
+redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+redis.call('HSET', KEYS[3], ARGV[4], ARGV[3])
+redis.call('EXPIRE', KEYS[3], ARGV[6])
+return 0
+"""
+
+
+@dataclass(slots=True)
+class BudgetUsage:
+    """Current budget consumption for a repository."""
+
+    plans_today: int
+    cost_this_month: float
+    cost_reserved: float
+
+
+class PlanBudget:
+    """Reserve-and-commit budget counters for issue plans."""
+
+    def __init__(self, client: redis.Redis, reservation_usd: float = 0.05):
+        """Initialize budget tracker.
+
+        Args:
+            client: Redis client
+            reservation_usd: Cost held for a plan until its actual cost is known
+        """
+        self.client = client
+        self.reservation_micro = int(reservation_usd * MICRO)
+        self._reserve = client.register_script(_RESERVE_SCRIPT)
+
+    def reserve(
+        self,
+        repository: str,
+        external_id: str,
+        daily_limit: int | None = None,
+        cost_limit_usd: float | None = None,
+        now: datetime | None = None,
+    ) -> str | None:
+        """Atomically check the limits and reserve budget for one plan.
+
+        Reserving the same external_id twice (a redelivered webhook) is a
+        no-op that succeeds.
+
+        Args:
+            repository: Repository name
+            external_id: Issue plan external ID, identifies the reservation
+            daily_limit: Max plans per day, None for unlimited
+            cost_limit_usd: Max cost per month, None for unlimited
+            now: Current time (for tests)
+
+        Returns:
+            Reason the plan is over budget, or None if it was reserved
+
+        Raises:
+            redis.RedisError: If Redis is unavailable
+        """
+        now = now or datetime.utcnow()
+        result = self._reserve(
+            keys=[
+                self._day_key(repository, now),
+                self._month_key(repository, now),
+                self._reserved_key(repository, now),
+            ],
+            args=[
+                daily_limit if daily_limit is not None else -1,
+                int(cost_limit_usd * MICRO) if cost_limit_usd is not None else -1,
+                self.reservation_micro,
+                external_id,
+                DAY_TTL_SECONDS,
+                MONTH_TTL_SECONDS,
+            ],
+        )
+        if result == 1:
+            return f"Daily limit exceeded ({daily_limit})"
+        if result == 2:
+            return f"Monthly cost limit exceeded (${cost_limit_usd})"
+        return None
+
+    def release(self, repository: str, external_id: str, now: datetime | None = None) -> None:
+        """Drop a reservation for a plan that was never created."""
+        now = now or datetime.utcnow()
+        if self.client.hdel(self._reserved_key(repository, now), external_id):
+            self.client.decr(self._day_key(repository, now))
+
+    def commit(
+        self,
+        repository: str,
+        external_id: str,
+        cost_usd: float,
+        created_at: datetime,
+    ) -> None:
+        """Replace a plan's reservation with its actual cost.
+
+        Plans created without a reservation (e.g. through the API) just add
+        their cost.
+
+        Args:
+            repository: Repository name
+            external_id: Issue plan external ID
+            cost_usd: Actual cost (0 for failed plans)
+            created_at: Plan creation time, selects the month
+        """
+        pipe = self.client.pipeline()
+        pipe.hdel(self._reserved_key(repository, created_at), external_id)
+        if cost_usd:
+            month_key = self._month_key(repository, created_at)
+            pipe.incrby(month_key, int(round(cost_usd * MICRO)))
+            pipe.expire(month_key, MONTH_TTL_SECONDS)
+        pipe.execute()
+
+    def usage(self, repository: str, now: datetime | None = None) -> BudgetUsage:
+        """Read the current counters for a repository."""
+        now = now or datetime.utcnow()
+        pipe = self.client.pipeline()
+        pipe.get(self._day_key(repository, now))
+        pipe.get(self._month_key(repository, now))
+        pipe.hvals(self._reserved_key(repository, now))
+        count, spent, reserved = pipe.execute()
+        return BudgetUsage(
+            plans_today=int(count or 0),
+            cost_this_month=int(spent or 0) / MICRO,
+            cost_reserved=sum(int(amount) for amount in reserved) / MICRO,
+        )
+
+    def reconcile(
+        self,
+        repository: str,
+        plans_today: int,
+        cost_this_month: float,
+        open_external_ids: set[str],
+        now: datetime | None = None,
+    ) -> BudgetUsage:
+        """Overwrite the counters with values computed from the database.
+
+        Reservations for plans that are no longer queued or running (or were
+        never created) are dropped.
+
+        Args:
+            repository: Repository name
+            plans_today: Plans created today
+            cost_this_month: Cost of plans created this month
+            open_external_ids: External IDs of queued/in-progress plans
+            now: Current time (for tests)
+
+        Returns:
+            Usage before reconciliation, for drift reporting
+        """
+        now = now or datetime.utcnow()
+        before = self.usage(repository, now)
+        reserved_key = self._reserved_key(repository, now)
+        stale = [
+            key.decode() if isinstance(key, bytes) else key
+            for key in self.client.hkeys(reserved_key)
+        ]
+        stale = [key for key in stale if key not in open_external_ids]
+
+        pipe = self.client.pipeline()
+        pipe.set(self._day_key(repository, now), plans_today, ex=DAY_TTL_SECONDS)
+        pipe.set(
+            self._month_key(repository, now),
+            int(round(cost_this_month * MICRO)),
+            ex=MONTH_TTL_SECONDS,
+        )
+        if stale:
+            pipe.hdel(reserved_key, *stale)
+        pipe.execute()
+        return before
+
+    @staticmethod
+    def _day_key(repository: str, when: datetime) -> str:
+        return DAY_KEY.format(repository=repository, day=when.strftime("%Y-%m-%d"))
+
+    @staticmethod
+    def _month_key(repository: str, when: datetime) -> str:
+        return MONTH_KEY.format(repository=repository, month=when.strftime("%Y-%m"))
+
+    @staticmethod
+    def _reserved_key(repository: str, when: datetime) -> str:
+        return RESERVED_KEY.format(repository=repository, month=when.strftime("%Y-%m"))
+
+
+_default_budget: PlanBudget | None = None
+
+
+def get_plan_budget() -> PlanBudget:
+    """Return the process-wide plan budget tracker."""
+    global _default_budget
+    if _default_budget is None:
+        from ..config import Config
+        from ..redis_client import get_redis
+
+        _default_budget = PlanBudget(
+            get_redis(), reservation_usd=Config.ISSUE_PLAN_COST_RESERVATION_USD
+        )
+    return _default_budget
@@ -0,0 +1,150 @@
+"""Adaptive polling scheduler for repositories without reliable webhooks."""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import random
+
+
+@dataclass(slots=True)
+class PollDecision:
+    """Outcome of evaluating a repository at a scheduler tick."""
+
+    should_poll: bool
+    reason: str  # "due", "not_due", "webhook_healthy"
+    next_poll_at: datetime
+    countdown_seconds: float = 0.0
+
+
+class AdaptivePollScheduler:
+    """Decide when each repository should be polled next.
+
+    Repositories with recent review activity are polled at their configured
+    interval. Each poll that finds nothing new doubles the interval up to
+    ``max_interval_minutes``. Repositories that received a webhook delivery
+    within ``webhook_healthy_hours`` are skipped entirely, and every poll is
+    offset by a random jitter so that repositories sharing an interval do not
+    hit the platform APIs at the same second.
+    """
+
+    def __init__(
+        self,
+        min_interval_minutes: int = 5,
+        max_interval_minutes: int = 240,
+        activity_window_hours: int = 24,
+        webhook_healthy_hours: int = 6,
+        jitter_seconds: int = 30,
+        rng: random.Random | None = None,
+    ):
+        """Initialize scheduler.
+
+        Args:
+            min_interval_minutes: Interval used for hot repositories
+            max_interval_minutes: Upper bound for backed-off repositories
+            activity_window_hours: Lookback for review history
+            webhook_healthy_hours: Webhook deliveries newer than this skip polling
+            jitter_seconds: Maximum random delay added to each poll
+            rng: Random source (injectable for tests)
+        """
+        self.min_interval_minutes = max(1, min_interval_minutes)
+        self.max_interval_minutes = max(self.min_interval_minutes, max_interval_minutes)
+        self.activity_window = timedelta(hours=activity_window_hours)
+        self.webhook_healthy_window = timedelta(hours=webhook_healthy_hours)
+        self.jitter_seconds = max(0, jitter_seconds)
+        self._rng = rng or random.Random()
+
+    def is_webhook_healthy(self, repo_config: dict, now: datetime) -> bool:
+        """Check whether the repository recently received webhook deliveries."""
+        last_webhook_at = repo_config.get("last_webhook_at")
+        if not last_webhook_at:
+            return False
+        return now - last_webhook_at <= self.webhook_healthy_window
+
+    def interval_minutes(self, repo_config: dict, recent_reviews: int) -> int:
+        """Compute the polling interval for a repository.
+
+        Args:
+            repo_config: Repository configuration record
+            recent_reviews: Reviews created within the activity window
+
+        Returns:
+            Interval in minutes
+        """
+        base = max(
+            self.min_interval_minutes,
+            repo_config.get("polling_interval_minutes") or self.min_interval_minutes,
+        )
+        if recent_reviews > 0:
+            return min(base, self.max_interval_minutes)
+
+        idle_count = repo_config.get("poll_idle_count") or 0
+        # Cap the exponent; max_interval_minutes bounds the result anyway
+        backoff = base * (2 ** min(idle_count, 16))
+        return min(backoff, self.max_interval_minutes)
+
+    def jitter(self) -> float:
+        """Random delay in seconds to spread polls across the tick."""
+        if not self.jitter_seconds:
+            return 0.0
+        return self._rng.uniform(0, self.jitter_seconds)
+
+    def evaluate(
+        self, repo_config: dict, recent_reviews: int, now: datetime
+    ) -> PollDecision:
+        """Decide whether a repository should be polled at this tick.
+
+        Args:
+            repo_config: Repository configuration record
+            recent_reviews: Reviews created within the activity window
+            now: Current UTC time
+
+        Returns:
+            PollDecision with the next scheduled poll time
+        """
+        interval = timedelta(minutes=self.interval_minutes(repo_config, recent_reviews))
+
+        if self.is_webhook_healthy(repo_config, now):
+            # Re-check once the webhook window could have lapsed
+            return PollDecision(
+                should_poll=False,
+                reason="webhook_healthy",
+                next_poll_at=repo_config["last_webhook_at"] + self.webhook_healthy_window,
+            )
+
+        next_poll_at = repo_config.get("next_poll_at")
+        if next_poll_at and next_poll_at > now:
+            return PollDecision(
+                should_poll=False, reason="not_due", next_poll_at=next_poll_at
+            )
+
+        countdown = self.jitter()
+        return PollDecision(
+            should_poll=True,
+            reason="due",
+            next_poll_at=now + interval + timedelta(seconds=countdown),
+            countdown_seconds=countdown,
+        )
+
+    def record_poll(
+        self, repo_config: dict, reviews_created: int, recent_reviews: int, now: datetime
+    ) -> tuple[int, datetime]:
+        """Update the idle streak after a completed poll.
+
+        Args:
+            repo_config: Repository configuration record
+            reviews_created: Reviews queued by this poll
+            recent_reviews: Reviews created within the activity window,
+                including those queued by this poll
+            now: Current UTC time
+
+        Returns:
+            Tuple of (poll_idle_count, next_poll_at)
+        """
+        if reviews_created > 0:
+            idle_count = 0
+        else:
+            idle_count = (repo_config.get("poll_idle_count") or 0) + 1
+
+        updated = {**repo_config, "poll_idle_count": idle_count}
+        interval = self.interval_minutes(updated, recent_reviews)
+        next_poll_at = now + timedelta(minutes=interval, seconds=self.jitter())
+        return idle_count, next_poll_at
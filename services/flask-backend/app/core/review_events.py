@@ -0,0 +1,189 @@
+"""Review progress events for Server-Sent Events streams.
+
+Workers publish an event for every review status change and every
+completed (file, category) unit. Each event gets a per-review sequence
+number, is kept in a short per-review history for replay, and is broadcast
+on a per-review pub/sub channel. A client that reconnects with
+``Last-Event-ID`` replays what it missed from the history, then follows
+the channel.
+"""
+
+from dataclasses import dataclass, field
+import json
+import logging
+import time
+from typing import Any, Iterator
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+SEQ_KEY = "darwin:review-events:{review_id}:seq"
+HISTORY_KEY = "darwin:review-events:{review_id}:history"
+CHANNEL = "darwin:review-events:{review_id}"
+
+TERMINAL_STATUSES = frozenset({"completed", "failed", "cancelled"})
+
+# KEYS: sequence counter, history (sorted set scored by sequence)
+# ARGV: event name, data JSON, history length, ttl, channel
+_PUBLISH_SCRIPT = """
+local seq = redis.call('INCR', KEYS[1])
+local payload = '{"id":' .. seq .. ',"event":' .. cjson.encode(ARGV[1]) .. ',"data":' .. ARGV[2] .. '}'
+redis.call('ZADD', KEYS[2], seq, payload)
+redis.call('ZREMRANGEBYRANK', KEYS[2], 0, -(tonumber(ARGV[3]) + 1))
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+redis.call('PUBLISH', ARGV[5], payload)
+return seq
+"""
+
+
+@dataclass(slots=True)
+class ReviewEvent:
+    """One progress event of a review."""
+
+    id: int
+    event: str
+    data: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def is_terminal(self) -> bool:
+        """Whether this event ends the review (no more events follow)."""
+        return self.event == "status" and self.data.get("status") in TERMINAL_STATUSES
+
+    def to_sse(self) -> str:
+        """Format as a Server-Sent Events message."""
+        lines = [f"id: {self.id}"] if self.id else []
+        lines.append(f"event: {self.event}")
+        lines.append(f"data: {json.dumps(self.data, default=str)}")
+        return "\n".join(lines) + "\n\n"
+
+
+def _decode(payload: bytes | str) -> ReviewEvent | None:
+    try:
+        message = json.loads(payload)
+        return ReviewEvent(id=int(message["id"]), event=message["event"], data=message["data"])
+    except (ValueError, KeyError, TypeError) as e:
+        logger.debug(f"Ignoring malformed review event: {e}")
+        return None
+
+
+class ReviewEvents:
+    """Publishes and follows per-review event streams."""
+
+    def __init__(self, client: redis.Redis, history: int = 500, ttl_seconds: int = 86400):
+        """Initialize event streams.
+
+        Args:
+            client: Redis client
+            history: Events kept per review for replay after reconnect
+            ttl_seconds: How long a review's events are kept after the last one
+        """
+        self.client = client
+        self.history_size = history
+        self.ttl_seconds = ttl_seconds
+        self._publish = client.register_script(_PUBLISH_SCRIPT)
+
+    def publish(self, review_id: int, event: str, data: dict[str, Any]) -> int | None:
+        """Publish an event; never raises, progress events are best effort.
+
+        Args:
+            review_id: Review the event belongs to
+            event: Event name (status, unit, file, shard)
+            data: JSON-serializable payload
+
+        Returns:
+            The event's sequence ID, or None if it could not be published
+        """
+        try:
+            return int(self._publish(
+                keys=[SEQ_KEY.format(review_id=review_id), HISTORY_KEY.format(review_id=review_id)],
+                args=[
+                    event,
+                    json.dumps(data, default=str),
+                    self.history_size,
+                    self.ttl_seconds,
+                    CHANNEL.format(review_id=review_id),
+                ],
+            ))
+        except redis.RedisError as e:
+            logger.debug(f"Could not publish {event} event for review {review_id}: {e}")
+            return None
+
+    def history(self, review_id: int, after: int = 0) -> list[ReviewEvent]:
+        """Events of a review with a sequence ID above after, oldest first."""
+        payloads = self.client.zrangebyscore(
+            HISTORY_KEY.format(review_id=review_id), f"({after}", "+inf"
+        )
+        return [event for event in map(_decode, payloads) if event is not None]
+
+    def follow(
+        self,
+        review_id: int,
+        after: int = 0,
+        max_seconds: float = 300.0,
+        heartbeat_seconds: float = 15.0,
+    ) -> Iterator[ReviewEvent | None]:
+        """Replay missed events, then yield new ones as they are published.
+
+        Subscribes before reading the history so nothing published in
+        between is lost; events seen in both are yielded once.
+
+        Args:
+            review_id: Review to follow
+            after: Last sequence ID the client has seen
+            max_seconds: Stop after this long (clients reconnect with Last-Event-ID)
+            heartbeat_seconds: Yield None after this long without events
+
+        Yields:
+            Events in sequence order, or None as a keep-alive tick. Ends after
+            a terminal status event or when max_seconds is reached.
+
+        Raises:
+            redis.RedisError: If Redis is unavailable
+        """
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(CHANNEL.format(review_id=review_id))
+        try:
+            last = after
+            for event in self.history(review_id, after):
+                last = event.id
+                yield event
+                if event.is_terminal:
+                    return
+
+            deadline = time.monotonic() + max_seconds
+            last_sent = time.monotonic()
+            while (remaining := deadline - time.monotonic()) > 0:
+                message = pubsub.get_message(timeout=min(heartbeat_seconds, remaining))
+                event = _decode(message["data"]) if message else None
+                if event is None or event.id <= last:
+                    if time.monotonic() - last_sent >= heartbeat_seconds:
+                        last_sent = time.monotonic()
+                        yield None
+                    continue
+                last = event.id
+                last_sent = time.monotonic()
+                yield event
+                if event.is_terminal:
+                    return
+        finally:
+            pubsub.close()
+
+
+_default_events: ReviewEvents | None = None
+
+
+def get_review_events() -> ReviewEvents:
+    """Return the process-wide review event streams."""
+    global _default_events
+    if _default_events is None:
+        from ..config import Config
+        from ..redis_client import get_redis
+
+        _default_events = ReviewEvents(
+            get_redis(),
+            history=Config.REVIEW_EVENTS_HISTORY,
+            ttl_seconds=Config.REVIEW_EVENTS_TTL_SECONDS,
+        )
+    return _default_events
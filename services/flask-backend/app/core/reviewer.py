@@ -1,15 +1,19 @@
 """Core review engine for Darwin code review system."""
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncContextManager, AsyncIterator, Awaitable, Callable
 import asyncio
+import hashlib
 import json
 import re
 
-from .detector import LanguageDetector, DetectionResult
-from .linter import LinterOrchestrator, OrchestratorResult
+from .dedupe import finding_fingerprint, patch_added_lines, patch_added_rows, patch_line_map
+from .detector import LanguageDetector, DetectionResult, merge_detection
+from .lint_cache import LintCache
+from .linter import LinterOrchestrator, OrchestratorResult, relative_issue_path
 from .prompts import ReviewPrompts
+from ..linters import LintIssue
 from ..providers.base import AIProvider, AIResponse
 from ..models import create_provider_usage
 
@@ -28,6 +32,7 @@ class ReviewComment:
     source: str  # "linter" or "ai"
     suggestion: str | None = None
     linter_rule_id: str | None = None
+    fingerprint: str | None = None  # see core.dedupe.finding_fingerprint
 
 
 @dataclass(slots=True)
@@ -53,14 +58,71 @@ class PRFile:
     deletions: int
     patch: str  # unified diff
     old_path: str | None = None  # for renames
+    blob_sha: str | None = None  # at head, when the platform lists it
+
+
+def patch_sha(patch: str | None) -> str:
+    """Hash of a file's diff, identifies what a checkpointed unit reviewed."""
+    return hashlib.sha256((patch or "").encode()).hexdigest()
+
+
+@dataclass(slots=True)
+class ReviewCheckpoint:
+    """Resume state of a review made of (file, category) units.
+
+    ``completed`` holds the units an earlier attempt finished, mapped to the
+    hash of the patch they were reviewed against; those units are skipped
+    unless the patch changed. ``on_unit_complete`` is called with each newly
+    reviewed unit's comments right after its AI call, so the work is
+    persisted before the next call is made. ``on_unit_comments`` receives
+    the comments of a unit that did not finish (e.g. one of its linters
+    failed): they are kept, but the unit is done again on resume.
+    """
+
+    completed: dict[tuple[str, str], str | None] = field(default_factory=dict)
+    on_unit_complete: Callable[[PRFile, str, list[ReviewComment]], None] | None = None
+    on_unit_comments: Callable[[PRFile, str, list[ReviewComment]], None] | None = None
+
+    def is_done(self, pr_file: PRFile, category: str) -> bool:
+        """Check whether a unit was already reviewed against this patch."""
+        key = (pr_file.path, category)
+        if key not in self.completed:
+            return False
+        reviewed_sha = self.completed[key]
+        return reviewed_sha is None or reviewed_sha == patch_sha(pr_file.patch)
+
+
+async def _call_directly(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    return func(*args, **kwargs)
 
 
 class ReviewEngine:
     """Core engine that coordinates detection, linting, and AI review."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        on_event: Callable[[str, dict[str, Any]], Any] | None = None,
+        lint_cache: LintCache | None = None,
+        run_blocking: Callable[..., Awaitable[Any]] | None = None,
+    ):
+        """Initialize engine.
+
+        Args:
+            on_event: Called with (event, data) as files and categories
+                complete, for progress streaming (optional)
+            lint_cache: Per-file cache of linter issues (optional)
+            run_blocking: Awaits a blocking call - usage records and
+                checkpoint hooks, which write to the database - off the
+                event loop (defaults to calling it directly)
+        """
         self.detector = LanguageDetector()
-        self.linter_orchestrator = LinterOrchestrator()
+        self.linter_orchestrator = LinterOrchestrator(lint_cache)
+        self.on_event = on_event
+        self.run_blocking = run_blocking or _call_directly
+
+    def _emit(self, event: str, data: dict[str, Any]) -> None:
+        if self.on_event:
+            self.on_event(event, data)
 
     async def review_pr(
         self,
@@ -84,48 +146,117 @@ class ReviewEngine:
         Returns:
             ReviewResult with comments and metadata
         """
-        result = ReviewResult()
 
-        # Get file paths for detection
-        file_paths = [f.path for f in pr_files if f.status != "deleted"]
-        if not file_paths:
-            return result
+        async def single_page() -> AsyncIterator[list[PRFile]]:
+            yield pr_files
 
-        # Detect languages and frameworks
-        result.detection = self.detector.detect_from_files(file_paths)
+        return await self.review_pr_stream(
+            platform=platform,
+            repository=repository,
+            pages=single_page(),
+            config=config,
+            ai_provider=ai_provider,
+            review_id=review_id,
+        )
+
+    async def review_pr_stream(
+        self,
+        platform: str,
+        repository: str,
+        pages: AsyncIterator[list[PRFile]],
+        config: dict[str, Any],
+        ai_provider: AIProvider | None = None,
+        review_id: int | None = None,
+        checkpoint: ReviewCheckpoint | None = None,
+        known_paths: list[str] | None = None,
+        lint_checkout: Callable[[list[str]], AsyncContextManager[Path | None]] | None = None,
+        base_detection: DetectionResult | None = None,
+    ) -> ReviewResult:
+        """Review pull request files as pages arrive from the platform API.
+
+        Detection is refreshed with every page so later pages see the full
+        language picture, while files on the first page are reviewed without
+        waiting for the rest of the listing. Changed paths alone name no
+        frameworks or IaC tools, so the repository's own detection is merged
+        in when given. When the linter category is
+        enabled, the changed files are checked out through lint_checkout once
+        the listing is complete and linted; each file is one (file, "linter")
+        checkpoint unit.
+
+        Args:
+            platform: Git platform (github, gitlab)
+            repository: Repository name
+            pages: Async iterator yielding lists of changed files
+            config: Review configuration
+            ai_provider: AI provider for reviews (optional)
+            review_id: Database review ID for tracking (optional)
+            checkpoint: Completed units to skip and a hook for new ones (optional)
+            known_paths: Paths of the whole PR when reviewing one shard of it,
+                so detection sees every file (optional)
+            lint_checkout: Given the paths to lint, returns an async context
+                manager yielding a checkout of the PR head containing them,
+                or None if it could not be made (optional, no linting without)
+            base_detection: Detection of the repository's default branch
+                (optional, see detection_cache)
+
+        Returns:
+            ReviewResult with comments and metadata
+        """
+        result = ReviewResult()
 
-        # Run linters on changed files
         categories = config.get("categories", ["security", "best_practices"])
         include_linter = "linter" in categories
+        ai_categories = [c for c in categories if c != "linter"]
 
-        if include_linter:
-            # Create temporary dict of file contents from patches
-            file_contents = {}
-            for pr_file in pr_files:
-                if pr_file.patch and pr_file.status != "deleted":
-                    # Extract added lines from patch for basic content detection
-                    lines = [
-                        line[1:] for line in pr_file.patch.split("\n") if line.startswith("+")
-                    ]
-                    file_contents[pr_file.path] = "\n".join(lines)
-
-            # Note: For real linting, we need the actual repository
-            # This is a placeholder - actual implementation would clone repo
-            # For now, we'll skip linting in PR mode
-            pass
+        file_paths: list[str] = list(known_paths or [])
+        seen_paths = set(file_paths)
+        lint_files: list[PRFile] = []
 
-        # Review each file with AI
-        if ai_provider:
-            ai_categories = [c for c in categories if c != "linter"]
-            for pr_file in pr_files:
-                if pr_file.status == "deleted" or not pr_file.patch:
-                    continue
+        async for page in pages:
+            # Get file paths for detection
+            page_paths = [f.path for f in page if f.status != "deleted"]
+            if not page_paths:
+                continue
 
-                file_comments = await self._review_file_with_ai(
-                    pr_file, result.detection, ai_categories, ai_provider, review_id
+            # Detect languages and frameworks
+            file_paths.extend(p for p in page_paths if p not in seen_paths)
+            seen_paths.update(page_paths)
+            result.detection = self.detector.detect_from_files(file_paths)
+            if base_detection is not None:
+                result.detection = merge_detection(base_detection, result.detection)
+
+            if include_linter:
+                lint_files.extend(
+                    f for f in page
+                    if f.status != "deleted" and f.patch
+                    and not (checkpoint and checkpoint.is_done(f, "linter"))
                 )
-                result.comments.extend(file_comments)
-                result.files_reviewed += 1
+
+            # Review each file with AI
+            if ai_provider:
+                for pr_file in page:
+                    if pr_file.status == "deleted" or not pr_file.patch:
+                        continue
+
+                    file_comments = await self._review_file_with_ai(
+                        pr_file,
+                        result.detection,
+                        ai_categories,
+                        ai_provider,
+                        review_id,
+                        checkpoint,
+                    )
+                    result.comments.extend(file_comments)
+                    result.files_reviewed += 1
+                    self._emit("file", {
+                        "file_path": pr_file.path,
+                        "comments": len(file_comments),
+                    })
+
+        if lint_files and lint_checkout:
+            async with lint_checkout([f.path for f in lint_files]) as repo_path:
+                if repo_path is not None:
+                    await self._lint_pr_files(repo_path, lint_files, result, checkpoint)
 
         return result
 
@@ -164,19 +295,11 @@ class ReviewEngine:
             # Convert linter issues to review comments
             for lint_result in result.linter_results.results:
                 for issue in lint_result.issues:
-                    comment = ReviewComment(
-                        file_path=issue.file,
-                        line_start=issue.line,
-                        line_end=issue.line,
-                        category="linter",
-                        severity=self._map_severity(issue.severity),
-                        title=f"{lint_result.linter}: {issue.rule_id}",
-                        body=issue.message,
-                        source="linter",
-                        suggestion=issue.suggestion,
-                        linter_rule_id=issue.rule_id,
+                    result.comments.append(
+                        self._linter_comment(lint_result.linter, issue, issue.file)
                     )
-                    result.comments.append(comment)
+
+            self._fingerprint_comments(result.comments)
 
         # AI review of specific files
         if ai_provider:
@@ -187,6 +310,79 @@ class ReviewEngine:
 
         return result
 
+    async def _lint_pr_files(
+        self,
+        repo_path: Path,
+        pr_files: list[PRFile],
+        result: ReviewResult,
+        checkpoint: ReviewCheckpoint | None = None,
+    ) -> None:
+        """Lint changed files in a checkout, keeping issues on added lines.
+
+        Secrets are scanned for in the added lines only, one gitleaks run
+        over the patch text rather than the checkout's history.
+
+        Args:
+            repo_path: Checkout of the PR head containing the files
+            pr_files: Changed files to lint
+            result: Review result to add comments and linter results to
+            checkpoint: Resume state (optional)
+        """
+        detection = self.detector.detect_from_directory(repo_path)
+        result.linter_results = await self.linter_orchestrator.run_linters(
+            repo_path, detection, files=[f.path for f in pr_files], include_security=False
+        )
+        result.linter_results.add(await self.linter_orchestrator.scan_added_lines(
+            {f.path: patch_added_rows(f.patch) for f in pr_files},
+            repo_path / ".gitleaks.toml",
+        ))
+
+        added_lines = {f.path: patch_added_lines(f.patch) for f in pr_files}
+        file_comments: dict[str, list[ReviewComment]] = {f.path: [] for f in pr_files}
+        failed = False
+        for lint_result in result.linter_results.results:
+            if lint_result.error:
+                result.errors.append(f"{lint_result.linter}: {lint_result.error}")
+                failed = True
+            for issue in lint_result.issues:
+                file_path = relative_issue_path(repo_path, issue.file)
+                # Pre-existing issues on unchanged lines are not the PR's
+                if issue.line not in added_lines.get(file_path, ()):
+                    continue
+                file_comments[file_path].append(
+                    self._linter_comment(lint_result.linter, issue, file_path)
+                )
+
+        for pr_file in pr_files:
+            comments = file_comments[pr_file.path]
+            self._fingerprint_comments(comments, pr_file.patch)
+            # With a failed linter the unit is linted again on resume
+            if checkpoint:
+                hook = checkpoint.on_unit_comments if failed else checkpoint.on_unit_complete
+                if hook:
+                    await self.run_blocking(hook, pr_file, "linter", comments)
+            result.comments.extend(comments)
+            self._emit("unit", {
+                "file_path": pr_file.path,
+                "category": "linter",
+                "findings": [asdict(c) for c in comments],
+            })
+
+    def _linter_comment(self, linter: str, issue: LintIssue, file_path: str) -> ReviewComment:
+        """Convert a linter issue to a review comment."""
+        return ReviewComment(
+            file_path=file_path,
+            line_start=issue.line,
+            line_end=issue.line,
+            category="linter",
+            severity=self._map_severity(issue.severity),
+            title=f"{linter}: {issue.rule_id}",
+            body=issue.message,
+            source="linter",
+            suggestion=issue.suggestion,
+            linter_rule_id=issue.rule_id,
+        )
+
     async def _review_file_with_ai(
         self,
         pr_file: PRFile,
@@ -194,18 +390,24 @@ class ReviewEngine:
         categories: list[str],
         ai_provider: AIProvider,
         review_id: int | None,
+        checkpoint: ReviewCheckpoint | None = None,
     ) -> list[ReviewComment]:
         """Review a single file using AI across multiple categories.
 
+        Each category is one checkpointed unit: units completed by an earlier
+        attempt are skipped, and new ones are handed to the checkpoint hook
+        as soon as their AI call returns.
+
         Args:
             pr_file: PR file with diff
             detection: Detection result
             categories: Review categories to apply
             ai_provider: AI provider
             review_id: Review ID for tracking
+            checkpoint: Resume state (optional)
 
         Returns:
-            List of review comments
+            List of comments from the units reviewed in this call
         """
         comments = []
 
@@ -222,6 +424,9 @@ class ReviewEngine:
 
         # Review for each category
         for category in categories:
+            if checkpoint and checkpoint.is_done(pr_file, category):
+                continue
+
             try:
                 prompt = self._build_prompt(
                     category=category,
@@ -244,7 +449,8 @@ class ReviewEngine:
 
                 # Track usage
                 if review_id:
-                    create_provider_usage(
+                    await self.run_blocking(
+                        create_provider_usage,
                         review_id=review_id,
                         provider=ai_provider.name,
                         model=response.model,
@@ -260,15 +466,50 @@ class ReviewEngine:
                 category_comments = self._parse_ai_response(
                     response, category, pr_file.path, ai_provider.name
                 )
-                comments.extend(category_comments)
 
             except Exception as e:
                 # Log error but continue with other categories
                 print(f"Error reviewing {pr_file.path} for {category}: {e}")
+                self._emit("unit_failed", {
+                    "file_path": pr_file.path,
+                    "category": category,
+                    "error": str(e),
+                })
                 continue
 
+            self._fingerprint_comments(category_comments, pr_file.patch)
+            # Outside the try: a failure to persist must fail the attempt
+            if checkpoint and checkpoint.on_unit_complete:
+                await self.run_blocking(
+                    checkpoint.on_unit_complete, pr_file, category, category_comments
+                )
+            comments.extend(category_comments)
+            self._emit("unit", {
+                "file_path": pr_file.path,
+                "category": category,
+                "findings": [asdict(c) for c in category_comments],
+            })
+
         return comments
 
+    def _fingerprint_comments(
+        self, comments: list[ReviewComment], patch: str | None = None
+    ) -> None:
+        """Attach dedupe fingerprints, anchored on the diff line when known.
+
+        Args:
+            comments: Comments to fingerprint in place
+            patch: Unified diff of the file the comments belong to
+        """
+        line_map = patch_line_map(patch) if patch else {}
+        for comment in comments:
+            comment.fingerprint = finding_fingerprint(
+                comment.file_path,
+                comment.category,
+                comment.title,
+                line_map.get(comment.line_start),
+            )
+
     def _build_prompt(
         self,
         category: str,
@@ -0,0 +1,270 @@
+"""Review work lanes and per-tenant fair share.
+
+Review work is split into Celery queues (lanes) by how latency-sensitive
+it is. Workers consume the lanes in priority order, so a nightly
+whole-repository scan never sits in front of a freshly opened PR. Within a
+lane, each tenant may hold only its weighted share of concurrently running
+reviews; work beyond that share is deferred and re-queued, leaving worker
+slots for other tenants.
+"""
+
+import json
+import logging
+import time
+from typing import Any, Iterator
+
+import redis
+from prometheus_client import REGISTRY
+from prometheus_client.core import GaugeMetricFamily, SummaryMetricFamily
+
+logger = logging.getLogger(__name__)
+
+# Lanes, highest priority first: an issue plan has someone waiting on it,
+# a whole-repository scan doesn't. Review workers list them in this order
+# in -Q; ingest, publish and polling run on their own workers (see
+# k8s/manifests) so they never queue behind a review.
+LANE_INTERACTIVE = "reviews"
+LANE_SYNC = "reviews-sync"
+LANE_PLANS = "plans"
+LANE_WHOLE = "reviews-whole"
+LANES = (LANE_INTERACTIVE, LANE_SYNC, LANE_PLANS, LANE_WHOLE)
+
+TRIGGER_INTERACTIVE = "interactive"
+TRIGGER_SYNC = "sync"
+
+ACTIVE_KEY = "darwin:tenant-active:{tenant_id}"
+WAIT_KEY = "darwin:lane-wait"
+
+# KEYS: tenant active set (review_id -> lease expiry)
+# ARGV: now, limit, review_id, lease expiry
+_ACQUIRE_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+if redis.call('ZSCORE', KEYS[1], ARGV[3]) then
+    redis.call('ZADD', KEYS[1], ARGV[4], ARGV[3])
+    return 1
+end
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[4], ARGV[3])
+redis.call('EXPIRE', KEYS[1], math.ceil(ARGV[4] - ARGV[1]))
+return 1
+"""
+
+
+def review_lane(review: dict[str, Any], trigger: str = TRIGGER_INTERACTIVE) -> str:
+    """Pick the lane for a review.
+
+    Args:
+        review: Review record
+        trigger: TRIGGER_INTERACTIVE (PR opened, manual) or TRIGGER_SYNC (new push)
+
+    Returns:
+        Celery queue name
+    """
+    if review.get("review_type") == "whole":
+        return LANE_WHOLE
+    if trigger == TRIGGER_SYNC:
+        return LANE_SYNC
+    return LANE_INTERACTIVE
+
+
+class TenantFairShare:
+    """Caps the number of reviews each tenant runs concurrently.
+
+    Running reviews are tracked as leases in a sorted set per tenant, so a
+    worker that dies mid-review frees its slot when the lease expires.
+    Reviews without a tenant are not limited. If Redis is unavailable,
+    slots are granted (fail open) rather than stalling all review work.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        max_active: int = 4,
+        lease_seconds: int = 1800,
+    ):
+        """Initialize fair share.
+
+        Args:
+            client: Redis client
+            max_active: Concurrent reviews per tenant at weight 1.0 (0 = unlimited)
+            lease_seconds: Slot lifetime if never released
+        """
+        self.client = client
+        self.max_active = max_active
+        self.lease_seconds = lease_seconds
+        self._acquire = client.register_script(_ACQUIRE_SCRIPT)
+
+    def limit_for(self, weight: float) -> int:
+        """Concurrent reviews allowed for a tenant with the given weight."""
+        return max(1, round(self.max_active * weight))
+
+    def acquire(self, tenant_id: int | None, review_id: int, weight: float = 1.0) -> bool:
+        """Take a slot for a review; re-acquiring a held slot renews it.
+
+        Args:
+            tenant_id: Tenant of the review
+            review_id: Review taking the slot
+            weight: Tenant's share multiplier
+
+        Returns:
+            True if the review may run now
+        """
+        if tenant_id is None or self.max_active <= 0:
+            return True
+        now = time.time()
+        try:
+            return bool(self._acquire(
+                keys=[ACTIVE_KEY.format(tenant_id=tenant_id)],
+                args=[now, self.limit_for(weight), review_id, now + self.lease_seconds],
+            ))
+        except redis.RedisError as e:
+            logger.warning(f"Fair share unavailable, running review {review_id}: {e}")
+            return True
+
+    def renew(self, tenant_id: int | None, review_id: int) -> None:
+        """Extend the lease of a slot the review already holds.
+
+        Sharded reviews hold their slot until the last shard finishes, so
+        every shard renews it; a lease that already expired is not taken
+        back (the shard runs regardless).
+        """
+        if tenant_id is None or self.max_active <= 0:
+            return
+        try:
+            self.client.zadd(
+                ACTIVE_KEY.format(tenant_id=tenant_id),
+                {review_id: time.time() + self.lease_seconds},
+                xx=True,
+            )
+        except redis.RedisError as e:
+            logger.warning(f"Could not renew slot of review {review_id}: {e}")
+
+    def release(self, tenant_id: int | None, review_id: int) -> None:
+        """Give a review's slot back."""
+        if tenant_id is None or self.max_active <= 0:
+            return
+        try:
+            self.client.zrem(ACTIVE_KEY.format(tenant_id=tenant_id), review_id)
+        except redis.RedisError as e:
+            logger.warning(f"Could not release slot of review {review_id}: {e}")
+
+
+def record_task_wait(client: redis.Redis, request: Any) -> None:
+    """Add a started task's queue wait to its lane's running totals.
+
+    Args:
+        client: Redis client
+        request: Celery task request (``self.request``)
+    """
+    enqueued_at = getattr(request, "enqueued_at", None)
+    lane = (getattr(request, "delivery_info", None) or {}).get("routing_key")
+    if enqueued_at is None or not lane:
+        return
+    try:
+        pipe = client.pipeline()
+        pipe.hincrbyfloat(WAIT_KEY, f"{lane}:sum", max(0.0, time.time() - float(enqueued_at)))
+        pipe.hincrby(WAIT_KEY, f"{lane}:count", 1)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.debug(f"Could not record wait for {lane}: {e}")
+
+
+class LaneCollector:
+    """Prometheus collector reading lane depth and wait times from Redis.
+
+    Celery workers don't serve /metrics, so workers write wait totals to
+    Redis and the web process exports them at scrape time, together with
+    each lane's length and the age of its oldest message.
+    """
+
+    def __init__(self, client: redis.Redis, lanes: tuple[str, ...] = LANES):
+        self.client = client
+        self.lanes = lanes
+
+    def collect(self) -> Iterator[Any]:
+        depth = GaugeMetricFamily(
+            "darwin_queue_depth", "Tasks waiting in each work lane", labels=["lane"]
+        )
+        oldest = GaugeMetricFamily(
+            "darwin_queue_oldest_wait_seconds",
+            "Age of the oldest task waiting in each work lane",
+            labels=["lane"],
+        )
+        waits = SummaryMetricFamily(
+            "darwin_queue_wait_seconds",
+            "Time tasks waited in a lane before a worker started them",
+            labels=["lane"],
+        )
+
+        try:
+            pipe = self.client.pipeline()
+            for lane in self.lanes:
+                pipe.llen(lane)
+                # Kombu pushes on the left and workers pop from the right
+                pipe.lindex(lane, -1)
+            pipe.hgetall(WAIT_KEY)
+            *lane_results, totals = pipe.execute()
+        except redis.RedisError as e:
+            logger.debug(f"Lane metrics unavailable: {e}")
+            return
+
+        now = time.time()
+        totals = {
+            (k.decode() if isinstance(k, bytes) else k): float(v) for k, v in totals.items()
+        }
+        for i, lane in enumerate(self.lanes):
+            length, tail = lane_results[2 * i], lane_results[2 * i + 1]
+            depth.add_metric([lane], length)
+            enqueued_at = _message_enqueued_at(tail)
+            oldest.add_metric([lane], max(0.0, now - enqueued_at) if enqueued_at else 0.0)
+            waits.add_metric(
+                [lane],
+                count_value=totals.get(f"{lane}:count", 0.0),
+                sum_value=totals.get(f"{lane}:sum", 0.0),
+            )
+
+        yield depth
+        yield oldest
+        yield waits
+
+
+def _message_enqueued_at(raw: bytes | None) -> float | None:
+    """Read the enqueued_at header of a raw Kombu message."""
+    if not raw:
+        return None
+    try:
+        value = json.loads(raw).get("headers", {}).get("enqueued_at")
+        return float(value) if value is not None else None
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+_lane_collector: LaneCollector | None = None
+
+
+def register_lane_metrics(client: redis.Redis) -> None:
+    """Export lane metrics on /metrics (once per process)."""
+    global _lane_collector
+    if _lane_collector is None:
+        _lane_collector = LaneCollector(client)
+        REGISTRY.register(_lane_collector)
+
+
+_default_fair_share: TenantFairShare | None = None
+
+
+def get_fair_share() -> TenantFairShare:
+    """Return the process-wide tenant fair share."""
+    global _default_fair_share
+    if _default_fair_share is None:
+        from ..config import Config
+        from ..redis_client import get_redis
+
+        _default_fair_share = TenantFairShare(
+            get_redis(),
+            max_active=Config.TENANT_MAX_ACTIVE_REVIEWS,
+            lease_seconds=Config.TENANT_REVIEW_LEASE_SECONDS,
+        )
+    return _default_fair_share
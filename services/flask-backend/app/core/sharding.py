@@ -0,0 +1,96 @@
+"""Split large reviews into file-batch shards.
+
+A review whose diff would take more prompt tokens than one worker should
+handle is split into shards of consecutive files, each sized to roughly
+the same token budget. Shards are reviewed in parallel (a Celery chord in
+the review worker) and their results merged back into one review.
+"""
+
+from dataclasses import asdict, dataclass, field
+import math
+from typing import Any
+
+from .reviewer import PRFile
+
+# Rough prompt size: diff characters per token, plus the category template,
+# tech stack and instructions sent with every file
+CHARS_PER_TOKEN = 4
+PROMPT_OVERHEAD_TOKENS = 800
+
+
+@dataclass(slots=True)
+class ReviewShard:
+    """A batch of files reviewed by one shard task."""
+
+    index: int
+    files: list[PRFile] = field(default_factory=list)
+    estimated_tokens: int = 0
+
+    def to_payload(self) -> list[dict[str, Any]]:
+        """Files as plain dicts for the task message."""
+        return [asdict(f) for f in self.files]
+
+
+def files_from_payload(payload: list[dict[str, Any]]) -> list[PRFile]:
+    """Rebuild shard files from a task message."""
+    return [PRFile(**item) for item in payload]
+
+
+def estimate_tokens(pr_file: PRFile, categories: int) -> int:
+    """Estimate the prompt tokens needed to review one file.
+
+    Args:
+        pr_file: Changed file
+        categories: Number of AI review categories (one call each)
+
+    Returns:
+        Estimated prompt tokens, 0 for files that are not sent to the AI
+    """
+    if pr_file.status == "deleted" or not pr_file.patch:
+        return 0
+    return (len(pr_file.patch) // CHARS_PER_TOKEN + PROMPT_OVERHEAD_TOKENS) * max(categories, 1)
+
+
+def plan_shards(
+    files: list[PRFile],
+    categories: int,
+    token_budget: int,
+    max_shards: int = 16,
+) -> list[ReviewShard]:
+    """Group files into shards of about token_budget tokens each.
+
+    Files keep their listing order, so re-planning the same review yields
+    the same shards. A file larger than the budget gets a shard of its own.
+    If the budget would produce more than max_shards shards it is raised
+    to spread the files over max_shards.
+
+    Args:
+        files: Changed files in listing order
+        categories: Number of AI review categories
+        token_budget: Target tokens per shard (<= 0 = a single shard)
+        max_shards: Upper bound on the number of shards
+
+    Returns:
+        Shards with their estimated token totals
+    """
+    estimates = [estimate_tokens(f, categories) for f in files]
+    total = sum(estimates)
+    if token_budget <= 0 or total <= token_budget:
+        return [ReviewShard(index=0, files=list(files), estimated_tokens=total)]
+
+    budget = max(token_budget, math.ceil(total / max(max_shards, 1)))
+    shards = [ReviewShard(index=0)]
+    for pr_file, tokens in zip(files, estimates):
+        current = shards[-1]
+        if current.files and current.estimated_tokens + tokens > budget:
+            current = ReviewShard(index=len(shards))
+            shards.append(current)
+        current.files.append(pr_file)
+        current.estimated_tokens += tokens
+
+    # Greedy packing can overshoot max_shards; fold the tail shards back in
+    while len(shards) > max_shards:
+        tail = shards.pop()
+        shards[-1].files.extend(tail.files)
+        shards[-1].estimated_tokens += tail.estimated_tokens
+    return shards
@@ -0,0 +1,139 @@
+"""Process-wide registry of linter tools and their versions.
+
+Linter instances are shared by every orchestrator in a process, so each
+tool's version command runs once per process instead of before every lint
+call. Workers probe all tools in parallel at start and publish the result
+to Redis, where the API reads the inventory of every worker host.
+"""
+
+from dataclasses import asdict, dataclass
+from datetime import datetime
+import asyncio
+import json
+import logging
+import socket
+from typing import Any
+
+import redis
+
+from ..linters import BaseLinter
+
+logger = logging.getLogger(__name__)
+
+INVENTORY_KEY = "darwin:toolchain:{host}"
+
+
+@dataclass(slots=True)
+class ToolInfo:
+    """Probe result of one linter's tool."""
+
+    linter: str
+    tool: str
+    available: bool
+    version: str
+
+
+class ToolchainRegistry:
+    """Shared linter instances whose tools are probed once."""
+
+    def __init__(
+        self, linter_classes: dict[str, type[BaseLinter]], memory_limit_mb: int = 0
+    ):
+        """Initialize registry.
+
+        Args:
+            linter_classes: Linter name to class
+            memory_limit_mb: Memory cap of every linter subprocess (0 = none)
+        """
+        self.linter_classes = linter_classes
+        self.memory_limit_mb = memory_limit_mb
+        self._linters: dict[str, BaseLinter] = {}
+
+    def get(self, name: str) -> BaseLinter | None:
+        """Get the shared instance of a linter, None if unknown."""
+        if name not in self._linters:
+            if name not in self.linter_classes:
+                return None
+            linter = self.linter_classes[name]()
+            linter.memory_limit_mb = self.memory_limit_mb
+            self._linters[name] = linter
+        return self._linters[name]
+
+    async def probe(self) -> list[ToolInfo]:
+        """Probe every linter's tool in parallel (tools already probed are not rerun).
+
+        Returns:
+            Inventory of all linters
+        """
+        linters = [self.get(name) for name in self.linter_classes]
+        await asyncio.gather(*(linter.probe() for linter in linters))
+        return self.inventory()
+
+    def inventory(self) -> list[ToolInfo]:
+        """Probe results of the linters probed so far."""
+        return [
+            ToolInfo(
+                linter=name,
+                tool=linter.version_command[0] if linter.version_command else "",
+                available=bool(linter._available),
+                version=linter._version or "",
+            )
+            for name, linter in sorted(self._linters.items())
+            if linter._available is not None
+        ]
+
+
+def publish_inventory(
+    client: redis.Redis, tools: list[ToolInfo], ttl_seconds: int = 86400
+) -> None:
+    """Record this host's toolchain in Redis (best effort).
+
+    Args:
+        client: Redis client
+        tools: Probe results
+        ttl_seconds: How long the record outlives the last worker start
+    """
+    host = socket.gethostname()
+    record = {
+        "host": host,
+        "probed_at": datetime.utcnow().isoformat(),
+        "tools": [asdict(tool) for tool in tools],
+    }
+    try:
+        client.set(INVENTORY_KEY.format(host=host), json.dumps(record), ex=ttl_seconds)
+    except redis.RedisError as e:
+        logger.warning(f"Could not publish toolchain inventory: {e}")
+
+
+def read_inventories(client: redis.Redis) -> list[dict[str, Any]]:
+    """Toolchain records of every worker host, sorted by host.
+
+    Raises:
+        redis.RedisError: If Redis is unavailable
+    """
+    records = []
+    for key in client.scan_iter(match=INVENTORY_KEY.format(host="*"), count=100):
+        payload = client.get(key)
+        if payload is None:
+            continue
+        try:
+            records.append(json.loads(payload))
+        except ValueError:
+            continue
+    return sorted(records, key=lambda record: record.get("host", ""))
+
+
+_default_registry: ToolchainRegistry | None = None
+
+
+def get_toolchain() -> ToolchainRegistry:
+    """Return the process-wide toolchain registry."""
+    global _default_registry
+    if _default_registry is None:
+        from ..config import Config
+        from .linter import LinterOrchestrator
+
+        _default_registry = ToolchainRegistry(
+            LinterOrchestrator.LINTER_MAP, memory_limit_mb=Config.LINTER_MEMORY_LIMIT_MB
+        )
+    return _default_registry
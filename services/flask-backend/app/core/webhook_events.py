@@ -0,0 +1,284 @@
+"""Durable webhook event stream backed by Redis Streams."""
+
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+import os
+import socket
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = "darwin:webhook-events"
+CONSUMER_GROUP = "darwin-ingest"
+DELIVERY_KEY = "darwin:webhook-delivery:{platform}:{delivery_id}"
+# Events that kept failing, kept for inspection and manual replay
+DEAD_LETTER_KEY = "darwin:webhook-events:dead"
+
+
+@dataclass(slots=True)
+class WebhookEvent:
+    """A verified webhook delivery waiting to be processed."""
+
+    stream_id: str
+    platform: str
+    event_type: str
+    delivery_id: str
+    repository: str
+    body: bytes
+    received_at: datetime
+    deliveries: int = 1  # times read by a consumer, this read included
+
+
+class WebhookEventQueue:
+    """Append-only webhook event log with delivery-ID dedupe.
+
+    The web tier only appends (``XADD``) and returns; consumer workers read
+    batches through a consumer group, so each event is handled by exactly
+    one worker. Events left unacknowledged - by a crashed worker, or
+    because processing failed - are reclaimed after ``claim_idle_ms`` and
+    retried; once read more than ``max_deliveries`` times an event is moved
+    to the dead-letter stream instead.
+
+    The stream itself is never trimmed by length, which could drop events
+    not yet delivered or still pending; acknowledged events are deleted
+    (``ack``), so it only holds the backlog.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        dead_letter_maxlen: int = 100000,
+        dedupe_ttl_seconds: int = 86400,
+        claim_idle_ms: int = 60000,
+        max_deliveries: int = 5,
+    ):
+        """Initialize event queue.
+
+        Args:
+            client: Redis client
+            dead_letter_maxlen: Approximate cap on the dead-letter stream
+            dedupe_ttl_seconds: How long delivery IDs are remembered
+            claim_idle_ms: Pending events idle this long are reclaimed
+            max_deliveries: Reads before an event is dead-lettered (0 = never)
+        """
+        self.client = client
+        self.dead_letter_maxlen = dead_letter_maxlen
+        self.dedupe_ttl_seconds = dedupe_ttl_seconds
+        self.claim_idle_ms = claim_idle_ms
+        self.max_deliveries = max_deliveries
+        self._group_ready = False
+
+    def publish(
+        self,
+        platform: str,
+        event_type: str,
+        delivery_id: str,
+        repository: str,
+        body: bytes,
+    ) -> bool:
+        """Append a delivery to the stream unless it was already seen.
+
+        Args:
+            platform: github or gitlab
+            event_type: Platform event header value
+            delivery_id: Unique delivery ID from the platform
+            repository: Repository full name / project path
+            body: Raw request body
+
+        Returns:
+            True if appended, False if the delivery is a duplicate
+        """
+        dedupe_key = DELIVERY_KEY.format(platform=platform, delivery_id=delivery_id)
+        if not self.client.set(dedupe_key, 1, nx=True, ex=self.dedupe_ttl_seconds):
+            return False
+
+        try:
+            self.client.xadd(
+                STREAM_KEY,
+                {
+                    "platform": platform,
+                    "event_type": event_type,
+                    "delivery_id": delivery_id,
+                    "repository": repository,
+                    "body": body,
+                    "received_at": datetime.utcnow().isoformat(),
+                },
+            )
+        except redis.RedisError:
+            # Let the platform's redelivery through
+            self.client.delete(dedupe_key)
+            raise
+        return True
+
+    def read_batch(
+        self, consumer: str, count: int = 100, block_ms: int | None = None
+    ) -> list[WebhookEvent]:
+        """Read the next batch for this consumer.
+
+        Events left pending for longer than ``claim_idle_ms`` are reclaimed
+        first, except those read ``max_deliveries`` times already, which are
+        dead-lettered.
+
+        Args:
+            consumer: Consumer name (unique per worker process)
+            count: Maximum number of events
+            block_ms: Block this long waiting for new events (None = don't block)
+
+        Returns:
+            List of WebhookEvent
+        """
+        self._ensure_group()
+
+        _, claimed, *_ = self.client.xautoclaim(
+            STREAM_KEY, CONSUMER_GROUP, consumer, self.claim_idle_ms, "0-0", count=count
+        )
+        deliveries = self._deliveries([stream_id for stream_id, fields in claimed if fields])
+        entries = self._dead_letter(list(claimed), deliveries)
+
+        if len(entries) < count:
+            response = self.client.xreadgroup(
+                CONSUMER_GROUP,
+                consumer,
+                {STREAM_KEY: ">"},
+                count=count - len(entries),
+                block=block_ms,
+            )
+            for _, stream_entries in response or []:
+                entries.extend(stream_entries)
+
+        events = []
+        for stream_id, fields in entries:
+            if fields:
+                event = self._to_event(stream_id, fields)
+                event.deliveries = deliveries.get(event.stream_id, 1)
+                events.append(event)
+        return events
+
+    def ack(self, events: list[WebhookEvent]) -> None:
+        """Acknowledge and remove processed events."""
+        if not events:
+            return
+        ids = [event.stream_id for event in events]
+        pipe = self.client.pipeline()
+        pipe.xack(STREAM_KEY, CONSUMER_GROUP, *ids)
+        pipe.xdel(STREAM_KEY, *ids)
+        pipe.execute()
+
+    def dead_letters(self) -> float:
+        """Number of dead-lettered events."""
+        try:
+            return float(self.client.xlen(DEAD_LETTER_KEY))
+        except redis.RedisError:
+            return float("nan")
+
+    def _deliveries(self, stream_ids: list) -> dict[str, int]:
+        """Delivery count of each pending event, by stream ID."""
+        if not stream_ids:
+            return {}
+        pipe = self.client.pipeline()
+        for stream_id in stream_ids:
+            pipe.xpending_range(STREAM_KEY, CONSUMER_GROUP, stream_id, stream_id, 1)
+        deliveries = {}
+        for pending in pipe.execute():
+            for entry in pending:
+                message_id = entry["message_id"]
+                if isinstance(message_id, bytes):
+                    message_id = message_id.decode()
+                deliveries[message_id] = entry["times_delivered"]
+        return deliveries
+
+    def _dead_letter(self, entries: list, deliveries: dict[str, int]) -> list:
+        """Move reclaimed entries read too often to the dead-letter stream.
+
+        Returns:
+            The entries to process
+        """
+        if self.max_deliveries <= 0:
+            return entries
+
+        keep, dead = [], []
+        for stream_id, fields in entries:
+            key = stream_id.decode() if isinstance(stream_id, bytes) else stream_id
+            if fields and deliveries.get(key, 1) > self.max_deliveries:
+                dead.append((stream_id, fields, deliveries[key]))
+            else:
+                keep.append((stream_id, fields))
+        if not dead:
+            return keep
+
+        pipe = self.client.pipeline()
+        for stream_id, fields, count in dead:
+            pipe.xadd(
+                DEAD_LETTER_KEY,
+                {**fields, "stream_id": stream_id, "deliveries": count},
+                maxlen=self.dead_letter_maxlen,
+                approximate=True,
+            )
+        ids = [stream_id for stream_id, _, _ in dead]
+        pipe.xack(STREAM_KEY, CONSUMER_GROUP, *ids)
+        pipe.xdel(STREAM_KEY, *ids)
+        pipe.execute()
+        logger.error(
+            f"Dead-lettered {len(dead)} webhook events after {self.max_deliveries} deliveries"
+        )
+        return keep
+
+    def backlog(self) -> float:
+        """Number of events in the stream (processed events are deleted)."""
+        try:
+            return float(self.client.xlen(STREAM_KEY))
+        except redis.RedisError:
+            return float("nan")
+
+    def _ensure_group(self) -> None:
+        if self._group_ready:
+            return
+        try:
+            self.client.xgroup_create(STREAM_KEY, CONSUMER_GROUP, id="0", mkstream=True)
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    @staticmethod
+    def _to_event(stream_id: bytes | str, fields: dict) -> WebhookEvent:
+        def text(key: str) -> str:
+            value = fields.get(key.encode(), fields.get(key, b""))
+            return value.decode() if isinstance(value, bytes) else str(value)
+
+        body = fields.get(b"body", fields.get("body", b""))
+        return WebhookEvent(
+            stream_id=stream_id.decode() if isinstance(stream_id, bytes) else stream_id,
+            platform=text("platform"),
+            event_type=text("event_type"),
+            delivery_id=text("delivery_id"),
+            repository=text("repository"),
+            body=body if isinstance(body, bytes) else str(body).encode(),
+            received_at=datetime.fromisoformat(text("received_at")),
+        )
+
+
+def consumer_name() -> str:
+    """Consumer name unique to this worker process."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+_default_queue: WebhookEventQueue | None = None
+
+
+def get_event_queue() -> WebhookEventQueue:
+    """Return the process-wide webhook event queue."""
+    global _default_queue
+    if _default_queue is None:
+        from ..config import Config
+        from ..redis_client import get_redis
+
+        _default_queue = WebhookEventQueue(
+            get_redis(),
+            dead_letter_maxlen=Config.WEBHOOK_DEAD_LETTER_MAXLEN,
+            dedupe_ttl_seconds=Config.WEBHOOK_DEDUPE_TTL_SECONDS,
+            max_deliveries=Config.WEBHOOK_MAX_DELIVERIES,
+        )
+    return _default_queue
@@ -256,6 +256,9 @@ def _create_all_fallback():
         Column('polling_enabled', Boolean, default=False),
         Column('polling_interval_minutes', Integer, default=5),
         Column('last_poll_at', DateTime(timezone=True)),
+        Column('next_poll_at', DateTime(timezone=True)),
+        Column('poll_idle_count', Integer, default=0),
+        Column('last_webhook_at', DateTime(timezone=True)),
         # Organization grouping (for dashboard drill-down)
         Column('platform_organization', String(255)),
         # Display settings
@@ -293,6 +296,7 @@ def _create_all_fallback():
         Column('completed_at', DateTime(timezone=True)),
         Column('summary', Text),
         Column('score', Integer),
+        Column('duplicates_suppressed', Integer, default=0),
         Column('created_at', DateTime(timezone=True), server_default=func.now()),
         Column('updated_at', DateTime(timezone=True), server_default=func.now(), onupdate=func.now()),
     )
@@ -307,9 +311,55 @@ def _create_all_fallback():
         Column('severity', String(20)),
         Column('message', Text),
         Column('suggestion', Text),
+        Column('fingerprint', String(64), index=True),
         Column('created_at', DateTime(timezone=True), server_default=func.now()),
     )
 
+    review_checkpoints = Table(
+        'review_checkpoints', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('review_id', Integer, ForeignKey('reviews.id', ondelete='CASCADE'), nullable=False),
+        Column('file_path', String(512), nullable=False),
+        Column('category', String(64), nullable=False),
+        Column('patch_sha', String(64)),
+        Column('comments_count', Integer, default=0),
+        Column('created_at', DateTime(timezone=True), server_default=func.now()),
+        UniqueConstraint('review_id', 'file_path', 'category', name='uq_review_checkpoint'),
+    )
+
+    review_shards = Table(
+        'review_shards', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('review_id', Integer, ForeignKey('reviews.id', ondelete='CASCADE'), nullable=False),
+        Column('shard_index', Integer, nullable=False),
+        Column('status', String(32), default='queued'),
+        Column('file_count', Integer, default=0),
+        Column('estimated_tokens', Integer, default=0),
+        Column('files_reviewed', Integer, default=0),
+        Column('comments_posted', Integer, default=0),
+        Column('error_message', Text),
+        Column('started_at', DateTime(timezone=True)),
+        Column('completed_at', DateTime(timezone=True)),
+        UniqueConstraint('review_id', 'shard_index', name='uq_review_shard'),
+    )
+
+    task_errors = Table(
+        'task_errors', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('task_name', String(255), nullable=False),
+        Column('entity_type', String(32), nullable=False),
+        Column('entity_id', Integer, nullable=False),
+        Column('fingerprint', String(32), nullable=False),
+        Column('error_type', String(128)),
+        Column('message', String(512)),
+        Column('location', String(255)),
+        Column('traceback', Text),
+        Column('occurrences', Integer, default=1),
+        Column('first_seen_at', DateTime(timezone=True), server_default=func.now()),
+        Column('last_seen_at', DateTime(timezone=True), server_default=func.now()),
+        UniqueConstraint('entity_type', 'entity_id', 'fingerprint', name='uq_task_error'),
+    )
+
     git_credentials = Table(
         'git_credentials', metadata,
         Column('id', Integer, primary_key=True),
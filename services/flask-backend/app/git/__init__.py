@@ -1,14 +1,24 @@
 """Git operations module for PR reviewer."""
 
+from .blob_cache import BlobCache, get_blob_cache, git_blob_sha
 from .clone import CloneResult, GitCloner
 from .credentials import CredentialManager, GitCredential
-from .sandbox import Sandbox, SandboxManager
+from .mirror import MirrorCache, MirrorError, get_mirror_cache
+from .sandbox import Sandbox, SandboxManager, SandboxQuotaError, get_sandbox_manager
 
 __all__ = [
+    "BlobCache",
+    "get_blob_cache",
+    "git_blob_sha",
     "CredentialManager",
     "GitCredential",
     "GitCloner",
     "CloneResult",
+    "MirrorCache",
+    "MirrorError",
+    "get_mirror_cache",
     "SandboxManager",
+    "SandboxQuotaError",
     "Sandbox",
+    "get_sandbox_manager",
 ]
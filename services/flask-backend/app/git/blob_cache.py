@@ -0,0 +1,291 @@
+"""Content-addressed on-disk cache for git blobs."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import mmap
+import os
+import re
+import shutil
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+_SHA_RE = re.compile(r"^[0-9a-f]{40}([0-9a-f]{24})?$")
+
+
+def git_blob_sha(data: bytes) -> str:
+    """Compute the git object ID of a blob (``git hash-object``).
+
+    Args:
+        data: Raw blob content
+
+    Returns:
+        Hex SHA-1 blob ID
+    """
+    header = f"blob {len(data)}\0".encode()
+    return hashlib.sha1(header + data).hexdigest()
+
+
+class BlobCache:
+    """Blob-SHA keyed file cache with an LRU size cap.
+
+    Blobs are stored as ``<base>/<sha[:2]>/<sha[2:]>``. Because git blob IDs
+    are content hashes, entries never go stale and can be shared by every
+    review, repository and worker process on the host. Reads bump the file's
+    mtime, and ``trim`` removes the least recently used blobs once the cache
+    has grown past ``max_bytes``, until it is back under ``low_water`` of the
+    cap. Writes never walk the cache: one worker per host trims it, measuring
+    what every process on the host has stored.
+    """
+
+    def __init__(
+        self,
+        base_path: str | Path,
+        max_bytes: int = 512 * 1024 * 1024,
+        mmap_threshold: int = 1024 * 1024,
+        low_water: float = 0.9,
+    ) -> None:
+        """Initialize blob cache.
+
+        Args:
+            base_path: Cache directory
+            max_bytes: Size cap before eviction starts
+            mmap_threshold: Blobs at least this large are memory-mapped by ``open``
+            low_water: Fraction of ``max_bytes`` eviction shrinks the cache to
+        """
+        self.base_path = Path(base_path)
+        self.max_bytes = max_bytes
+        self.mmap_threshold = mmap_threshold
+        self.low_water = low_water
+        self.hits = 0
+        self.misses = 0
+        self.base_path.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, sha: str) -> Path:
+        """Return the on-disk path for a blob SHA.
+
+        Raises:
+            ValueError: If ``sha`` is not a hex object ID
+        """
+        sha = sha.lower()
+        if not _SHA_RE.match(sha):
+            raise ValueError(f"Invalid blob SHA: {sha}")
+        return self.base_path / sha[:2] / sha[2:]
+
+    def contains(self, sha: str) -> bool:
+        """Check whether a blob is cached without touching its LRU position."""
+        return self.path_for(sha).is_file()
+
+    def get(self, sha: str, max_bytes: int | None = None) -> bytes | None:
+        """Read a cached blob.
+
+        Blocking file I/O: async callers run it in a thread.
+
+        Args:
+            sha: Git blob SHA
+            max_bytes: Read at most this many leading bytes; of a large blob
+                only those pages are read (see ``open``)
+
+        Returns:
+            Blob content, or None on a cache miss
+        """
+        with self.open(sha) as content:
+            if content is None:
+                return None
+            return content[:max_bytes]
+
+    def put(self, sha: str, data: bytes) -> Path:
+        """Store a blob.
+
+        The write goes to a temporary file that is atomically renamed into
+        place, so concurrent writers of the same blob are harmless.
+
+        Args:
+            sha: Git blob SHA of ``data``
+            data: Blob content
+
+        Returns:
+            Path of the cached blob
+        """
+        path = self.path_for(sha)
+        if path.is_file():
+            self._touch(path)
+            return path
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        return path
+
+    def store(self, data: bytes) -> Path:
+        """Store a blob under its own git blob SHA (see ``put``)."""
+        return self.put(git_blob_sha(data), data)
+
+    @contextmanager
+    def open(self, sha: str) -> Iterator[bytes | mmap.mmap | None]:
+        """Open a cached blob for reading.
+
+        Blobs at or above ``mmap_threshold`` are memory-mapped, so readers
+        that only need part of one (the detector reads a file's first
+        CONTENT_READ_BYTES) don't copy the whole file into the Python heap;
+        smaller blobs are returned as bytes.
+
+        Args:
+            sha: Git blob SHA
+
+        Yields:
+            Blob content (bytes or read-only mmap), or None on a cache miss
+        """
+        path = self.path_for(sha)
+        try:
+            handle = path.open("rb")
+        except FileNotFoundError:
+            self.misses += 1
+            yield None
+            return
+
+        self.hits += 1
+        self._touch(path)
+        with handle:
+            size = os.fstat(handle.fileno()).st_size
+            if size < self.mmap_threshold or size == 0:
+                yield handle.read()
+                return
+
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                yield mapped
+            finally:
+                mapped.close()
+
+    def materialize(self, sha: str, dest: str | Path) -> bool:
+        """Place a cached blob at ``dest`` (e.g. inside a sandbox checkout).
+
+        Hard links are used when the sandbox shares the cache's filesystem,
+        falling back to a copy. A link keeps the content even if the blob is
+        evicted afterwards.
+
+        Args:
+            sha: Git blob SHA
+            dest: Destination file path
+
+        Returns:
+            True if the blob was cached and written to ``dest``
+        """
+        path = self.path_for(sha)
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(path, dest)
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+        except OSError:
+            try:
+                shutil.copyfile(path, dest)
+            except FileNotFoundError:
+                self.misses += 1
+                return False
+
+        self.hits += 1
+        self._touch(path)
+        return True
+
+    def size_bytes(self) -> int:
+        """Total size of cached blobs, as found on disk."""
+        return sum(size for _, _, size in self._entries())
+
+    def trim(self) -> int:
+        """Evict down to the low-water mark if the cache is over its cap.
+
+        Walks the whole directory, so callers run it in a thread (see
+        tasks.housekeeping, which trims each host's caches periodically).
+
+        Returns:
+            Number of blobs removed
+        """
+        entries = list(self._entries())
+        if sum(size for _, _, size in entries) <= self.max_bytes:
+            return 0
+        return self.evict(entries=entries)
+
+    def evict(
+        self,
+        target_bytes: int | None = None,
+        entries: list[tuple[Path, float, int]] | None = None,
+    ) -> int:
+        """Remove least recently used blobs until the cache fits.
+
+        Args:
+            target_bytes: Size to shrink to (defaults to the low-water mark)
+            entries: Cache listing from _entries, if already walked
+
+        Returns:
+            Number of blobs removed
+        """
+        if target_bytes is None:
+            target_bytes = int(self.max_bytes * self.low_water)
+
+        if entries is None:
+            entries = list(self._entries())
+        entries = sorted(entries, key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        removed = 0
+
+        for path, _, size in entries:
+            if total <= target_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+
+        if removed:
+            logger.info(f"Evicted {removed} blobs from cache ({total} bytes remain)")
+        return removed
+
+    def _entries(self) -> Iterator[tuple[Path, float, int]]:
+        """Yield (path, mtime, size) for every cached blob."""
+        for shard in os.scandir(self.base_path):
+            if not shard.is_dir(follow_symlinks=False):
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.startswith(".") or not entry.is_file(follow_symlinks=False):
+                    continue
+                try:
+                    stat = entry.stat(follow_symlinks=False)
+                except FileNotFoundError:
+                    continue
+                yield Path(entry.path), stat.st_mtime, stat.st_size
+
+    @staticmethod
+    def _touch(path: Path) -> None:
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+
+_default_cache: BlobCache | None = None
+
+
+def get_blob_cache() -> BlobCache:
+    """Return the process-wide blob cache configured from app settings."""
+    global _default_cache
+    if _default_cache is None:
+        from ..config import Config
+
+        _default_cache = BlobCache(
+            Path(Config.SANDBOX_BASE_PATH) / "blob-cache",
+            max_bytes=Config.BLOB_CACHE_MAX_MB * 1024 * 1024,
+            mmap_threshold=Config.BLOB_CACHE_MMAP_THRESHOLD_KB * 1024,
+        )
+    return _default_cache
@@ -7,10 +7,22 @@ import os
 import tempfile
 from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from .credentials import CredentialManager, GitCredential
 from .sandbox import Sandbox, SandboxManager
 
+if TYPE_CHECKING:
+    from .mirror import MirrorCache
+
+
+def _sparse_pattern(path: str) -> str:
+    """Sparse-checkout pattern matching exactly one repository path."""
+    escaped = "".join("\\" + c if c in "\\*?[" else c for c in path.lstrip("/"))
+    if escaped.endswith(" "):
+        escaped = escaped[:-1] + "\\ "
+    return "/" + escaped
+
 
 @dataclass(slots=True)
 class CloneResult:
@@ -31,15 +43,19 @@ class GitCloner:
         self,
         sandbox_manager: SandboxManager,
         credential_manager: CredentialManager,
+        mirror_cache: MirrorCache | None = None,
     ) -> None:
         """Initialize git cloner.
 
         Args:
             sandbox_manager: Manager for sandboxed directories
             credential_manager: Manager for credential encryption
+            mirror_cache: Cache of repository mirrors to check out from
+                instead of cloning (optional)
         """
         self.sandbox = sandbox_manager
         self.credentials = credential_manager
+        self.mirror_cache = mirror_cache
 
     async def clone(
         self,
@@ -264,6 +280,82 @@ class GitCloner:
             except Exception:
                 pass
 
+    async def sparse_checkout_with_token(
+        self,
+        url: str,
+        token: str,
+        sandbox: Sandbox,
+        commit_sha: str,
+        paths: list[str],
+        timeout: int = 300,
+    ) -> CloneResult:
+        """Check out only some paths of a single commit.
+
+        Fetches just the commit as a blobless partial clone
+        (``--filter=blob:none``) and checks out the given paths sparsely, so
+        only their blobs are downloaded. The cost scales with the number of
+        paths rather than the size of the repository. With a mirror cache,
+        the commit is fetched into the repository's mirror instead (if not
+        already there) and checked out as a sparse worktree of it.
+
+        Args:
+            url: Git repository URL
+            token: Authentication token
+            sandbox: Sandbox to check out into
+            commit_sha: Commit to check out (e.g. a pull request head)
+            paths: Repository-relative paths to materialize
+            timeout: Timeout in seconds for each git step
+
+        Returns:
+            CloneResult with repository information
+        """
+        if self.mirror_cache is not None:
+            return await self.mirror_cache.checkout(
+                url, token, sandbox, commit_sha, paths, timeout=timeout
+            )
+
+        auth_url = self.credentials.build_auth_url(url, token)
+        repo_path = sandbox.path / "repo"
+
+        steps = [
+            ("init", ["git", "init", "--quiet", "repo"]),
+            ("remote", ["git", "-C", "repo", "remote", "add", "origin", auth_url]),
+            ("config", ["git", "-C", "repo", "config", "core.sparseCheckout", "true"]),
+            ("fetch", [
+                "git", "-C", "repo", "fetch", "--quiet", "--no-tags",
+                "--depth", "1", "--filter=blob:none", "origin", commit_sha,
+            ]),
+            ("checkout", ["git", "-C", "repo", "checkout", "--quiet", "--detach", "FETCH_HEAD"]),
+        ]
+        for name, cmd in steps:
+            if name == "fetch":
+                # Non-cone patterns so each changed file is matched exactly
+                sparse_file = repo_path / ".git" / "info" / "sparse-checkout"
+                sparse_file.parent.mkdir(parents=True, exist_ok=True)
+                sparse_file.write_text(
+                    "".join(f"{_sparse_pattern(path)}\n" for path in paths)
+                )
+
+            exit_code, stdout, stderr = await self.sandbox.run_in_sandbox(
+                sandbox, cmd, timeout=timeout
+            )
+            if exit_code != 0:
+                # Remove token from error message
+                safe_stderr = stderr.replace(token, "***")
+                return CloneResult(
+                    success=False,
+                    sandbox=sandbox,
+                    repo_path=repo_path,
+                    error=f"Sparse checkout failed at {name}: {safe_stderr}",
+                )
+
+        return CloneResult(
+            success=True,
+            sandbox=sandbox,
+            repo_path=repo_path,
+            commit_sha=commit_sha,
+        )
+
     async def get_commit_info(self, repo_path: Path) -> dict[str, str]:
         """Get current commit SHA, author, and message.
 
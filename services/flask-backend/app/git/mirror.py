@@ -0,0 +1,425 @@
+"""Persistent bare-mirror cache of reviewed repositories."""
+
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import hashlib
+import logging
+import os
+import re
+import shutil
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator
+from urllib.parse import urlsplit
+
+from .clone import CloneResult, _sparse_pattern
+from .credentials import CredentialManager
+from .sandbox import Sandbox, _tree_size
+
+logger = logging.getLogger(__name__)
+
+# Fetched commits are kept reachable under this namespace so gc keeps them
+REF_PREFIX = "refs/darwin/"
+LAST_USED_FILE = "darwin-last-used"
+
+_SLUG_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+class MirrorError(Exception):
+    """A mirror could not be locked, created or updated."""
+
+
+@dataclass(slots=True)
+class MirrorUsage:
+    """Disk usage of one cached mirror."""
+
+    path: Path
+    size_bytes: int
+    last_used: float
+    in_use: bool  # has live worktrees
+
+
+class MirrorCache:
+    """Bare mirrors of repositories, shared by every review on the host.
+
+    Each repository is mirrored once as ``<base>/<slug>-<hash>.git`` and
+    updated incrementally: a review fetches only the commits it needs
+    (``+<sha>:refs/darwin/<sha>``), negotiating against everything already
+    cached. Reviews get ``git worktree`` checkouts of the mirror, optionally
+    sparse, so no object is downloaded or copied twice.
+
+    A mirror is changed only under its lock, which is held across worker
+    processes (``flock`` on ``<mirror>.lock``) and coroutines. Tokens are
+    passed per fetch and never stored in the mirror's config. ``maintain``
+    prunes stale worktrees, trims old refs, runs ``git gc`` and evicts the
+    least recently used mirrors once the cache is over ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        base_path: str | Path,
+        credential_manager: CredentialManager,
+        max_bytes: int = 20 * 1024 * 1024 * 1024,
+        keep_refs: int = 1000,
+        lock_timeout: float = 1800.0,
+    ) -> None:
+        """Initialize mirror cache.
+
+        Args:
+            base_path: Directory holding the mirrors
+            credential_manager: Builds authenticated fetch URLs
+            max_bytes: Total mirror size before LRU eviction
+            keep_refs: Fetched commits kept per mirror (newest first)
+            lock_timeout: Seconds to wait for a mirror another review holds
+        """
+        self.base_path = Path(base_path)
+        self.credentials = credential_manager
+        self.max_bytes = max_bytes
+        self.keep_refs = keep_refs
+        self.lock_timeout = lock_timeout
+        self._locks: dict[str, asyncio.Lock] = {}
+        self.base_path.mkdir(parents=True, exist_ok=True)
+
+    def mirror_path(self, url: str) -> Path:
+        """Return the mirror directory of a repository URL (credentials ignored)."""
+        parts = urlsplit(url)
+        location = f"{parts.hostname or ''}{parts.path}".lower().removesuffix(".git")
+        slug = _SLUG_RE.sub("-", location).strip("-")[-60:]
+        digest = hashlib.sha256(location.encode()).hexdigest()[:12]
+        return self.base_path / f"{slug}-{digest}.git"
+
+    async def checkout(
+        self,
+        url: str,
+        token: str,
+        sandbox: Sandbox,
+        commit_sha: str,
+        paths: list[str] | None = None,
+        timeout: int = 1800,
+    ) -> CloneResult:
+        """Check out a commit from the mirror into a sandbox worktree.
+
+        Args:
+            url: Git repository URL
+            token: Authentication token for fetching missing commits
+            sandbox: Sandbox to check out into
+            commit_sha: Commit to check out
+            paths: Repository-relative paths to check out sparsely (all if None)
+            timeout: Timeout in seconds for each git step
+
+        Returns:
+            CloneResult with the worktree as repo_path
+        """
+        mirror = self.mirror_path(url)
+        repo_path = sandbox.path / "repo"
+        try:
+            async with self.lock(mirror):
+                await self._update(mirror, url, token, [commit_sha], timeout)
+                await self._git_checked(
+                    mirror,
+                    ["worktree", "add", "--quiet", "--detach", "--no-checkout",
+                     str(repo_path), commit_sha],
+                    timeout,
+                )
+                _touch(mirror / LAST_USED_FILE)
+
+            # Only the worktree's own index and config change from here on
+            if paths is not None:
+                await self._git_checked(
+                    repo_path,
+                    ["sparse-checkout", "set", "--no-cone",
+                     *[_sparse_pattern(path) for path in paths]],
+                    timeout,
+                )
+            await self._git_checked(repo_path, ["read-tree", "-mu", "HEAD"], timeout)
+        except MirrorError as e:
+            return CloneResult(
+                success=False,
+                sandbox=sandbox,
+                repo_path=repo_path,
+                error=str(e).replace(token, "***"),
+            )
+
+        return CloneResult(
+            success=True,
+            sandbox=sandbox,
+            repo_path=repo_path,
+            commit_sha=commit_sha,
+        )
+
+    async def fetch(
+        self, url: str, token: str, shas: list[str], timeout: int = 1800
+    ) -> Path:
+        """Make sure the mirror of a repository has the given commits.
+
+        Args:
+            url: Git repository URL
+            token: Authentication token
+            shas: Commits needed
+            timeout: Fetch timeout in seconds
+
+        Returns:
+            Path of the bare mirror
+
+        Raises:
+            MirrorError: If the mirror could not be locked or fetched into
+        """
+        mirror = self.mirror_path(url)
+        try:
+            async with self.lock(mirror):
+                await self._update(mirror, url, token, shas, timeout)
+                _touch(mirror / LAST_USED_FILE)
+        except MirrorError as e:
+            raise MirrorError(str(e).replace(token, "***")) from None
+        return mirror
+
+    @asynccontextmanager
+    async def lock(self, mirror: Path, wait: bool = True) -> AsyncIterator[None]:
+        """Hold a mirror's lock across coroutines and worker processes.
+
+        Args:
+            mirror: Mirror directory
+            wait: Wait up to lock_timeout for the lock, else fail at once
+
+        Raises:
+            MirrorError: If the lock could not be acquired
+        """
+        local = self._locks.setdefault(mirror.name, asyncio.Lock())
+        if not wait and local.locked():
+            raise MirrorError(f"Mirror {mirror.name} is busy")
+
+        async with local:
+            fd = os.open(mirror.with_suffix(".lock"), os.O_CREAT | os.O_RDWR, 0o600)
+            try:
+                deadline = time.monotonic() + (self.lock_timeout if wait else 0)
+                while True:
+                    try:
+                        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        break
+                    except BlockingIOError:
+                        if time.monotonic() >= deadline:
+                            raise MirrorError(f"Mirror {mirror.name} is busy") from None
+                        await asyncio.sleep(0.2)
+                yield
+            finally:
+                # Closing the descriptor releases the flock
+                os.close(fd)
+
+    async def maintain(self) -> dict[str, int]:
+        """Prune, trim and gc every idle mirror, then enforce the size cap.
+
+        Mirrors locked by a running review are skipped until the next run.
+
+        Returns:
+            dict with mirrors seen, collected and evicted, and bytes in use
+        """
+        collected = 0
+        for mirror in self._mirrors():
+            try:
+                async with self.lock(mirror, wait=False):
+                    await self._git_checked(mirror, ["worktree", "prune"], 60)
+                    await self._trim_refs(mirror)
+                    await self._git_checked(mirror, ["gc", "--quiet"], 3600)
+                    collected += 1
+            except MirrorError as e:
+                logger.info(f"Skipping maintenance of {mirror.name}: {e}")
+
+        evicted = await self.evict()
+        usage = await asyncio.to_thread(self.usage)
+        return {
+            "mirrors": len(usage) + evicted,
+            "collected": collected,
+            "evicted": evicted,
+            "size_bytes": sum(u.size_bytes for u in usage),
+        }
+
+    async def evict(self, target_bytes: int | None = None) -> int:
+        """Remove least recently used idle mirrors until the cache fits.
+
+        Args:
+            target_bytes: Size to shrink to (defaults to max_bytes)
+
+        Returns:
+            Number of mirrors removed
+        """
+        if target_bytes is None:
+            target_bytes = self.max_bytes
+
+        usage = sorted(await asyncio.to_thread(self.usage), key=lambda u: u.last_used)
+        total = sum(u.size_bytes for u in usage)
+        removed = 0
+
+        for entry in usage:
+            if total <= target_bytes:
+                break
+            if entry.in_use:
+                continue
+            try:
+                async with self.lock(entry.path, wait=False):
+                    # A review may have added a worktree since usage was read
+                    if _has_live_worktrees(entry.path):
+                        continue
+                    await asyncio.to_thread(shutil.rmtree, entry.path, True)
+            except MirrorError:
+                continue
+            total -= entry.size_bytes
+            removed += 1
+            logger.info(f"Evicted mirror {entry.path.name} ({entry.size_bytes} bytes)")
+
+        return removed
+
+    def usage(self) -> list[MirrorUsage]:
+        """Disk usage and last use of every mirror."""
+        entries = []
+        for mirror in self._mirrors():
+            try:
+                last_used = (mirror / LAST_USED_FILE).stat().st_mtime
+            except FileNotFoundError:
+                last_used = 0.0
+            entries.append(MirrorUsage(
+                path=mirror,
+                size_bytes=_tree_size(mirror),
+                last_used=last_used,
+                in_use=_has_live_worktrees(mirror),
+            ))
+        return entries
+
+    def _mirrors(self) -> list[Path]:
+        return sorted(
+            path for path in self.base_path.glob("*.git") if path.is_dir()
+        )
+
+    async def _update(
+        self, mirror: Path, url: str, token: str, shas: list[str], timeout: int
+    ) -> None:
+        """Create the mirror if needed and fetch the missing commits (lock held)."""
+        if not (mirror / "HEAD").exists():
+            await self._create(mirror, timeout)
+
+        missing = [sha for sha in dict.fromkeys(shas) if not await self._has_commit(mirror, sha)]
+        if not missing:
+            return
+
+        auth_url = self.credentials.build_auth_url(url, token)
+        await self._git_checked(
+            mirror,
+            ["fetch", "--quiet", "--no-tags", "--no-write-fetch-head", auth_url,
+             *[f"+{sha}:{REF_PREFIX}{sha}" for sha in missing]],
+            timeout,
+        )
+
+    async def _create(self, mirror: Path, timeout: int) -> None:
+        shutil.rmtree(mirror, ignore_errors=True)  # leftover of a failed init
+        await self._git_checked(
+            self.base_path, ["init", "--quiet", "--bare", str(mirror)], timeout
+        )
+        # Sparse settings of one review's worktree stay out of the others.
+        # core.bare moves to the mirror's own worktree config, where it no
+        # longer applies to the linked worktrees.
+        await self._git_checked(mirror, ["config", "extensions.worktreeConfig", "true"], timeout)
+        await self._git_checked(mirror, ["config", "--worktree", "core.bare", "true"], timeout)
+        await self._git_checked(mirror, ["config", "--unset", "core.bare"], timeout)
+        # gc runs from maintain(), under the lock, not detached after a fetch
+        await self._git_checked(mirror, ["config", "gc.auto", "0"], timeout)
+
+    async def _has_commit(self, mirror: Path, sha: str) -> bool:
+        exit_code, _, _ = await _run_git(mirror, ["cat-file", "-e", f"{sha}^{{commit}}"], 30)
+        return exit_code == 0
+
+    async def _trim_refs(self, mirror: Path) -> None:
+        """Drop all but the newest keep_refs fetched commits."""
+        stdout = await self._git_checked(
+            mirror,
+            ["for-each-ref", "--sort=-creatordate", "--format=%(refname)", REF_PREFIX],
+            60,
+        )
+        stale = stdout.split()[self.keep_refs:]
+        if stale:
+            await self._git_checked(
+                mirror,
+                ["update-ref", "--stdin"],
+                300,
+                stdin="".join(f"delete {ref}\n" for ref in stale),
+            )
+
+    async def _git_checked(
+        self, cwd: Path, args: list[str], timeout: int, stdin: str | None = None
+    ) -> str:
+        exit_code, stdout, stderr = await _run_git(cwd, args, timeout, stdin)
+        if exit_code != 0:
+            raise MirrorError(f"git {args[0]} failed: {stderr.strip()}")
+        return stdout
+
+
+async def _run_git(
+    cwd: Path, args: list[str], timeout: int, stdin: str | None = None
+) -> tuple[int, str, str]:
+    """Run a git command and return (exit_code, stdout, stderr)."""
+    process = None
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "git", *args,
+            cwd=str(cwd),
+            stdin=asyncio.subprocess.PIPE if stdin is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout_data, stderr_data = await asyncio.wait_for(
+            process.communicate(stdin.encode() if stdin is not None else None),
+            timeout=timeout,
+        )
+        return (
+            process.returncode or 0,
+            stdout_data.decode("utf-8", errors="replace"),
+            stderr_data.decode("utf-8", errors="replace"),
+        )
+    except asyncio.TimeoutError:
+        if process:
+            process.kill()
+            await process.wait()
+        return (-1, "", f"Command timed out after {timeout} seconds")
+    except Exception as e:
+        return (-1, "", f"Command execution failed: {str(e)}")
+
+
+def _touch(path: Path) -> None:
+    try:
+        path.touch()
+    except OSError:
+        pass
+
+
+def _has_live_worktrees(mirror: Path) -> bool:
+    """Whether any worktree of the mirror still exists on disk."""
+    worktrees = mirror / "worktrees"
+    if not worktrees.is_dir():
+        return False
+    for entry in worktrees.iterdir():
+        try:
+            gitdir = Path((entry / "gitdir").read_text().strip())
+        except OSError:
+            continue
+        if gitdir.exists():
+            return True
+    return False
+
+
+_default_cache: MirrorCache | None = None
+
+
+def get_mirror_cache() -> MirrorCache:
+    """Return the process-wide mirror cache configured from app settings."""
+    global _default_cache
+    if _default_cache is None:
+        from ..config import Config
+
+        _default_cache = MirrorCache(
+            Path(Config.SANDBOX_BASE_PATH) / "mirrors",
+            CredentialManager(Config.CREDENTIAL_ENCRYPTION_KEY or None),
+            max_bytes=Config.GIT_MIRROR_CACHE_MAX_MB * 1024 * 1024,
+        )
+    return _default_cache
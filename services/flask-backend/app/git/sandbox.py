@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import asyncio
+import logging
+import os
 import shutil
 import uuid
 from dataclasses import dataclass
@@ -10,6 +12,18 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+logger = logging.getLogger(__name__)
+
+# Written at the sandbox root, beside the "repo" checkout, so any process
+# can tell when a sandbox expires
+EXPIRES_FILE = ".expires"
+# Sandboxes are moved in here before being deleted, so each is deleted once
+TRASH_DIR = ".trash"
+
+
+class SandboxQuotaError(OSError):
+    """The host's sandboxes already use their disk quota."""
+
 
 @dataclass(slots=True)
 class Sandbox:
@@ -21,20 +35,45 @@ class Sandbox:
     expires_at: datetime
 
 
+@dataclass(slots=True)
+class SandboxUsage:
+    """Disk usage of one sandbox."""
+
+    path: Path
+    size_bytes: int
+    expires_at: datetime
+
+
 class SandboxManager:
-    """Manages creation and cleanup of sandboxed directories."""
+    """Manages creation and cleanup of sandboxed directories.
+
+    Sandboxes are ``<base>/<uuid>`` directories, or tmpfs mounts there when
+    tmpfs_mb is set (mounting needs CAP_SYS_ADMIN; plain directories are
+    used when it fails). Removal never blocks the event loop: a tmpfs
+    sandbox is unmounted, any other is renamed into ``<base>/.trash`` and
+    deleted in a thread. ``reap`` removes expired sandboxes that crashed or
+    killed workers left behind.
+    """
 
     def __init__(
-        self, base_path: str = "/tmp/pr-reviewer", default_timeout: int = 3600
+        self,
+        base_path: str = "/tmp/pr-reviewer",
+        default_timeout: int = 3600,
+        max_bytes: int = 0,
+        tmpfs_mb: int = 0,
     ) -> None:
         """Initialize sandbox manager.
 
         Args:
             base_path: Base directory for all sandboxes
             default_timeout: Default sandbox lifetime in seconds
+            max_bytes: Total sandbox size above which create fails (0 = no quota)
+            tmpfs_mb: Size of a tmpfs mounted per sandbox (0 = plain directories)
         """
         self.base_path = Path(base_path)
         self.default_timeout = default_timeout
+        self.max_bytes = max_bytes
+        self.tmpfs_mb = tmpfs_mb
         self.base_path.mkdir(parents=True, exist_ok=True)
 
     async def create(self, timeout: int | None = None) -> Sandbox:
@@ -45,7 +84,17 @@ class SandboxManager:
 
         Returns:
             Created Sandbox instance
+
+        Raises:
+            SandboxQuotaError: If the sandboxes already use max_bytes
         """
+        if self.max_bytes > 0:
+            used = await asyncio.to_thread(self.used_bytes)
+            if used >= self.max_bytes:
+                raise SandboxQuotaError(
+                    f"Sandboxes use {used} bytes of their {self.max_bytes} byte quota"
+                )
+
         sandbox_id = str(uuid.uuid4())
         sandbox_path = self.base_path / sandbox_id
 
@@ -55,11 +104,15 @@ class SandboxManager:
         # Set ownership and permissions
         sandbox_path.chmod(0o700)
 
+        if self.tmpfs_mb > 0:
+            await self._mount_tmpfs(sandbox_path)
+
         # Calculate expiration
         created_at = datetime.utcnow()
         expires_at = created_at + timedelta(
             seconds=timeout or self.default_timeout
         )
+        (sandbox_path / EXPIRES_FILE).write_text(expires_at.isoformat())
 
         return Sandbox(
             id=sandbox_id,
@@ -78,12 +131,11 @@ class SandboxManager:
             True if cleanup successful, False otherwise
         """
         try:
-            if sandbox.path.exists():
-                shutil.rmtree(sandbox.path, ignore_errors=False)
+            await self._remove(sandbox.path)
             return True
-        except Exception as e:
-            # Log error but don't raise
-            print(f"Failed to cleanup sandbox {sandbox.id}: {e}")
+        except OSError as e:
+            # Log error but don't raise; reap retries expired sandboxes
+            logger.warning(f"Failed to cleanup sandbox {sandbox.id}: {e}")
             return False
 
     async def cleanup_expired(self) -> int:
@@ -98,37 +150,49 @@ class SandboxManager:
         cleaned = 0
         now = datetime.utcnow()
 
-        # Iterate through all directories in base path
-        for sandbox_dir in self.base_path.iterdir():
-            if not sandbox_dir.is_dir():
-                continue
+        for sandbox in self._sandboxes():
+            if now >= sandbox.expires_at and await self.cleanup(sandbox):
+                cleaned += 1
 
-            try:
-                # Check if directory name is a valid UUID
-                sandbox_id = sandbox_dir.name
-                uuid.UUID(sandbox_id)  # Validate UUID format
-
-                # Get directory creation time
-                stat = sandbox_dir.stat()
-                created_at = datetime.fromtimestamp(stat.st_ctime)
-                expires_at = created_at + timedelta(seconds=self.default_timeout)
-
-                # Cleanup if expired
-                if now >= expires_at:
-                    sandbox = Sandbox(
-                        id=sandbox_id,
-                        path=sandbox_dir,
-                        created_at=created_at,
-                        expires_at=expires_at,
-                    )
-                    if await self.cleanup(sandbox):
-                        cleaned += 1
+        return cleaned
 
-            except (ValueError, OSError):
-                # Skip invalid directories
-                continue
+    async def reap(self) -> dict[str, int]:
+        """Remove expired sandboxes and what interrupted removals left.
 
-        return cleaned
+        Returns:
+            dict with sandboxes seen and reaped, and bytes still in use
+        """
+        reaped = await self.cleanup_expired()
+
+        trash = self.base_path / TRASH_DIR
+        if trash.is_dir():
+            # Entries rather than the directory: cleanups may be moving into it
+            for entry in trash.iterdir():
+                await asyncio.to_thread(shutil.rmtree, entry, True)
+
+        usage = await asyncio.to_thread(self.usage)
+        if reaped:
+            logger.info(f"Reaped {reaped} expired sandboxes")
+        return {
+            "sandboxes": len(usage) + reaped,
+            "reaped": reaped,
+            "size_bytes": sum(u.size_bytes for u in usage),
+        }
+
+    def usage(self) -> list[SandboxUsage]:
+        """Disk usage and expiry of every sandbox."""
+        return [
+            SandboxUsage(
+                path=sandbox.path,
+                size_bytes=_tree_size(sandbox.path),
+                expires_at=sandbox.expires_at,
+            )
+            for sandbox in self._sandboxes()
+        ]
+
+    def used_bytes(self) -> int:
+        """Total size of the sandboxes, counted against max_bytes."""
+        return sum(u.size_bytes for u in self.usage())
 
     def get_sandbox(self, sandbox_id: str) -> Sandbox | None:
         """Get sandbox by ID if it exists.
@@ -150,21 +214,69 @@ class SandboxManager:
         if not sandbox_path.exists() or not sandbox_path.is_dir():
             return None
 
-        # Get directory creation time
         try:
-            stat = sandbox_path.stat()
-            created_at = datetime.fromtimestamp(stat.st_ctime)
-            expires_at = created_at + timedelta(seconds=self.default_timeout)
-
-            return Sandbox(
-                id=sandbox_id,
-                path=sandbox_path,
-                created_at=created_at,
-                expires_at=expires_at,
-            )
+            return self._load(sandbox_path)
         except OSError:
             return None
 
+    def _sandboxes(self) -> list[Sandbox]:
+        """Every sandbox under the base path (mirrors and caches are skipped)."""
+        sandboxes = []
+        for sandbox_dir in self.base_path.iterdir():
+            try:
+                # Check if directory name is a valid UUID
+                uuid.UUID(sandbox_dir.name)
+                if sandbox_dir.is_dir():
+                    sandboxes.append(self._load(sandbox_dir))
+            except (ValueError, OSError):
+                # Skip invalid directories
+                continue
+        return sandboxes
+
+    def _load(self, sandbox_path: Path) -> Sandbox:
+        """Sandbox of an existing directory, expiring as recorded at creation."""
+        created_at = datetime.utcfromtimestamp(sandbox_path.stat().st_ctime)
+        try:
+            expires_at = datetime.fromisoformat((sandbox_path / EXPIRES_FILE).read_text().strip())
+        except (OSError, ValueError):
+            expires_at = created_at + timedelta(seconds=self.default_timeout)
+        return Sandbox(
+            id=sandbox_path.name,
+            path=sandbox_path,
+            created_at=created_at,
+            expires_at=expires_at,
+        )
+
+    async def _mount_tmpfs(self, sandbox_path: Path) -> None:
+        """Mount a tmpfs on the sandbox, or leave it a plain directory."""
+        exit_code, _, stderr = await _run(
+            ["mount", "-t", "tmpfs", "-o", f"size={self.tmpfs_mb}m,mode=0700",
+             "tmpfs", str(sandbox_path)]
+        )
+        if exit_code != 0:
+            # Don't retry for every sandbox of this process
+            logger.warning(f"Sandboxes fall back to directories, tmpfs mount failed: {stderr}")
+            self.tmpfs_mb = 0
+
+    async def _remove(self, sandbox_path: Path) -> None:
+        """Unmount or delete a sandbox without blocking the event loop."""
+        if os.path.ismount(sandbox_path):
+            # Freeing a tmpfs is O(1); lazy so open files don't keep it busy
+            exit_code, _, stderr = await _run(["umount", "--lazy", str(sandbox_path)])
+            if exit_code != 0:
+                raise OSError(f"umount failed: {stderr.strip()}")
+            sandbox_path.rmdir()
+            return
+
+        trash = self.base_path / TRASH_DIR
+        trash.mkdir(exist_ok=True)
+        try:
+            sandbox_path.rename(trash / sandbox_path.name)
+        except FileNotFoundError:
+            # Already removed, by an earlier cleanup or the reaper
+            return
+        await asyncio.to_thread(shutil.rmtree, trash / sandbox_path.name, True)
+
     async def run_in_sandbox(
         self,
         sandbox: Sandbox,
@@ -218,3 +330,58 @@ class SandboxManager:
 
         except Exception as e:
             return (-1, "", f"Command execution failed: {str(e)}")
+
+
+async def _run(command: list[str], timeout: int = 30) -> tuple[int, str, str]:
+    """Run a command and return (exit_code, stdout, stderr)."""
+    process = None
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout_data, stderr_data = await asyncio.wait_for(
+            process.communicate(), timeout=timeout
+        )
+        return (
+            process.returncode or 0,
+            stdout_data.decode("utf-8", errors="replace"),
+            stderr_data.decode("utf-8", errors="replace"),
+        )
+    except asyncio.TimeoutError:
+        if process:
+            process.kill()
+            await process.wait()
+        return (-1, "", f"Command timed out after {timeout} seconds")
+    except Exception as e:
+        return (-1, "", f"Command execution failed: {str(e)}")
+
+
+def _tree_size(path: Path) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+_default_manager: SandboxManager | None = None
+
+
+def get_sandbox_manager() -> SandboxManager:
+    """Return the process-wide sandbox manager configured from app settings."""
+    global _default_manager
+    if _default_manager is None:
+        from ..config import Config
+
+        _default_manager = SandboxManager(
+            Config.SANDBOX_BASE_PATH,
+            Config.SANDBOX_CLEANUP_TIMEOUT,
+            max_bytes=Config.SANDBOX_MAX_MB * 1024 * 1024,
+            tmpfs_mb=Config.SANDBOX_TMPFS_MB,
+        )
+    return _default_manager
@@ -6,14 +6,19 @@ including pull requests, reviews, check runs, and webhooks.
 """
 
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, AsyncIterator
+import asyncio
 import hmac
 import hashlib
 import logging
 import httpx
 
+from ..git.blob_cache import BlobCache
+
 logger = logging.getLogger(__name__)
 
+RAW_MEDIA_TYPE = "application/vnd.github.raw"
+
 
 class GitHubAPIError(Exception):
     """Base exception for GitHub API errors."""
@@ -37,6 +42,7 @@ class GitHubConfig:
     app_id: str | None = None
     app_private_key: str | None = None
     base_url: str = "https://api.github.com"
+    max_concurrent_pages: int = 4
 
 
 @dataclass(slots=True)
@@ -63,19 +69,23 @@ class PRFile:
     additions: int
     deletions: int
     patch: str | None
+    previous_filename: str | None = None
+    sha: str | None = None  # blob SHA at head
 
 
 class GitHubClient:
     """Async client for GitHub API operations."""
 
-    def __init__(self, config: GitHubConfig):
+    def __init__(self, config: GitHubConfig, blob_cache: BlobCache | None = None):
         """
         Initialize GitHub client.
 
         Args:
             config: GitHub configuration with token and optional app credentials
+            blob_cache: Optional content-addressed cache for file bodies
         """
         self.config = config
+        self.blob_cache = blob_cache
         self._client: httpx.AsyncClient | None = None
 
     async def __aenter__(self):
@@ -96,11 +106,9 @@ class GitHubClient:
         if self._client:
             await self._client.aclose()
 
-    async def _request(
-        self, method: str, path: str, **kwargs
-    ) -> dict[str, Any] | list[Any]:
+    async def _send(self, method: str, path: str, **kwargs) -> httpx.Response:
         """
-        Make an authenticated request to GitHub API.
+        Send an authenticated request to GitHub API.
 
         Args:
             method: HTTP method
@@ -108,7 +116,7 @@ class GitHubClient:
             **kwargs: Additional request parameters
 
         Returns:
-            JSON response data
+            Successful HTTP response
 
         Raises:
             GitHubAPIError: On API errors
@@ -120,7 +128,7 @@ class GitHubClient:
         try:
             response = await self._client.request(method, path, **kwargs)
             response.raise_for_status()
-            return response.json()
+            return response
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 403:
                 # Check if rate limited
@@ -139,6 +147,89 @@ class GitHubClient:
             logger.error(f"GitHub API request error: {str(e)}")
             raise GitHubAPIError(f"Request failed: {str(e)}")
 
+    async def _request(
+        self, method: str, path: str, **kwargs
+    ) -> dict[str, Any] | list[Any]:
+        """
+        Make an authenticated request to GitHub API.
+
+        Args:
+            method: HTTP method
+            path: API path
+            **kwargs: Additional request parameters
+
+        Returns:
+            JSON response data
+
+        Raises:
+            GitHubAPIError: On API errors
+            GitHubRateLimitError: On rate limit exceeded
+        """
+        response = await self._send(method, path, **kwargs)
+        return response.json()
+
+    @staticmethod
+    def _link_page(response: httpx.Response, rel: str) -> int | None:
+        """Extract the page number of a Link header relation."""
+        link = response.links.get(rel)
+        if not link or "url" not in link:
+            return None
+        page = httpx.URL(link["url"]).params.get("page")
+        return int(page) if page and page.isdigit() else None
+
+    async def _paginate(
+        self, path: str, params: dict[str, Any] | None = None, per_page: int = 100
+    ) -> AsyncIterator[tuple[int, list[Any]]]:
+        """
+        Iterate over all pages of a list endpoint.
+
+        The first page is fetched alone; its ``Link: rel="last"`` header tells
+        us how many pages remain, and those are fetched concurrently (bounded
+        by ``max_concurrent_pages``). Pages are yielded as soon as they arrive,
+        so they may be out of order.
+
+        Args:
+            path: API path
+            params: Extra query parameters
+            per_page: Page size (GitHub maximum is 100)
+
+        Yields:
+            Tuples of (page number, page items)
+        """
+        base_params = {**(params or {}), "per_page": per_page}
+
+        response = await self._send("GET", path, params={**base_params, "page": 1})
+        yield 1, response.json()
+
+        last_page = self._link_page(response, "last")
+        if last_page is None:
+            # No total advertised - follow rel="next" sequentially
+            next_page = self._link_page(response, "next")
+            while next_page is not None:
+                response = await self._send(
+                    "GET", path, params={**base_params, "page": next_page}
+                )
+                yield next_page, response.json()
+                next_page = self._link_page(response, "next")
+            return
+
+        semaphore = asyncio.Semaphore(max(1, self.config.max_concurrent_pages))
+
+        async def fetch(page: int) -> tuple[int, list[Any]]:
+            async with semaphore:
+                data = await self._request(
+                    "GET", path, params={**base_params, "page": page}
+                )
+                return page, data
+
+        tasks = [asyncio.create_task(fetch(page)) for page in range(2, last_page + 1)]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
+
     async def get_pull_request(
         self, owner: str, repo: str, pr_number: int
     ) -> PullRequest:
@@ -168,6 +259,53 @@ class GitHubClient:
             diff_url=data["diff_url"],
         )
 
+    async def list_pull_requests(
+        self, owner: str, repo: str, state: str = "open"
+    ) -> list[dict]:
+        """
+        List pull requests, most recently updated first.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            state: PR state filter (open, closed, all)
+
+        Returns:
+            List of raw pull request data
+        """
+        return await self._request(
+            "GET",
+            f"/repos/{owner}/{repo}/pulls",
+            params={
+                "state": state,
+                "sort": "updated",
+                "direction": "desc",
+                "per_page": 100,
+            },
+        )
+
+    async def iter_pull_request_files(
+        self, owner: str, repo: str, pr_number: int
+    ) -> AsyncIterator[list[PRFile]]:
+        """
+        Iterate over files changed in a pull request, one page at a time.
+
+        Pages after the first are fetched concurrently and yielded as they
+        arrive, so callers can start work on the first page immediately.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            pr_number: Pull request number
+
+        Yields:
+            Lists of PRFile objects, one list per API page
+        """
+        async for _, data in self._paginate(
+            f"/repos/{owner}/{repo}/pulls/{pr_number}/files"
+        ):
+            yield [self._parse_pr_file(file_data) for file_data in data]
+
     async def get_pull_request_files(
         self, owner: str, repo: str, pr_number: int
     ) -> list[PRFile]:
@@ -180,42 +318,35 @@ class GitHubClient:
             pr_number: Pull request number
 
         Returns:
-            List of PRFile objects representing changed files
+            List of PRFile objects representing changed files, in API order
         """
-        files = []
-        page = 1
-        per_page = 100
-
-        while True:
-            data = await self._request(
-                "GET",
-                f"/repos/{owner}/{repo}/pulls/{pr_number}/files",
-                params={"page": page, "per_page": per_page},
-            )
-
-            if not data:
-                break
-
-            for file_data in data:
-                files.append(
-                    PRFile(
-                        filename=file_data["filename"],
-                        status=file_data["status"],
-                        additions=file_data["additions"],
-                        deletions=file_data["deletions"],
-                        patch=file_data.get("patch"),
-                    )
-                )
-
-            if len(data) < per_page:
-                break
+        pages: dict[int, list[Any]] = {}
+        async for page, data in self._paginate(
+            f"/repos/{owner}/{repo}/pulls/{pr_number}/files"
+        ):
+            pages[page] = data
+
+        return [
+            self._parse_pr_file(file_data)
+            for page in sorted(pages)
+            for file_data in pages[page]
+        ]
 
-            page += 1
-
-        return files
+    @staticmethod
+    def _parse_pr_file(file_data: dict[str, Any]) -> PRFile:
+        """Convert a raw PR file payload to a PRFile."""
+        return PRFile(
+            filename=file_data["filename"],
+            status=file_data["status"],
+            additions=file_data["additions"],
+            deletions=file_data["deletions"],
+            patch=file_data.get("patch"),
+            previous_filename=file_data.get("previous_filename"),
+            sha=file_data.get("sha"),
+        )
 
     async def get_file_content(
-        self, owner: str, repo: str, path: str, ref: str
+        self, owner: str, repo: str, path: str, ref: str, blob_sha: str | None = None
     ) -> str:
         """
         Get file content at a specific ref.
@@ -225,17 +356,79 @@ class GitHubClient:
             repo: Repository name
             path: File path
             ref: Git ref (branch, tag, or commit SHA)
+            blob_sha: Blob SHA if already known (e.g. from the PR file list),
+                allowing the body to be served from the blob cache
 
         Returns:
             File content as string
         """
-        data = await self._request(
-            "GET", f"/repos/{owner}/{repo}/contents/{path}", params={"ref": ref}
+        data = await self.get_file_bytes(owner, repo, path, ref, blob_sha=blob_sha)
+        return data.decode("utf-8")
+
+    async def get_file_bytes(
+        self, owner: str, repo: str, path: str, ref: str, blob_sha: str | None = None
+    ) -> bytes:
+        """
+        Get raw file bytes at a specific ref.
+
+        The body is requested with the raw media type, so no JSON or base64
+        decoding is involved, and is stored in the blob cache under its git
+        blob SHA.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            path: File path
+            ref: Git ref (branch, tag, or commit SHA)
+            blob_sha: Blob SHA if already known
+
+        Returns:
+            File content as bytes
+        """
+        if blob_sha:
+            return await self.get_blob(owner, repo, blob_sha)
+
+        response = await self._send(
+            "GET",
+            f"/repos/{owner}/{repo}/contents/{path}",
+            params={"ref": ref},
+            headers={"Accept": RAW_MEDIA_TYPE},
         )
+        data = response.content
+        if self.blob_cache:
+            await asyncio.to_thread(self.blob_cache.store, data)
+        return data
+
+    async def get_blob(
+        self, owner: str, repo: str, blob_sha: str, max_bytes: int | None = None
+    ) -> bytes:
+        """
+        Get a blob by SHA, serving it from the blob cache when possible.
 
-        import base64
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            blob_sha: Git blob SHA
+            max_bytes: Only the first max_bytes are needed (a cached blob is
+                then only partly read)
 
-        return base64.b64decode(data["content"]).decode("utf-8")
+        Returns:
+            Blob content as bytes
+        """
+        if self.blob_cache:
+            cached = await asyncio.to_thread(self.blob_cache.get, blob_sha, max_bytes)
+            if cached is not None:
+                return cached
+
+        response = await self._send(
+            "GET",
+            f"/repos/{owner}/{repo}/git/blobs/{blob_sha}",
+            headers={"Accept": RAW_MEDIA_TYPE},
+        )
+        data = response.content
+        if self.blob_cache:
+            await asyncio.to_thread(self.blob_cache.store, data)
+        return data[:max_bytes]
 
     async def create_review(
         self,
@@ -307,6 +500,27 @@ class GitHubClient:
             json=payload,
         )
 
+    async def list_review_comments(
+        self, owner: str, repo: str, pr_number: int
+    ) -> list[dict]:
+        """
+        List all review comments on a pull request.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            pr_number: Pull request number
+
+        Returns:
+            List of review comment data
+        """
+        comments: list[dict] = []
+        async for _, data in self._paginate(
+            f"/repos/{owner}/{repo}/pulls/{pr_number}/comments"
+        ):
+            comments.extend(data)
+        return comments
+
     async def create_issue_comment(
         self, owner: str, repo: str, issue_number: int, body: str
     ) -> dict:
@@ -450,3 +664,44 @@ class GitHubClient:
         """
         repo_data = await self.get_repository(owner, repo)
         return repo_data["default_branch"]
+
+    async def get_branch_tree_sha(self, owner: str, repo: str, branch: str) -> str:
+        """
+        Get the SHA of the tree at a branch's head commit.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            branch: Branch name
+
+        Returns:
+            Git tree SHA
+        """
+        branch_data = await self._request("GET", f"/repos/{owner}/{repo}/branches/{branch}")
+        return branch_data["commit"]["commit"]["tree"]["sha"]
+
+    async def get_tree(self, owner: str, repo: str, tree_sha: str) -> list[tuple[str, str]]:
+        """
+        List every file of a tree, recursively, in one request.
+
+        GitHub truncates very large trees (over 100,000 entries); the
+        entries it did return are used.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            tree_sha: Git tree SHA (or a ref)
+
+        Returns:
+            (path, blob SHA) of each file
+        """
+        tree_data = await self._request(
+            "GET", f"/repos/{owner}/{repo}/git/trees/{tree_sha}", params={"recursive": "1"}
+        )
+        if tree_data.get("truncated"):
+            logger.warning(f"Tree {tree_sha} of {owner}/{repo} was truncated by GitHub")
+        return [
+            (entry["path"], entry["sha"])
+            for entry in tree_data.get("tree", [])
+            if entry.get("type") == "blob"
+        ]
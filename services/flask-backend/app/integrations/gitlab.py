@@ -6,10 +6,13 @@ including merge requests, discussions, notes, and webhooks.
 """
 
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, AsyncIterator
+import asyncio
 import logging
 import httpx
 
+from ..git.blob_cache import BlobCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,6 +36,7 @@ class GitLabConfig:
 
     token: str
     base_url: str = "https://gitlab.com"
+    max_concurrent_pages: int = 4
 
 
 @dataclass(slots=True)
@@ -64,14 +68,16 @@ class MRChange:
 class GitLabClient:
     """Async client for GitLab API operations."""
 
-    def __init__(self, config: GitLabConfig):
+    def __init__(self, config: GitLabConfig, blob_cache: BlobCache | None = None):
         """
         Initialize GitLab client.
 
         Args:
             config: GitLab configuration with token and base URL
+            blob_cache: Optional content-addressed cache for file bodies
         """
         self.config = config
+        self.blob_cache = blob_cache
         self._client: httpx.AsyncClient | None = None
 
     async def __aenter__(self):
@@ -91,11 +97,9 @@ class GitLabClient:
         if self._client:
             await self._client.aclose()
 
-    async def _request(
-        self, method: str, path: str, **kwargs
-    ) -> dict[str, Any] | list[Any]:
+    async def _send(self, method: str, path: str, **kwargs) -> httpx.Response:
         """
-        Make an authenticated request to GitLab API.
+        Send an authenticated request to GitLab API.
 
         Args:
             method: HTTP method
@@ -103,7 +107,7 @@ class GitLabClient:
             **kwargs: Additional request parameters
 
         Returns:
-            JSON response data
+            Successful HTTP response
 
         Raises:
             GitLabAPIError: On API errors
@@ -115,12 +119,7 @@ class GitLabClient:
         try:
             response = await self._client.request(method, path, **kwargs)
             response.raise_for_status()
-
-            # GitLab returns empty response for some endpoints
-            if response.status_code == 204 or not response.content:
-                return {}
-
-            return response.json()
+            return response
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 429:
                 raise GitLabRateLimitError(
@@ -137,6 +136,91 @@ class GitLabClient:
             logger.error(f"GitLab API request error: {str(e)}")
             raise GitLabAPIError(f"Request failed: {str(e)}")
 
+    async def _request(
+        self, method: str, path: str, **kwargs
+    ) -> dict[str, Any] | list[Any]:
+        """
+        Make an authenticated request to GitLab API.
+
+        Args:
+            method: HTTP method
+            path: API path
+            **kwargs: Additional request parameters
+
+        Returns:
+            JSON response data
+
+        Raises:
+            GitLabAPIError: On API errors
+            GitLabRateLimitError: On rate limit exceeded
+        """
+        response = await self._send(method, path, **kwargs)
+
+        # GitLab returns empty response for some endpoints
+        if response.status_code == 204 or not response.content:
+            return {}
+
+        return response.json()
+
+    @staticmethod
+    def _header_page(response: httpx.Response, header: str) -> int | None:
+        """Read a numeric pagination header (X-Total-Pages, X-Next-Page)."""
+        value = response.headers.get(header, "")
+        return int(value) if value.isdigit() else None
+
+    async def _paginate(
+        self, path: str, params: dict[str, Any] | None = None, per_page: int = 100
+    ) -> AsyncIterator[tuple[int, list[Any]]]:
+        """
+        Iterate over all pages of a list endpoint.
+
+        The first page is fetched alone; its ``X-Total-Pages`` header tells us
+        how many pages remain, and those are fetched concurrently (bounded by
+        ``max_concurrent_pages``). GitLab omits the total for very large
+        collections, in which case ``X-Next-Page`` is followed sequentially.
+        Pages are yielded as soon as they arrive, so they may be out of order.
+
+        Args:
+            path: API path
+            params: Extra query parameters
+            per_page: Page size (GitLab maximum is 100)
+
+        Yields:
+            Tuples of (page number, page items)
+        """
+        base_params = {**(params or {}), "per_page": per_page}
+
+        response = await self._send("GET", path, params={**base_params, "page": 1})
+        yield 1, response.json() if response.content else []
+
+        total_pages = self._header_page(response, "X-Total-Pages")
+        if total_pages is None:
+            next_page = self._header_page(response, "X-Next-Page")
+            while next_page is not None:
+                response = await self._send(
+                    "GET", path, params={**base_params, "page": next_page}
+                )
+                yield next_page, response.json() if response.content else []
+                next_page = self._header_page(response, "X-Next-Page")
+            return
+
+        semaphore = asyncio.Semaphore(max(1, self.config.max_concurrent_pages))
+
+        async def fetch(page: int) -> tuple[int, list[Any]]:
+            async with semaphore:
+                data = await self._request(
+                    "GET", path, params={**base_params, "page": page}
+                )
+                return page, data or []
+
+        tasks = [asyncio.create_task(fetch(page)) for page in range(2, total_pages + 1)]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
+
     async def get_merge_request(self, project_id: str, mr_iid: int) -> MergeRequest:
         """
         Retrieve merge request details.
@@ -162,6 +246,30 @@ class GitLabClient:
             diff_refs=data.get("diff_refs", {}),
         )
 
+    async def list_merge_requests(
+        self, project_id: str, state: str = "opened"
+    ) -> list[dict]:
+        """
+        List merge requests, most recently updated first.
+
+        Args:
+            project_id: Project ID or URL-encoded path
+            state: MR state filter (opened, closed, merged, all)
+
+        Returns:
+            List of raw merge request data
+        """
+        return await self._request(
+            "GET",
+            f"/projects/{project_id}/merge_requests",
+            params={
+                "state": state,
+                "order_by": "updated_at",
+                "sort": "desc",
+                "per_page": 100,
+            },
+        )
+
     async def get_merge_request_changes(
         self, project_id: str, mr_iid: int
     ) -> list[MRChange]:
@@ -179,22 +287,47 @@ class GitLabClient:
             "GET", f"/projects/{project_id}/merge_requests/{mr_iid}/changes"
         )
 
-        changes = []
-        for change_data in data.get("changes", []):
-            changes.append(
-                MRChange(
-                    old_path=change_data["old_path"],
-                    new_path=change_data["new_path"],
-                    diff=change_data["diff"],
-                    new_file=change_data["new_file"],
-                    renamed_file=change_data["renamed_file"],
-                    deleted_file=change_data["deleted_file"],
-                )
-            )
+        return [
+            self._parse_mr_change(change_data)
+            for change_data in data.get("changes", [])
+        ]
 
-        return changes
+    async def iter_merge_request_diffs(
+        self, project_id: str, mr_iid: int
+    ) -> AsyncIterator[list[MRChange]]:
+        """
+        Iterate over files changed in a merge request, one page at a time.
+
+        Uses the paginated ``/diffs`` endpoint. Pages after the first are
+        fetched concurrently and yielded as they arrive.
+
+        Args:
+            project_id: Project ID or URL-encoded path
+            mr_iid: Merge request internal ID
 
-    async def get_file_content(self, project_id: str, path: str, ref: str) -> str:
+        Yields:
+            Lists of MRChange objects, one list per API page
+        """
+        async for _, data in self._paginate(
+            f"/projects/{project_id}/merge_requests/{mr_iid}/diffs"
+        ):
+            yield [self._parse_mr_change(change_data) for change_data in data]
+
+    @staticmethod
+    def _parse_mr_change(change_data: dict[str, Any]) -> MRChange:
+        """Convert a raw MR diff payload to an MRChange."""
+        return MRChange(
+            old_path=change_data["old_path"],
+            new_path=change_data["new_path"],
+            diff=change_data.get("diff", ""),
+            new_file=change_data.get("new_file", False),
+            renamed_file=change_data.get("renamed_file", False),
+            deleted_file=change_data.get("deleted_file", False),
+        )
+
+    async def get_file_content(
+        self, project_id: str, path: str, ref: str, blob_sha: str | None = None
+    ) -> str:
         """
         Get file content at a specific ref.
 
@@ -202,22 +335,93 @@ class GitLabClient:
             project_id: Project ID or URL-encoded path
             path: File path
             ref: Git ref (branch, tag, or commit SHA)
+            blob_sha: Blob SHA if already known
 
         Returns:
             File content as string
         """
+        data = await self.get_file_bytes(project_id, path, ref, blob_sha=blob_sha)
+        return data.decode("utf-8")
+
+    async def get_file_bytes(
+        self, project_id: str, path: str, ref: str, blob_sha: str | None = None
+    ) -> bytes:
+        """
+        Get raw file bytes at a specific ref.
+
+        With a blob cache configured, the blob ID is resolved with a HEAD
+        request (no body) and the content is only downloaded on a cache miss.
+
+        Args:
+            project_id: Project ID or URL-encoded path
+            path: File path
+            ref: Git ref (branch, tag, or commit SHA)
+            blob_sha: Blob SHA if already known
+
+        Returns:
+            File content as bytes
+        """
         import urllib.parse
 
         encoded_path = urllib.parse.quote(path, safe="")
-        data = await self._request(
-            "GET", f"/projects/{project_id}/repository/files/{encoded_path}/raw",
-            params={"ref": ref}
+        file_path = f"/projects/{project_id}/repository/files/{encoded_path}"
+
+        if self.blob_cache and not blob_sha:
+            response = await self._send("HEAD", file_path, params={"ref": ref})
+            blob_sha = response.headers.get("X-Gitlab-Blob-Id")
+
+        if blob_sha:
+            return await self.get_blob(project_id, blob_sha)
+
+        # Raw endpoint returns the file body directly, not JSON
+        response = await self._send("GET", f"{file_path}/raw", params={"ref": ref})
+        return response.content
+
+    async def get_blob(
+        self, project_id: str, blob_sha: str, max_bytes: int | None = None
+    ) -> bytes:
+        """
+        Get a blob by SHA, serving it from the blob cache when possible.
+
+        Args:
+            project_id: Project ID or URL-encoded path
+            blob_sha: Git blob SHA
+            max_bytes: Only the first max_bytes are needed (a cached blob is
+                then only partly read)
+
+        Returns:
+            Blob content as bytes
+        """
+        if self.blob_cache:
+            cached = await asyncio.to_thread(self.blob_cache.get, blob_sha, max_bytes)
+            if cached is not None:
+                return cached
+
+        response = await self._send(
+            "GET", f"/projects/{project_id}/repository/blobs/{blob_sha}/raw"
         )
+        data = response.content
+        if self.blob_cache:
+            await asyncio.to_thread(self.blob_cache.store, data)
+        return data[:max_bytes]
 
-        # Raw endpoint returns text directly, not JSON
-        if isinstance(data, str):
-            return data
-        return str(data)
+    async def list_mr_notes(self, project_id: str, mr_iid: int) -> list[dict]:
+        """
+        List all notes on a merge request, including discussion replies.
+
+        Args:
+            project_id: Project ID or URL-encoded path
+            mr_iid: Merge request internal ID
+
+        Returns:
+            List of note data
+        """
+        notes: list[dict] = []
+        async for _, data in self._paginate(
+            f"/projects/{project_id}/merge_requests/{mr_iid}/notes"
+        ):
+            notes.extend(data)
+        return notes
 
     async def create_mr_note(self, project_id: str, mr_iid: int, body: str) -> dict:
         """
@@ -412,25 +616,50 @@ class GitLabClient:
         Returns:
             List of commit data
         """
-        commits = []
-        page = 1
-        per_page = 100
+        pages: dict[int, list[dict]] = {}
+        async for page, data in self._paginate(
+            f"/projects/{project_id}/merge_requests/{mr_iid}/commits"
+        ):
+            pages[page] = data
 
-        while True:
-            data = await self._request(
-                "GET",
-                f"/projects/{project_id}/merge_requests/{mr_iid}/commits",
-                params={"page": page, "per_page": per_page}
-            )
+        return [commit for page in sorted(pages) for commit in pages[page]]
+
+    async def get_branch_commit_sha(self, project_id: str, branch: str) -> str:
+        """
+        Get the SHA of a branch's head commit.
 
-            if not data:
-                break
+        Args:
+            project_id: Project ID or URL-encoded path
+            branch: Branch name
 
-            commits.extend(data)
+        Returns:
+            Commit SHA
+        """
+        import urllib.parse
 
-            if len(data) < per_page:
-                break
+        encoded_branch = urllib.parse.quote(branch, safe="")
+        branch_data = await self._request(
+            "GET", f"/projects/{project_id}/repository/branches/{encoded_branch}"
+        )
+        return branch_data["commit"]["id"]
 
-            page += 1
+    async def get_tree(self, project_id: str, ref: str) -> list[tuple[str, str]]:
+        """
+        List every file of the repository at a ref, recursively.
 
-        return commits
+        Args:
+            project_id: Project ID or URL-encoded path
+            ref: Git ref (branch, tag, or commit SHA)
+
+        Returns:
+            (path, blob SHA) of each file, in path order
+        """
+        files: list[tuple[str, str]] = []
+        async for _, data in self._paginate(
+            f"/projects/{project_id}/repository/tree",
+            params={"ref": ref, "recursive": "true"},
+        ):
+            files.extend(
+                (entry["path"], entry["id"]) for entry in data if entry.get("type") == "blob"
+            )
+        return sorted(files)
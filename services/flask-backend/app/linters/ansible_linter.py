@@ -6,11 +6,8 @@ from .base import BaseLinter, LintResult, LintIssue
 class AnsibleLinter(BaseLinter):
     name = "ansible"
     languages = ["ansible", "yaml"]
-
-    async def is_available(self) -> bool:
-        """Check if ansible-lint is installed."""
-        _, stdout, _ = await self._run_command(["ansible-lint", "--version"], Path.cwd())
-        return "ansible-lint" in stdout
+    version_command = ["ansible-lint", "--version"]
+    config_files = [".ansible-lint", ".ansible-lint.yml", ".ansible-lint.yaml"]
 
     async def lint(self, path: Path, files: list[str] | None = None) -> LintResult:
         """Run ansible-lint on Ansible files."""
@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from pathlib import Path
 import asyncio
+import resource
 import time
 
 
@@ -23,38 +24,108 @@ class LintResult:
     issues: list[LintIssue] = field(default_factory=list)
     error: str | None = None
     execution_time_ms: int = 0
+    cache_hits: int = 0  # files whose issues came from the lint cache
+    cache_misses: int = 0  # files the linter actually ran on
+
+    @property
+    def cache_hit_rate(self) -> float | None:
+        """Fraction of files served from the lint cache, None if not cached."""
+        total = self.cache_hits + self.cache_misses
+        return self.cache_hits / total if total else None
 
 
 class BaseLinter(ABC):
     name: str = ""
     languages: list[str] = []
+    # Command printing the tool version; succeeds only if the tool is
+    # installed, and its output is part of the lint cache key
+    version_command: list[str] = []
+    # Repository-root config files that change the tool's findings
+    config_files: list[str] = []
+    # Whether a file's issues depend only on its own content (so they can be
+    # cached by blob SHA); false for package- or module-level analysis
+    cacheable: bool = True
+    # Scheduler slots (cores) one run of the tool keeps busy
+    weight: int = 1
+    # Data segment cap of the tool's subprocesses in MB (0 = unlimited)
+    memory_limit_mb: int = 0
+    _available: bool | None = None
+    _version: str | None = None
 
     @abstractmethod
     async def lint(self, path: Path, files: list[str] | None = None) -> LintResult:
         """Run linter on path, optionally limiting to specific files."""
         pass
 
-    @abstractmethod
     async def is_available(self) -> bool:
-        """Check if linter tool is installed."""
-        pass
+        """Check if linter tool is installed (probed once per instance)."""
+        return await self.probe()
+
+    async def probe(self) -> bool:
+        """Run the version command once, recording availability and version.
+
+        Returns:
+            True if the tool's version command succeeded
+        """
+        if self._available is None:
+            available, version = False, ""
+            if self.version_command:
+                exit_code, stdout, stderr = await self._run_command(
+                    self.version_command, Path.cwd(), timeout=30
+                )
+                if exit_code == 0:
+                    available = True
+                    version = next(
+                        (line.strip() for line in (stdout or stderr).splitlines() if line.strip()),
+                        "",
+                    )
+            self._version = version
+            self._available = available
+        return self._available
+
+    async def version(self) -> str:
+        """Return the tool's version string, empty if unknown."""
+        if self._version is None:
+            await self.probe()
+        return self._version or ""
 
     async def _run_command(
-        self, cmd: list[str], cwd: Path, timeout: int = 120
+        self, cmd: list[str], cwd: Path, timeout: int = 120, stdin: bytes | None = None
     ) -> tuple[int, str, str]:
-        """Run command and return (exit_code, stdout, stderr)."""
+        """Run command and return (exit_code, stdout, stderr), feeding it stdin if given."""
         start = time.time()
         try:
             proc = await asyncio.create_subprocess_exec(
                 *cmd,
                 cwd=str(cwd),
+                stdin=asyncio.subprocess.PIPE if stdin is not None else None,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
             )
-            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+            if self.memory_limit_mb > 0:
+                self._limit_memory(proc.pid)
+            stdout, stderr = await asyncio.wait_for(proc.communicate(stdin), timeout=timeout)
             return proc.returncode or 0, stdout.decode(), stderr.decode()
         except asyncio.TimeoutError:
             proc.kill()
             return -1, "", "Command timeout"
         except Exception as e:
             return -1, "", str(e)
+
+    def _limit_memory(self, pid: int) -> None:
+        """Cap a started child's data segment.
+
+        Set with prlimit(2) right after the spawn rather than in a
+        preexec_fn, which is unsafe in a process with threads (the worker
+        runtime and thread pools). Processes the tool starts later inherit
+        the cap.
+
+        RLIMIT_DATA rather than RLIMIT_AS: Go and Node tools reserve far more
+        address space than they ever touch and fail to start under an AS cap.
+        """
+        limit = self.memory_limit_mb * 1024 * 1024
+        try:
+            resource.prlimit(pid, resource.RLIMIT_DATA, (limit, limit))
+        except (OSError, ValueError):
+            # The child already exited, or the cap is above our own hard limit
+            pass
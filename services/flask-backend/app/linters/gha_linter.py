@@ -6,11 +6,8 @@ from .base import BaseLinter, LintResult, LintIssue
 class GHALinter(BaseLinter):
     name = "gha"
     languages = ["github-actions", "yaml"]
-
-    async def is_available(self) -> bool:
-        """Check if actionlint is installed."""
-        _, stdout, _ = await self._run_command(["actionlint", "-version"], Path.cwd())
-        return "actionlint" in stdout
+    version_command = ["actionlint", "-version"]
+    config_files = [".github/actionlint.yaml", ".github/actionlint.yml"]
 
     async def lint(self, path: Path, files: list[str] | None = None) -> LintResult:
         """Run actionlint on GitHub Actions workflows."""
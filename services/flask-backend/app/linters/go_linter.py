@@ -7,11 +7,12 @@ from .base import BaseLinter, LintResult, LintIssue
 class GoLinter(BaseLinter):
     name = "go"
     languages = ["go"]
-
-    async def is_available(self) -> bool:
-        """Check if golangci-lint is installed."""
-        _, stdout, _ = await self._run_command(["golangci-lint", "--version"], Path.cwd())
-        return "golangci-lint" in stdout
+    version_command = ["golangci-lint", "--version"]
+    config_files = [".golangci.yml", ".golangci.yaml", ".golangci.toml", ".golangci.json"]
+    # Type checking spans the whole package
+    cacheable = False
+    # golangci-lint runs its analyzers in parallel; capped at the weight below
+    weight = 4
 
     async def lint(self, path: Path, files: list[str] | None = None) -> LintResult:
         """Run golangci-lint on Go files."""
@@ -23,7 +24,9 @@ class GoLinter(BaseLinter):
                 result.error = "golangci-lint not installed"
                 return result
 
-            cmd = ["golangci-lint", "run", "--out-format=json"]
+            cmd = [
+                "golangci-lint", "run", "--out-format=json", f"--concurrency={self.weight}"
+            ]
             if files:
                 cmd.extend(files)
             else:
@@ -7,11 +7,11 @@ from .base import BaseLinter, LintResult, LintIssue
 class JavaScriptLinter(BaseLinter):
     name = "javascript"
     languages = ["javascript", "typescript"]
-
-    async def is_available(self) -> bool:
-        """Check if eslint is installed."""
-        _, stdout, _ = await self._run_command(["eslint", "--version"], Path.cwd())
-        return "v" in stdout
+    version_command = ["eslint", "--version"]
+    config_files = [
+        ".eslintrc", ".eslintrc.js", ".eslintrc.cjs", ".eslintrc.json", ".eslintrc.yml",
+        ".eslintrc.yaml", "eslint.config.js", "eslint.config.mjs", "package.json",
+    ]
 
     async def lint(self, path: Path, files: list[str] | None = None) -> LintResult:
         """Run eslint on JS/TS files."""
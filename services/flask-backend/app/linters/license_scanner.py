@@ -37,6 +37,8 @@ class CycloneDXScanner(BaseLinter):
     """
     name = "cyclonedx"
     languages = ["python", "javascript", "typescript", "go", "java", "ruby", "php"]
+    # scancode license matching is CPU- and memory-heavy
+    weight = 4
 
     async def is_available(self) -> bool:
         """Check if CycloneDX is installed."""
@@ -0,0 +1,346 @@
+"""In-process flake8-compatible Python lint engine.
+
+Runs pyflakes and pycodestyle (the checkers behind flake8's default F, E
+and W codes) through their APIs on file contents, in a process pool shared
+by every lint call of the process, instead of starting a flake8 subprocess
+per review. Findings use flake8's codes and honour ``# noqa`` and the
+``[flake8]`` options that affect them; repositories configuring anything
+else (per-file ignores, plugins, complexity) are left to flake8 itself.
+"""
+
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from configparser import ConfigParser, Error as ConfigError
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from pathlib import Path
+import ast
+import asyncio
+import logging
+import multiprocessing
+import os
+import re
+
+try:
+    import pycodestyle
+    import pyflakes
+    import pyflakes.checker
+except ImportError:  # flake8 (which brings both) is not installed
+    pycodestyle = None
+    pyflakes = None
+
+from .base import LintIssue
+
+logger = logging.getLogger(__name__)
+
+# flake8's code of each pyflakes message class
+PYFLAKES_CODES = {
+    "UnusedImport": "F401",
+    "ImportShadowedByLoopVar": "F402",
+    "ImportStarUsed": "F403",
+    "LateFutureImport": "F404",
+    "ImportStarUsage": "F405",
+    "ImportStarNotPermitted": "F406",
+    "FutureFeatureNotDefined": "F407",
+    "PercentFormatInvalidFormat": "F501",
+    "PercentFormatExpectedMapping": "F502",
+    "PercentFormatExpectedSequence": "F503",
+    "PercentFormatExtraNamedArguments": "F504",
+    "PercentFormatMissingArgument": "F505",
+    "PercentFormatMixedPositionalAndNamed": "F506",
+    "PercentFormatPositionalCountMismatch": "F507",
+    "PercentFormatStarRequiresSequence": "F508",
+    "PercentFormatUnsupportedFormatCharacter": "F509",
+    "StringDotFormatInvalidFormat": "F521",
+    "StringDotFormatExtraNamedArguments": "F522",
+    "StringDotFormatExtraPositionalArguments": "F523",
+    "StringDotFormatMissingArgument": "F524",
+    "StringDotFormatMixingAutomatic": "F525",
+    "FStringMissingPlaceholders": "F541",
+    "MultiValueRepeatedKeyLiteral": "F601",
+    "MultiValueRepeatedKeyVariable": "F602",
+    "TooManyExpressionsInStarredAssignment": "F621",
+    "TwoStarredExpressions": "F622",
+    "AssertTuple": "F631",
+    "IsLiteral": "F632",
+    "InvalidPrintSyntax": "F633",
+    "IfTuple": "F634",
+    "BreakOutsideLoop": "F701",
+    "ContinueOutsideLoop": "F702",
+    "YieldOutsideFunction": "F704",
+    "ReturnOutsideFunction": "F706",
+    "DefaultExceptNotLast": "F707",
+    "DoctestSyntaxError": "F721",
+    "ForwardAnnotationSyntaxError": "F722",
+    "RedefinedWhileUnused": "F811",
+    "UndefinedName": "F821",
+    "UndefinedExport": "F822",
+    "UndefinedLocal": "F823",
+    "DuplicateArgument": "F831",
+    "UnusedVariable": "F841",
+    "UnusedAnnotation": "F842",
+    "RaiseNotImplemented": "F901",
+}
+
+# flake8 defaults
+DEFAULT_SELECT = ("E", "F", "W", "C90")
+DEFAULT_IGNORE = ("E121", "E123", "E126", "E226", "E24", "E704", "W503", "W504")
+DEFAULT_EXCLUDE = (".svn", "CVS", ".bzr", ".hg", ".git", "__pycache__", ".tox", ".nox",
+                   ".eggs", "*.egg")
+CONFIG_FILES = ("setup.cfg", "tox.ini", ".flake8")  # flake8's lookup order
+
+# [flake8] options the engine applies, and options that don't change findings
+SUPPORTED_OPTIONS = {
+    "max-line-length", "max-doc-length", "select", "extend-select", "ignore",
+    "extend-ignore", "exclude", "extend-exclude", "builtins", "hang-closing",
+}
+NEUTRAL_OPTIONS = {
+    "count", "statistics", "show-source", "format", "jobs", "output-file", "tee",
+    "benchmark", "quiet", "verbose", "color",
+}
+
+_NOQA_RE = re.compile(r"# noqa(?::[\s]?(?P<codes>([A-Z]+[0-9]+(?:[,\s]+)?)+))?", re.I)
+_NOQA_FILE_RE = re.compile(r"\s*# flake8[:=]\s*noqa", re.I)
+_CODE_RE = re.compile(r"[A-Z]+[0-9]+")
+_PREFIX_RE = re.compile(r"[A-Z]+[0-9]*")
+
+
+def available() -> bool:
+    """Whether pyflakes and pycodestyle can be imported."""
+    return pycodestyle is not None and pyflakes is not None
+
+
+def engine_version() -> str:
+    """Checker versions, which decide the findings (part of lint cache keys)."""
+    return f"pyflakes {pyflakes.__version__}, pycodestyle {pycodestyle.__version__}"
+
+
+@dataclass(frozen=True, slots=True)
+class EngineOptions:
+    """flake8 options affecting findings (picklable, sent to pool workers)."""
+
+    max_line_length: int = 79
+    max_doc_length: int | None = None
+    hang_closing: bool = False
+    select: tuple[str, ...] = DEFAULT_SELECT
+    ignore: tuple[str, ...] = DEFAULT_IGNORE
+    exclude: tuple[str, ...] = DEFAULT_EXCLUDE
+    builtins: tuple[str, ...] = ()
+
+    def selects(self, code: str) -> bool:
+        """flake8's decision: the longest matching select or ignore prefix wins."""
+        selected = max((len(s) for s in self.select if code.startswith(s)), default=0)
+        ignored = max((len(i) for i in self.ignore if code.startswith(i)), default=0)
+        return selected > ignored
+
+    def excludes(self, path: Path) -> bool:
+        """Whether a file or directory matches an exclude pattern."""
+        return any(fnmatch(path.name, p) or fnmatch(str(path), p) for p in self.exclude)
+
+
+def load_options(repo_path: Path) -> EngineOptions | None:
+    """Read a repository's [flake8] options.
+
+    Returns:
+        Options to lint with, or None if the configuration uses options the
+        engine doesn't implement (flake8 itself should run instead)
+    """
+    for name in CONFIG_FILES:
+        parser = ConfigParser(interpolation=None)
+        try:
+            parser.read(repo_path / name, encoding="utf-8")
+        except (ConfigError, UnicodeDecodeError):
+            return None
+        if parser.has_section("flake8"):
+            break
+    else:
+        return EngineOptions()
+
+    raw = {key.replace("_", "-"): value for key, value in parser.items("flake8")}
+    if set(raw) - SUPPORTED_OPTIONS - NEUTRAL_OPTIONS:
+        return None
+
+    def codes(key: str) -> tuple[str, ...]:
+        return tuple(_PREFIX_RE.findall(raw.get(key, "").upper()))
+
+    def patterns(key: str) -> tuple[str, ...]:
+        return tuple(
+            str(repo_path / p) if "/" in p else p
+            for p in (s.strip() for s in raw.get(key, "").split(",")) if p
+        )
+
+    try:
+        return EngineOptions(
+            max_line_length=int(raw.get("max-line-length", 79)),
+            max_doc_length=int(raw["max-doc-length"]) if "max-doc-length" in raw else None,
+            hang_closing=raw.get("hang-closing", "").lower() in ("1", "true", "yes", "on"),
+            select=(codes("select") if "select" in raw else DEFAULT_SELECT)
+            + codes("extend-select"),
+            ignore=(codes("ignore") if "ignore" in raw else DEFAULT_IGNORE)
+            + codes("extend-ignore"),
+            exclude=(patterns("exclude") if "exclude" in raw else DEFAULT_EXCLUDE)
+            + patterns("extend-exclude"),
+            builtins=tuple(b.strip() for b in raw.get("builtins", "").split(",") if b.strip()),
+        )
+    except ValueError:
+        return None
+
+
+def lint_sources(
+    sources: list[tuple[str, bytes]], options: EngineOptions
+) -> list[LintIssue]:
+    """Lint file contents (runs in a pool worker).
+
+    Args:
+        sources: (file path as reported, content) of each file
+        options: flake8 options
+
+    Returns:
+        Issues of all files, in file and line order
+    """
+    issues: list[LintIssue] = []
+    for file, content in sources:
+        issues.extend(lint_source(file, content, options))
+    return issues
+
+
+def lint_source(file: str, content: bytes, options: EngineOptions) -> list[LintIssue]:
+    """Lint one file's content like ``flake8 <file>`` would."""
+    try:
+        source = content.decode("utf-8")
+    except UnicodeDecodeError:
+        source = content.decode("latin-1")
+    lines = source.splitlines(True)
+    if any(_NOQA_FILE_RE.match(line) for line in lines):
+        return []
+
+    found: list[tuple[int, int, str, str]] = []
+    try:
+        tree = ast.parse(source, filename=file)
+    except (SyntaxError, ValueError) as e:
+        row = getattr(e, "lineno", None) or 1
+        col = (getattr(e, "offset", None) or 0) + 1  # as flake8 reports it
+        found.append((row, col, "E999", f"{type(e).__name__}: {getattr(e, 'msg', e)}"))
+    else:
+        checker = pyflakes.checker.Checker(tree, filename=file, builtins=options.builtins)
+        for message in checker.messages:
+            code = PYFLAKES_CODES.get(type(message).__name__)
+            if code:
+                found.append((
+                    message.lineno, message.col + 1, code,
+                    message.message % message.message_args,
+                ))
+        found.extend(_pycodestyle(file, lines, options))
+
+    issues = []
+    for row, col, code, text in sorted(found):
+        if not options.selects(code) or _noqa(lines, row, code):
+            continue
+        issues.append(LintIssue(
+            file=file, line=row, column=col, severity=severity(code),
+            rule_id=code, message=text,
+        ))
+    return issues
+
+
+def severity(code: str) -> str:
+    """Syntax errors and pyflakes findings (likely bugs) are errors; style is a warning."""
+    return "error" if code.startswith(("E9", "F")) else "warning"
+
+
+def _noqa(lines: list[str], row: int, code: str) -> bool:
+    if not 0 < row <= len(lines):
+        return False
+    match = _NOQA_RE.search(lines[row - 1])
+    if match is None:
+        return False
+    codes = match.group("codes")
+    return codes is None or any(code.startswith(c) for c in _CODE_RE.findall(codes.upper()))
+
+
+if pycodestyle is not None:
+
+    class _Collector(pycodestyle.BaseReport):
+        """pycodestyle report keeping (row, col, code, text) of every finding."""
+
+        def __init__(self, options):
+            super().__init__(options)
+            self.found: list[tuple[int, int, str, str]] = []
+
+        def error(self, line_number, offset, text, check):
+            code = super().error(line_number, offset, text, check)
+            if code:
+                self.found.append((line_number, offset + 1, code, text[5:]))
+            return code
+
+
+_styles: dict[EngineOptions, object] = {}
+
+
+def _pycodestyle(
+    file: str, lines: list[str], options: EngineOptions
+) -> list[tuple[int, int, str, str]]:
+    """Run every pycodestyle check; selection is applied by the caller."""
+    style = _styles.get(options)
+    if style is None:
+        style = pycodestyle.StyleGuide(
+            select=("E", "W"),
+            max_line_length=options.max_line_length,
+            max_doc_length=options.max_doc_length,
+            hang_closing=options.hang_closing,
+            reporter=_Collector,
+            quiet=True,
+        )
+        _styles[options] = style
+    report = _Collector(style.options)
+    pycodestyle.Checker(file, lines=lines, options=style.options, report=report).check_all()
+    return report.found
+
+
+_executor: Executor | None = None
+_executor_pid: int | None = None
+
+
+def _pool() -> Executor | None:
+    """The process's lint worker pool, started on first use (None: lint in a thread).
+
+    Every engine run holds a linter scheduler slot, so the pool has one
+    worker per slot: prefork children, which split the host's cores among
+    them (see core.linter_scheduler), never start more workers than their
+    share.
+    """
+    global _executor, _executor_pid
+    if _executor_pid != os.getpid():
+        # Also after fork: the parent's pool isn't usable here
+        from ..core.linter_scheduler import get_linter_scheduler
+
+        workers = get_linter_scheduler().slots
+        try:
+            context = multiprocessing.get_context("forkserver")
+        except ValueError:
+            context = None
+        _executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        _executor_pid = os.getpid()
+    return _executor
+
+
+async def run(sources: list[tuple[str, bytes]], options: EngineOptions) -> list[LintIssue]:
+    """Lint contents in the process pool.
+
+    Daemonic processes (Celery's prefork children) may not start a pool;
+    they lint in a thread instead, once logged.
+    """
+    global _executor, _executor_pid
+    loop = asyncio.get_running_loop()
+    executor = _pool()
+    if executor is not None:
+        try:
+            return await loop.run_in_executor(executor, lint_sources, sources, options)
+        except AssertionError as e:
+            logger.warning(f"Python lint pool unavailable, linting in threads: {e}")
+            _executor = None
+        except BrokenProcessPool:
+            # A worker died: start a fresh pool next time
+            _executor_pid = None
+            raise
+    return await loop.run_in_executor(None, lint_sources, sources, options)
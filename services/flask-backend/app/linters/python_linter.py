@@ -1,20 +1,35 @@
 from pathlib import Path
-import json
+import os
+import re
 import time
+from . import python_engine
 from .base import BaseLinter, LintResult, LintIssue
 
+# flake8's default output: path:row:col: code text
+_FLAKE8_LINE_RE = re.compile(
+    r"^(?P<path>.+?):(?P<row>\d+):(?P<col>\d+): (?P<code>[A-Z]+\d+) (?P<text>.*)$"
+)
+
 
 class PythonLinter(BaseLinter):
     name = "python"
     languages = ["python"]
+    version_command = ["flake8", "--version"]
+    config_files = [".flake8", "setup.cfg", "tox.ini"]
 
-    async def is_available(self) -> bool:
-        """Check if flake8 is installed."""
-        _, stdout, _ = await self._run_command(["flake8", "--version"], Path.cwd())
-        return "flake8" in stdout
+    async def probe(self) -> bool:
+        """Available through the in-process engine, else if flake8 is installed."""
+        if self._available is None and python_engine.available():
+            self._available = True
+            self._version = python_engine.engine_version()
+        return await super().probe()
 
     async def lint(self, path: Path, files: list[str] | None = None) -> LintResult:
-        """Run flake8 on Python files."""
+        """Run flake8 checks on Python files.
+
+        Uses the in-process engine (see python_engine) unless it's missing
+        or the repository's flake8 config needs flake8 itself.
+        """
         result = LintResult(linter=self.name, success=False)
         start = time.time()
 
@@ -23,35 +38,48 @@ class PythonLinter(BaseLinter):
                 result.error = "flake8 not installed"
                 return result
 
-            cmd = ["flake8", "--format=json"]
+            options = python_engine.load_options(path) if python_engine.available() else None
+            if options is not None:
+                sources = [
+                    (file, Path(file).read_bytes())
+                    for file in (files or _python_files(path, options))
+                ]
+                result.issues = await python_engine.run(sources, options)
+                result.execution_time_ms = int((time.time() - start) * 1000)
+                result.success = not result.issues
+                return result
+
+            cmd = ["flake8"]
             if files:
                 cmd.extend(files)
             else:
                 cmd.append(str(path))
 
-            exit_code, stdout, stderr = await self._run_command(cmd, path.parent)
+            # Run from the repository so flake8 picks up its config
+            exit_code, stdout, stderr = await self._run_command(cmd, path)
             result.execution_time_ms = int((time.time() - start) * 1000)
 
             if exit_code == -1:
                 result.error = stderr or "Command execution failed"
                 return result
 
-            if stdout.strip():
-                issues = json.loads(stdout)
-                for issue in issues:
-                    result.issues.append(
-                        LintIssue(
-                            file=issue.get("filename", ""),
-                            line=issue.get("line_number", 0),
-                            column=issue.get("column_number", 0),
-                            severity="error"
-                            if issue.get("type") == "E"
-                            else "warning",
-                            rule_id=issue.get("code", ""),
-                            message=issue.get("text", ""),
-                        )
+            for line in stdout.splitlines():
+                match = _FLAKE8_LINE_RE.match(line)
+                if match is None:
+                    continue
+                result.issues.append(
+                    LintIssue(
+                        file=match["path"],
+                        line=int(match["row"]),
+                        column=int(match["col"]),
+                        severity=python_engine.severity(match["code"]),
+                        rule_id=match["code"],
+                        message=match["text"],
                     )
+                )
 
+            if exit_code != 0 and not result.issues:
+                result.error = stderr.strip() or f"flake8 exited with {exit_code}"
             result.success = exit_code == 0
             return result
 
@@ -59,3 +87,16 @@ class PythonLinter(BaseLinter):
             result.error = str(e)
             result.execution_time_ms = int((time.time() - start) * 1000)
             return result
+
+
+def _python_files(path: Path, options: python_engine.EngineOptions) -> list[str]:
+    """Python files under path, skipping flake8's excluded names."""
+    found = []
+    for root, dirs, names in os.walk(path):
+        root_path = Path(root)
+        dirs[:] = sorted(d for d in dirs if not options.excludes(root_path / d))
+        found.extend(
+            str(root_path / name) for name in sorted(names)
+            if name.endswith(".py") and not options.excludes(root_path / name)
+        )
+    return found
@@ -1,20 +1,71 @@
+from collections.abc import Callable, Iterator
 from pathlib import Path
 import json
+import os
+import tempfile
 import time
+from typing import Any
 from .base import BaseLinter, LintResult, LintIssue
 
+# Report bytes read at a time while decoding findings
+REPORT_CHUNK_SIZE = 64 * 1024
+
+
+def iter_report(report_path: Path) -> Iterator[dict[str, Any]]:
+    """Yield the findings of a gitleaks JSON report one at a time.
+
+    The report is a JSON array; it is decoded incrementally so a repository
+    with many findings is never held in memory whole.
+    """
+    decoder = json.JSONDecoder()
+    with open(report_path, encoding="utf-8") as f:
+        buffer = ""
+        started = False
+        while True:
+            chunk = f.read(REPORT_CHUNK_SIZE)
+            buffer += chunk
+            while True:
+                buffer = buffer.lstrip()
+                if not started:
+                    if not buffer:
+                        break
+                    if buffer[0] != "[":
+                        raise ValueError("gitleaks report is not a JSON array")
+                    buffer = buffer[1:]
+                    started = True
+                    continue
+                if buffer.startswith(","):
+                    buffer = buffer[1:]
+                    continue
+                if buffer.startswith("]") or not buffer:
+                    break
+                try:
+                    finding, end = decoder.raw_decode(buffer)
+                except ValueError:
+                    if not chunk:
+                        raise
+                    break  # incomplete object: read more
+                buffer = buffer[end:]
+                yield finding
+            if not chunk:
+                return
+
 
 class SecurityLinter(BaseLinter):
     name = "security"
     languages = ["all"]
-
-    async def is_available(self) -> bool:
-        """Check if gitleaks is installed."""
-        _, stdout, _ = await self._run_command(["gitleaks", "version"], Path.cwd())
-        return "gitleaks" in stdout or "version" in stdout
+    version_command = ["gitleaks", "version"]
+    config_files = [".gitleaks.toml", ".gitleaksignore"]
+    # gitleaks scans the whole path, not a file list
+    cacheable = False
 
     async def lint(self, path: Path, files: list[str] | None = None) -> LintResult:
-        """Run gitleaks for secrets detection."""
+        """Run gitleaks for secrets detection.
+
+        Without files, the repository history is scanned. With files, the
+        working tree is scanned without git (only files present in a sparse
+        checkout are read) and findings outside files are dropped.
+        """
         result = LintResult(linter=self.name, success=False)
         start = time.time()
 
@@ -23,43 +74,144 @@ class SecurityLinter(BaseLinter):
                 result.error = "gitleaks not installed"
                 return result
 
-            cmd = [
-                "gitleaks",
-                "detect",
-                "--source",
-                str(path),
-                "--report-path=/tmp/gitleaks-report.json",
-                "--verbose",
-            ]
+            cmd = ["gitleaks", "detect", "--source", str(path)]
+            if files:
+                cmd.append("--no-git")
+            wanted = {str(Path(f).resolve()) for f in files or []}
+
+            def add(leak: dict[str, Any]) -> None:
+                file = leak.get("File", "")
+                if not wanted or str((path / file).resolve()) in wanted:
+                    result.issues.append(self._issue(leak, file))
+
+            await self._detect(cmd, path.parent, result, add)
+
+            result.execution_time_ms = int((time.time() - start) * 1000)
+            if result.error is None:
+                result.success = not result.issues
+            return result
 
-            exit_code, stdout, stderr = await self._run_command(cmd, path.parent)
+        except Exception as e:
+            result.error = str(e)
             result.execution_time_ms = int((time.time() - start) * 1000)
+            return result
 
-            if exit_code == -1:
-                result.error = stderr or "Command execution failed"
+    async def scan_added_lines(
+        self, added: dict[str, list[tuple[int, str]]], config_path: Path | None = None
+    ) -> LintResult:
+        """Scan only the lines a change adds, like ``gitleaks protect --staged``.
+
+        The added lines of all files are piped through gitleaks in one run
+        and findings are mapped back to their file and line, so the scan
+        takes time proportional to the change, not to the repository.
+
+        Args:
+            added: (line number, text) of each added line, by file path
+            config_path: gitleaks config to apply (optional)
+
+        Returns:
+            LintResult with issues on added lines
+        """
+        result = LintResult(linter=self.name, success=False)
+        start = time.time()
+
+        try:
+            if not await self.is_available():
+                result.error = "gitleaks not installed"
                 return result
 
-            try:
-                with open("/tmp/gitleaks-report.json") as f:
-                    data = json.load(f)
-                    for leak in data.get("Leaks", []):
-                        result.issues.append(
-                            LintIssue(
-                                file=leak.get("File", ""),
-                                line=leak.get("StartLine", 0),
-                                column=leak.get("StartColumn", 0),
-                                severity="error",
-                                rule_id=leak.get("RuleID", ""),
-                                message=leak.get("Match", ""),
-                            )
-                        )
-            except FileNotFoundError:
-                pass
-
-            result.success = exit_code == 0
+            text, origins = _piped_text(added)
+            if not any(origins):
+                result.success = True
+                return result
+
+            cmd = ["gitleaks", "detect", "--pipe"]
+            if config_path is not None and config_path.is_file():
+                cmd.extend(["--config", str(config_path)])
+
+            def add(leak: dict[str, Any]) -> None:
+                index = leak.get("StartLine", 0) - 1
+                origin = origins[index] if 0 <= index < len(origins) else None
+                if origin is not None:
+                    result.issues.append(self._issue(leak, origin[0], line=origin[1]))
+
+            await self._detect(cmd, Path(tempfile.gettempdir()), result, add, stdin=text)
+
+            result.execution_time_ms = int((time.time() - start) * 1000)
+            if result.error is None:
+                result.success = not result.issues
             return result
 
         except Exception as e:
             result.error = str(e)
             result.execution_time_ms = int((time.time() - start) * 1000)
             return result
+
+    async def _detect(
+        self,
+        cmd: list[str],
+        work_dir: Path,
+        result: LintResult,
+        on_leak: Callable[[dict[str, Any]], None],
+        stdin: str | None = None,
+    ) -> None:
+        """Run a gitleaks command with a private report file and read its findings.
+
+        Each run gets its own report in work_dir (the sandbox), so
+        concurrent scans on a host never read each other's reports. Findings
+        are streamed from the report to on_leak; failures set result.error.
+        """
+        fd, report = tempfile.mkstemp(prefix="gitleaks-", suffix=".json", dir=work_dir)
+        os.close(fd)
+        try:
+            cmd = [
+                *cmd, "--report-format", "json", "--report-path", report,
+                "--redact", "--no-banner",
+            ]
+            exit_code, _, stderr = await self._run_command(
+                cmd, work_dir, stdin=stdin.encode() if stdin is not None else None
+            )
+            if exit_code == -1:
+                result.error = stderr or "Command execution failed"
+                return
+            if os.path.getsize(report) == 0:
+                # No report written: gitleaks failed before scanning
+                if exit_code != 0:
+                    result.error = stderr.strip() or f"gitleaks exited with {exit_code}"
+                return
+            for leak in iter_report(Path(report)):
+                on_leak(leak)
+        finally:
+            os.unlink(report)
+
+    def _issue(self, leak: dict[str, Any], file: str, line: int | None = None) -> LintIssue:
+        return LintIssue(
+            file=file,
+            line=leak.get("StartLine", 0) if line is None else line,
+            column=leak.get("StartColumn", 0),
+            severity="error",
+            rule_id=leak.get("RuleID", ""),
+            message=leak.get("Description") or leak.get("Match", ""),
+        )
+
+
+def _piped_text(
+    added: dict[str, list[tuple[int, str]]],
+) -> tuple[str, list[tuple[str, int] | None]]:
+    """Added lines as one text, with each text line's (file, line) origin.
+
+    Files are separated by a blank line (origin None) so a match can't join
+    the end of one file to the start of the next.
+    """
+    lines: list[str] = []
+    origins: list[tuple[str, int] | None] = []
+    for file, rows in added.items():
+        if not rows:
+            continue
+        if lines:
+            lines.append("")
+            origins.append(None)
+        for line_no, text in rows:
+            lines.append(text)
+            origins.append((file, line_no))
+    return "\n".join(lines) + "\n", origins
@@ -7,11 +7,10 @@ from .base import BaseLinter, LintResult, LintIssue
 class TerraformLinter(BaseLinter):
     name = "terraform"
     languages = ["terraform", "hcl"]
-
-    async def is_available(self) -> bool:
-        """Check if tflint is installed."""
-        _, stdout, _ = await self._run_command(["tflint", "--version"], Path.cwd())
-        return "tflint" in stdout
+    version_command = ["tflint", "--version"]
+    config_files = [".tflint.hcl"]
+    # Rules evaluate the whole module
+    cacheable = False
 
     async def lint(self, path: Path, files: list[str] | None = None) -> LintResult:
         """Run tflint on Terraform files."""
@@ -0,0 +1,125 @@
+"""Prometheus metrics exposed on /metrics."""
+
+import logging
+from typing import Any, Iterator
+
+import redis
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import GaugeMetricFamily
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_EVENTS_RECEIVED = Counter(
+    "darwin_webhook_events_received_total",
+    "Webhook deliveries received by the ingestion endpoint",
+    ["platform", "result"],  # accepted, duplicate, rejected, ignored
+)
+
+WEBHOOK_INGEST_SECONDS = Histogram(
+    "darwin_webhook_ingest_seconds",
+    "Time from request start to acknowledgement of a webhook delivery",
+    ["platform"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+
+WEBHOOK_STREAM_BACKLOG = Gauge(
+    "darwin_webhook_stream_backlog",
+    "Webhook events waiting in the ingestion stream",
+)
+
+WEBHOOK_DEAD_LETTERS = Gauge(
+    "darwin_webhook_dead_letters",
+    "Webhook events that failed WEBHOOK_MAX_DELIVERIES times",
+)
+
+CONFIG_CACHE_REQUESTS = Counter(
+    "darwin_config_cache_requests_total",
+    "Config cache lookups by outcome",
+    ["cache", "result"],  # hit, redis_hit, miss
+)
+
+
+class RedisMemoryCollector:
+    """Prometheus collector for Redis memory, read at scrape time.
+
+    Reports the server's total usage, the size of each Celery queue and an
+    estimate of the memory held by stored task results, which is sampled
+    (bounded SCAN plus MEMORY USAGE on a few keys) to keep scrapes cheap.
+    """
+
+    RESULT_PATTERN = "celery-task-meta-*"
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        queues: tuple[str, ...],
+        scan_limit: int = 10000,
+        sample_size: int = 50,
+    ):
+        self.client = client
+        self.queues = queues
+        self.scan_limit = scan_limit
+        self.sample_size = sample_size
+
+    def collect(self) -> Iterator[Any]:
+        try:
+            info = self.client.info("memory")
+            pipe = self.client.pipeline()
+            for queue in self.queues:
+                pipe.memory_usage(queue)
+            queue_bytes = pipe.execute()
+
+            result_keys = 0
+            sample: list[bytes] = []
+            for key in self.client.scan_iter(match=self.RESULT_PATTERN, count=1000):
+                result_keys += 1
+                if len(sample) < self.sample_size:
+                    sample.append(key)
+                if result_keys >= self.scan_limit:
+                    break
+            pipe = self.client.pipeline()
+            for key in sample:
+                pipe.memory_usage(key)
+            sample_bytes = [size or 0 for size in pipe.execute()]
+        except redis.RedisError as e:
+            logger.debug(f"Redis memory metrics unavailable: {e}")
+            return
+
+        used = GaugeMetricFamily("darwin_redis_used_memory_bytes", "Memory used by Redis")
+        used.add_metric([], info.get("used_memory", 0))
+        yield used
+
+        queues = GaugeMetricFamily(
+            "darwin_celery_queue_memory_bytes",
+            "Memory used by each Celery queue in Redis",
+            labels=["queue"],
+        )
+        for queue, size in zip(self.queues, queue_bytes):
+            queues.add_metric([queue], size or 0)
+        yield queues
+
+        keys = GaugeMetricFamily(
+            "darwin_celery_result_keys",
+            "Stored Celery task results (capped at the scan limit)",
+        )
+        keys.add_metric([], result_keys)
+        yield keys
+
+        results = GaugeMetricFamily(
+            "darwin_celery_result_memory_bytes",
+            "Estimated memory used by stored Celery task results",
+        )
+        average = sum(sample_bytes) / len(sample_bytes) if sample_bytes else 0
+        results.add_metric([], average * result_keys)
+        yield results
+
+
+_redis_memory_collector: RedisMemoryCollector | None = None
+
+
+def register_redis_memory_metrics(client: redis.Redis, queues: tuple[str, ...]) -> None:
+    """Export Redis memory metrics on /metrics (once per process)."""
+    global _redis_memory_collector
+    if _redis_memory_collector is None:
+        _redis_memory_collector = RedisMemoryCollector(client, queues)
+        REGISTRY.register(_redis_memory_collector)
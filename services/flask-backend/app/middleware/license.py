@@ -8,7 +8,7 @@ import logging
 from functools import wraps
 from typing import Callable, Optional, Any, Dict
 
-from flask import current_app, g, jsonify
+from flask import current_app, g, has_app_context, jsonify
 
 from penguin_licensing.python_client import (
     PenguinTechLicenseClient,
@@ -16,6 +16,8 @@ from penguin_licensing.python_client import (
     LicenseValidationError,
 )
 
+from ..config import Config
+
 
 logger = logging.getLogger(__name__)
 
@@ -74,6 +76,17 @@ class ReviewLimitExceededError(Exception):
         )
 
 
+def _setting(name: str, default: Any = None) -> Any:
+    """Read a license setting from the Flask app, or from Config outside one.
+
+    Celery workers (e.g. the webhook consumer checking issue autopilot) run
+    without an app context; Config is what the app is configured from.
+    """
+    if has_app_context():
+        return current_app.config.get(name, default)
+    return getattr(Config, name, default)
+
+
 def get_license_client() -> Optional[PenguinTechLicenseClient]:
     """
     Get the global license client instance.
@@ -90,9 +103,9 @@ def get_license_client() -> Optional[PenguinTechLicenseClient]:
 
     # Initialize from Flask config
     try:
-        license_key = current_app.config.get("LICENSE_KEY", "")
-        product_name = current_app.config.get("PRODUCT_NAME", "ai-pr-reviewer")
-        server_url = current_app.config.get(
+        license_key = _setting("LICENSE_KEY", "")
+        product_name = _setting("PRODUCT_NAME", "ai-pr-reviewer")
+        server_url = _setting(
             "LICENSE_SERVER_URL",
             "https://license.penguintech.io"
         )
@@ -114,14 +127,14 @@ def get_license_client() -> Optional[PenguinTechLicenseClient]:
             logger.info(f"License initialized for product: {product_name}")
         except LicenseValidationError as e:
             logger.error(f"License validation failed: {e}")
-            if current_app.config.get("RELEASE_MODE", False):
+            if _setting("RELEASE_MODE", False):
                 raise
 
         return _license_client
 
     except Exception as e:
         logger.error(f"Failed to initialize license client: {e}")
-        if current_app.config.get("RELEASE_MODE", False):
+        if _setting("RELEASE_MODE", False):
             raise
         return None
 
@@ -140,7 +153,7 @@ def check_feature_available(feature: str) -> bool:
         True if feature is available, False otherwise
     """
     # In development mode, all features are available
-    if not current_app.config.get("RELEASE_MODE", False):
+    if not _setting("RELEASE_MODE", False):
         return True
 
     # In production mode, check with license server
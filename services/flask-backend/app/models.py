@@ -7,12 +7,30 @@ from flask import Flask, g
 from pydal import DAL, Field
 from pydal.validators import IS_EMAIL, IS_IN_SET, IS_NOT_EMPTY, IS_JSON
 
+from .cache import ConfigCache
 from .config import Config
+from .redis_client import get_redis
 
 # Valid roles for the application
 VALID_ROLES = ["admin", "maintainer", "viewer"]
 
 
+def _config_cache(name: str) -> ConfigCache:
+    return ConfigCache(
+        name,
+        maxsize=Config.CONFIG_CACHE_MAX_ENTRIES,
+        ttl_seconds=Config.CONFIG_CACHE_TTL_SECONDS,
+        redis_client=get_redis(),
+    )
+
+
+# Read-mostly lookups made for every webhook delivery; writes below invalidate
+repo_config_cache = _config_cache("repo_configs")
+platform_identity_cache = _config_cache("platform_identities")
+installation_config_cache = _config_cache("installation_config")
+tenant_settings_cache = _config_cache("tenant_settings")
+
+
 def init_db(app: Flask) -> DAL:
     """Initialize database connection for runtime operations.
 
@@ -181,6 +199,7 @@ def init_db(app: Flask) -> DAL:
         Field("error_message", "text"),
         Field("files_reviewed", "integer", default=0),
         Field("comments_posted", "integer", default=0),
+        Field("duplicates_suppressed", "integer", default=0),
         Field("started_at", "datetime"),
         Field("completed_at", "datetime"),
         Field("created_at", "datetime", default=datetime.utcnow),
@@ -205,14 +224,44 @@ def init_db(app: Flask) -> DAL:
         Field("suggestion", "text"),
         Field("source", "string", length=64),
         Field("linter_rule_id", "string", length=128),
+        Field("fingerprint", "string", length=64),
         Field("platform_comment_id", "string", length=128),
         Field("status", "string", default="open", requires=IS_IN_SET(
-            ["open", "acknowledged", "fixed", "wont_fix", "false_positive"]
+            # failed: rejected by the platform, see task_errors
+            ["open", "acknowledged", "fixed", "wont_fix", "false_positive", "failed"]
         )),
         Field("posted_at", "datetime"),
         Field("created_at", "datetime", default=datetime.utcnow),
     )
 
+    # Define review_checkpoints table - Completed (file, category) units of a review
+    db.define_table(
+        "review_checkpoints",
+        Field("review_id", "reference reviews", requires=IS_NOT_EMPTY()),
+        Field("file_path", "string", length=512),
+        Field("category", "string", length=64),
+        Field("patch_sha", "string", length=64),
+        Field("comments_count", "integer", default=0),
+        Field("created_at", "datetime", default=datetime.utcnow),
+    )
+
+    # Define review_shards table - File-batch shards of a sharded review
+    db.define_table(
+        "review_shards",
+        Field("review_id", "reference reviews", requires=IS_NOT_EMPTY()),
+        Field("shard_index", "integer"),
+        Field("status", "string", default="queued", requires=IS_IN_SET(
+            ["queued", "in_progress", "completed", "failed"]
+        )),
+        Field("file_count", "integer", default=0),
+        Field("estimated_tokens", "integer", default=0),
+        Field("files_reviewed", "integer", default=0),
+        Field("comments_posted", "integer", default=0),
+        Field("error_message", "text"),
+        Field("started_at", "datetime"),
+        Field("completed_at", "datetime"),
+    )
+
     # Define review_detections table - Detected languages/frameworks per review
     db.define_table(
         "review_detections",
@@ -240,6 +289,13 @@ def init_db(app: Flask) -> DAL:
         Field("ignored_paths", "json"),
         Field("custom_rules", "json"),
         Field("webhook_secret", "string", length=255),
+        Field("credential_id", "integer"),
+        Field("polling_enabled", "boolean", default=False),
+        Field("polling_interval_minutes", "integer", default=5),
+        Field("last_poll_at", "datetime"),
+        Field("next_poll_at", "datetime"),
+        Field("poll_idle_count", "integer", default=0),
+        Field("last_webhook_at", "datetime"),
         Field("auto_plan_on_issue", "boolean", default=False),
         Field("issue_plan_provider", "string", length=64),
         Field("issue_plan_model", "string", length=128),
@@ -390,6 +446,22 @@ def init_db(app: Flask) -> DAL:
         Field("updated_at", "datetime", default=datetime.utcnow, update=datetime.utcnow),
     )
 
+    # Define task_errors table - Compact, deduplicated background task failures
+    db.define_table(
+        "task_errors",
+        Field("task_name", "string", length=255),
+        Field("entity_type", "string", length=32),
+        Field("entity_id", "integer"),
+        Field("fingerprint", "string", length=32),
+        Field("error_type", "string", length=128),
+        Field("message", "string", length=512),
+        Field("location", "string", length=255),
+        Field("traceback", "text"),
+        Field("occurrences", "integer", default=1),
+        Field("first_seen_at", "datetime", default=datetime.utcnow),
+        Field("last_seen_at", "datetime", default=datetime.utcnow),
+    )
+
     # Commit table definitions
     db.commit()
 
@@ -408,6 +480,21 @@ def get_db() -> DAL:
     return g.db
 
 
+def get_tenant_settings(tenant_id: int) -> dict:
+    """Get a tenant's settings (cached, invalidated on write)."""
+    def load() -> dict:
+        db = get_db()
+        tenant = db(db.tenants.id == tenant_id).select(db.tenants.settings).first()
+        return (tenant.settings or {}) if tenant else {}
+
+    return tenant_settings_cache.get_or_load(str(tenant_id), load)
+
+
+def invalidate_tenant_settings(tenant_id: int) -> None:
+    """Drop a tenant's cached settings in every process."""
+    tenant_settings_cache.invalidate(str(tenant_id))
+
+
 def get_user_by_email(email: str) -> Optional[dict]:
     """Get user by email address."""
     db = get_db()
@@ -454,6 +541,8 @@ def update_user(user_id: int, **kwargs) -> Optional[dict]:
 
     db(db.users.id == user_id).update(**update_data)
     db.commit()
+    # Resolved identities embed the user record
+    platform_identity_cache.invalidate()
     return get_user_by_id(user_id)
 
 
@@ -462,6 +551,7 @@ def delete_user(user_id: int) -> bool:
     db = get_db()
     deleted = db(db.users.id == user_id).delete()
     db.commit()
+    platform_identity_cache.invalidate()
     return deleted > 0
 
 
@@ -592,7 +682,64 @@ def update_review_status(review_id: int, status: str,
 
     db(db.reviews.id == review_id).update(**update_data)
     db.commit()
-    return get_review_by_id(review_id)
+    review = get_review_by_id(review_id)
+    if review:
+        _publish_review_event(review_id, "status", {
+            "status": review["status"],
+            "files_reviewed": review["files_reviewed"],
+            "comments_posted": review["comments_posted"],
+        })
+    return review
+
+
+def _publish_review_event(review_id: int, event: str, data: dict) -> None:
+    """Publish a progress event for SSE clients (best effort)."""
+    from .core.review_events import get_review_events
+
+    get_review_events().publish(review_id, event, data)
+
+
+def supersede_queued_reviews(platform: str, repository: str, pull_request_id: int,
+                             keep_review_id: int) -> int:
+    """Cancel queued reviews of a pull request other than the newest one.
+
+    A terminal status event is published for each, so clients following
+    their progress stop waiting.
+
+    Returns:
+        Number of reviews cancelled
+    """
+    db = get_db()
+    query = (
+        (db.reviews.platform == platform) &
+        (db.reviews.repository == repository) &
+        (db.reviews.pull_request_id == pull_request_id) &
+        (db.reviews.status == "queued") &
+        (db.reviews.id != keep_review_id)
+    )
+    review_ids = [row.id for row in db(query).select(db.reviews.id)]
+    if not review_ids:
+        return 0
+
+    error_message = f"Superseded by review {keep_review_id}"
+    cancelled = db(query & db.reviews.id.belongs(review_ids)).update(
+        status="cancelled",
+        error_message=error_message,
+        completed_at=datetime.utcnow(),
+    )
+    db.commit()
+
+    # Reviews that started between the select and the update are not ours
+    rows = db(
+        db.reviews.id.belongs(review_ids) & (db.reviews.error_message == error_message)
+    ).select(db.reviews.id, db.reviews.files_reviewed, db.reviews.comments_posted)
+    for row in rows:
+        _publish_review_event(row.id, "status", {
+            "status": "cancelled",
+            "files_reviewed": row.files_reviewed,
+            "comments_posted": row.comments_posted,
+        })
+    return cancelled
 
 
 def list_reviews(platform: Optional[str] = None,
@@ -634,7 +781,8 @@ def create_comment(review_id: int, file_path: str, line_start: int,
                   line_end: int, category: str, severity: str,
                   title: str, body: str, source: str,
                   suggestion: Optional[str] = None,
-                  linter_rule_id: Optional[str] = None) -> dict:
+                  linter_rule_id: Optional[str] = None,
+                  fingerprint: Optional[str] = None) -> dict:
     """Create a new review comment."""
     db = get_db()
     comment_id = db.review_comments.insert(
@@ -649,12 +797,148 @@ def create_comment(review_id: int, file_path: str, line_start: int,
         source=source,
         suggestion=suggestion,
         linter_rule_id=linter_rule_id,
+        fingerprint=fingerprint,
     )
     db.commit()
     comment = db(db.review_comments.id == comment_id).select().first()
     return comment.as_dict() if comment else None
 
 
+def store_review_unit(review_id: int, file_path: str, category: str,
+                      comments: list[dict], patch_sha: Optional[str] = None,
+                      completed: bool = True) -> int:
+    """Store the comments of one reviewed (file, category) unit and checkpoint it.
+
+    Comments and checkpoint are committed together, so a retried review
+    either sees the whole unit or none of it. Comments whose fingerprint the
+    review already has are skipped, which keeps re-running a unit idempotent.
+
+    Args:
+        review_id: Review ID
+        file_path: Reviewed file
+        category: Review category
+        comments: Comment fields as accepted by create_comment
+        patch_sha: Hash of the diff the unit was reviewed against
+        completed: Checkpoint the unit (False stores the comments only)
+
+    Returns:
+        Number of comments inserted
+    """
+    db = get_db()
+    table = db.review_checkpoints
+    if db((table.review_id == review_id) & (table.file_path == file_path) &
+          (table.category == category)).count():
+        return 0
+
+    fingerprints = [c["fingerprint"] for c in comments if c.get("fingerprint")]
+    existing = set()
+    if fingerprints:
+        rows = db(
+            (db.review_comments.review_id == review_id) &
+            db.review_comments.fingerprint.belongs(fingerprints)
+        ).select(db.review_comments.fingerprint)
+        existing = {row.fingerprint for row in rows}
+
+    inserted = 0
+    for comment in comments:
+        fingerprint = comment.get("fingerprint")
+        if fingerprint and fingerprint in existing:
+            continue
+        db.review_comments.insert(review_id=review_id, **comment)
+        if fingerprint:
+            existing.add(fingerprint)
+        inserted += 1
+
+    if completed:
+        table.insert(
+            review_id=review_id,
+            file_path=file_path,
+            category=category,
+            patch_sha=patch_sha,
+            comments_count=inserted,
+        )
+    db.commit()
+    return inserted
+
+
+def get_review_checkpoints(review_id: int) -> dict[tuple[str, str], Optional[str]]:
+    """Get the completed units of a review.
+
+    Returns:
+        Dict of (file_path, category) to the patch hash it was reviewed against
+    """
+    db = get_db()
+    rows = db(db.review_checkpoints.review_id == review_id).select(
+        db.review_checkpoints.file_path,
+        db.review_checkpoints.category,
+        db.review_checkpoints.patch_sha,
+    )
+    return {(row.file_path, row.category): row.patch_sha for row in rows}
+
+
+def count_review_comments(review_id: int, file_paths: Optional[list[str]] = None) -> int:
+    """Count the comments stored for a review, optionally for some files only."""
+    db = get_db()
+    query = db.review_comments.review_id == review_id
+    if file_paths is not None:
+        query &= db.review_comments.file_path.belongs(file_paths)
+    return db(query).count()
+
+
+def create_review_shards(review_id: int, shards: list[dict]) -> None:
+    """Record the shard plan of a review, resetting shards planned before.
+
+    Args:
+        review_id: Review ID
+        shards: Dicts with shard_index, file_count and estimated_tokens
+    """
+    db = get_db()
+    db(db.review_shards.review_id == review_id).delete()
+    for shard in shards:
+        db.review_shards.insert(review_id=review_id, status="queued", **shard)
+    db.commit()
+
+
+def update_review_shard(review_id: int, shard_index: int, status: str,
+                        files_reviewed: Optional[int] = None,
+                        comments_posted: Optional[int] = None,
+                        error_message: Optional[str] = None) -> None:
+    """Update the status and counts of one shard."""
+    db = get_db()
+    update_data = {"status": status}
+
+    if files_reviewed is not None:
+        update_data["files_reviewed"] = files_reviewed
+    if comments_posted is not None:
+        update_data["comments_posted"] = comments_posted
+    if error_message is not None:
+        update_data["error_message"] = error_message
+
+    if status == "in_progress":
+        update_data["started_at"] = datetime.utcnow()
+    elif status in ["completed", "failed"]:
+        update_data["completed_at"] = datetime.utcnow()
+
+    db((db.review_shards.review_id == review_id) &
+       (db.review_shards.shard_index == shard_index)).update(**update_data)
+    db.commit()
+    _publish_review_event(review_id, "shard", {
+        "index": shard_index,
+        "status": status,
+        "files_reviewed": files_reviewed,
+        "comments_posted": comments_posted,
+    })
+
+
+def get_review_shards(review_id: int) -> list[dict]:
+    """Get the shards of a review in shard order (empty if not sharded)."""
+    db = get_db()
+    shards = db(db.review_shards.review_id == review_id).select(
+        orderby=db.review_shards.shard_index
+    )
+    return [s.as_dict() for s in shards]
+
+
 def get_comments_by_review(review_id: int,
                           category: Optional[str] = None,
                           severity: Optional[str] = None) -> list[dict]:
@@ -687,6 +971,60 @@ def update_comment_status(comment_id: int, status: str,
     return comment.as_dict() if comment else None
 
 
+def get_pending_comments(review_id: int) -> list[dict]:
+    """Get comments of a review not yet posted to (or rejected by) the platform."""
+    db = get_db()
+    query = (
+        (db.review_comments.review_id == review_id)
+        & (db.review_comments.platform_comment_id == None)  # noqa: E711
+        & (db.review_comments.posted_at == None)  # noqa: E711
+        & ((db.review_comments.status == None)  # noqa: E711
+           | (db.review_comments.status != "failed"))
+    )
+    comments = db(query).select(orderby=db.review_comments.id)
+    return [c.as_dict() for c in comments]
+
+
+def get_posted_fingerprints(platform: str, repository: str, pull_request_id: int,
+                            fingerprints: list[str]) -> dict[str, str]:
+    """Find fingerprints already posted on a pull request by earlier reviews.
+
+    Returns:
+        Dict of fingerprint to platform comment ID
+    """
+    if not fingerprints:
+        return {}
+
+    db = get_db()
+    query = (
+        db.review_comments.fingerprint.belongs(fingerprints)
+        & (db.review_comments.platform_comment_id != None)  # noqa: E711
+        & (db.review_comments.review_id == db.reviews.id)
+        & (db.reviews.platform == platform)
+        & (db.reviews.repository == repository)
+        & (db.reviews.pull_request_id == pull_request_id)
+    )
+    rows = db(query).select(
+        db.review_comments.fingerprint, db.review_comments.platform_comment_id
+    )
+    return {row.fingerprint: row.platform_comment_id for row in rows}
+
+
+def record_suppressed_duplicates(review_id: int, count: int) -> None:
+    """Add to the number of duplicate findings suppressed for a review."""
+    if count <= 0:
+        return
+
+    db = get_db()
+    review = db(db.reviews.id == review_id).select(db.reviews.duplicates_suppressed).first()
+    if not review:
+        return
+    db(db.reviews.id == review_id).update(
+        duplicates_suppressed=(review.duplicates_suppressed or 0) + count
+    )
+    db.commit()
+
+
 # ===========================
 # Review Detections Helper Functions
 # ===========================
@@ -727,13 +1065,21 @@ def get_detections_by_review(review_id: int,
 
 
 def get_repo_config(platform: str, repository: str) -> Optional[dict]:
-    """Get repository configuration."""
-    db = get_db()
-    config = db(
-        (db.repo_configs.platform == platform) &
-        (db.repo_configs.repository == repository)
-    ).select().first()
-    return config.as_dict() if config else None
+    """Get repository configuration (cached, invalidated on write)."""
+    def load() -> Optional[dict]:
+        db = get_db()
+        config = db(
+            (db.repo_configs.platform == platform) &
+            (db.repo_configs.repository == repository)
+        ).select().first()
+        return config.as_dict() if config else None
+
+    return repo_config_cache.get_or_load(f"{platform}:{repository}", load)
+
+
+def invalidate_repo_config(platform: str, repository: str) -> None:
+    """Drop a cached repository configuration in every process."""
+    repo_config_cache.invalidate(f"{platform}:{repository}")
 
 
 def create_or_update_repo_config(platform: str, repository: str, **kwargs) -> dict:
@@ -762,6 +1108,7 @@ def create_or_update_repo_config(platform: str, repository: str, **kwargs) -> di
         )
         db.commit()
 
+    invalidate_repo_config(platform, repository)
     return get_repo_config(platform, repository)
 
 
@@ -780,6 +1127,44 @@ def list_repo_configs(platform: Optional[str] = None,
     return [c.as_dict() for c in configs]
 
 
+def list_polling_repo_configs() -> list[dict]:
+    """List enabled repositories with polling turned on."""
+    db = get_db()
+    query = (db.repo_configs.enabled == True) & (db.repo_configs.polling_enabled == True)  # noqa: E712
+    configs = db(query).select(orderby=db.repo_configs.next_poll_at)
+    return [c.as_dict() for c in configs]
+
+
+def update_repo_poll_state(repo_id: int, **kwargs) -> None:
+    """Update adaptive polling bookkeeping for a repository."""
+    db = get_db()
+
+    allowed_fields = {"last_poll_at", "next_poll_at", "poll_idle_count"}
+    update_data = {k: v for k, v in kwargs.items() if k in allowed_fields}
+    if not update_data:
+        return
+
+    db(db.repo_configs.id == repo_id).update(**update_data)
+    db.commit()
+
+
+def record_webhook_delivery(repo_id: int) -> None:
+    """Mark that a verified webhook delivery arrived for a repository."""
+    db = get_db()
+    db(db.repo_configs.id == repo_id).update(last_webhook_at=datetime.utcnow())
+    db.commit()
+
+
+def count_recent_reviews(platform: str, repository: str, since: datetime) -> int:
+    """Count reviews created for a repository since a point in time."""
+    db = get_db()
+    return db(
+        (db.reviews.platform == platform) &
+        (db.reviews.repository == repository) &
+        (db.reviews.created_at >= since)
+    ).count()
+
+
 # ===========================
 # Provider Usage Helper Functions
 # ===========================
@@ -1012,10 +1397,14 @@ def update_violation_status(violation_id: int, status: str) -> Optional[dict]:
 
 
 def get_config_value(key: str, default: Optional[str] = None) -> Optional[str]:
-    """Get installation config value."""
-    db = get_db()
-    config = db(db.installation_config.config_key == key).select().first()
-    return config.config_value if config else default
+    """Get installation config value (cached, invalidated on write)."""
+    def load() -> Optional[str]:
+        db = get_db()
+        config = db(db.installation_config.config_key == key).select().first()
+        return config.config_value if config else None
+
+    value = installation_config_cache.get_or_load(key, load)
+    return value if value is not None else default
 
 
 def set_config_value(key: str, value: str) -> None:
@@ -1030,6 +1419,7 @@ def set_config_value(key: str, value: str) -> None:
         db.installation_config.insert(config_key=key, config_value=value)
 
     db.commit()
+    installation_config_cache.invalidate(key)
 
 
 def get_repo_count() -> int:
@@ -1064,18 +1454,27 @@ def check_repo_limit(has_professional_license: bool) -> tuple[bool, int, int]:
 def resolve_platform_user(platform: str, username: str) -> Optional[dict]:
     """Look up Darwin user by platform identity.
 
-    Returns the Darwin user dict if a mapping exists, otherwise None.
+    Returns the Darwin user dict (without password_hash) if a mapping
+    exists, otherwise None. Results, including misses, are cached until the
+    mapping or the user changes.
     """
-    db = get_db()
-    identity = db(
-        (db.platform_identities.platform == platform) &
-        (db.platform_identities.platform_username == username)
-    ).select().first()
+    def load() -> Optional[dict]:
+        db = get_db()
+        identity = db(
+            (db.platform_identities.platform == platform) &
+            (db.platform_identities.platform_username == username)
+        ).select().first()
+
+        if not identity:
+            return None
 
-    if not identity:
-        return None
+        user = get_user_by_id(identity.user_id)
+        if user:
+            # Cached copies are shared through Redis
+            user.pop("password_hash", None)
+        return user
 
-    return get_user_by_id(identity.user_id)
+    return platform_identity_cache.get_or_load(f"{platform}:{username}", load)
 
 
 def create_platform_identity(user_id: int, platform: str, username: str,
@@ -1092,6 +1491,7 @@ def create_platform_identity(user_id: int, platform: str, username: str,
         is_verified=False,
     )
     db.commit()
+    platform_identity_cache.invalidate(f"{platform}:{username}")
     identity = db(db.platform_identities.id == identity_id).select().first()
     return identity.as_dict() if identity else None
 
@@ -1115,8 +1515,11 @@ def get_platform_identity_by_id(identity_id: int) -> Optional[dict]:
 def delete_platform_identity(identity_id: int) -> bool:
     """Remove a platform identity mapping."""
     db = get_db()
+    identity = db(db.platform_identities.id == identity_id).select().first()
     deleted = db(db.platform_identities.id == identity_id).delete()
     db.commit()
+    if identity:
+        platform_identity_cache.invalidate(f"{identity.platform}:{identity.platform_username}")
     return deleted > 0
 
 
@@ -1256,7 +1659,7 @@ def calculate_monthly_cost(repository: str) -> float:
         (db.issue_plans.repository == repository) &
         (db.issue_plans.created_at >= month_start) &
         (db.issue_plans.token_usage != None)
-    ).select()
+    ).select(db.issue_plans.token_usage)
 
     total_cost = 0.0
     for plan in plans:
@@ -1264,3 +1667,76 @@ def calculate_monthly_cost(repository: str) -> float:
             total_cost += plan.token_usage.get("cost_estimate", 0.0)
 
     return total_cost
+
+
+def list_open_issue_plan_external_ids(repository: str) -> set[str]:
+    """External IDs of queued or in-progress issue plans for a repository."""
+    db = get_db()
+    rows = db(
+        (db.issue_plans.repository == repository) &
+        (db.issue_plans.status.belongs(["queued", "in_progress"]))
+    ).select(db.issue_plans.external_id)
+    return {row.external_id for row in rows}
+
+
+# ===========================
+# Task Error Helper Functions
+# ===========================
+
+
+def record_task_error(task_name: str, entity_type: str, entity_id: int,
+                      fingerprint: str, error_type: str, message: str,
+                      location: str, traceback: str) -> dict:
+    """Record a task failure, folding repeats of the same error into one row.
+
+    Args:
+        task_name: Celery task name
+        entity_type: What the task worked on (review, review_shard, issue_plan)
+        entity_id: ID of that record
+        fingerprint: Identity of the error (see tasks.errors.compact_error)
+        error_type: Exception class name
+        message: Truncated exception message
+        location: Innermost frame of the failure
+        traceback: Truncated traceback
+
+    Returns:
+        The error record with its occurrence count
+    """
+    db = get_db()
+    query = (
+        (db.task_errors.entity_type == entity_type) &
+        (db.task_errors.entity_id == entity_id) &
+        (db.task_errors.fingerprint == fingerprint)
+    )
+    existing = db(query).select(db.task_errors.id, db.task_errors.occurrences).first()
+    if existing:
+        db(db.task_errors.id == existing.id).update(
+            occurrences=(existing.occurrences or 0) + 1,
+            last_seen_at=datetime.utcnow(),
+            task_name=task_name,
+        )
+        error_id = existing.id
+    else:
+        error_id = db.task_errors.insert(
+            task_name=task_name,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            fingerprint=fingerprint,
+            error_type=error_type,
+            message=message,
+            location=location,
+            traceback=traceback,
+        )
+    db.commit()
+    error = db(db.task_errors.id == error_id).select().first()
+    return error.as_dict() if error else None
+
+
+def get_task_errors(entity_type: str, entity_id: int) -> list[dict]:
+    """Get the distinct errors recorded for a record, most recent first."""
+    db = get_db()
+    errors = db(
+        (db.task_errors.entity_type == entity_type) &
+        (db.task_errors.entity_id == entity_id)
+    ).select(orderby=~db.task_errors.last_seen_at)
+    return [e.as_dict() for e in errors]
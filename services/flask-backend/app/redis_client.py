@@ -0,0 +1,15 @@
+"""Shared Redis connection."""
+
+import redis
+
+from .config import Config
+
+_client: redis.Redis | None = None
+
+
+def get_redis() -> redis.Redis:
+    """Return the process-wide Redis client (connection pooled)."""
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(Config.REDIS_URL)
+    return _client
@@ -0,0 +1,111 @@
+"""Compact error records for failed background tasks.
+
+Task failures are stored once per distinct error in ``task_errors`` with a
+truncated traceback and an occurrence count, instead of a full traceback
+written into the failing record on every retry. Records such as reviews
+keep a one-line summary in ``error_message``.
+"""
+
+from dataclasses import dataclass
+import hashlib
+import logging
+import re
+import traceback as tb
+
+from ..models import record_task_error
+
+logger = logging.getLogger(__name__)
+
+MAX_MESSAGE_CHARS = 500
+MAX_TRACEBACK_CHARS = 4000
+
+# Ids, counts, hashes and addresses vary between occurrences of one error
+_VOLATILE = re.compile(r"0x[0-9a-fA-F]+|\b[0-9a-f]{12,}\b|\d+")
+
+
+@dataclass(slots=True)
+class ErrorRecord:
+    """A truncated, fingerprinted exception."""
+
+    error_type: str
+    message: str
+    location: str
+    traceback: str
+    fingerprint: str
+
+    @property
+    def summary(self) -> str:
+        """One-line description for error_message columns."""
+        return f"{self.error_type}: {self.message}" if self.message else self.error_type
+
+
+def _truncate(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def compact_error(exc: BaseException) -> ErrorRecord:
+    """Summarize an exception for storage.
+
+    Errors with the same type, failing frame and message (ignoring numbers
+    and hashes) share a fingerprint.
+
+    Args:
+        exc: The exception, with its traceback attached
+
+    Returns:
+        ErrorRecord with message and traceback truncated
+    """
+    error_type = type(exc).__name__
+    message = _truncate(" ".join(str(exc).split()), MAX_MESSAGE_CHARS)
+
+    frames = tb.extract_tb(exc.__traceback__) if exc.__traceback__ else []
+    location = f"{frames[-1].filename}:{frames[-1].name}" if frames else ""
+
+    formatted = "".join(tb.format_exception(type(exc), exc, exc.__traceback__))
+    if len(formatted) > MAX_TRACEBACK_CHARS:
+        # The innermost frames are the useful part
+        formatted = "...\n" + formatted[-(MAX_TRACEBACK_CHARS - 4):]
+
+    identity = "\0".join([error_type, location, _VOLATILE.sub("#", message)])
+    return ErrorRecord(
+        error_type=error_type,
+        message=message,
+        location=_truncate(location, 255),
+        traceback=formatted,
+        fingerprint=hashlib.sha256(identity.encode()).hexdigest()[:32],
+    )
+
+
+def record_error(
+    task_name: str, entity_type: str, entity_id: int, exc: BaseException
+) -> ErrorRecord:
+    """Store a task failure in task_errors (deduplicated) and return its summary.
+
+    Storage problems are logged, not raised, so they never mask the
+    original error.
+
+    Args:
+        task_name: Celery task name
+        entity_type: What the task worked on (review, review_shard, issue_plan,
+            review_comment)
+        entity_id: ID of that record
+        exc: The failure
+
+    Returns:
+        The compacted error
+    """
+    record = compact_error(exc)
+    try:
+        record_task_error(
+            task_name=task_name,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            fingerprint=record.fingerprint,
+            error_type=record.error_type,
+            message=record.message,
+            location=record.location,
+            traceback=record.traceback,
+        )
+    except Exception as e:
+        logger.warning(f"Could not record {record.error_type} for {entity_type} {entity_id}: {e}")
+    return record
@@ -0,0 +1,208 @@
+"""Per-host housekeeping of the workers' local disk.
+
+Sandboxes, git mirrors and the blob and lint caches live on the disk of the
+host a worker runs on, so a beat task - taken by whichever worker reads it
+first - cannot look after them: most hosts would never run it. Instead
+every worker starts a housekeeping thread when it is ready, and an
+``flock`` per job on a file under ``SANDBOX_BASE_PATH`` elects one worker
+per host to run it. Jobs run on the worker's asyncio runtime (see runtime),
+so they never take a task slot on the review lanes; blocking ones are
+handed to a thread there.
+"""
+
+import asyncio
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
+import fcntl
+import logging
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any
+
+from celery.signals import worker_ready, worker_shutdown
+
+from ..core.scheduling import LANE_INTERACTIVE, LANE_SYNC, LANE_WHOLE
+from .runtime import run_async
+
+logger = logging.getLogger(__name__)
+
+LOCK_FILE = ".housekeeping-{job}.lock"
+
+# Workers consuming any of these use sandboxes and mirrors on their host
+REVIEW_LANES = frozenset((LANE_INTERACTIVE, LANE_SYNC, LANE_WHOLE))
+
+
+@dataclass(slots=True)
+class HousekeepingJob:
+    """A periodic job of the host's housekeeper."""
+
+    name: str
+    interval_seconds: float
+    run: Callable[[], Coroutine[Any, Any, Any]]
+    next_run: float = 0.0
+
+
+class HostHousekeeper:
+    """Runs each housekeeping job while this worker holds the job's host lock.
+
+    A job's lock is taken without blocking whenever the job is due and kept
+    once held, so a single worker per host runs it; if that worker exits,
+    the lock is released and another worker takes over on its next tick.
+    """
+
+    def __init__(
+        self,
+        base_path: str | Path,
+        jobs: list[HousekeepingJob],
+        poll_seconds: float = 60.0,
+    ):
+        """Initialize housekeeper.
+
+        Args:
+            base_path: Directory shared by the host's workers (holds the locks)
+            jobs: Jobs to run, each every interval_seconds
+            poll_seconds: How often due jobs are looked for
+        """
+        self.base_path = Path(base_path)
+        self.jobs = jobs
+        self.poll_seconds = poll_seconds
+        self._locks: dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the housekeeping thread (idempotent)."""
+        if self._thread is not None or not self.jobs:
+            return
+        self._thread = threading.Thread(
+            target=self._loop, name="darwin-housekeeping", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the thread and give the host locks to other workers."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        locks, self._locks = self._locks, {}
+        for fd in locks.values():
+            os.close(fd)
+
+    def holds(self, job: str) -> bool:
+        """Take a job's host lock if it is free; True while this worker holds it."""
+        if job in self._locks:
+            return True
+        try:
+            self.base_path.mkdir(parents=True, exist_ok=True)
+            fd = os.open(
+                self.base_path / LOCK_FILE.format(job=job), os.O_RDWR | os.O_CREAT, 0o644
+            )
+        except OSError as e:
+            logger.warning(f"Housekeeping lock of {job} unavailable: {e}")
+            return False
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._locks[job] = fd
+        logger.info(f"This worker runs {job} for {self.base_path}")
+        return True
+
+    def run_due(self, now: float | None = None) -> list[str]:
+        """Run the due jobs this worker is the host's housekeeper of.
+
+        Args:
+            now: Monotonic time (defaults to the current one)
+
+        Returns:
+            Names of the jobs run
+        """
+        now = time.monotonic() if now is None else now
+        ran = []
+        for job in self.jobs:
+            if job.next_run > now or not self.holds(job.name):
+                continue
+            job.next_run = now + job.interval_seconds
+            try:
+                logger.info(f"Housekeeping {job.name}: {run_async(job.run())}")
+            except Exception as e:
+                logger.warning(f"Housekeeping {job.name} failed: {e}")
+            ran.append(job.name)
+        return ran
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self.run_due()
+            self._stop.wait(self.poll_seconds)
+
+
+def consumes_review_lane(queue_names: set[str] | None) -> bool:
+    """Check whether a worker consuming these queues (None = all) runs reviews."""
+    return queue_names is None or bool(queue_names & REVIEW_LANES)
+
+
+_housekeeper: HostHousekeeper | None = None
+
+
+def get_housekeeper(review_host: bool = True) -> HostHousekeeper:
+    """Return this worker's housekeeper configured from app settings.
+
+    Args:
+        review_host: Whether the worker runs reviews (sandboxes, mirrors and
+            linting); every worker fills the blob cache
+    """
+    global _housekeeper
+    if _housekeeper is None:
+        from ..config import Config
+        from ..core.lint_cache import get_lint_cache
+        from ..git import get_blob_cache, get_mirror_cache, get_sandbox_manager
+
+        trim_seconds = Config.CACHE_TRIM_MINUTES * 60.0
+        jobs = [
+            HousekeepingJob(
+                "trim-blob-cache",
+                trim_seconds,
+                lambda: asyncio.to_thread(get_blob_cache().trim),
+            ),
+        ]
+        if review_host:
+            # Reviews remove their own sandboxes; this catches those of
+            # crashed or killed workers
+            jobs.append(HousekeepingJob(
+                "reap-sandboxes",
+                Config.SANDBOX_REAP_MINUTES * 60.0,
+                lambda: get_sandbox_manager().reap(),
+            ))
+            lint_cache = get_lint_cache()
+            if lint_cache is not None:
+                jobs.append(HousekeepingJob(
+                    "trim-lint-cache",
+                    trim_seconds,
+                    lambda: asyncio.to_thread(lint_cache.store.trim),
+                ))
+        if review_host and Config.GIT_MIRROR_CACHE_ENABLED:
+            # Prune, gc and size-cap the mirror cache; mirrors busy with a
+            # review are skipped until the next run
+            jobs.append(HousekeepingJob(
+                "maintain-git-mirrors",
+                Config.GIT_MIRROR_MAINTENANCE_MINUTES * 60.0,
+                lambda: get_mirror_cache().maintain(),
+            ))
+        _housekeeper = HostHousekeeper(Config.SANDBOX_BASE_PATH, jobs)
+    return _housekeeper
+
+
+@worker_ready.connect
+def _start_housekeeping(sender=None, **kwargs) -> None:
+    queues = sender.app.amqp.queues if sender is not None else None
+    names = set(queues.consume_from) if queues is not None else None
+    get_housekeeper(consumes_review_lane(names)).start()
+
+
+@worker_shutdown.connect
+def _stop_housekeeping(**kwargs) -> None:
+    if _housekeeper is not None:
+        _housekeeper.stop()
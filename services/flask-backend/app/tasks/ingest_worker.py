@@ -0,0 +1,404 @@
+"""Webhook Ingestion Worker - Turn queued webhook events into reviews and plans."""
+
+import json
+import logging
+import time
+from typing import Any, Callable
+
+from redis import RedisError
+
+from ..celery_config import make_celery
+from ..config import Config
+from ..core.plan_budget import get_plan_budget
+from ..core.scheduling import TRIGGER_INTERACTIVE, TRIGGER_SYNC
+from ..core.webhook_events import WebhookEvent, consumer_name, get_event_queue
+from ..models import (
+    create_review,
+    get_review_by_external_id,
+    supersede_queued_reviews,
+    get_repo_config,
+    create_issue_plan,
+    get_issue_plan_by_external_id,
+    count_issue_plans_today,
+    calculate_monthly_cost,
+    resolve_platform_user,
+    record_webhook_delivery,
+)
+from .plan_worker import process_issue_plan
+from .review_worker import enqueue_review
+
+logger = logging.getLogger(__name__)
+
+# Create Celery instance
+celery = make_celery()
+
+
+@celery.task(name="app.tasks.ingest_worker.consume_webhook_events")
+def consume_webhook_events() -> dict[str, Any]:
+    """
+    Drain the webhook event stream in batches.
+
+    Runs on every beat tick and keeps reading until the stream is empty or
+    the tick interval is used up, so a burst is worked off by consecutive
+    batches rather than one task per delivery.
+
+    Returns:
+        dict with processed/failed counts
+    """
+    queue = get_event_queue()
+    consumer = consumer_name()
+    deadline = time.monotonic() + Config.WEBHOOK_CONSUMER_INTERVAL_SECONDS
+
+    totals = {"processed": 0, "failed": 0, "batches": 0}
+    while True:
+        events = queue.read_batch(consumer, count=Config.WEBHOOK_CONSUMER_BATCH_SIZE)
+        if not events:
+            break
+
+        result, failed = process_event_batch(events)
+        # Failed events stay pending and are retried once reclaimed
+        failed_ids = {event.stream_id for event in failed}
+        queue.ack([event for event in events if event.stream_id not in failed_ids])
+
+        totals["processed"] += result["processed"]
+        totals["failed"] += result["failed"]
+        totals["batches"] += 1
+
+        if time.monotonic() >= deadline:
+            break
+
+    return totals
+
+
+def process_event_batch(
+    events: list[WebhookEvent],
+) -> tuple[dict[str, int], list[WebhookEvent]]:
+    """
+    Process a batch of webhook events.
+
+    Repository configs and sender identities are looked up once per batch,
+    and webhook health is recorded once per repository.
+
+    Args:
+        events: Events read from the stream
+
+    Returns:
+        (dict with processed/failed counts, events that failed)
+    """
+    repo_configs: dict[tuple[str, str], dict | None] = {}
+    users: dict[tuple[str, str], int | None] = {}
+    delivered_repo_ids: set[int] = set()
+    counts = {"processed": 0, "failed": 0}
+    failed: list[WebhookEvent] = []
+
+    def resolve_user(platform: str, username: str) -> int | None:
+        if not username:
+            return None
+        key = (platform, username)
+        if key not in users:
+            darwin_user = resolve_platform_user(platform, username)
+            users[key] = darwin_user.get("id") if darwin_user else None
+        return users[key]
+
+    for event in events:
+        key = (event.platform, event.repository)
+        if key not in repo_configs:
+            repo_configs[key] = get_repo_config(event.platform, event.repository)
+        repo_config = repo_configs[key]
+
+        if not repo_config or not repo_config.get("enabled"):
+            continue
+        delivered_repo_ids.add(repo_config["id"])
+
+        try:
+            data = json.loads(event.body)
+            if event.platform == "github":
+                outcome = handle_github_event(event.event_type, data, repo_config, resolve_user)
+            else:
+                outcome = handle_gitlab_event(event.event_type, data, repo_config, resolve_user)
+            counts["processed"] += 1
+            if outcome:
+                logger.info(f"Webhook {event.delivery_id} ({event.repository}): {outcome}")
+        except Exception:
+            counts["failed"] += 1
+            failed.append(event)
+            logger.exception(
+                f"Failed to process webhook {event.delivery_id} "
+                f"(delivery {event.deliveries}), will retry"
+            )
+
+    # Verified deliveries - lets the adaptive poller skip these repositories
+    for repo_id in delivered_repo_ids:
+        record_webhook_delivery(repo_id)
+
+    return counts, failed
+
+
+def _check_plan_limits(
+    repo_config: dict[str, Any], repo_name: str, external_id: str
+) -> str | None:
+    """
+    Reserve issue plan budget and return the reason a plan is blocked, if any.
+
+    Limits are checked and the plan's share reserved in one atomic Redis
+    step, so concurrent issue webhooks cannot overshoot them. If Redis is
+    unavailable the limits are computed from issue_plans instead.
+
+    Args:
+        repo_config: Repository configuration
+        repo_name: Repository name
+        external_id: External ID the plan will be created with
+
+    Returns:
+        Reason the plan may not be created, or None
+    """
+    from ..middleware.license import check_feature_available, FEATURE_ISSUE_AUTOPILOT
+
+    # Check license feature
+    if not check_feature_available(FEATURE_ISSUE_AUTOPILOT):
+        return "Issue autopilot requires license upgrade"
+
+    daily_limit = repo_config.get("issue_plan_daily_limit")
+    cost_limit = repo_config.get("issue_plan_cost_limit_usd")
+    if daily_limit is None and cost_limit is None:
+        return None
+
+    try:
+        return get_plan_budget().reserve(repo_name, external_id, daily_limit, cost_limit)
+    except RedisError as e:
+        logger.warning(f"Plan budget counters unavailable ({e}), checking issue_plans")
+
+    if daily_limit is not None and count_issue_plans_today(repo_name) >= daily_limit:
+        return f"Daily limit exceeded ({daily_limit})"
+    if cost_limit is not None and calculate_monthly_cost(repo_name) >= cost_limit:
+        return f"Monthly cost limit exceeded (${cost_limit})"
+    return None
+
+
+def _queue_review(
+    repo_config: dict[str, Any],
+    triggered_by: int | None,
+    debounce: bool = False,
+    **kwargs,
+) -> str:
+    """
+    Create a differential review from a webhook and enqueue it.
+
+    Reviews are keyed by head SHA, so a commit that was already picked up
+    (by another delivery or by the poller) is not reviewed twice. Any review
+    of an older head still waiting in the queue is cancelled, and push
+    reviews wait SYNC_DEBOUNCE_SECONDS before starting so a burst of pushes
+    collapses into a single review of the latest head.
+
+    Args:
+        repo_config: Repository configuration
+        triggered_by: Darwin user ID of the sender, if mapped
+        debounce: Delay the review by the debounce window
+        **kwargs: Review fields passed to create_review
+
+    Returns:
+        Description of what was queued
+    """
+    existing = get_review_by_external_id(kwargs["external_id"])
+    if existing:
+        return f"Review {existing['id']} already exists for this head"
+
+    review = create_review(
+        review_type="differential",
+        categories=repo_config.get("default_categories", ["security", "best_practices"]),
+        ai_provider=repo_config.get("default_ai_provider", "claude"),
+        triggered_by=triggered_by,
+        tenant_id=repo_config.get("tenant_id"),
+        team_id=repo_config.get("team_id"),
+        repo_id=repo_config.get("id"),
+        **kwargs,
+    )
+    superseded = supersede_queued_reviews(
+        review["platform"], review["repository"], review["pull_request_id"], review["id"]
+    )
+
+    if debounce:
+        enqueue_review(review, TRIGGER_SYNC, countdown=Config.SYNC_DEBOUNCE_SECONDS)
+    else:
+        enqueue_review(review, TRIGGER_INTERACTIVE)
+
+    if superseded:
+        return f"Review {review['id']} queued, superseding {superseded} older review(s)"
+    return f"Review {review['id']} queued"
+
+
+def _queue_plan(repo_config: dict[str, Any], **kwargs) -> str:
+    """Create an issue plan from a webhook and enqueue it."""
+    existing = get_issue_plan_by_external_id(kwargs["external_id"])
+    if existing:
+        return f"Issue plan {existing['id']} already exists"
+
+    try:
+        plan = create_issue_plan(
+            ai_provider=repo_config.get("issue_plan_provider") or repo_config.get("default_ai_provider", "claude"),
+            ai_model=repo_config.get("issue_plan_model"),
+            **kwargs,
+        )
+    except Exception:
+        try:
+            get_plan_budget().release(kwargs["repository"], kwargs["external_id"])
+        except RedisError:
+            pass  # Reconciliation drops the orphaned reservation
+        raise
+    process_issue_plan.apply_async((plan.get("id"),), headers={"enqueued_at": time.time()})
+    return f"Issue plan {plan.get('id')} queued"
+
+
+def handle_github_event(
+    event_type: str,
+    data: dict[str, Any],
+    repo_config: dict[str, Any],
+    resolve_user: Callable[[str, str], int | None],
+) -> str | None:
+    """
+    Handle a GitHub webhook event.
+
+    Args:
+        event_type: X-GitHub-Event header value
+        data: Parsed payload
+        repo_config: Repository configuration
+        resolve_user: Maps (platform, username) to a Darwin user ID
+
+    Returns:
+        Description of what was queued, or None
+    """
+    repo_name = data.get("repository", {}).get("full_name", "")
+    action = data.get("action", "")
+
+    # Resolve sender to Darwin user (if platform identity mapping exists)
+    sender_login = data.get("sender", {}).get("login", "")
+
+    # Process pull request events
+    if event_type == "pull_request":
+        pr_data = data.get("pull_request", {})
+        review_fields = dict(
+            platform="github",
+            repository=repo_name,
+            pull_request_id=pr_data.get("number"),
+            pull_request_url=pr_data.get("html_url"),
+            base_sha=pr_data.get("base", {}).get("sha"),
+            head_sha=pr_data.get("head", {}).get("sha"),
+        )
+
+        # Trigger review on open if configured
+        if action == "opened" and repo_config.get("review_on_open"):
+            return _queue_review(
+                repo_config,
+                resolve_user("github", sender_login),
+                external_id=f"github-{pr_data.get('id')}-{review_fields['head_sha']}",
+                **review_fields,
+            )
+
+        # Trigger review on synchronize if configured
+        if action == "synchronize" and repo_config.get("review_on_sync"):
+            return _queue_review(
+                repo_config,
+                resolve_user("github", sender_login),
+                debounce=True,
+                external_id=f"github-{pr_data.get('id')}-{review_fields['head_sha']}",
+                **review_fields,
+            )
+
+    # Process issue events - only newly opened issues
+    if event_type == "issues" and action == "opened" and repo_config.get("auto_plan_on_issue"):
+        issue_data = data.get("issue", {})
+        external_id = f"github-issue-{issue_data.get('id')}"
+        blocked = _check_plan_limits(repo_config, repo_name, external_id)
+        if blocked:
+            return blocked
+
+        return _queue_plan(
+            repo_config,
+            external_id=external_id,
+            platform="github",
+            repository=repo_name,
+            issue_number=issue_data.get("number"),
+            issue_url=issue_data.get("html_url"),
+            issue_title=issue_data.get("title", ""),
+            issue_body=issue_data.get("body", ""),
+        )
+
+    return None
+
+
+def handle_gitlab_event(
+    event_type: str,
+    data: dict[str, Any],
+    repo_config: dict[str, Any],
+    resolve_user: Callable[[str, str], int | None],
+) -> str | None:
+    """
+    Handle a GitLab webhook event.
+
+    Args:
+        event_type: X-Gitlab-Event header value
+        data: Parsed payload
+        repo_config: Repository configuration
+        resolve_user: Maps (platform, username) to a Darwin user ID
+
+    Returns:
+        Description of what was queued, or None
+    """
+    repo_name = data.get("project", {}).get("path_with_namespace", "")
+
+    # Resolve sender to Darwin user (if platform identity mapping exists)
+    gl_username = data.get("user", {}).get("username", "")
+
+    # Process merge request events
+    if event_type == "Merge Request Hook":
+        mr_data = data.get("object_attributes", {})
+        action = mr_data.get("action", "")
+        review_fields = dict(
+            platform="gitlab",
+            repository=repo_name,
+            pull_request_id=mr_data.get("iid"),
+            pull_request_url=mr_data.get("url"),
+            base_sha=(mr_data.get("diff_refs") or {}).get("base_sha"),
+            head_sha=(mr_data.get("last_commit") or {}).get("id"),
+        )
+
+        # Trigger review on open if configured
+        if action == "open" and repo_config.get("review_on_open"):
+            return _queue_review(
+                repo_config,
+                resolve_user("gitlab", gl_username),
+                external_id=f"gitlab-{mr_data.get('id')}-{review_fields['head_sha']}",
+                **review_fields,
+            )
+
+        # Trigger review on update if configured
+        if action == "update" and repo_config.get("review_on_sync"):
+            return _queue_review(
+                repo_config,
+                resolve_user("gitlab", gl_username),
+                debounce=True,
+                external_id=f"gitlab-{mr_data.get('id')}-{review_fields['head_sha']}",
+                **review_fields,
+            )
+
+    # Process issue events - only newly opened issues
+    if event_type == "Issue Hook":
+        issue_data = data.get("object_attributes", {})
+        if issue_data.get("action", "") == "open" and repo_config.get("auto_plan_on_issue"):
+            external_id = f"gitlab-issue-{issue_data.get('id')}"
+            blocked = _check_plan_limits(repo_config, repo_name, external_id)
+            if blocked:
+                return blocked
+
+            return _queue_plan(
+                repo_config,
+                external_id=external_id,
+                platform="gitlab",
+                repository=repo_name,
+                issue_number=issue_data.get("iid"),
+                issue_url=issue_data.get("url"),
+                issue_title=issue_data.get("title", ""),
+                issue_body=issue_data.get("description", ""),
+            )
+
+    return None
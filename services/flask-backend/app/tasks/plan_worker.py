@@ -1,11 +1,11 @@
 """Plan Generation Worker - Process queued issue plan generation."""
 
-import asyncio
 import json
 import logging
-import traceback
+from datetime import datetime
 from typing import Any
 from celery import Task
+from redis import RedisError
 
 from ..celery_config import make_celery
 from ..models import (
@@ -14,10 +14,17 @@ from ..models import (
     get_repo_config,
     get_credential_by_id,
     create_provider_usage,
+    list_repo_configs,
+    count_issue_plans_today,
+    calculate_monthly_cost,
+    list_open_issue_plan_external_ids,
 )
+from ..core.plan_budget import get_plan_budget
 from ..core.plan_generator import PlanGenerator
-from ..integrations.github import GitHubClient, GitHubConfig
-from ..integrations.gitlab import GitLabClient, GitLabConfig
+from ..core.scheduling import record_task_wait
+from ..redis_client import get_redis
+from .errors import record_error
+from .runtime import get_runtime, run_async
 
 
 # Create Celery instance
@@ -49,6 +56,8 @@ def process_issue_plan(self, plan_id: int) -> dict[str, Any]:
     Raises:
         Exception: On processing failure (triggers retry)
     """
+    record_task_wait(get_redis(), self.request)
+    plan = None
     try:
         # Fetch issue plan from database
         plan = get_issue_plan_by_id(plan_id)
@@ -89,7 +98,7 @@ def process_issue_plan(self, plan_id: int) -> dict[str, Any]:
                 return {"status": "failed", "message": "Credential not found"}
 
         # Run plan generation
-        result = asyncio.run(_execute_plan_generation(plan, repo_config, credential))
+        result = run_async(_execute_plan_generation(plan, repo_config, credential))
 
         # Update plan status with results
         update_issue_plan_status(
@@ -101,6 +110,7 @@ def process_issue_plan(self, plan_id: int) -> dict[str, Any]:
             platform_comment_id=result.get("platform_comment_id"),
             token_usage=result.get("token_usage"),
         )
+        _commit_plan_budget(plan, result.get("token_usage"))
 
         return {
             "status": "completed",
@@ -109,15 +119,72 @@ def process_issue_plan(self, plan_id: int) -> dict[str, Any]:
         }
 
     except Exception as e:
-        # Log error and update status
-        error_message = f"Plan generation failed: {str(e)}\n{traceback.format_exc()}"
+        # Log error and update status; the traceback goes to task_errors once
+        error = record_error(self.name, "issue_plan", plan_id, e)
+        error_message = f"Plan generation failed: {error.summary}"
         logger.error(error_message)
         update_issue_plan_status(plan_id, "failed", error_message=error_message)
+        if plan:
+            _commit_plan_budget(plan, None)
 
         # Reraise for Celery retry mechanism
         raise
 
 
+def _commit_plan_budget(plan: dict[str, Any], token_usage: dict | None) -> None:
+    """Swap the plan's budget reservation for its actual cost."""
+    cost = (token_usage or {}).get("cost_estimate") or 0.0
+    try:
+        get_plan_budget().commit(
+            plan["repository"],
+            plan["external_id"],
+            cost,
+            plan.get("created_at") or datetime.utcnow(),
+        )
+    except RedisError as e:
+        # Reconciliation picks the cost up from issue_plans
+        logger.warning(f"Could not record cost of issue plan {plan['id']}: {e}")
+
+
+@celery.task(name="app.tasks.plan_worker.reconcile_plan_budgets")
+def reconcile_plan_budgets() -> dict[str, Any]:
+    """
+    Rebuild plan budget counters from the issue_plans table.
+
+    Corrects drift from missed commits, plans created outside the webhook
+    path and reservations whose plan was never created.
+
+    Returns:
+        dict with repositories checked and those whose counters drifted
+    """
+    budget = get_plan_budget()
+    repositories = {
+        config["repository"]
+        for config in list_repo_configs(enabled_only=True)
+        if config.get("auto_plan_on_issue")
+    }
+
+    drifted = []
+    for repository in sorted(repositories):
+        plans_today = count_issue_plans_today(repository)
+        monthly_cost = calculate_monthly_cost(repository)
+        before = budget.reconcile(
+            repository,
+            plans_today,
+            monthly_cost,
+            list_open_issue_plan_external_ids(repository),
+        )
+        if before.plans_today != plans_today or abs(before.cost_this_month - monthly_cost) > 0.005:
+            drifted.append(repository)
+            logger.info(
+                f"Plan budget drift for {repository}: "
+                f"{before.plans_today} -> {plans_today} plans, "
+                f"${before.cost_this_month:.2f} -> ${monthly_cost:.2f}"
+            )
+
+    return {"repositories": len(repositories), "drifted": drifted}
+
+
 async def _execute_plan_generation(
     plan: dict[str, Any],
     repo_config: dict[str, Any],
@@ -216,8 +283,7 @@ async def _post_github_comment(
         Comment data with ID or None if failed
     """
     try:
-        config = GitHubConfig(token=credential["token"])
-        async with GitHubClient(config) as client:
+        async with get_runtime().github(credential) as client:
             owner, repo = plan["repository"].split("/")
             issue_number = plan["issue_number"]
 
@@ -254,11 +320,7 @@ async def _post_gitlab_comment(
         Note data with ID or None if failed
     """
     try:
-        config = GitLabConfig(
-            token=credential["token"],
-            base_url=credential.get("base_url", "https://gitlab.com")
-        )
-        async with GitLabClient(config) as client:
+        async with get_runtime().gitlab(credential) as client:
             project_id = plan["repository"]
             issue_iid = plan["issue_number"]
 
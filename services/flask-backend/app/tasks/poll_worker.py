@@ -1,53 +1,84 @@
 """Repository Polling Worker - Check for new/updated PRs and MRs."""
 
-import asyncio
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any
 
 from ..celery_config import make_celery
+from ..config import Config
 from ..models import (
     get_db,
     get_repo_config,
     get_credential_by_id,
     create_review,
     get_review_by_external_id,
+    supersede_queued_reviews,
+    list_polling_repo_configs,
+    update_repo_poll_state,
+    count_recent_reviews,
 )
-from ..integrations.github import GitHubClient, GitHubConfig
-from ..integrations.gitlab import GitLabClient, GitLabConfig
-from .review_worker import process_review
+from ..core.poll_scheduler import AdaptivePollScheduler
+from ..core.scheduling import TRIGGER_SYNC
+from .review_worker import enqueue_review
+from .runtime import get_runtime, run_async, run_blocking
 
 
 # Create Celery instance
 celery = make_celery()
 
 
+def _get_scheduler() -> AdaptivePollScheduler:
+    """Build the adaptive scheduler from configuration."""
+    return AdaptivePollScheduler(
+        min_interval_minutes=Config.DEFAULT_POLLING_INTERVAL_MINUTES,
+        max_interval_minutes=Config.POLL_MAX_INTERVAL_MINUTES,
+        activity_window_hours=Config.POLL_ACTIVITY_WINDOW_HOURS,
+        webhook_healthy_hours=Config.POLL_WEBHOOK_HEALTHY_HOURS,
+        jitter_seconds=Config.POLL_JITTER_SECONDS,
+    )
+
+
 @celery.task(name="app.tasks.poll_worker.poll_repositories")
 def poll_repositories() -> dict[str, Any]:
     """
-    Beat schedule task to poll all enabled repositories.
+    Beat schedule task to poll enabled repositories that are due.
 
-    Queries database for repositories with polling_enabled=True
-    and queues individual poll tasks for each.
+    Runs every minute. Each repository with polling_enabled=True is
+    evaluated by the adaptive scheduler: active repositories are polled at
+    their configured interval, idle ones back off exponentially, and those
+    with healthy webhooks are skipped. Due polls are queued with jitter.
 
     Returns:
-        dict with count of repositories queued for polling
+        dict with counts of queued and skipped repositories
     """
-    db = get_db()
-
-    # Query enabled repositories with polling enabled
-    query = (db.repo_configs.enabled == True) & (db.repo_configs.polling_enabled == True)  # noqa: E712
-    repos = db(query).select()
+    scheduler = _get_scheduler()
+    now = datetime.utcnow()
+    activity_since = now - timedelta(hours=Config.POLL_ACTIVITY_WINDOW_HOURS)
 
     queued_count = 0
-    for repo in repos:
-        # Queue individual poll task
-        poll_repository.delay(repo.id)
+    skipped: dict[str, int] = {"not_due": 0, "webhook_healthy": 0}
+
+    for repo in list_polling_repo_configs():
+        recent_reviews = count_recent_reviews(
+            repo["platform"], repo["repository"], activity_since
+        )
+        decision = scheduler.evaluate(repo, recent_reviews, now)
+
+        if not decision.should_poll:
+            skipped[decision.reason] += 1
+            continue
+
+        # Reserve the slot before queueing so the next tick won't re-queue it
+        update_repo_poll_state(repo["id"], next_poll_at=decision.next_poll_at)
+        poll_repository.apply_async(
+            (repo["id"],), countdown=decision.countdown_seconds
+        )
         queued_count += 1
 
     return {
         "status": "completed",
         "repositories_queued": queued_count,
-        "timestamp": datetime.utcnow().isoformat(),
+        "repositories_skipped": skipped,
+        "timestamp": now.isoformat(),
     }
 
 
@@ -85,16 +116,28 @@ def poll_repository(repo_id: int) -> dict[str, Any]:
         repository = repo_config["repository"]
 
         if platform == "github":
-            result = asyncio.run(_poll_github(repository, credential, repo_config))
+            result = run_async(_poll_github(repository, credential, repo_config))
         elif platform == "gitlab":
-            result = asyncio.run(_poll_gitlab(repository, credential, repo_config))
+            result = run_async(_poll_gitlab(repository, credential, repo_config))
         else:
             return {"status": "error", "message": f"Unsupported platform: {platform}"}
 
-        # Update last_poll_at timestamp
-        db = get_db()
-        db(db.repo_configs.id == repo_id).update(last_poll_at=datetime.utcnow())
-        db.commit()
+        # Update last_poll_at and schedule the next poll from the outcome
+        now = datetime.utcnow()
+        recent_reviews = count_recent_reviews(
+            platform,
+            repository,
+            now - timedelta(hours=Config.POLL_ACTIVITY_WINDOW_HOURS),
+        )
+        poll_idle_count, next_poll_at = _get_scheduler().record_poll(
+            repo_config, result.get("reviews_created", 0), recent_reviews, now
+        )
+        update_repo_poll_state(
+            repo_id,
+            last_poll_at=now,
+            next_poll_at=next_poll_at,
+            poll_idle_count=poll_idle_count,
+        )
 
         return result
 
@@ -102,6 +145,48 @@ def poll_repository(repo_id: int) -> dict[str, Any]:
         return {"status": "error", "message": str(e)}
 
 
+def _start_review(
+    platform: str,
+    repository: str,
+    pull_request_id: int,
+    external_id: str,
+    pull_request_url: str | None,
+    base_sha: str,
+    head_sha: str,
+    repo_config: dict[str, Any],
+) -> bool:
+    """Create and enqueue a review of a pull request head not reviewed yet.
+
+    Blocking (database and broker); the pollers run it through run_blocking.
+
+    Returns:
+        True if a review was created
+    """
+    # Check if we've already reviewed this SHA
+    if get_review_by_external_id(external_id):
+        return False
+
+    review = create_review(
+        external_id=external_id,
+        platform=platform,
+        repository=repository,
+        pull_request_id=pull_request_id,
+        pull_request_url=pull_request_url,
+        base_sha=base_sha,
+        head_sha=head_sha,
+        review_type="differential",
+        categories=repo_config.get("default_categories", ["security", "best_practices"]),
+        ai_provider=repo_config.get("default_ai_provider", "ollama"),
+    )
+
+    # Reviews of older heads still waiting in the queue are moot
+    supersede_queued_reviews(platform, repository, pull_request_id, review["id"])
+
+    # Background discovery - interactive lane is for webhook-triggered opens
+    enqueue_review(review, TRIGGER_SYNC)
+    return True
+
+
 async def _poll_github(
     repository: str,
     credential: dict[str, Any],
@@ -118,10 +203,9 @@ async def _poll_github(
     Returns:
         dict with reviews_created count
     """
-    config = GitHubConfig(token=credential["token"])
     owner, repo = repository.split("/")
 
-    async with GitHubClient(config) as client:
+    async with get_runtime().github(credential) as client:
         # Fetch open pull requests
         prs = await client.list_pull_requests(owner, repo, state="open")
 
@@ -135,31 +219,19 @@ async def _poll_github(
             if not all([pr_id, pr_number, head_sha, base_sha]):
                 continue
 
-            # Check if we've already reviewed this SHA
             external_id = f"github-{pr_id}-{head_sha}"
-            existing_review = get_review_by_external_id(external_id)
-
-            if existing_review:
-                # Already reviewed this commit
-                continue
-
-            # Create new review
-            review = create_review(
-                external_id=external_id,
-                platform="github",
-                repository=repository,
-                pull_request_id=pr_number,
-                pull_request_url=pr.get("html_url"),
-                base_sha=base_sha,
-                head_sha=head_sha,
-                review_type="differential",
-                categories=repo_config.get("default_categories", ["security", "best_practices"]),
-                ai_provider=repo_config.get("default_ai_provider", "ollama"),
-            )
-
-            # Queue for processing
-            process_review.delay(review["id"])
-            reviews_created += 1
+            if await run_blocking(
+                _start_review,
+                "github",
+                repository,
+                pr_number,
+                external_id,
+                pr.get("html_url"),
+                base_sha,
+                head_sha,
+                repo_config,
+            ):
+                reviews_created += 1
 
         return {
             "status": "completed",
@@ -184,12 +256,7 @@ async def _poll_gitlab(
     Returns:
         dict with reviews_created count
     """
-    config = GitLabConfig(
-        token=credential["token"],
-        base_url=credential.get("base_url", "https://gitlab.com")
-    )
-
-    async with GitLabClient(config) as client:
+    async with get_runtime().gitlab(credential) as client:
         # Fetch open merge requests
         mrs = await client.list_merge_requests(project_id, state="opened")
 
@@ -203,31 +270,19 @@ async def _poll_gitlab(
             if not all([mr_id, mr_iid, head_sha, base_sha]):
                 continue
 
-            # Check if we've already reviewed this SHA
             external_id = f"gitlab-{mr_id}-{head_sha}"
-            existing_review = get_review_by_external_id(external_id)
-
-            if existing_review:
-                # Already reviewed this commit
-                continue
-
-            # Create new review
-            review = create_review(
-                external_id=external_id,
-                platform="gitlab",
-                repository=project_id,
-                pull_request_id=mr_iid,
-                pull_request_url=mr.get("web_url"),
-                base_sha=base_sha,
-                head_sha=head_sha,
-                review_type="differential",
-                categories=repo_config.get("default_categories", ["security", "best_practices"]),
-                ai_provider=repo_config.get("default_ai_provider", "ollama"),
-            )
-
-            # Queue for processing
-            process_review.delay(review["id"])
-            reviews_created += 1
+            if await run_blocking(
+                _start_review,
+                "gitlab",
+                project_id,
+                mr_iid,
+                external_id,
+                mr.get("web_url"),
+                base_sha,
+                head_sha,
+                repo_config,
+            ):
+                reviews_created += 1
 
         return {
             "status": "completed",
@@ -0,0 +1,324 @@
+"""Comment Publishing Worker - Post persisted review comments to platforms."""
+
+import asyncio
+import logging
+from typing import Any
+from celery import Task
+
+from ..celery_config import make_celery
+from ..config import Config
+from ..models import (
+    get_review_by_id,
+    get_pending_comments,
+    get_posted_fingerprints,
+    record_suppressed_duplicates,
+    update_comment_status,
+    get_repo_config,
+    get_credential_by_id,
+)
+from ..core.dedupe import add_fingerprint_marker, extract_fingerprints
+from ..integrations.github import (
+    GitHubAPIError,
+    GitHubRateLimitError,
+)
+from ..integrations.gitlab import (
+    GitLabAPIError,
+    GitLabRateLimitError,
+)
+from .errors import record_error
+from .runtime import get_runtime, run_async, run_blocking
+
+logger = logging.getLogger(__name__)
+
+# Create Celery instance
+celery = make_celery()
+
+
+class PublishRetryableError(Exception):
+    """Raised when some comments could not be posted and a retry may succeed."""
+
+    pass
+
+
+class PublishWorkerTask(Task):
+    """Publishing task with backoff for rate limits and transient API failures."""
+
+    autoretry_for = (PublishRetryableError,)
+    retry_kwargs = {"max_retries": 5}
+    retry_backoff = True
+    retry_backoff_max = 600  # 10 minutes max
+    retry_jitter = True
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Rate limits, server errors and network failures are worth retrying."""
+    if isinstance(error, (GitHubRateLimitError, GitLabRateLimitError)):
+        return True
+    if isinstance(error, (GitHubAPIError, GitLabAPIError)):
+        return error.status_code is None or error.status_code >= 500
+    return False
+
+
+@celery.task(
+    bind=True,
+    base=PublishWorkerTask,
+    name="app.tasks.publish_worker.publish_review_comments",
+)
+def publish_review_comments(
+    self, review_id: int, diff_refs: dict[str, str] | None = None
+) -> dict[str, Any]:
+    """
+    Publish pending comments of a review to GitHub/GitLab.
+
+    Only comments without a platform_comment_id are sent, and each one is
+    marked posted as soon as the platform accepts it, so retries never
+    duplicate comments that already went out. Findings whose fingerprint was
+    already posted on the same PR - by an earlier review or found on the
+    platform - are linked to the existing comment instead of being re-posted.
+
+    Args:
+        review_id: Database review ID
+        diff_refs: head_sha/base_sha/start_sha resolved by the review worker;
+            looked up from the platform when missing
+
+    Returns:
+        dict with published/failed counts
+
+    Raises:
+        PublishRetryableError: When retryable failures remain (triggers retry)
+    """
+    review = get_review_by_id(review_id)
+    if not review:
+        return {"status": "error", "message": f"Review {review_id} not found"}
+
+    pending = get_pending_comments(review_id)
+    if not pending:
+        return {"status": "completed", "review_id": review_id, "published": 0}
+
+    repo_config = get_repo_config(review["platform"], review["repository"])
+    if not repo_config or not repo_config.get("credential_id"):
+        return {"status": "failed", "message": "No credentials configured"}
+
+    credential = get_credential_by_id(repo_config["credential_id"])
+    if not credential:
+        return {"status": "failed", "message": "Credential not found"}
+
+    # Fingerprints posted by earlier reviews of this PR (indexed lookup)
+    posted = get_posted_fingerprints(
+        review["platform"],
+        review["repository"],
+        review["pull_request_id"],
+        [c["fingerprint"] for c in pending if c.get("fingerprint")],
+    )
+
+    result = run_async(_publish(review, pending, credential, diff_refs or {}, posted))
+    record_suppressed_duplicates(review_id, result["suppressed"])
+
+    if result["retryable"]:
+        raise PublishRetryableError(
+            f"{result['retryable']} comment(s) for review {review_id} not yet published"
+        )
+
+    return {
+        "status": "completed",
+        "review_id": review_id,
+        "published": result["published"],
+        "suppressed": result["suppressed"],
+        "failed": result["failed"],
+    }
+
+
+def _partition_duplicates(
+    comments: list[dict[str, Any]], known: dict[str, str]
+) -> tuple[list[list[dict[str, Any]]], list[tuple[dict[str, Any], str]]]:
+    """
+    Split pending comments into groups to post and known duplicates.
+
+    Args:
+        comments: Pending review_comments records
+        known: Fingerprint to platform comment ID of findings already on the PR
+
+    Returns:
+        Tuple of (groups sharing a fingerprint - only the first of each is
+        posted, list of (duplicate comment, existing platform comment ID))
+    """
+    groups: dict[str, list[dict[str, Any]]] = {}
+    duplicates: list[tuple[dict[str, Any], str]] = []
+
+    for comment in comments:
+        fingerprint = comment.get("fingerprint")
+        if fingerprint and fingerprint in known:
+            duplicates.append((comment, known[fingerprint]))
+            continue
+        groups.setdefault(fingerprint or f"id:{comment['id']}", []).append(comment)
+
+    return list(groups.values()), duplicates
+
+
+async def _publish(
+    review: dict[str, Any],
+    comments: list[dict[str, Any]],
+    credential: dict[str, Any],
+    diff_refs: dict[str, str],
+    posted: dict[str, str],
+) -> dict[str, int]:
+    """
+    Suppress duplicates, then post the remaining comments with bounded concurrency.
+
+    Args:
+        review: Review record from database
+        comments: Pending review_comments records
+        credential: Decrypted credential
+        diff_refs: Known head/base/start SHAs of the PR or MR
+        posted: Fingerprints already posted by earlier reviews of the PR
+
+    Returns:
+        dict with published, suppressed, failed and retryable counts
+    """
+    semaphore = asyncio.Semaphore(max(1, Config.PUBLISH_MAX_CONCURRENCY))
+    counts = {"published": 0, "suppressed": 0, "failed": 0, "retryable": 0}
+    platform = review["platform"]
+
+    async def link_duplicates(duplicates: list[tuple[dict[str, Any], str]]) -> None:
+        for comment, platform_comment_id in duplicates:
+            await run_blocking(
+                update_comment_status,
+                comment["id"],
+                comment.get("status") or "open",
+                platform_comment_id=platform_comment_id,
+            )
+            counts["suppressed"] += 1
+
+    async def post_each(list_existing, post_comment) -> None:
+        groups, duplicates = _partition_duplicates(comments, posted)
+        await link_duplicates(duplicates)
+        if not groups:
+            return
+
+        # One listing of the PR's comments covers everything left to post
+        on_platform = extract_fingerprints(await list_existing())
+        groups, duplicates = _partition_duplicates(
+            [comment for group in groups for comment in group], on_platform
+        )
+        await link_duplicates(duplicates)
+
+        async def run(group: list[dict[str, Any]]) -> None:
+            comment = group[0]
+            async with semaphore:
+                try:
+                    platform_comment = await post_comment(comment)
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to post comment {comment['id']} to {platform}: {e}"
+                    )
+                    if _is_retryable(e):
+                        counts["retryable"] += 1
+                        return
+                    # Rejected for good (e.g. a line outside the diff): stop
+                    # offering it, and its same-finding siblings, to retries
+                    await run_blocking(
+                        record_error,
+                        publish_review_comments.name,
+                        "review_comment",
+                        comment["id"],
+                        e,
+                    )
+                    for failed in group:
+                        await run_blocking(update_comment_status, failed["id"], "failed")
+                    counts["failed"] += 1
+                    return
+
+            platform_comment_id = str(platform_comment.get("id", ""))
+            await run_blocking(
+                update_comment_status,
+                comment["id"],
+                comment.get("status") or "open",
+                platform_comment_id=platform_comment_id,
+            )
+            counts["published"] += 1
+            # Same finding reported twice in this review
+            await link_duplicates([(sibling, platform_comment_id) for sibling in group[1:]])
+
+        await asyncio.gather(*(run(group) for group in groups))
+
+    if platform == "github":
+        async with get_runtime().github(credential) as client:
+            owner, repo = review["repository"].split("/")
+            pr_number = review["pull_request_id"]
+            head_sha = diff_refs.get("head_sha") or review.get("head_sha")
+            if not head_sha:
+                head_sha = (await client.get_pull_request(owner, repo, pr_number)).head_sha
+
+            async def post_comment(comment: dict[str, Any]) -> dict:
+                return await client.create_review_comment(
+                    owner=owner,
+                    repo=repo,
+                    pr_number=pr_number,
+                    commit_id=head_sha,
+                    path=comment["file_path"],
+                    line=comment["line_end"],
+                    body=format_github_body(comment),
+                )
+
+            await post_each(
+                lambda: client.list_review_comments(owner, repo, pr_number),
+                post_comment,
+            )
+
+    elif platform == "gitlab":
+        async with get_runtime().gitlab(credential) as client:
+            project_id = review["repository"]
+            mr_number = review["pull_request_id"]
+            if not diff_refs.get("head_sha") or not diff_refs.get("base_sha"):
+                mr_data = await client.get_merge_request(project_id, mr_number)
+                known = {k: v for k, v in diff_refs.items() if v}
+                diff_refs = {**(mr_data.diff_refs or {}), **known}
+            base_sha = diff_refs.get("base_sha")
+
+            async def post_comment(comment: dict[str, Any]) -> dict:
+                return await client.create_mr_discussion(
+                    project_id=project_id,
+                    mr_iid=mr_number,
+                    body=format_gitlab_body(comment),
+                    position={
+                        "position_type": "text",
+                        "base_sha": base_sha,
+                        "start_sha": diff_refs.get("start_sha") or base_sha,
+                        "head_sha": diff_refs.get("head_sha"),
+                        "new_path": comment["file_path"],
+                        "new_line": comment["line_end"],
+                    },
+                )
+
+            await post_each(
+                lambda: client.list_mr_notes(project_id, mr_number),
+                post_comment,
+            )
+    else:
+        raise ValueError(f"Unsupported platform: {platform}")
+
+    return counts
+
+
+def format_github_body(comment: dict[str, Any]) -> str:
+    """Format comment body with GitHub's native suggestion format."""
+    body = f"**{comment['title']}**\n\n{comment['body']}"
+
+    # Add GitHub suggested change if available
+    if comment.get("suggestion"):
+        body += f"\n\n```suggestion\n{comment['suggestion']}\n```"
+
+    return add_fingerprint_marker(body, comment.get("fingerprint"))
+
+
+def format_gitlab_body(comment: dict[str, Any]) -> str:
+    """Format comment body with GitLab's native suggestion format."""
+    body = f"**{comment['title']}**\n\n{comment['body']}"
+
+    # GitLab uses ```suggestion:-X+Y syntax where X=lines to remove, Y=lines to add
+    if comment.get("suggestion"):
+        # Suggestion replaces the affected lines
+        lines_affected = comment["line_end"] - comment["line_start"] + 1
+        body += f"\n\n```suggestion:-{lines_affected}+0\n{comment['suggestion']}\n```"
+
+    return add_fingerprint_marker(body, comment.get("fingerprint"))
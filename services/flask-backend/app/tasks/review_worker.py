@@ -1,28 +1,77 @@
 """Review Processing Worker - Process queued code reviews."""
 
 import asyncio
-import traceback
-from typing import Any
-from celery import Task
+from contextlib import asynccontextmanager
+from functools import partial
+import logging
+from pathlib import Path
+import shutil
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable
+from celery import Task, chord
 
 from ..celery_config import make_celery
+from ..config import Config
 from ..models import (
+    get_tenant_settings,
     get_review_by_id,
     update_review_status,
-    create_comment,
     get_repo_config,
     get_credential_by_id,
+    count_review_comments,
+    get_review_checkpoints,
+    store_review_unit,
+    create_review_shards,
+    update_review_shard,
 )
-from ..core.reviewer import ReviewEngine, PRFile
-from ..integrations.github import GitHubClient, GitHubConfig
-from ..integrations.gitlab import GitLabClient, GitLabConfig
-from ..providers import create_provider
+from ..core.reviewer import (
+    ReviewCheckpoint,
+    ReviewComment,
+    ReviewEngine,
+    ReviewResult,
+    PRFile,
+    patch_sha,
+)
+from ..core.detection_cache import (
+    detect_tree,
+    detection_from_dict,
+    detection_to_dict,
+    get_detection_cache,
+)
+from ..core.detector import CONTENT_READ_BYTES, DetectionResult, LanguageDetector
+from ..core.linter import lint_config_paths
+from ..core.lint_cache import get_lint_cache
+from ..core.review_events import get_review_events
+from ..core.sharding import ReviewShard, files_from_payload, plan_shards
+from ..core.scheduling import (
+    TRIGGER_INTERACTIVE,
+    get_fair_share,
+    record_task_wait,
+    review_lane,
+)
+from ..git import (
+    CredentialManager,
+    GitCloner,
+    get_blob_cache,
+    get_mirror_cache,
+    get_sandbox_manager,
+)
+from ..integrations.gitlab import MRChange
+from ..redis_client import get_redis
+from .errors import compact_error, record_error
+from .publish_worker import publish_review_comments
+from .runtime import get_runtime, run_async, run_blocking
 
+logger = logging.getLogger(__name__)
 
 # Create Celery instance
 celery = make_celery()
 
 
+class ReviewSuperseded(Exception):
+    """The pull request head moved past the SHA this review was queued for."""
+
+
 class ReviewWorkerTask(Task):
     """Custom task class with retry logic and error handling."""
 
@@ -38,6 +87,12 @@ def process_review(self, review_id: int) -> dict[str, Any]:
     """
     Process a queued code review.
 
+    Reviews are checkpointed per (file, category) unit, so a retried or
+    redelivered review resumes where the previous attempt stopped instead of
+    repeating completed AI calls. PRs too large for one worker are split
+    into shards reviewed in parallel (see _dispatch_shards); the review
+    stays in_progress until the last shard finishes.
+
     Args:
         review_id: Database review ID
 
@@ -47,19 +102,42 @@ def process_review(self, review_id: int) -> dict[str, Any]:
     Raises:
         Exception: On processing failure (triggers retry)
     """
+    record_task_wait(get_redis(), self.request)
+    fair_share = get_fair_share()
+    tenant_id = None
+    sharded = False
     try:
         # Fetch review from database
         review = get_review_by_id(review_id)
         if not review:
             return {"status": "error", "message": f"Review {review_id} not found"}
 
-        # Skip if already processed
-        if review["status"] != "queued":
+        # Skip if already processed; a redelivered message (worker lost
+        # mid-review) resumes the review it was running
+        redelivered = (self.request.delivery_info or {}).get("redelivered")
+        if review["status"] != "queued" and not (
+            review["status"] == "in_progress" and redelivered
+        ):
             return {
                 "status": "skipped",
                 "message": f"Review {review_id} already processed (status: {review['status']})"
             }
 
+        # Leave the worker slot to other tenants if this one is at its share
+        weight = 1.0
+        if review.get("tenant_id") is not None:
+            weight = float(get_tenant_settings(review["tenant_id"]).get("review_weight", 1.0))
+        if not fair_share.acquire(review.get("tenant_id"), review_id, weight):
+            lane = (self.request.delivery_info or {}).get("routing_key")
+            enqueue_review(
+                review,
+                lane=lane,
+                countdown=Config.TENANT_DEFER_SECONDS,
+                enqueued_at=getattr(self.request, "enqueued_at", None),
+            )
+            return {"status": "deferred", "review_id": review_id}
+        tenant_id = review.get("tenant_id")
+
         # Update status to in_progress
         update_review_status(review_id, "in_progress")
 
@@ -93,7 +171,18 @@ def process_review(self, review_id: int) -> dict[str, Any]:
             return {"status": "failed", "message": "Credential not found"}
 
         # Run review based on type
-        result = asyncio.run(_execute_review(review, repo_config, credential))
+        result = run_async(_execute_review(review, repo_config, credential))
+
+        if result.get("shards"):
+            lane = (self.request.delivery_info or {}).get("routing_key") or review_lane(review)
+            _dispatch_shards(review, result, repo_config, lane)
+            # The slot stays taken until finalize_review or review_shards_failed
+            sharded = True
+            return {
+                "status": "sharded",
+                "review_id": review_id,
+                "shards": len(result["shards"]),
+            }
 
         # Update review status with results
         update_review_status(
@@ -110,14 +199,622 @@ def process_review(self, review_id: int) -> dict[str, Any]:
             "comments_posted": result["comments_posted"],
         }
 
+    except ReviewSuperseded as e:
+        update_review_status(review_id, "cancelled", error_message=str(e))
+        return {"status": "superseded", "review_id": review_id, "message": str(e)}
+
     except Exception as e:
-        # Log error and update status
-        error_message = f"Review processing failed: {str(e)}\n{traceback.format_exc()}"
-        update_review_status(review_id, "failed", error_message=error_message)
+        # Record the error once in task_errors and keep a one-line summary on
+        # the review. While retries remain the review goes back to queued so
+        # the retry resumes from its checkpoints.
+        error = record_error(self.name, "review", review_id, e)
+        error_message = f"Review processing failed: {error.summary}"
+        max_retries = self.retry_kwargs.get("max_retries", self.max_retries)
+        if self.request.retries < max_retries:
+            update_review_status(review_id, "queued", error_message=error_message)
+        else:
+            update_review_status(review_id, "failed", error_message=error_message)
 
         # Reraise for Celery retry mechanism
         raise
 
+    finally:
+        if not sharded:
+            fair_share.release(tenant_id, review_id)
+
+
+# Chord headers must store results; every other task here ignores them
+@celery.task(
+    bind=True,
+    base=ReviewWorkerTask,
+    name="app.tasks.review_worker.review_shard",
+    ignore_result=False,
+)
+def review_shard(
+    self,
+    review_id: int,
+    shard_index: int,
+    files: list[dict[str, Any]],
+    known_paths: list[str],
+    head_sha: str | None = None,
+    base_detection: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Review one file-batch shard of a sharded review.
+
+    Args:
+        review_id: Database review ID
+        shard_index: Shard number within the review
+        files: Shard files (see ReviewShard.to_payload)
+        known_paths: Paths of every file in the PR, for detection
+        head_sha: PR head the shard's files are linted at
+        base_detection: Repository detection (see detection_to_dict)
+
+    Returns:
+        dict with the shard's files_reviewed and comments_posted counts
+    """
+    review = get_review_by_id(review_id)
+    if not review or review["status"] != "in_progress":
+        # Cancelled or superseded while the shard was queued
+        return {"shard_index": shard_index, "files_reviewed": 0, "comments_posted": 0}
+
+    # The review's tenant slot is held across its shards
+    get_fair_share().renew(review.get("tenant_id"), review_id)
+    update_review_shard(review_id, shard_index, "in_progress")
+    pr_files = files_from_payload(files)
+    try:
+        result = run_async(
+            _review_shard_files(
+                review,
+                pr_files,
+                known_paths,
+                head_sha,
+                detection_from_dict(base_detection) if base_detection else None,
+            )
+        )
+        comments_posted = count_review_comments(review_id, [f.path for f in pr_files])
+    except Exception as e:
+        error = record_error(self.name, "review", review_id, e)
+        max_retries = self.retry_kwargs.get("max_retries", self.max_retries)
+        status = "queued" if self.request.retries < max_retries else "failed"
+        update_review_shard(review_id, shard_index, status, error_message=error.summary)
+        raise
+
+    update_review_shard(
+        review_id,
+        shard_index,
+        "completed",
+        files_reviewed=result.files_reviewed,
+        comments_posted=comments_posted,
+    )
+    return {
+        "shard_index": shard_index,
+        "files_reviewed": result.files_reviewed,
+        "comments_posted": comments_posted,
+    }
+
+
+@celery.task(bind=True, base=ReviewWorkerTask, name="app.tasks.review_worker.finalize_review")
+def finalize_review(
+    self,
+    shard_results: list[dict[str, Any]],
+    review_id: int,
+    diff_refs: dict[str, Any],
+    auto_review: bool = True,
+) -> dict[str, Any]:
+    """
+    Merge the shards of a review once all of them have finished (chord body).
+
+    Args:
+        shard_results: Return values of review_shard
+        review_id: Database review ID
+        diff_refs: Diff refs for publishing comments
+        auto_review: Whether comments are posted to the platform
+
+    Returns:
+        dict with status and merged metrics
+    """
+    review = get_review_by_id(review_id)
+    if review:
+        get_fair_share().release(review.get("tenant_id"), review_id)
+    if not review or review["status"] != "in_progress":
+        return {"status": "skipped", "review_id": review_id}
+
+    files_reviewed = sum(r.get("files_reviewed", 0) for r in shard_results)
+    # Counted from the database so comments from any shard attempt are included once
+    comments_posted = count_review_comments(review_id)
+    update_review_status(
+        review_id,
+        "completed",
+        files_reviewed=files_reviewed,
+        comments_posted=comments_posted,
+    )
+    if comments_posted and auto_review:
+        publish_review_comments.delay(review_id, diff_refs=diff_refs)
+
+    return {
+        "status": "completed",
+        "review_id": review_id,
+        "shards": len(shard_results),
+        "files_reviewed": files_reviewed,
+        "comments_posted": comments_posted,
+    }
+
+
+@celery.task(name="app.tasks.review_worker.review_shards_failed")
+def review_shards_failed(request: Any, exc: Exception, traceback: Any, review_id: int) -> None:
+    """Mark a sharded review failed when a shard ran out of retries (chord errback)."""
+    review = get_review_by_id(review_id)
+    if review:
+        get_fair_share().release(review.get("tenant_id"), review_id)
+    update_review_status(
+        review_id, "failed", error_message=f"Review shard failed: {compact_error(exc).summary}"
+    )
+
+
+def _dispatch_shards(
+    review: dict[str, Any],
+    result: dict[str, Any],
+    repo_config: dict[str, Any],
+    lane: str,
+) -> None:
+    """Record the shard plan and start the shards as a chord on the review's lane."""
+    shards: list[ReviewShard] = result["shards"]
+    create_review_shards(
+        review["id"],
+        [
+            {
+                "shard_index": shard.index,
+                "file_count": len(shard.files),
+                "estimated_tokens": shard.estimated_tokens,
+            }
+            for shard in shards
+        ],
+    )
+    header = [
+        review_shard.s(
+            review["id"],
+            shard.index,
+            shard.to_payload(),
+            result["known_paths"],
+            result["diff_refs"].get("head_sha"),
+            result.get("base_detection"),
+        ).set(queue=lane)
+        for shard in shards
+    ]
+    body = finalize_review.s(
+        review["id"], result["diff_refs"], repo_config.get("auto_review", True)
+    ).set(queue=lane)
+    chord(header)(body.on_error(review_shards_failed.s(review["id"])))
+
+
+def enqueue_review(
+    review: dict[str, Any],
+    trigger: str = TRIGGER_INTERACTIVE,
+    countdown: float | None = None,
+    lane: str | None = None,
+    enqueued_at: float | None = None,
+) -> str:
+    """
+    Queue a review on its priority lane.
+
+    Args:
+        review: Review record
+        trigger: What caused the review (selects the lane)
+        countdown: Delay before the review may start
+        lane: Explicit lane, overrides trigger
+        enqueued_at: Original enqueue time when re-queueing (for wait metrics)
+
+    Returns:
+        Lane the review was queued on
+    """
+    lane = lane or review_lane(review, trigger)
+    if enqueued_at is None:
+        # Deliberate delays (debounce) don't count as queue wait
+        enqueued_at = time.time() + (countdown or 0)
+    process_review.apply_async(
+        (review["id"],),
+        queue=lane,
+        countdown=countdown,
+        headers={"enqueued_at": enqueued_at},
+    )
+    return lane
+
+
+def _mr_change_to_pr_file(change: MRChange) -> PRFile:
+    """Convert a GitLab MR diff entry to the engine's PRFile."""
+    if change.new_file:
+        status = "added"
+    elif change.deleted_file:
+        status = "deleted"
+    elif change.renamed_file:
+        status = "renamed"
+    else:
+        status = "modified"
+
+    diff_lines = change.diff.split("\n")
+    return PRFile(
+        path=change.new_path,
+        status=status,
+        additions=sum(
+            1 for line in diff_lines if line.startswith("+") and not line.startswith("+++")
+        ),
+        deletions=sum(
+            1 for line in diff_lines if line.startswith("-") and not line.startswith("---")
+        ),
+        patch=change.diff,
+        old_path=change.old_path if change.renamed_file else None,
+    )
+
+
+def _ensure_current_head(review: dict[str, Any], current_head_sha: str | None) -> None:
+    """Raise ReviewSuperseded if the PR head is no longer the reviewed SHA."""
+    expected = review.get("head_sha")
+    if expected and current_head_sha and current_head_sha != expected:
+        raise ReviewSuperseded(
+            f"Superseded: head moved from {expected[:12]} to {current_head_sha[:12]}"
+        )
+
+
+def _comment_fields(comment: ReviewComment) -> dict[str, Any]:
+    """Map an engine comment to review_comments columns."""
+    return {
+        "file_path": comment.file_path,
+        "line_start": comment.line_start,
+        "line_end": comment.line_end,
+        "category": comment.category,
+        "severity": comment.severity,
+        "title": comment.title,
+        "body": comment.body,
+        "source": comment.source,
+        "suggestion": comment.suggestion,
+        "linter_rule_id": comment.linter_rule_id,
+        "fingerprint": comment.fingerprint,
+    }
+
+
+def _store_unit(
+    review_id: int,
+    pr_file: PRFile,
+    category: str,
+    comments: list[ReviewComment],
+    completed: bool = True,
+) -> None:
+    """Persist one reviewed (file, category) unit together with its checkpoint."""
+    store_review_unit(
+        review_id,
+        pr_file.path,
+        category,
+        [_comment_fields(comment) for comment in comments],
+        patch_sha=patch_sha(pr_file.patch),
+        completed=completed,
+    )
+
+
+def _review_config(review: dict[str, Any]) -> dict[str, Any]:
+    """Engine configuration for a review."""
+    return {
+        "categories": review.get("categories", ["security", "best_practices"]),
+    }
+
+
+def _review_engine(review_id: int) -> ReviewEngine:
+    """Review engine streaming its progress to the review's event stream."""
+    return ReviewEngine(
+        on_event=partial(get_review_events().publish, review_id),
+        lint_cache=get_lint_cache(),
+        run_blocking=run_blocking,
+    )
+
+
+def _review_provider(review: dict[str, Any]):
+    """Shared AI provider instance for a review, if it uses one."""
+    ai_provider_type = review.get("ai_provider")
+    return get_runtime().provider(ai_provider_type) if ai_provider_type else None
+
+
+async def _single_page(files: list[PRFile]) -> AsyncIterator[list[PRFile]]:
+    yield files
+
+
+def _clone_url(review: dict[str, Any], credential: dict[str, Any]) -> tuple[str, str]:
+    """HTTPS clone URL of a review's repository and the token to embed in it."""
+    if review["platform"] == "gitlab":
+        base_url = (credential.get("base_url") or "https://gitlab.com").rstrip("/")
+        return f"{base_url}/{review['repository']}.git", f"oauth2:{credential['token']}"
+    return f"https://github.com/{review['repository']}.git", credential["token"]
+
+
+def _is_relative_path(path: str) -> bool:
+    """Whether a platform-listed path stays inside the checkout."""
+    parts = Path(path).parts
+    return bool(parts) and not Path(path).is_absolute() and ".." not in parts
+
+
+def _stage_cached_blobs(staging: Path, blobs: dict[str, str]) -> dict[str, Path]:
+    """Link the cached head blobs of linted paths into the sandbox.
+
+    Blocking; run in a thread. A linked blob survives its eviction from the
+    cache, so the staged paths can be left out of the checkout.
+
+    Returns:
+        Staged file of each path found in the blob cache
+    """
+    cache = get_blob_cache()
+    staged = {}
+    for index, (path, sha) in enumerate(blobs.items()):
+        dest = staging / str(index)
+        if cache.materialize(sha, dest):
+            staged[path] = dest
+    return staged
+
+
+def _place_cached_blobs(repo_path: Path, staged: dict[str, Path], fetched: list[str]) -> None:
+    """Move staged blobs into the checkout and cache the fetched ones.
+
+    Blocking; run in a thread. Files checked out from git are stored in the
+    blob cache, so the next review of the pull request (after a push that
+    left them unchanged) takes them from there.
+    """
+    for path, src in staged.items():
+        dest = repo_path / path
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(src, dest)
+    cache = get_blob_cache()
+    for path in fetched:
+        file_path = repo_path / path
+        if file_path.is_file() and not file_path.is_symlink():
+            cache.store(file_path.read_bytes())
+
+
+def _lint_checkout(
+    review: dict[str, Any],
+    credential: dict[str, Any],
+    resolve_head: Callable[[], Awaitable[str | None]],
+    head_blobs: dict[str, str] | None = None,
+) -> Callable[[list[str]], Any]:
+    """
+    Checkout factory for PR-mode linting (see ReviewEngine.review_pr_stream).
+
+    Each checkout is a blobless partial clone of the PR head (or, with the
+    mirror cache enabled, a worktree of the repository's mirror) with only
+    the linted paths and linter config files checked out, in a sandbox
+    removed on exit. Linted files whose head blob is in the blob cache are
+    linked from it instead of being fetched. Linting is best effort: if the
+    checkout fails the review continues without it.
+
+    Args:
+        review: Review record
+        credential: Decrypted credential
+        resolve_head: Returns the PR head SHA to check out
+        head_blobs: Head blob SHA of each changed path, if the platform lists
+            them (filled while the review pages through the files)
+    """
+
+    @asynccontextmanager
+    async def checkout(paths: list[str]) -> AsyncIterator[Path | None]:
+        head_sha = await resolve_head()
+        if not head_sha:
+            logger.warning(f"Review {review['id']}: no head SHA, skipping linters")
+            yield None
+            return
+
+        try:
+            sandbox_manager = get_sandbox_manager()
+            sandbox = await sandbox_manager.create()
+        except OSError as e:
+            logger.warning(f"Review {review['id']}: no sandbox, skipping linters: {e}")
+            yield None
+            return
+
+        try:
+            repo_path = None
+            try:
+                staged = {}
+                if head_blobs:
+                    blobs = {
+                        path: head_blobs[path]
+                        for path in paths
+                        if path in head_blobs and _is_relative_path(path)
+                    }
+                    staged = await asyncio.to_thread(
+                        _stage_cached_blobs, sandbox.path / "cached-blobs", blobs
+                    )
+                fetched = [path for path in paths if path not in staged]
+                mirror_cache = get_mirror_cache() if Config.GIT_MIRROR_CACHE_ENABLED else None
+                cloner = GitCloner(
+                    sandbox_manager,
+                    CredentialManager(Config.CREDENTIAL_ENCRYPTION_KEY or None),
+                    mirror_cache=mirror_cache,
+                )
+                url, token = _clone_url(review, credential)
+                clone = await cloner.sparse_checkout_with_token(
+                    url,
+                    token,
+                    sandbox,
+                    head_sha,
+                    # The linters' config files come along so they apply
+                    [*fetched, *lint_config_paths(paths)],
+                    # A repository's first mirror fetch is a full clone
+                    timeout=1800 if mirror_cache else 300,
+                )
+                if clone.success:
+                    if head_blobs is not None:
+                        await asyncio.to_thread(
+                            _place_cached_blobs, clone.repo_path, staged, fetched
+                        )
+                    repo_path = clone.repo_path
+                else:
+                    logger.warning(f"Review {review['id']}: skipping linters: {clone.error}")
+            except Exception as e:
+                logger.warning(f"Review {review['id']}: skipping linters: {e}")
+            yield repo_path
+        finally:
+            await sandbox_manager.cleanup(sandbox)
+
+    return checkout
+
+
+async def _review_or_plan(
+    engine: ReviewEngine,
+    review: dict[str, Any],
+    pages: AsyncIterator[list[PRFile]],
+    ai_provider: Any,
+    lint_checkout: Callable[[list[str]], Any] | None = None,
+    base_detection: DetectionResult | None = None,
+) -> tuple[ReviewResult | None, list[ReviewShard], list[str]]:
+    """
+    Review the PR in this worker, or plan shards if it is too large.
+
+    With sharding enabled the whole file listing is read first, since the
+    shard plan needs every file's size.
+
+    Args:
+        engine: Review engine
+        review: Review record
+        pages: Pages of changed files
+        ai_provider: AI provider (sharding only applies to AI reviews)
+        lint_checkout: Checkout factory for the linter category (optional)
+        base_detection: Repository detection merged into the PR's (optional)
+
+    Returns:
+        (result, [], []) for an in-process review, or
+        (None, shards, all paths) when the review must be sharded
+    """
+    review_config = _review_config(review)
+    if Config.REVIEW_SHARD_TOKEN_BUDGET > 0 and ai_provider:
+        files = [pr_file async for page in pages for pr_file in page]
+        ai_categories = [c for c in review_config["categories"] if c != "linter"]
+        shards = plan_shards(
+            files,
+            len(ai_categories),
+            Config.REVIEW_SHARD_TOKEN_BUDGET,
+            Config.REVIEW_MAX_SHARDS,
+        )
+        if len(shards) > 1:
+            return None, shards, [f.path for f in files if f.status != "deleted"]
+        pages = _single_page(files)
+
+    result = await engine.review_pr_stream(
+        platform=review["platform"],
+        repository=review["repository"],
+        pages=pages,
+        config=review_config,
+        ai_provider=ai_provider,
+        review_id=review["id"],
+        checkpoint=await _review_checkpoint(review["id"]),
+        lint_checkout=lint_checkout,
+        base_detection=base_detection,
+    )
+    return result, [], []
+
+
+async def _review_shard_files(
+    review: dict[str, Any],
+    files: list[PRFile],
+    known_paths: list[str],
+    head_sha: str | None = None,
+    base_detection: DetectionResult | None = None,
+) -> ReviewResult:
+    """Review (and lint) the files of one shard, resuming from checkpoints."""
+    lint_checkout = None
+    repo_config = await run_blocking(get_repo_config, review["platform"], review["repository"])
+    credential = None
+    if repo_config and repo_config.get("credential_id"):
+        credential = await run_blocking(get_credential_by_id, repo_config["credential_id"])
+    if credential:
+        head = head_sha or review.get("head_sha")
+
+        async def resolve_head() -> str | None:
+            return head
+
+        head_blobs = {f.path: f.blob_sha for f in files if f.blob_sha}
+        lint_checkout = _lint_checkout(review, credential, resolve_head, head_blobs)
+
+    return await _review_engine(review["id"]).review_pr_stream(
+        platform=review["platform"],
+        repository=review["repository"],
+        pages=_single_page(files),
+        config=_review_config(review),
+        ai_provider=_review_provider(review),
+        review_id=review["id"],
+        checkpoint=await _review_checkpoint(review["id"]),
+        known_paths=known_paths,
+        lint_checkout=lint_checkout,
+        base_detection=base_detection,
+    )
+
+
+async def _review_checkpoint(review_id: int) -> ReviewCheckpoint:
+    """Load a review's completed units and persist new ones as they finish.
+
+    The hooks are blocking; the engine runs them through run_blocking.
+    """
+    return ReviewCheckpoint(
+        completed=await run_blocking(get_review_checkpoints, review_id),
+        on_unit_complete=partial(_store_unit, review_id),
+        on_unit_comments=partial(_store_unit, review_id, completed=False),
+    )
+
+
+async def _base_detection(
+    review: dict[str, Any],
+    tree_sha: Callable[[], Awaitable[str]],
+    list_tree: Callable[[str], Awaitable[list[tuple[str, str]]]],
+    read_blob: Callable[[str], Awaitable[bytes]],
+) -> DetectionResult | None:
+    """
+    Detection of the repository's default branch, cached per tree.
+
+    On a miss the tree is listed through the platform API and only the
+    files detection looks inside are downloaded. Failures only cost the
+    review its framework and IaC context.
+
+    Args:
+        review: Review record
+        tree_sha: Returns the default branch's tree (or head commit) SHA
+        list_tree: Returns (path, blob SHA) of every file given that SHA
+        read_blob: Returns a blob's content given its SHA
+
+    Returns:
+        Detection result, or None if disabled or unavailable
+    """
+    if Config.DETECTION_CACHE_TTL_HOURS <= 0:
+        return None
+
+    try:
+        sha = await tree_sha()
+
+        async def detect() -> DetectionResult:
+            return await detect_tree(LanguageDetector(), await list_tree(sha), read_blob)
+
+        return await get_detection_cache().get_or_detect(
+            review["platform"], review["repository"], sha, detect
+        )
+    except Exception as e:
+        logger.warning(f"Review {review['id']}: no repository detection: {e}")
+        return None
+
+
+async def _await_detection(
+    review: dict[str, Any], detection_task: "asyncio.Future[DetectionResult | None]"
+) -> DetectionResult | None:
+    """
+    Repository detection if it is ready within DETECTION_WAIT_SECONDS.
+
+    A cache hit is ready almost at once; a miss lists and reads the tree
+    through the platform API, which the first AI call shouldn't wait for.
+    The review then goes on with detection from the changed files alone,
+    while the task keeps running and fills the cache for the next review.
+    """
+    try:
+        return await asyncio.wait_for(
+            asyncio.shield(detection_task), Config.DETECTION_WAIT_SECONDS
+        )
+    except asyncio.TimeoutError:
+        logger.info(f"Review {review['id']}: repository detection not ready, using the PR's")
+        return None
+
 
 async def _execute_review(
     review: dict[str, Any],
@@ -125,7 +822,16 @@ async def _execute_review(
     credential: dict[str, Any],
 ) -> dict[str, Any]:
     """
-    Execute the review using ReviewEngine and post comments.
+    Execute the review using ReviewEngine and queue comments for publishing.
+
+    Comments are stored unit by unit while the engine runs (see
+    _review_checkpoint), so units finished by an earlier attempt are not
+    sent to the AI provider again.
+
+    PR metadata and the paged file listing are fetched concurrently, and the
+    engine starts reviewing as soon as the first page of files arrives -
+    unless the PR head has moved past the review's SHA, in which case
+    ReviewSuperseded is raised before anything is sent to the AI provider.
 
     Args:
         review: Review record from database
@@ -133,186 +839,159 @@ async def _execute_review(
         credential: Decrypted credential
 
     Returns:
-        dict with files_reviewed and comments_posted counts
+        dict with files_reviewed and comments_posted counts, or with the
+        shards, all file paths and diff_refs when the review must be sharded
     """
     # Initialize ReviewEngine
-    engine = ReviewEngine()
+    engine = _review_engine(review["id"])
 
     # Create AI provider
-    ai_provider = None
-    ai_provider_type = review.get("ai_provider")
-    if ai_provider_type:
-        ai_provider = create_provider(ai_provider_type)
+    ai_provider = _review_provider(review)
 
     # Get platform client and execute review
     platform = review["platform"]
 
     if platform == "github":
-        config = GitHubConfig(token=credential["token"])
-        async with GitHubClient(config) as client:
+        async with get_runtime().github(credential) as client:
             owner, repo = review["repository"].split("/")
             pr_number = review["pull_request_id"]
 
-            # Fetch PR files
-            pr_data = await client.get_pull_request(owner, repo, pr_number)
-            pr_files_data = await client.get_pull_request_files(owner, repo, pr_number)
-
-            # Convert to PRFile objects
-            pr_files = [
-                PRFile(
-                    path=f.filename,
-                    status=f.status,
-                    additions=f.additions,
-                    deletions=f.deletions,
-                    patch=f.patch or "",
-                    old_path=None,
-                )
-                for f in pr_files_data
-            ]
+            pr_task = asyncio.ensure_future(client.get_pull_request(owner, repo, pr_number))
 
-            # Execute review
-            review_config = {
-                "categories": review.get("categories", ["security", "best_practices"]),
-            }
-            review_result = await engine.review_pr(
-                platform=platform,
-                repository=review["repository"],
-                pr_files=pr_files,
-                config=review_config,
-                ai_provider=ai_provider,
-                review_id=review["id"],
-            )
+            async def default_tree_sha() -> str:
+                branch = await client.get_default_branch(owner, repo)
+                return await client.get_branch_tree_sha(owner, repo, branch)
 
-            # Store comments in database
-            comments_posted = 0
-            for comment in review_result.comments:
-                create_comment(
-                    review_id=review["id"],
-                    file_path=comment.file_path,
-                    line_start=comment.line_start,
-                    line_end=comment.line_end,
-                    category=comment.category,
-                    severity=comment.severity,
-                    title=comment.title,
-                    body=comment.body,
-                    review_source=comment.source,
-                    suggestion=comment.suggestion,
-                    linter_rule_id=comment.linter_rule_id,
+            detection_task = asyncio.ensure_future(
+                _base_detection(
+                    review,
+                    default_tree_sha,
+                    partial(client.get_tree, owner, repo),
+                    partial(client.get_blob, owner, repo, max_bytes=CONTENT_READ_BYTES),
                 )
-                comments_posted += 1
-
-            # Post comments to platform
-            if repo_config.get("auto_review", True):
-                for comment in review_result.comments:
-                    try:
-                        # Format body with GitHub's native suggestion format
-                        body = f"**{comment.title}**\n\n{comment.body}"
-
-                        # Add GitHub suggested change if available
-                        if comment.suggestion:
-                            body += f"\n\n```suggestion\n{comment.suggestion}\n```"
-
-                        await client.create_review_comment(
-                            owner=owner,
-                            repo=repo,
-                            pr_number=pr_number,
-                            commit_sha=review["head_sha"],
-                            path=comment.file_path,
-                            line=comment.line_end,
-                            body=body,
+            )
+            head_blobs: dict[str, str] = {}
+
+            async def pr_file_pages() -> AsyncIterator[list[PRFile]]:
+                async for page in client.iter_pull_request_files(owner, repo, pr_number):
+                    # Stale heads never reach the AI provider
+                    _ensure_current_head(review, (await pr_task).head_sha)
+                    files = [
+                        PRFile(
+                            path=f.filename,
+                            status="deleted" if f.status == "removed" else f.status,
+                            additions=f.additions,
+                            deletions=f.deletions,
+                            patch=f.patch or "",
+                            old_path=f.previous_filename,
+                            blob_sha=f.sha,
                         )
-                    except Exception as e:
-                        print(f"Failed to post comment to GitHub: {e}")
+                        for f in page
+                    ]
+                    head_blobs.update((f.path, f.blob_sha) for f in files if f.blob_sha)
+                    yield files
+
+            async def pr_head() -> str | None:
+                return review.get("head_sha") or (await pr_task).head_sha
+
+            # PR metadata is fetched alongside the first page of files
+            try:
+                base_detection = await _await_detection(review, detection_task)
+                review_result, shards, known_paths = await _review_or_plan(
+                    engine,
+                    review,
+                    pr_file_pages(),
+                    ai_provider,
+                    _lint_checkout(review, credential, pr_head, head_blobs),
+                    base_detection,
+                )
+                if shards and base_detection is None:
+                    # No AI call waits on it here; the shards get the full context
+                    base_detection = await detection_task
+                pr_data = await pr_task
+            finally:
+                # An unfinished detection_task is left to fill the cache
+                pr_task.cancel()
+            diff_refs = {
+                "head_sha": review.get("head_sha") or pr_data.head_sha,
+                "base_sha": review.get("base_sha") or pr_data.base_sha,
+            }
 
     elif platform == "gitlab":
-        config = GitLabConfig(
-            token=credential["token"],
-            base_url=credential.get("base_url", "https://gitlab.com")
-        )
-        async with GitLabClient(config) as client:
+        async with get_runtime().gitlab(credential) as client:
             project_id = review["repository"]
             mr_number = review["pull_request_id"]
 
-            # Fetch MR files
-            mr_data = await client.get_merge_request(project_id, mr_number)
-            mr_changes = await client.get_mr_changes(project_id, mr_number)
-
-            # Convert to PRFile objects
-            pr_files = []
-            for file_data in mr_changes:
-                pr_file = PRFile(
-                    path=file_data.get("new_path") or file_data.get("path"),
-                    status=file_data.get("status", "modified"),
-                    additions=file_data.get("additions", 0),
-                    deletions=file_data.get("deletions", 0),
-                    patch=file_data.get("patch", ""),
-                    old_path=file_data.get("old_path"),
-                )
-                pr_files.append(pr_file)
+            mr_task = asyncio.ensure_future(client.get_merge_request(project_id, mr_number))
 
-            # Execute review
-            review_config = {
-                "categories": review.get("categories", ["security", "best_practices"]),
-            }
-            review_result = await engine.review_pr(
-                platform=platform,
-                repository=review["repository"],
-                pr_files=pr_files,
-                config=review_config,
-                ai_provider=ai_provider,
-                review_id=review["id"],
+            # GitLab exposes no tree SHAs, so its detections are keyed by commit
+            async def default_commit_sha() -> str:
+                branch = await client.get_default_branch(project_id)
+                return await client.get_branch_commit_sha(project_id, branch)
+
+            detection_task = asyncio.ensure_future(
+                _base_detection(
+                    review,
+                    default_commit_sha,
+                    partial(client.get_tree, project_id),
+                    partial(client.get_blob, project_id, max_bytes=CONTENT_READ_BYTES),
+                )
             )
 
-            # Store comments in database
-            comments_posted = 0
-            for comment in review_result.comments:
-                create_comment(
-                    review_id=review["id"],
-                    file_path=comment.file_path,
-                    line_start=comment.line_start,
-                    line_end=comment.line_end,
-                    category=comment.category,
-                    severity=comment.severity,
-                    title=comment.title,
-                    body=comment.body,
-                    review_source=comment.source,
-                    suggestion=comment.suggestion,
-                    linter_rule_id=comment.linter_rule_id,
+            async def mr_file_pages() -> AsyncIterator[list[PRFile]]:
+                async for page in client.iter_merge_request_diffs(project_id, mr_number):
+                    # Stale heads never reach the AI provider
+                    _ensure_current_head(review, (await mr_task).sha)
+                    yield [_mr_change_to_pr_file(change) for change in page]
+
+            async def mr_head() -> str | None:
+                return review.get("head_sha") or (await mr_task).sha
+
+            # MR metadata is fetched alongside the first page of diffs
+            try:
+                base_detection = await _await_detection(review, detection_task)
+                review_result, shards, known_paths = await _review_or_plan(
+                    engine,
+                    review,
+                    mr_file_pages(),
+                    ai_provider,
+                    _lint_checkout(review, credential, mr_head),
+                    base_detection,
                 )
-                comments_posted += 1
-
-            # Post comments to platform
-            if repo_config.get("auto_review", True):
-                for comment in review_result.comments:
-                    try:
-                        # Format body with GitLab's native suggestion format
-                        body = f"**{comment.title}**\n\n{comment.body}"
-
-                        # Add GitLab suggested change if available
-                        # GitLab uses ```suggestion:-X+Y syntax where X=lines to remove, Y=lines to add
-                        if comment.suggestion:
-                            # Calculate line range
-                            lines_affected = comment.line_end - comment.line_start + 1
-                            # Suggestion replaces the affected lines
-                            body += f"\n\n```suggestion:-{lines_affected}+0\n{comment.suggestion}\n```"
-
-                        await client.create_discussion(
-                            project_id=project_id,
-                            mr_number=mr_number,
-                            body=body,
-                            position={
-                                "base_sha": review["base_sha"],
-                                "start_sha": review["base_sha"],
-                                "head_sha": review["head_sha"],
-                                "new_path": comment.file_path,
-                                "new_line": comment.line_end,
-                            },
-                        )
-                    except Exception as e:
-                        print(f"Failed to post comment to GitLab: {e}")
+                if shards and base_detection is None:
+                    # No AI call waits on it here; the shards get the full context
+                    base_detection = await detection_task
+                mr_data = await mr_task
+            finally:
+                # An unfinished detection_task is left to fill the cache
+                mr_task.cancel()
+            mr_refs = mr_data.diff_refs or {}
+            base_sha = review.get("base_sha") or mr_refs.get("base_sha")
+            diff_refs = {
+                "head_sha": review.get("head_sha") or mr_refs.get("head_sha") or mr_data.sha,
+                "base_sha": base_sha,
+                "start_sha": mr_refs.get("start_sha") or base_sha,
+            }
+
     else:
         raise ValueError(f"Unsupported platform: {platform}")
 
+    if shards:
+        return {
+            "shards": shards,
+            "known_paths": known_paths,
+            "diff_refs": diff_refs,
+            "base_detection": detection_to_dict(base_detection) if base_detection else None,
+        }
+
+    # Includes comments stored by earlier attempts of this review
+    comments_posted = await run_blocking(count_review_comments, review["id"])
+
+    # Posting to the platform happens on the publish queue so slow platform
+    # APIs don't hold review worker slots
+    if comments_posted and repo_config.get("auto_review", True):
+        await run_blocking(publish_review_comments.delay, review["id"], diff_refs=diff_refs)
+
     return {
         "files_reviewed": review_result.files_reviewed,
         "comments_posted": comments_posted,
@@ -0,0 +1,284 @@
+"""Worker-lifetime asyncio runtime for Celery tasks.
+
+Each worker process runs one event loop in a background thread, started on
+``worker_process_init``. Tasks submit coroutines to it with ``run_async``
+instead of calling ``asyncio.run``, so platform API clients and AI provider
+clients - and their connection pools - are created once per process and
+reused by every task. The linter toolchain is probed once at the same time
+(see core.toolchain).
+
+With the default prefork pool each process runs one task at a time. Starting
+a worker with ``--pool threads --concurrency N`` lets N tasks share the loop,
+so many reviews (which mostly wait on platform and model APIs) run
+concurrently in a single process.
+
+The loop thread has no Flask app context and must never block, so database
+and other blocking calls made by coroutines go through ``run_blocking``: it
+runs them in a thread of the loop's executor with the task's app context
+pushed.
+"""
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Callable, Coroutine
+from contextlib import asynccontextmanager
+import functools
+import hashlib
+import logging
+import os
+import threading
+from typing import Any, AsyncIterator, TypeVar
+
+from celery import concurrency
+from celery.signals import celeryd_init, worker_process_init, worker_process_shutdown
+from flask import current_app, has_app_context
+
+from ..git.blob_cache import get_blob_cache
+from ..integrations.github import GitHubClient, GitHubConfig
+from ..integrations.gitlab import GitLabClient, GitLabConfig
+from ..providers import AIProvider, get_provider
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class WorkerRuntime:
+    """Event loop thread plus the long-lived clients bound to it."""
+
+    def __init__(self, max_clients: int = 32):
+        """Initialize runtime.
+
+        Args:
+            max_clients: Pooled platform clients kept open; the least
+                recently used idle ones are closed beyond this
+        """
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.max_clients = max_clients
+        self.app: Any = None
+        self._thread: threading.Thread | None = None
+        self._clients: OrderedDict[str, GitHubClient | GitLabClient] = OrderedDict()
+        self._borrowed: dict[str, int] = {}
+        self._clients_lock: asyncio.Lock | None = None
+        self._providers: dict[str, AIProvider] = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the event loop thread (idempotent)."""
+        with self._lock:
+            if self.loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=loop.run_forever, name="darwin-async-runtime", daemon=True
+            )
+            self._thread.start()
+            self.loop = loop
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        """Run a coroutine on the worker loop and wait for its result.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Seconds to wait (None = no limit)
+
+        Returns:
+            The coroutine's result
+        """
+        self.start()
+        if has_app_context():
+            # Handed to run_blocking calls made on the loop
+            self.app = current_app._get_current_object()
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def stop(self) -> None:
+        """Close pooled clients and stop the loop."""
+        with self._lock:
+            loop, self.loop = self.loop, None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_clients(), loop).result(10)
+        except Exception as e:
+            logger.warning(f"Error closing worker clients: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread:
+            self._thread.join(timeout=5)
+        loop.close()
+
+    async def run_blocking(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking call (e.g. a models helper) off the loop.
+
+        The call runs in the loop's default executor, inside the Flask app
+        context of the task that started the coroutine, so ``get_db`` works
+        and other reviews on the loop keep running meanwhile.
+        """
+        app = self.app
+
+        def call() -> T:
+            if app is None:
+                return func(*args, **kwargs)
+            with app.app_context():
+                return func(*args, **kwargs)
+
+        return await asyncio.get_running_loop().run_in_executor(None, call)
+
+    @asynccontextmanager
+    async def github(self, credential: dict[str, Any]) -> AsyncIterator[GitHubClient]:
+        """Borrow the pooled GitHub client for a credential.
+
+        Used like ``async with GitHubClient(...)``, but the client stays open
+        for later tasks.
+        """
+        factory = functools.partial(
+            GitHubClient, GitHubConfig(token=credential["token"]), blob_cache=get_blob_cache()
+        )
+        async with self._borrow(_credential_key("github", credential), factory) as client:
+            yield client
+
+    @asynccontextmanager
+    async def gitlab(self, credential: dict[str, Any]) -> AsyncIterator[GitLabClient]:
+        """Borrow the pooled GitLab client for a credential."""
+        factory = functools.partial(
+            GitLabClient,
+            GitLabConfig(
+                token=credential["token"],
+                base_url=credential.get("base_url", "https://gitlab.com"),
+            ),
+            blob_cache=get_blob_cache(),
+        )
+        async with self._borrow(_credential_key("gitlab", credential), factory) as client:
+            yield client
+
+    @asynccontextmanager
+    async def _borrow(
+        self, key: str, factory: Callable[[], GitHubClient | GitLabClient]
+    ) -> AsyncIterator[GitHubClient | GitLabClient]:
+        """Borrow a pooled client, opening it on first use.
+
+        Opening is serialized so concurrent tasks share one client per
+        credential. Beyond max_clients the least recently used clients no
+        task is borrowing are closed.
+        """
+        if self._clients_lock is None:
+            self._clients_lock = asyncio.Lock()
+        async with self._clients_lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = factory()
+                await client.__aenter__()
+                self._clients[key] = client
+            self._clients.move_to_end(key)
+            self._borrowed[key] = self._borrowed.get(key, 0) + 1
+            idle = [k for k in self._clients if k != key and not self._borrowed.get(k)]
+            evicted = [
+                self._clients.pop(k) for k in idle[:max(0, len(self._clients) - self.max_clients)]
+            ]
+        for old in evicted:
+            await old.__aexit__(None, None, None)
+        try:
+            yield client
+        finally:
+            self._borrowed[key] -= 1
+            if not self._borrowed[key]:
+                del self._borrowed[key]
+
+    def provider(self, name: str) -> AIProvider:
+        """Return the shared AI provider instance for a provider name."""
+        provider = self._providers.get(name)
+        if provider is None:
+            provider = get_provider(name)
+            self._providers[name] = provider
+        return provider
+
+    async def _close_clients(self) -> None:
+        clients, self._clients = self._clients, OrderedDict()
+        self._providers = {}
+        for client in clients.values():
+            await client.__aexit__(None, None, None)
+
+
+def _credential_key(platform: str, credential: dict[str, Any]) -> str:
+    """Pool key for a credential that doesn't keep the token in clear."""
+    material = f"{platform}\0{credential.get('base_url', '')}\0{credential['token']}"
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+_runtime: WorkerRuntime | None = None
+_runtime_pid: int | None = None
+
+
+def get_runtime() -> WorkerRuntime:
+    """Return this process's runtime.
+
+    A runtime inherited across fork is unusable (its loop thread didn't
+    survive), so forked children build their own.
+    """
+    global _runtime, _runtime_pid
+    if _runtime is None or _runtime_pid != os.getpid():
+        from ..config import Config
+
+        _runtime = WorkerRuntime(max_clients=Config.WORKER_MAX_PLATFORM_CLIENTS)
+        _runtime_pid = os.getpid()
+    return _runtime
+
+
+def run_async(coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+    """Run a coroutine on the worker-lifetime loop (replaces asyncio.run)."""
+    return get_runtime().run(coro, timeout)
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking call from a coroutine on the worker loop (see WorkerRuntime)."""
+    return await get_runtime().run_blocking(func, *args, **kwargs)
+
+
+@celeryd_init.connect
+def _share_host_cores(conf=None, options=None, **kwargs) -> None:
+    """Split the host's linter slots among prefork children before they fork.
+
+    Thread-pool workers run every task in one process and keep all the cores.
+    """
+    from ..core.linter_scheduler import available_cpus, share_cores
+
+    options = options or {}
+    pool = options.get("pool_cls") or (conf.worker_pool if conf is not None else None)
+    if isinstance(pool, str) or pool is None:
+        pool = concurrency.get_implementation(pool or "prefork")
+    if pool is not concurrency.get_implementation("prefork"):
+        return
+    processes = options.get("concurrency") or (conf.worker_concurrency if conf else None)
+    share_cores(processes or available_cpus())
+
+
+@worker_process_init.connect
+def _start_runtime(**kwargs) -> None:
+    get_runtime().start()
+    _probe_toolchain()
+
+
+def _probe_toolchain() -> None:
+    """Probe every linter tool once, in parallel, and publish the inventory."""
+    from ..core.toolchain import get_toolchain, publish_inventory
+    from ..redis_client import get_redis
+
+    try:
+        tools = run_async(get_toolchain().probe(), timeout=60)
+    except Exception as e:
+        # Linters probe themselves on first use instead
+        logger.warning(f"Linter toolchain probe failed: {e}")
+        return
+    missing = [tool.linter for tool in tools if not tool.available]
+    if missing:
+        logger.info(f"Linters without their tool installed: {', '.join(missing)}")
+    publish_inventory(get_redis(), tools)
+
+
+@worker_process_shutdown.connect
+def _stop_runtime(**kwargs) -> None:
+    get_runtime().stop()
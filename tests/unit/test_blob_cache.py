@@ -0,0 +1,156 @@
+"""Unit tests for the content-addressed blob cache."""
+
+import mmap
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Add Flask backend to path
+flask_backend_path = Path(__file__).parent.parent.parent / "services" / "flask-backend"
+sys.path.insert(0, str(flask_backend_path))
+
+from app.git.blob_cache import BlobCache, git_blob_sha
+from app.integrations.github import GitHubClient, GitHubConfig
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return BlobCache(tmp_path / "blobs", max_bytes=1024, mmap_threshold=64)
+
+
+def test_git_blob_sha_matches_git(tmp_path):
+    """Blob IDs agree with git hash-object."""
+    data = b"print('hello')\n"
+    sample = tmp_path / "sample.py"
+    sample.write_bytes(data)
+
+    try:
+        expected = subprocess.run(
+            ["git", "hash-object", str(sample)], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        pytest.skip("git not available")
+
+    assert git_blob_sha(data) == expected
+
+
+class TestBlobCache:
+    """Test cache storage, lookup and eviction."""
+
+    def test_put_then_get(self, cache):
+        data = b"content"
+        sha = git_blob_sha(data)
+
+        assert cache.get(sha) is None
+        cache.put(sha, data)
+
+        assert cache.get(sha) == data
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_large_blobs_are_memory_mapped(self, cache):
+        small, large = b"s" * 10, b"L" * 100
+        cache.put(git_blob_sha(small), small)
+        cache.put(git_blob_sha(large), large)
+        with cache.open(git_blob_sha(small)) as content:
+            assert content == small
+        with cache.open(git_blob_sha(large)) as content:
+            assert isinstance(content, mmap.mmap)
+            assert content[:] == large
+
+        assert cache.get(git_blob_sha(large), max_bytes=8) == b"L" * 8
+        assert cache.get(git_blob_sha(large)) == large
+
+    def test_materialize(self, cache, tmp_path):
+        data = b"x = 1\n"
+        sha = git_blob_sha(data)
+        cache.store(data)
+
+        dest = tmp_path / "sandbox" / "pkg" / "mod.py"
+        assert cache.materialize(sha, dest)
+        assert dest.read_bytes() == data
+        assert not cache.materialize(git_blob_sha(b"missing"), tmp_path / "missing.py")
+
+    def test_rejects_invalid_sha(self, cache):
+        with pytest.raises(ValueError):
+            cache.path_for("../../etc/passwd")
+
+    def test_lru_eviction(self, cache):
+        """Trimming removes least recently used blobs once the cap is exceeded."""
+        blobs = [bytes([i]) * 300 for i in range(3)]
+        shas = [git_blob_sha(b) for b in blobs]
+        for age, (sha, data) in enumerate(zip(shas, blobs)):
+            path = cache.put(sha, data)
+            os.utime(path, (1000 + age, 1000 + age))
+
+        # Reading the oldest blob makes it the most recently used
+        assert cache.get(shas[0]) is not None
+
+        assert cache.trim() == 0
+        fourth = b"z" * 300
+        cache.put(git_blob_sha(fourth), fourth)
+
+        # Writes never evict; the cap is enforced by trim
+        assert cache.size_bytes() == 1200
+        assert cache.trim() == 1
+        assert cache.size_bytes() <= 1024
+        assert cache.contains(shas[0])
+        assert not cache.contains(shas[1])
+
+    def test_trim_sees_other_processes_blobs(self, cache):
+        other = BlobCache(cache.base_path, max_bytes=1024)
+        for i in range(4):
+            data = bytes([i]) * 300
+            (cache if i % 2 else other).put(git_blob_sha(data), data)
+
+        assert cache.trim() == 1
+        assert other.size_bytes() == 900
+
+
+@pytest.mark.asyncio
+async def test_github_blob_fetched_once(tmp_path):
+    """A known blob SHA is downloaded in raw form once, then served from disk."""
+    data = b"def f():\n    return 1\n"
+    sha = git_blob_sha(data)
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, content=data)
+
+    client = GitHubClient(GitHubConfig(token="t"), blob_cache=BlobCache(tmp_path))
+    client._client = httpx.AsyncClient(
+        base_url="https://api.github.com", transport=httpx.MockTransport(handler)
+    )
+
+    first = await client.get_file_content("org", "repo", "f.py", "main", blob_sha=sha)
+    second = await client.get_file_content("org", "repo", "f.py", "main", blob_sha=sha)
+
+    assert first == second == data.decode()
+    assert len(requests) == 1
+    assert requests[0].headers["Accept"] == "application/vnd.github.raw"
+
+
+def test_lint_checkout_files_come_from_cache(cache, tmp_path, monkeypatch):
+    """Cached head blobs are staged before the checkout; fetched files fill the cache."""
+    from app.tasks import review_worker
+
+    monkeypatch.setattr(review_worker, "get_blob_cache", lambda: cache)
+    cached, fetched = b"a = 1\n", b"b = 2\n"
+    cache.store(cached)
+    blobs = {"pkg/a.py": git_blob_sha(cached), "pkg/b.py": git_blob_sha(fetched)}
+
+    staged = review_worker._stage_cached_blobs(tmp_path / "staging", blobs)
+    assert list(staged) == ["pkg/a.py"]
+
+    repo = tmp_path / "repo"
+    (repo / "pkg").mkdir(parents=True)
+    (repo / "pkg" / "b.py").write_bytes(fetched)
+    review_worker._place_cached_blobs(repo, staged, ["pkg/b.py"])
+
+    assert (repo / "pkg" / "a.py").read_bytes() == cached
+    assert cache.get(git_blob_sha(fetched)) == fetched
+    assert not review_worker._is_relative_path("../outside.py")
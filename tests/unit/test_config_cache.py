@@ -0,0 +1,113 @@
+"""Unit tests for the config lookup cache."""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add Flask backend to path
+flask_backend_path = Path(__file__).parent.parent.parent / "services" / "flask-backend"
+sys.path.insert(0, str(flask_backend_path))
+
+from app import cache as cache_module
+from app.cache import ConfigCache, _decode, _encode, _handle_invalidation
+
+
+class CountingLoader:
+    """Loader that records how often it was called."""
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+class TestLocalCache:
+    """Test the per-process LRU/TTL layer."""
+
+    def test_hit_after_first_load(self):
+        cache = ConfigCache("test_hit")
+        loader = CountingLoader({"id": 1, "enabled": True})
+
+        assert cache.get_or_load("github:org/repo", loader) == {"id": 1, "enabled": True}
+        assert cache.get_or_load("github:org/repo", loader) == {"id": 1, "enabled": True}
+        assert loader.calls == 1
+
+    def test_none_is_cached(self):
+        cache = ConfigCache("test_none")
+        loader = CountingLoader(None)
+
+        cache.get_or_load("github:nobody", loader)
+        cache.get_or_load("github:nobody", loader)
+
+        assert loader.calls == 1
+
+    def test_callers_get_copies(self):
+        cache = ConfigCache("test_copies")
+        cache.get_or_load("k", lambda: {"categories": ["security"]})["categories"].append("x")
+
+        assert cache.get_or_load("k", lambda: None) == {"categories": ["security"]}
+
+    def test_ttl_expiry(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+        cache = ConfigCache("test_ttl", ttl_seconds=60)
+        loader = CountingLoader("v")
+
+        cache.get_or_load("k", loader)
+        now[0] += 61
+        cache.get_or_load("k", loader)
+
+        assert loader.calls == 2
+
+    def test_lru_eviction(self):
+        cache = ConfigCache("test_lru", maxsize=2)
+        cache.get_or_load("a", lambda: 1)
+        cache.get_or_load("b", lambda: 2)
+        cache.get_or_load("a", lambda: 1)  # a is now most recent
+        cache.get_or_load("c", lambda: 3)
+
+        loader = CountingLoader(2)
+        cache.get_or_load("b", loader)
+        assert loader.calls == 1
+
+    def test_invalidate(self):
+        cache = ConfigCache("test_invalidate")
+        loader = CountingLoader("v")
+
+        cache.get_or_load("k", loader)
+        cache.invalidate("k")
+        cache.get_or_load("k", loader)
+
+        assert loader.calls == 2
+
+
+class TestInvalidationMessages:
+    """Test handling of invalidations broadcast by other processes."""
+
+    def test_remote_invalidation_drops_entry(self):
+        cache = ConfigCache("test_remote")
+        loader = CountingLoader("v")
+        cache.get_or_load("k", loader)
+
+        _handle_invalidation(
+            {"data": json.dumps({"cache": "test_remote", "key": "k", "origin": "other-1"})}
+        )
+        cache.get_or_load("k", loader)
+
+        assert loader.calls == 2
+
+    def test_garbage_message_ignored(self):
+        _handle_invalidation({"data": b"not json"})
+
+
+class TestSerialization:
+    """Test the Redis payload encoding."""
+
+    def test_datetime_round_trip(self):
+        value = {"id": 3, "last_webhook_at": datetime(2024, 5, 1, 12, 30), "tags": ["a"]}
+
+        assert _decode(_encode(value)) == value
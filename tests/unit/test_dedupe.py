@@ -0,0 +1,168 @@
+"""Unit tests for finding fingerprints and duplicate suppression."""
+
+import asyncio
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+# Add Flask backend to path
+flask_backend_path = Path(__file__).parent.parent.parent / "services" / "flask-backend"
+sys.path.insert(0, str(flask_backend_path))
+
+from app.core.dedupe import (
+    add_fingerprint_marker,
+    extract_fingerprints,
+    finding_fingerprint,
+    normalize_path,
+    patch_line_map,
+)
+from app.integrations.github import GitHubAPIError, GitHubRateLimitError
+from app.tasks import publish_worker
+from app.tasks.publish_worker import _partition_duplicates
+
+
+PATCH = """@@ -10,4 +10,5 @@ def handler():
+     user = request.args["user"]
+-    query = "SELECT * FROM users"
++    query = f"SELECT * FROM users WHERE name = '{user}'"
++    cursor.execute(query)
+     return cursor.fetchall()
+\\ No newline at end of file"""
+
+
+class TestPatchLineMap:
+    """Test mapping of new-side line numbers to content."""
+
+    def test_added_and_context_lines(self):
+        lines = patch_line_map(PATCH)
+
+        assert lines[10] == '    user = request.args["user"]'
+        assert lines[11].startswith("    query = f")
+        assert lines[12] == "    cursor.execute(query)"
+        assert lines[13] == "    return cursor.fetchall()"
+        assert 14 not in lines
+
+
+class TestFingerprint:
+    """Test fingerprint stability."""
+
+    def test_stable_across_line_shifts(self):
+        """The same finding on a moved line keeps its fingerprint."""
+        shifted = PATCH.replace("@@ -10,4 +10,5 @@", "@@ -20,4 +20,5 @@")
+
+        first = finding_fingerprint(
+            "app/db.py", "security", "SQL injection", patch_line_map(PATCH)[11]
+        )
+        second = finding_fingerprint(
+            "app/db.py", "security", "SQL injection", patch_line_map(shifted)[21]
+        )
+
+        assert first == second
+
+    def test_normalizes_path_title_and_whitespace(self):
+        a = finding_fingerprint("./app/db.py", "security", "SQL  Injection", "x =  1")
+        b = finding_fingerprint("app/db.py", "Security", "sql injection", "x = 1 ")
+
+        assert a == b
+
+    def test_changed_anchor_line_is_new_finding(self):
+        a = finding_fingerprint("app/db.py", "security", "SQL injection", "x = 1")
+        b = finding_fingerprint("app/db.py", "security", "SQL injection", "x = 2")
+
+        assert a != b
+
+    def test_normalize_path(self):
+        assert normalize_path("./src//pkg/../mod.py") == "src/mod.py"
+        assert normalize_path("/src/mod.py") == "src/mod.py"
+
+
+class TestPlatformMarkers:
+    """Test the hidden fingerprint marker round trip."""
+
+    def test_marker_round_trip(self):
+        fingerprint = finding_fingerprint("a.py", "security", "t")
+        body = add_fingerprint_marker("**Title**\n\nBody", fingerprint)
+
+        found = extract_fingerprints([{"id": 42, "body": body}, {"id": 7, "body": None}])
+
+        assert found == {fingerprint: "42"}
+
+
+class TestPartitionDuplicates:
+    """Test splitting pending comments before publishing."""
+
+    def test_known_and_repeated_fingerprints(self):
+        comments = [
+            {"id": 1, "fingerprint": "a"},
+            {"id": 2, "fingerprint": "b"},
+            {"id": 3, "fingerprint": "b"},
+            {"id": 4, "fingerprint": None},
+        ]
+
+        groups, duplicates = _partition_duplicates(comments, {"a": "gh-100"})
+
+        assert [(c["id"], existing) for c, existing in duplicates] == [(1, "gh-100")]
+        assert [[c["id"] for c in group] for group in groups] == [[2, 3], [4]]
+
+
+class FakeGitHub:
+    """Rejects some comments, rate-limits others and posts the rest."""
+
+    def __init__(self, errors):
+        self.errors = errors
+
+    async def list_review_comments(self, owner, repo, pr_number):
+        return []
+
+    async def create_review_comment(self, path, **kwargs):
+        if path in self.errors:
+            raise self.errors[path]
+        return {"id": f"gh-{path}"}
+
+
+class FakeRuntime:
+    def __init__(self, client):
+        self.client = client
+
+    @asynccontextmanager
+    async def github(self, credential):
+        yield self.client
+
+
+class TestPublishFailures:
+    """Test how platform errors leave comments."""
+
+    def test_rejected_comments_are_marked_failed(self, monkeypatch):
+        statuses, errors = [], []
+        client = FakeGitHub({
+            "bad.py": GitHubAPIError("line must be part of the diff", status_code=422),
+            "busy.py": GitHubRateLimitError("slow down", status_code=403),
+        })
+        monkeypatch.setattr(publish_worker, "get_runtime", lambda: FakeRuntime(client))
+        monkeypatch.setattr(
+            publish_worker, "update_comment_status",
+            lambda comment_id, status, platform_comment_id=None: statuses.append(
+                (comment_id, status, platform_comment_id)
+            ),
+        )
+        monkeypatch.setattr(
+            publish_worker, "record_error",
+            lambda task, entity_type, entity_id, exc: errors.append((entity_type, entity_id)),
+        )
+        comments = [
+            {"id": i, "file_path": path, "line_end": 1, "fingerprint": fingerprint,
+             "severity": "minor", "category": "best_practices", "title": "t", "body": "b"}
+            for i, path, fingerprint in [
+                (1, "ok.py", "a"), (2, "bad.py", "b"), (3, "bad.py", "b"), (4, "busy.py", "c")
+            ]
+        ]
+        review = {"platform": "github", "repository": "acme/api", "pull_request_id": 7}
+
+        counts = asyncio.run(
+            publish_worker._publish(review, comments, {}, {"head_sha": "abc"}, {})
+        )
+
+        assert counts == {"published": 1, "suppressed": 0, "failed": 1, "retryable": 1}
+        assert sorted(statuses) == [(1, "open", "gh-ok.py"), (2, "failed", None),
+                                    (3, "failed", None)]
+        assert errors == [("review_comment", 2)]
@@ -0,0 +1,184 @@
+"""Unit tests for repository detection caching and merging."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import redis
+
+# Add Flask backend to path
+flask_backend_path = Path(__file__).parent.parent.parent / "services" / "flask-backend"
+sys.path.insert(0, str(flask_backend_path))
+
+from app.core.detection_cache import DetectionCache, detect_tree
+from app.core.detector import DetectionResult, LanguageDetector, merge_detection
+from app.core.reviewer import PRFile, ReviewEngine
+
+
+class FakeRedis:
+    """Just enough of the Redis API for get/set."""
+
+    def __init__(self):
+        self.values = {}
+        self.down = False
+
+    def get(self, key):
+        if self.down:
+            raise redis.ConnectionError("down")
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        if self.down:
+            raise redis.ConnectionError("down")
+        self.values[key] = value
+
+
+TREE = {
+    "package.json": b'{"dependencies": {"react": "^18.0.0"}}',
+    "src/index.js": b"export default 1;\n",
+    "src/util.js": b"export const x = 1;\n",
+    "main.tf": b'resource "aws_s3_bucket" "b" {}\n',
+    "Dockerfile": b"FROM node:20\n",
+}
+
+
+def _listing() -> list[tuple[str, str]]:
+    return [(path, f"blob-{path}") for path in TREE]
+
+
+class TestDetectTree:
+    """Test detection from an API tree listing."""
+
+    def test_reads_only_content_candidates(self):
+        read = []
+
+        async def read_blob(sha):
+            read.append(sha)
+            return TREE[sha.removeprefix("blob-")]
+
+        result = asyncio.run(detect_tree(LanguageDetector(), _listing(), read_blob))
+
+        assert read == ["blob-package.json"]
+        assert "react" in result.frameworks
+        assert result.iac_tools == ["terraform", "docker"]
+        assert result.languages["javascript"] > 0
+
+    def test_unreadable_blobs_are_skipped(self):
+        async def read_blob(sha):
+            raise OSError("gone")
+
+        result = asyncio.run(detect_tree(LanguageDetector(), _listing(), read_blob))
+
+        assert result.iac_tools == ["terraform", "docker"]
+        assert "react" not in result.frameworks
+
+
+class TestDetectionCache:
+    """Test caching per tree."""
+
+    def test_detects_once_per_tree(self):
+        cache = DetectionCache(FakeRedis())
+        calls = []
+
+        async def detect():
+            calls.append(1)
+            return DetectionResult(
+                languages={"go": 1.0}, iac_tools=["docker"], file_mapping={"main.go": "go"}
+            )
+
+        async def main():
+            first = await cache.get_or_detect("github", "acme/api", "tree1", detect)
+            second = await cache.get_or_detect("github", "acme/api", "tree1", detect)
+            await cache.get_or_detect("github", "acme/api", "tree2", detect)
+            return first, second
+
+        first, second = asyncio.run(main())
+
+        assert len(calls) == 2
+        assert first == second
+        assert second.iac_tools == ["docker"] and second.file_mapping == {}
+
+    def test_redis_errors_are_misses(self):
+        client = FakeRedis()
+        client.down = True
+        cache = DetectionCache(client)
+
+        async def detect():
+            return DetectionResult(languages={"go": 1.0})
+
+        result = asyncio.run(cache.get_or_detect("gitlab", "acme/api", "abc", detect))
+
+        assert result.languages == {"go": 1.0}
+
+
+class TestAwaitDetection:
+    """Test bounding a review's wait for repository detection."""
+
+    def test_slow_detection_is_not_waited_for(self, monkeypatch):
+        from app.tasks import review_worker
+
+        monkeypatch.setattr(review_worker.Config, "DETECTION_WAIT_SECONDS", 0.01)
+        cached = DetectionResult(languages={"go": 1.0})
+
+        async def slow_detection():
+            await asyncio.sleep(0.05)
+            return cached
+
+        async def main():
+            ready = asyncio.ensure_future(asyncio.sleep(0, cached))
+            slow = asyncio.ensure_future(slow_detection())
+            results = [
+                await review_worker._await_detection({"id": 1}, ready),
+                await review_worker._await_detection({"id": 2}, slow),
+            ]
+            # The slow detection keeps running so the cache gets filled
+            return results, await slow
+
+        (ready, slow), finished = asyncio.run(main())
+
+        assert ready is cached
+        assert slow is None
+        assert finished is cached
+
+
+class TestMerge:
+    """Test merging repository and change detections."""
+
+    def test_merge_keeps_repository_context(self):
+        base = DetectionResult(
+            languages={"python": 0.8, "yaml": 0.2},
+            frameworks={"flask": 0.8},
+            iac_tools=["docker"],
+        )
+        changed = LanguageDetector().detect_from_files(["api/app.py", "web/App.tsx"])
+        changed.frameworks = {"flask": 0.3, "react": 0.3}
+        changed.iac_tools = ["docker", "kubernetes"]
+
+        merged = merge_detection(base, changed)
+
+        assert merged.languages == {"python": 0.8, "yaml": 0.2, "typescript": 0.5}
+        assert merged.frameworks == {"flask": 0.8, "react": 0.3}
+        assert merged.iac_tools == ["docker", "kubernetes"]
+        assert merged.file_mapping == {"api/app.py": "python", "web/App.tsx": "typescript"}
+
+    def test_pr_review_sees_repository_frameworks(self):
+        base = DetectionResult(languages={"python": 1.0}, frameworks={"django": 0.63})
+        pr_file = PRFile(path="views.py", status="modified", additions=1, deletions=0,
+                         patch="@@ -1 +1 @@\n-a\n+b\n")
+
+        result = asyncio.run(
+            ReviewEngine().review_pr_stream(
+                platform="github",
+                repository="acme/api",
+                pages=_pages([pr_file]),
+                config={"categories": ["security"]},
+                base_detection=base,
+            )
+        )
+
+        assert result.detection.frameworks == {"django": 0.63}
+        assert result.detection.file_mapping == {"views.py": "python"}
+
+
+async def _pages(files):
+    yield files
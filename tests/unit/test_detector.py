@@ -0,0 +1,104 @@
+"""Unit tests for directory language, framework and IaC detection."""
+
+import sys
+import time
+from pathlib import Path
+
+# Add Flask backend to path
+flask_backend_path = Path(__file__).parent.parent.parent / "services" / "flask-backend"
+sys.path.insert(0, str(flask_backend_path))
+
+from app.core import detector
+from app.core.detector import LanguageDetector
+
+
+def _tree(root: Path, files: dict[str, str]) -> Path:
+    for name, content in files.items():
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_text(content)
+    return root
+
+
+class TestDetectFromDirectory:
+    """Test detection from a checkout on disk."""
+
+    def test_frameworks_and_iac_from_manifests(self, tmp_path):
+        repo = _tree(tmp_path, {
+            "package.json": '{"dependencies": {"react": "^18.0.0", "express": "^4"}}',
+            "requirements.txt": "Flask==3.0.0\n",
+            "web/App.tsx": "export const App = () => null;\n",
+            "api/app.py": "from flask import Flask\n",
+            ".github/workflows/ci.yml": "on: push\n",
+            "deploy/app.yaml": "apiVersion: apps/v1\nkind: Deployment\n",
+            "Dockerfile": "FROM python:3.12\n",
+        })
+
+        result = LanguageDetector().detect_from_directory(repo)
+
+        assert set(result.frameworks) == {"react", "express", "flask"}
+        assert result.frameworks["flask"] == 1.0
+        assert result.iac_tools == ["github_actions", "kubernetes", "docker"]
+        assert result.file_mapping["api/app.py"] == "python"
+
+    def test_ignored_directories_are_not_walked(self, tmp_path):
+        repo = _tree(tmp_path, {
+            "main.go": "package main\n",
+            "node_modules/left-pad/index.js": "module.exports = 1;\n",
+            ".git/config": "[core]\n",
+            "vendor/lib/lib.go": "package lib\n",
+        })
+
+        result = LanguageDetector().detect_from_directory(repo)
+
+        assert result.file_mapping == {"main.go": "go"}
+        assert result.languages == {"go": 1.0}
+
+    def test_content_reads_are_bounded(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(detector, "CONTENT_READ_BYTES", 32)
+        monkeypatch.setattr(detector, "MAX_CONTENT_FILES", 3)
+        repo = _tree(tmp_path, {
+            **{f"deep/nested/{i}.yaml": "name: x\n" for i in range(10)},
+            "late.yaml": "#" * 64 + "\nkind: Service\n",  # beyond the bytes read
+            "deep/template.json": '{"AWSTemplateFormatVersion": "2010-09-09"}',
+        })
+        read = []
+        probe_get = detector._ContentProbe.get
+
+        def get(self, file):
+            read.append(file)
+            return probe_get(self, file)
+
+        monkeypatch.setattr(detector._ContentProbe, "get", get)
+
+        result = LanguageDetector().detect_from_directory(repo)
+
+        assert result.iac_tools == ["cloudformation"]
+        assert "late.yaml" in read
+        assert len({f for f in read if f.endswith(".yaml")}) == 3
+
+    def test_provided_contents_take_precedence(self, tmp_path):
+        repo = _tree(tmp_path, {"Gemfile": "source 'https://rubygems.org'\n"})
+
+        result = LanguageDetector().detect_from_directory(
+            repo, file_contents={"Gemfile": "gem 'rails'"}
+        )
+
+        assert "rails" in result.frameworks
+
+
+def test_large_tree_detection_time(tmp_path):
+    """Walk and match a 20k-file tree (printed for comparison across changes)."""
+    for d in range(200):
+        directory = tmp_path / f"pkg{d}"
+        directory.mkdir()
+        for f in range(100):
+            (directory / f"m{f}.{'py' if f % 2 else 'ts'}").touch()
+    (tmp_path / "package.json").write_text('{"dependencies": {"vue": "3"}}')
+
+    start = time.perf_counter()
+    result = LanguageDetector().detect_from_directory(tmp_path)
+    elapsed = time.perf_counter() - start
+    print(f"\ndetected 20000 files in {elapsed * 1000:.0f} ms")
+
+    assert (result.languages["python"], result.languages["typescript"]) == (0.5, 0.5)
+    assert "vue" in result.frameworks
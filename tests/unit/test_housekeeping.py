@@ -0,0 +1,69 @@
+"""Unit tests for per-host housekeeping of review workers."""
+
+import sys
+from pathlib import Path
+
+# Add Flask backend to path
+flask_backend_path = Path(__file__).parent.parent.parent / "services" / "flask-backend"
+sys.path.insert(0, str(flask_backend_path))
+
+from app.tasks.housekeeping import HostHousekeeper, HousekeepingJob, consumes_review_lane
+
+
+def _job(name, interval, runs):
+    async def run():
+        runs.append(name)
+        return {"status": "ok"}
+
+    return HousekeepingJob(name, interval, run)
+
+
+class TestHostHousekeeper:
+    """Test leader election and job timing."""
+
+    def test_one_worker_per_host_and_job(self, tmp_path):
+        first_runs, second_runs = [], []
+        first = HostHousekeeper(tmp_path, [_job("reap", 60, first_runs)])
+        second = HostHousekeeper(
+            tmp_path, [_job("reap", 60, second_runs), _job("trim", 60, second_runs)]
+        )
+
+        assert first.run_due(0) == ["reap"]
+        assert second.run_due(0) == ["trim"]
+
+        first.stop()
+        assert second.run_due(0) == ["reap"]
+        second.stop()
+        assert first_runs == ["reap"]
+        assert second_runs == ["trim", "reap"]
+
+    def test_jobs_run_once_per_interval(self, tmp_path):
+        runs = []
+        housekeeper = HostHousekeeper(tmp_path, [_job("reap", 600, runs), _job("gc", 3600, runs)])
+
+        housekeeper.run_due(0)
+        housekeeper.run_due(300)
+        housekeeper.run_due(600)
+        housekeeper.stop()
+
+        assert runs == ["reap", "gc", "reap"]
+
+    def test_failing_job_does_not_stop_others(self, tmp_path):
+        runs = []
+
+        async def boom():
+            raise OSError("disk gone")
+
+        housekeeper = HostHousekeeper(
+            tmp_path, [HousekeepingJob("boom", 60, boom), _job("reap", 60, runs)]
+        )
+
+        assert housekeeper.run_due(0) == ["boom", "reap"]
+        housekeeper.stop()
+        assert runs == ["reap"]
+
+
+def test_only_review_workers_keep_house():
+    assert consumes_review_lane({"ingest", "reviews-sync"})
+    assert consumes_review_lane(None)
+    assert not consumes_review_lane({"ingest", "publish", "plans"})
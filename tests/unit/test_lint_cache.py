@@ -0,0 +1,136 @@
+"""Unit tests for the per-file linter result cache."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add Flask backend to path
+flask_backend_path = Path(__file__).parent.parent.parent / "services" / "flask-backend"
+sys.path.insert(0, str(flask_backend_path))
+
+from app.core.detector import DetectionResult
+from app.core.lint_cache import LintCache
+from app.core.linter import LinterOrchestrator
+from app.git import BlobCache
+from app.linters import BaseLinter, LintIssue, LintResult
+
+
+class BadLineLinter(BaseLinter):
+    """Reports every line containing "bad"; records the files it was run on."""
+
+    name = "python"
+    languages = ["python"]
+    config_files = [".flake8"]
+
+    def __init__(self, version: str = "1.0", error: str | None = None):
+        self._version = version
+        self.error = error
+        self.runs: list[list[str]] = []
+
+    async def is_available(self) -> bool:
+        return True
+
+    async def lint(self, path, files=None):
+        self.runs.append(sorted(Path(f).relative_to(path).as_posix() for f in files))
+        result = LintResult(linter=self.name, success=True, error=self.error)
+        for file in files:
+            for number, line in enumerate(Path(file).read_text().splitlines(), 1):
+                if "bad" in line:
+                    result.issues.append(LintIssue(
+                        file=file, line=number, column=1, severity="warning",
+                        rule_id="B001", message="bad line",
+                    ))
+        result.success = not result.issues
+        return result
+
+
+def _repo(tmp_path, files: dict[str, str]) -> tuple[Path, DetectionResult]:
+    repo = tmp_path / "repo"
+    for name, content in files.items():
+        (repo / name).parent.mkdir(parents=True, exist_ok=True)
+        (repo / name).write_text(content)
+    detection = DetectionResult(
+        languages={"python": 1.0},
+        file_mapping={name: "python" for name in files if name.endswith(".py")},
+    )
+    return repo, detection
+
+
+def _run(tmp_path, linter, repo, detection, files=None) -> LintResult:
+    orchestrator = LinterOrchestrator(LintCache(BlobCache(tmp_path / "lint-cache")))
+    orchestrator._linter_cache["python"] = linter
+    result = asyncio.run(orchestrator.run_linters(
+        repo, detection, files=files, include_security=False
+    ))
+    return result.results[0]
+
+
+class TestLintCache:
+    """Test that only changed blobs are linted again."""
+
+    def test_second_run_lints_only_changed_files(self, tmp_path):
+        repo, detection = _repo(tmp_path, {"a.py": "bad\n", "b.py": "ok\n", "c.py": "x = 1\nbad\n"})
+        linter = BadLineLinter()
+        first = _run(tmp_path, linter, repo, detection)
+
+        (repo / "b.py").write_text("too bad\n")
+        second = _run(tmp_path, linter, repo, detection)
+
+        assert linter.runs == [["a.py", "b.py", "c.py"], ["b.py"]]
+        assert (first.cache_hits, first.cache_misses) == (0, 3)
+        assert (second.cache_hits, second.cache_misses) == (2, 1)
+        assert second.cache_hit_rate == 2 / 3
+        assert sorted((Path(i.file).name, i.line) for i in second.issues) == [
+            ("a.py", 1), ("b.py", 1), ("c.py", 2)
+        ]
+        assert all(i.file == str(repo / Path(i.file).name) for i in second.issues)
+
+    def test_same_blob_in_another_repo_is_a_hit(self, tmp_path):
+        repo, detection = _repo(tmp_path, {"a.py": "bad\n"})
+        _run(tmp_path, BadLineLinter(), repo, detection)
+        other, other_detection = _repo(tmp_path / "other", {"pkg/moved.py": "bad\n"})
+        linter = BadLineLinter()
+
+        result = _run(tmp_path, linter, other, other_detection)
+
+        assert linter.runs == []
+        assert [(i.file, i.line) for i in result.issues] == [(str(other / "pkg/moved.py"), 1)]
+
+    def test_version_and_config_changes_invalidate(self, tmp_path):
+        repo, detection = _repo(tmp_path, {"a.py": "bad\n"})
+        _run(tmp_path, BadLineLinter(), repo, detection)
+
+        upgraded = BadLineLinter(version="2.0")
+        _run(tmp_path, upgraded, repo, detection)
+        (repo / ".flake8").write_text("[flake8]\nmax-line-length = 120\n")
+        reconfigured = BadLineLinter(version="2.0")
+        _run(tmp_path, reconfigured, repo, detection)
+
+        assert upgraded.runs == [["a.py"]]
+        assert reconfigured.runs == [["a.py"]]
+
+    def test_failed_runs_are_not_cached(self, tmp_path):
+        repo, detection = _repo(tmp_path, {"a.py": "bad\n"})
+        failed = _run(tmp_path, BadLineLinter(error="crashed"), repo, detection)
+        linter = BadLineLinter()
+
+        _run(tmp_path, linter, repo, detection)
+
+        assert failed.error == "crashed"
+        assert linter.runs == [["a.py"]]
+
+    def test_non_cacheable_linter_runs_as_before(self, tmp_path):
+        repo, detection = _repo(tmp_path, {"a.py": "bad\n"})
+        linter = BadLineLinter()
+        linter.cacheable = False
+        calls = []
+
+        async def lint(path, files=None):
+            calls.append(files)
+            return LintResult(linter="python", success=True)
+
+        linter.lint = lint
+        result = _run(tmp_path, linter, repo, detection)
+
+        assert calls == [None]
+        assert result.cache_hit_rate is None
@@ -0,0 +1,191 @@
+"""Unit tests for linter scheduling, sharding and memory caps."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add Flask backend to path
+flask_backend_path = Path(__file__).parent.parent.parent / "services" / "flask-backend"
+sys.path.insert(0, str(flask_backend_path))
+
+from app.core.detector import DetectionResult
+from app.core.linter import LinterOrchestrator
+from app.core import linter_scheduler
+from app.core.linter_scheduler import LinterScheduler, shard_files
+from app.linters import BaseLinter, LintIssue, LintResult
+
+
+class CountingLinter(BaseLinter):
+    """Reports one issue per file and records how many runs overlap."""
+
+    name = "python"
+    languages = ["python"]
+
+    def __init__(self, weight: int = 1, cacheable: bool = True):
+        self.weight = weight
+        self.cacheable = cacheable
+        self.runs: list[list[str]] = []
+        self.running = 0
+        self.peak = 0
+
+    async def is_available(self) -> bool:
+        return True
+
+    async def lint(self, path, files=None):
+        self.runs.append(files)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return LintResult(linter=self.name, success=False, issues=[
+            LintIssue(file=f, line=1, column=1, severity="warning", rule_id="X1", message="x")
+            for f in files
+        ])
+
+
+class TestScheduler:
+    """Test the weighted, first come first served semaphore."""
+
+    def test_weights_never_exceed_slots(self):
+        scheduler = LinterScheduler(slots=4)
+        peak = 0
+
+        async def run(weight):
+            nonlocal peak
+            async with scheduler.slot(weight):
+                peak = max(peak, scheduler.in_use)
+                await asyncio.sleep(0.01)
+
+        async def main():
+            await asyncio.gather(*(run(w) for w in (1, 3, 2, 4, 1, 1, 8)))
+
+        asyncio.run(main())
+
+        assert peak <= 4
+        assert scheduler.in_use == 0
+
+    def test_heavy_waiter_is_not_starved(self):
+        scheduler = LinterScheduler(slots=2)
+        order = []
+
+        async def run(name, weight, delay):
+            await asyncio.sleep(delay)
+            async with scheduler.slot(weight):
+                order.append(name)
+                await asyncio.sleep(0.02)
+
+        async def main():
+            await asyncio.gather(
+                run("light-1", 1, 0),
+                run("heavy", 2, 0.001),
+                run("light-2", 1, 0.002),
+            )
+
+        asyncio.run(main())
+
+        assert order == ["light-1", "heavy", "light-2"]
+
+    def test_cancelled_waiter_gives_up_its_place(self):
+        scheduler = LinterScheduler(slots=1)
+
+        async def main():
+            async with scheduler.slot():
+                waiter = asyncio.create_task(scheduler.slot().__aenter__())
+                await asyncio.sleep(0)
+                waiter.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await waiter
+            async with scheduler.slot():
+                return scheduler.in_use
+
+        assert asyncio.run(main()) == 1
+        assert scheduler.in_use == 0
+
+
+class TestSlotBudget:
+    """Test how a process's default slots are sized."""
+
+    def test_prefork_children_split_the_cores(self, monkeypatch):
+        monkeypatch.setattr(linter_scheduler, "available_cpus", lambda: 16)
+        monkeypatch.setattr(linter_scheduler, "_processes_sharing_cores", 1)
+        assert linter_scheduler.default_slots() == 16
+
+        linter_scheduler.share_cores(4)
+        assert linter_scheduler.default_slots() == 4
+        linter_scheduler.share_cores(32)
+        assert linter_scheduler.default_slots() == 1
+
+    def test_cpu_limit_caps_available_cpus(self, monkeypatch, tmp_path):
+        cpu_max = tmp_path / "cpu.max"
+        cpu_max.write_text("150000 100000\n")
+        monkeypatch.setattr(linter_scheduler, "CGROUP_CPU_MAX", str(cpu_max))
+        monkeypatch.setattr(linter_scheduler.os, "sched_getaffinity", lambda pid: set(range(8)))
+        assert linter_scheduler.available_cpus() == 2
+
+        cpu_max.write_text("max 100000\n")
+        assert linter_scheduler.available_cpus() == 8
+
+
+class TestSharding:
+    """Test splitting file lists across slots."""
+
+    def test_shard_sizes(self):
+        files = [f"f{i}.py" for i in range(1000)]
+
+        assert [len(s) for s in shard_files(files, 4, 500)] == [250, 250, 250, 250]
+        assert [len(s) for s in shard_files(files, 1, 400)] == [400, 400, 200]
+        assert len(shard_files(files[:60], 8, 500)) == 2  # at least 50 per shard
+        assert shard_files([], 4, 500) == []
+
+    def test_orchestrator_shards_and_merges(self, tmp_path):
+        files = [f"m{i}.py" for i in range(200)]
+        detection = DetectionResult(languages={"python": 1.0},
+                                    file_mapping={f: "python" for f in files})
+        linter = CountingLinter()
+        orchestrator = LinterOrchestrator(scheduler=LinterScheduler(slots=2))
+        orchestrator._linter_cache["python"] = linter
+
+        result = asyncio.run(orchestrator.run_linters(
+            tmp_path, detection, files=files, include_security=False
+        ))
+
+        assert sorted(len(run) for run in linter.runs) == [100, 100]
+        assert linter.peak == 2
+        assert result.results[0].linter == "python"
+        assert len(result.results[0].issues) == 200
+
+    def test_heavy_and_package_linters_run_whole(self, tmp_path):
+        files = [f"m{i}.py" for i in range(200)]
+        detection = DetectionResult(languages={"python": 1.0},
+                                    file_mapping={f: "python" for f in files})
+
+        for linter in (CountingLinter(weight=4), CountingLinter(cacheable=False)):
+            orchestrator = LinterOrchestrator(scheduler=LinterScheduler(slots=4))
+            orchestrator._linter_cache["python"] = linter
+            asyncio.run(orchestrator.run_linters(
+                tmp_path, detection, files=files, include_security=False
+            ))
+
+            assert [len(run) for run in linter.runs] == [200]
+
+
+class TestMemoryLimit:
+    """Test the per-subprocess memory cap."""
+
+    def test_data_limit_applied_to_child(self, tmp_path):
+        linter = CountingLinter()
+        linter.memory_limit_mb = 512
+        # Reading stdin first holds the child until the cap has been set
+        script = (
+            "import resource, sys; sys.stdin.read(); "
+            "print(resource.getrlimit(resource.RLIMIT_DATA)[0])"
+        )
+
+        exit_code, stdout, _ = asyncio.run(
+            linter._run_command([sys.executable, "-c", script], tmp_path, stdin=b"")
+        )
+
+        assert exit_code == 0
+        assert int(stdout) == 512 * 1024 * 1024
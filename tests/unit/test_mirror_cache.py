@@ -0,0 +1,187 @@
+"""Unit tests for the persistent git mirror cache."""
+
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add Flask backend to path
+flask_backend_path = Path(__file__).parent.parent.parent / "services" / "flask-backend"
+sys.path.insert(0, str(flask_backend_path))
+
+from app.git import MirrorCache, MirrorError, SandboxManager
+from app.git.mirror import LAST_USED_FILE, REF_PREFIX
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+class PlainCredentials:
+    """Credential manager for local repositories that need no token."""
+
+    def build_auth_url(self, url, token):
+        return url
+
+
+class SourceRepo:
+    """A local upstream repository to mirror."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        path.mkdir()
+        self.git("init", "--quiet")
+        self.git("config", "uploadpack.allowFilter", "true")
+        self.git("config", "uploadpack.allowAnySHA1InWant", "true")
+
+    @property
+    def url(self) -> str:
+        return self.path.as_uri()
+
+    def git(self, *args) -> str:
+        return subprocess.run(
+            ["git", "-C", str(self.path), *args], check=True, capture_output=True, text=True
+        ).stdout.strip()
+
+    def commit(self, files: dict[str, str]) -> str:
+        for name, content in files.items():
+            (self.path / name).parent.mkdir(parents=True, exist_ok=True)
+            (self.path / name).write_text(content)
+        self.git("add", ".")
+        self.git("-c", "user.name=test", "-c", "user.email=test@example.com",
+                 "commit", "--quiet", "-m", "change")
+        return self.git("rev-parse", "HEAD")
+
+
+@pytest.fixture
+def source(tmp_path):
+    return SourceRepo(tmp_path / "source")
+
+
+def _cache(tmp_path, **kwargs) -> MirrorCache:
+    return MirrorCache(tmp_path / "mirrors", PlainCredentials(), **kwargs)
+
+
+def _checkout(tmp_path, cache, url, sha, paths=None):
+    async def run():
+        manager = SandboxManager(str(tmp_path / "sandboxes"), 60)
+        return await cache.checkout(url, "token", await manager.create(), sha, paths)
+
+    return asyncio.run(run())
+
+
+class TestMirrorPath:
+    """Test mirror naming."""
+
+    def test_credentials_and_suffix_ignored(self, tmp_path):
+        cache = _cache(tmp_path)
+
+        assert cache.mirror_path("https://token@github.com/Acme/App.git") == cache.mirror_path(
+            "https://github.com/acme/app"
+        )
+        assert cache.mirror_path("https://github.com/acme/app").name.startswith("github.com-acme-app-")
+
+
+class TestCheckout:
+    """Test worktree checkouts and incremental fetches."""
+
+    def test_sparse_worktree(self, tmp_path, source):
+        sha = source.commit({"pkg/a.py": "a = 1\n", "pkg/b.py": "b = 1\n"})
+
+        result = _checkout(tmp_path, _cache(tmp_path), source.url, sha, ["pkg/a.py"])
+
+        assert result.success, result.error
+        assert (result.repo_path / "pkg" / "a.py").read_text() == "a = 1\n"
+        assert not (result.repo_path / "pkg" / "b.py").exists()
+
+    def test_cached_commit_needs_no_upstream(self, tmp_path, source):
+        sha = source.commit({"a.py": "a = 1\n"})
+        cache = _cache(tmp_path)
+        assert _checkout(tmp_path, cache, source.url, sha).success
+
+        moved = source.path.rename(tmp_path / "gone")
+        result = _checkout(tmp_path, cache, source.url, sha)
+
+        assert result.success, result.error
+        assert (result.repo_path / "a.py").exists()
+        assert moved.exists()
+
+    def test_new_commit_fetched_into_existing_mirror(self, tmp_path, source):
+        cache = _cache(tmp_path)
+        first = source.commit({"a.py": "a = 1\n"})
+        _checkout(tmp_path, cache, source.url, first)
+        second = source.commit({"a.py": "a = 2\n"})
+
+        result = _checkout(tmp_path, cache, source.url, second, ["a.py"])
+
+        assert result.success, result.error
+        assert (result.repo_path / "a.py").read_text() == "a = 2\n"
+        assert len(list((tmp_path / "mirrors").glob("*.git"))) == 1
+
+    def test_unknown_commit_fails(self, tmp_path, source):
+        source.commit({"a.py": "a = 1\n"})
+
+        result = _checkout(tmp_path, _cache(tmp_path), source.url, "f" * 40)
+
+        assert not result.success
+        assert "fetch failed" in result.error
+
+
+class TestLock:
+    """Test per-mirror locking."""
+
+    def test_busy_mirror_fails_without_waiting(self, tmp_path):
+        cache = _cache(tmp_path)
+        mirror = cache.mirror_path("https://github.com/acme/app")
+
+        async def run():
+            async with cache.lock(mirror):
+                async with cache.lock(mirror, wait=False):
+                    pass
+
+        with pytest.raises(MirrorError):
+            asyncio.run(run())
+
+
+class TestMaintenance:
+    """Test ref trimming, gc and LRU eviction."""
+
+    def test_trims_refs_and_collects(self, tmp_path, source):
+        cache = _cache(tmp_path, keep_refs=1)
+        shas = [source.commit({"a.py": f"a = {i}\n"}) for i in range(3)]
+        mirror = asyncio.run(cache.fetch(source.url, "token", shas))
+
+        stats = asyncio.run(cache.maintain())
+
+        refs = subprocess.run(
+            ["git", "--git-dir", str(mirror), "for-each-ref", "--format=%(refname)", REF_PREFIX],
+            check=True, capture_output=True, text=True,
+        ).stdout.split()
+        assert len(refs) == 1
+        assert stats["collected"] == 1
+        assert stats["evicted"] == 0
+
+    def test_evicts_least_recently_used(self, tmp_path, tmp_path_factory):
+        cache = _cache(tmp_path)
+        old = SourceRepo(tmp_path_factory.mktemp("old") / "repo")
+        new = SourceRepo(tmp_path_factory.mktemp("new") / "repo")
+        old_mirror = asyncio.run(cache.fetch(old.url, "token", [old.commit({"a.py": "a\n"})]))
+        new_mirror = asyncio.run(cache.fetch(new.url, "token", [new.commit({"b.py": "b\n"})]))
+        os.utime(old_mirror / LAST_USED_FILE, (1, 1))
+
+        sizes = {u.path: u.size_bytes for u in cache.usage()}
+        removed = asyncio.run(cache.evict(target_bytes=sizes[new_mirror]))
+
+        assert removed == 1
+        assert not old_mirror.exists()
+        assert new_mirror.exists()
+
+    def test_mirror_with_live_worktree_is_kept(self, tmp_path, source):
+        cache = _cache(tmp_path)
+        result = _checkout(tmp_path, cache, source.url, source.commit({"a.py": "a\n"}))
+
+        assert asyncio.run(cache.evict(target_bytes=0)) == 0
+        assert cache.mirror_path(source.url).exists()
+        assert result.repo_path.exists()
@@ -0,0 +1,127 @@
+"""Unit tests for concurrent paged fetching in the platform clients."""
+
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Add Flask backend to path
+flask_backend_path = Path(__file__).parent.parent.parent / "services" / "flask-backend"
+sys.path.insert(0, str(flask_backend_path))
+
+from app.integrations.github import GitHubClient, GitHubConfig
+from app.integrations.gitlab import GitLabClient, GitLabConfig
+
+
+def _github_file(name: str) -> dict:
+    return {
+        "filename": name,
+        "status": "modified",
+        "additions": 1,
+        "deletions": 0,
+        "patch": "@@ -1 +1 @@\n+x",
+    }
+
+
+def _github_handler(total_pages: int, per_page: int = 2):
+    """Serve PR files with Link headers advertising the last page."""
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        requested.append(page)
+        files = [_github_file(f"p{page}_f{i}.py") for i in range(per_page)]
+        last_url = request.url.copy_set_param("page", str(total_pages))
+        headers = {"Link": f'<{last_url}>; rel="last"'} if page < total_pages else {}
+        return httpx.Response(200, json=files, headers=headers)
+
+    return handler, requested
+
+
+@pytest.fixture
+def github_client():
+    def make(handler):
+        client = GitHubClient(GitHubConfig(token="t", max_concurrent_pages=2))
+        client._client = httpx.AsyncClient(
+            base_url="https://api.github.com", transport=httpx.MockTransport(handler)
+        )
+        return client
+
+    return make
+
+
+class TestGitHubPagination:
+    """Test GitHub Link-header pagination."""
+
+    @pytest.mark.asyncio
+    async def test_all_pages_fetched_in_order(self, github_client):
+        """Collected files keep API order regardless of arrival order."""
+        handler, requested = _github_handler(total_pages=4)
+        client = github_client(handler)
+
+        files = await client.get_pull_request_files("org", "repo", 1)
+
+        assert sorted(requested) == [1, 2, 3, 4]
+        assert [f.filename for f in files][:3] == ["p1_f0.py", "p1_f1.py", "p2_f0.py"]
+        assert len(files) == 8
+
+    @pytest.mark.asyncio
+    async def test_first_page_yielded_before_rest(self, github_client):
+        """The iterator hands out page one before later pages are requested."""
+        handler, requested = _github_handler(total_pages=3)
+        client = github_client(handler)
+
+        pages = client.iter_pull_request_files("org", "repo", 1)
+        first = await pages.__anext__()
+
+        assert [f.filename for f in first] == ["p1_f0.py", "p1_f1.py"]
+        assert requested == [1]
+        await pages.aclose()
+
+    @pytest.mark.asyncio
+    async def test_single_page_without_link_header(self, github_client):
+        """A PR with one page of files makes a single request."""
+        handler, requested = _github_handler(total_pages=1)
+        client = github_client(handler)
+
+        files = await client.get_pull_request_files("org", "repo", 1)
+
+        assert requested == [1]
+        assert len(files) == 2
+
+
+class TestGitLabPagination:
+    """Test GitLab header-based pagination."""
+
+    @pytest.mark.asyncio
+    async def test_diffs_use_total_pages_header(self):
+        """MR diffs are fetched across all advertised pages."""
+        requested = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            page = int(request.url.params["page"])
+            requested.append(page)
+            diffs = [
+                {
+                    "old_path": f"p{page}.py",
+                    "new_path": f"p{page}.py",
+                    "diff": "@@ -1 +1 @@\n-a\n+b",
+                    "new_file": False,
+                    "renamed_file": False,
+                    "deleted_file": False,
+                }
+            ]
+            return httpx.Response(200, json=diffs, headers={"X-Total-Pages": "3"})
+
+        client = GitLabClient(GitLabConfig(token="t"))
+        client._client = httpx.AsyncClient(
+            base_url="https://gitlab.com/api/v4", transport=httpx.MockTransport(handler)
+        )
+
+        paths = []
+        async for page in client.iter_merge_request_diffs("1", 7):
+            paths.extend(change.new_path for change in page)
+
+        assert sorted(requested) == [1, 2, 3]
+        assert sorted(paths) == ["p1.py", "p2.py", "p3.py"]
@@ -0,0 +1,143 @@
+"""Unit tests for issue plan budget counters."""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add Flask backend to path
+flask_backend_path = Path(__file__).parent.parent.parent / "services" / "flask-backend"
+sys.path.insert(0, str(flask_backend_path))
+
+from app.core.plan_budget import PlanBudget
+
+
+class FakeRedis:
+    """Just enough of the Redis API for the non-script budget paths."""
+
+    def __init__(self):
+        self.values = {}
+        self.hashes = {}
+        self.script_calls = []
+        self.script_result = 0
+
+    def register_script(self, script):
+        def run(keys, args):
+            self.script_calls.append((keys, args))
+            return self.script_result
+
+        return run
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    def incrby(self, key, amount):
+        self.values[key] = int(self.values.get(key, 0)) + amount
+
+    def decr(self, key):
+        self.incrby(key, -1)
+
+    def expire(self, key, seconds):
+        pass
+
+    def hvals(self, key):
+        return list(self.hashes.get(key, {}).values())
+
+    def hkeys(self, key):
+        return list(self.hashes.get(key, {}))
+
+    def hdel(self, key, *fields):
+        bucket = self.hashes.get(key, {})
+        return sum(1 for field in fields if bucket.pop(field, None) is not None)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    def execute(self):
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+NOW = datetime(2024, 3, 15, 10, 0)
+RESERVED = "darwin:plan-budget:org/repo:2024-03:reserved"
+SPENT = "darwin:plan-budget:org/repo:2024-03:spent"
+COUNT = "darwin:plan-budget:org/repo:2024-03-15:count"
+
+
+class TestReserve:
+    """Test limit arguments and results of the reserve script."""
+
+    def test_reserve_arguments(self):
+        client = FakeRedis()
+        budget = PlanBudget(client, reservation_usd=0.05)
+
+        assert budget.reserve("org/repo", "github-issue-1", 10, 2.5, now=NOW) is None
+
+        keys, args = client.script_calls[0]
+        assert keys == [COUNT, SPENT, RESERVED]
+        assert args[:4] == [10, 2_500_000, 50_000, "github-issue-1"]
+
+    def test_no_limits_passed_as_negative(self):
+        client = FakeRedis()
+        PlanBudget(client).reserve("org/repo", "x", now=NOW)
+
+        assert client.script_calls[0][1][:2] == [-1, -1]
+
+    def test_blocked_reasons(self):
+        client = FakeRedis()
+        budget = PlanBudget(client)
+
+        client.script_result = 1
+        assert budget.reserve("org/repo", "x", 3, None, now=NOW) == "Daily limit exceeded (3)"
+        client.script_result = 2
+        assert "Monthly cost limit exceeded" in budget.reserve("org/repo", "x", None, 1.0, now=NOW)
+
+
+class TestCommitAndReconcile:
+    """Test committing actual costs and correcting drift."""
+
+    def test_commit_replaces_reservation(self):
+        client = FakeRedis()
+        client.hashes[RESERVED] = {"github-issue-1": "50000", "github-issue-2": "50000"}
+        budget = PlanBudget(client)
+
+        budget.commit("org/repo", "github-issue-1", 0.123, created_at=NOW)
+        usage = budget.usage("org/repo", now=NOW)
+
+        assert usage.cost_this_month == 0.123
+        assert usage.cost_reserved == 0.05
+
+    def test_release_only_counts_held_reservations(self):
+        client = FakeRedis()
+        client.values[COUNT] = 2
+        client.hashes[RESERVED] = {"github-issue-1": "50000"}
+        budget = PlanBudget(client)
+
+        budget.release("org/repo", "github-issue-1", now=NOW)
+        budget.release("org/repo", "github-issue-1", now=NOW)
+
+        assert client.values[COUNT] == 1
+
+    def test_reconcile_overwrites_counters(self):
+        client = FakeRedis()
+        client.values[COUNT] = 7
+        client.hashes[RESERVED] = {"open": "50000", "finished": "50000"}
+        budget = PlanBudget(client)
+
+        before = budget.reconcile("org/repo", 5, 1.5, {"open"}, now=NOW)
+
+        assert before.plans_today == 7
+        usage = budget.usage("org/repo", now=NOW)
+        assert usage.plans_today == 5
+        assert usage.cost_this_month == 1.5
+        assert client.hkeys(RESERVED) == ["open"]
@@ -0,0 +1,146 @@
+"""Unit tests for the adaptive repository polling scheduler."""
+
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add Flask backend to path
+flask_backend_path = Path(__file__).parent.parent.parent / "services" / "flask-backend"
+sys.path.insert(0, str(flask_backend_path))
+
+from app.core.poll_scheduler import AdaptivePollScheduler
+
+
+NOW = datetime(2026, 1, 15, 12, 0, 0)
+
+
+@pytest.fixture
+def scheduler():
+    """Scheduler with jitter disabled for deterministic intervals."""
+    return AdaptivePollScheduler(
+        min_interval_minutes=5,
+        max_interval_minutes=240,
+        webhook_healthy_hours=6,
+        jitter_seconds=0,
+    )
+
+
+@pytest.fixture
+def repo_config():
+    """Minimal polling-enabled repository configuration."""
+    return {
+        "id": 1,
+        "platform": "github",
+        "repository": "myorg/myrepo",
+        "polling_interval_minutes": 5,
+        "poll_idle_count": 0,
+        "next_poll_at": None,
+        "last_webhook_at": None,
+    }
+
+
+class TestIntervalMinutes:
+    """Test interval calculation."""
+
+    def test_hot_repo_uses_base_interval(self, scheduler, repo_config):
+        """Repositories with recent reviews are polled at their base interval."""
+        repo_config["poll_idle_count"] = 5
+        assert scheduler.interval_minutes(repo_config, recent_reviews=3) == 5
+
+    def test_idle_repo_backs_off_exponentially(self, scheduler, repo_config):
+        """Each idle poll doubles the interval."""
+        intervals = []
+        for idle_count in range(4):
+            repo_config["poll_idle_count"] = idle_count
+            intervals.append(scheduler.interval_minutes(repo_config, recent_reviews=0))
+
+        assert intervals == [5, 10, 20, 40]
+
+    def test_backoff_capped_at_max_interval(self, scheduler, repo_config):
+        """Backoff never exceeds the configured maximum."""
+        repo_config["poll_idle_count"] = 100
+        assert scheduler.interval_minutes(repo_config, recent_reviews=0) == 240
+
+    def test_repo_interval_below_minimum_is_clamped(self, scheduler, repo_config):
+        """Per-repo intervals can't go below the global minimum."""
+        repo_config["polling_interval_minutes"] = 1
+        assert scheduler.interval_minutes(repo_config, recent_reviews=1) == 5
+
+
+class TestEvaluate:
+    """Test per-tick poll decisions."""
+
+    def test_never_polled_repo_is_due(self, scheduler, repo_config):
+        """A repository without next_poll_at is polled immediately."""
+        decision = scheduler.evaluate(repo_config, recent_reviews=0, now=NOW)
+
+        assert decision.should_poll is True
+        assert decision.reason == "due"
+        assert decision.next_poll_at == NOW + timedelta(minutes=5)
+
+    def test_future_next_poll_is_not_due(self, scheduler, repo_config):
+        """A repository scheduled in the future is skipped."""
+        repo_config["next_poll_at"] = NOW + timedelta(minutes=3)
+
+        decision = scheduler.evaluate(repo_config, recent_reviews=0, now=NOW)
+
+        assert decision.should_poll is False
+        assert decision.reason == "not_due"
+
+    def test_healthy_webhook_skips_poll(self, scheduler, repo_config):
+        """Recent webhook deliveries suppress polling."""
+        repo_config["last_webhook_at"] = NOW - timedelta(hours=1)
+
+        decision = scheduler.evaluate(repo_config, recent_reviews=5, now=NOW)
+
+        assert decision.should_poll is False
+        assert decision.reason == "webhook_healthy"
+        assert decision.next_poll_at == NOW + timedelta(hours=5)
+
+    def test_stale_webhook_resumes_polling(self, scheduler, repo_config):
+        """Polling resumes once webhooks stop arriving."""
+        repo_config["last_webhook_at"] = NOW - timedelta(hours=7)
+
+        decision = scheduler.evaluate(repo_config, recent_reviews=0, now=NOW)
+
+        assert decision.should_poll is True
+
+    def test_jitter_bounds(self, repo_config):
+        """Jitter stays within the configured window and delays next_poll_at."""
+        scheduler = AdaptivePollScheduler(jitter_seconds=30, rng=random.Random(42))
+
+        for _ in range(50):
+            decision = scheduler.evaluate(repo_config, recent_reviews=0, now=NOW)
+            assert 0 <= decision.countdown_seconds <= 30
+            assert decision.next_poll_at == (
+                NOW + timedelta(minutes=5, seconds=decision.countdown_seconds)
+            )
+
+
+class TestRecordPoll:
+    """Test state updates after a poll completes."""
+
+    def test_new_reviews_reset_idle_streak(self, scheduler, repo_config):
+        """Finding new PRs resets the backoff."""
+        repo_config["poll_idle_count"] = 4
+
+        idle_count, next_poll_at = scheduler.record_poll(
+            repo_config, reviews_created=2, recent_reviews=2, now=NOW
+        )
+
+        assert idle_count == 0
+        assert next_poll_at == NOW + timedelta(minutes=5)
+
+    def test_empty_poll_extends_idle_streak(self, scheduler, repo_config):
+        """An empty poll on a cold repository doubles the next interval."""
+        repo_config["poll_idle_count"] = 2
+
+        idle_count, next_poll_at = scheduler.record_poll(
+            repo_config, reviews_created=0, recent_reviews=0, now=NOW
+        )
+
+        assert idle_count == 3
+        assert next_poll_at == NOW + timedelta(minutes=40)
@@ -0,0 +1,259 @@
+"""Unit tests for linting changed files in PR mode."""
+
+import asyncio
+from contextlib import asynccontextmanager
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add Flask backend to path
+flask_backend_path = Path(__file__).parent.parent.parent / "services" / "flask-backend"
+sys.path.insert(0, str(flask_backend_path))
+
+from app.core.dedupe import patch_added_lines
+from app.core.detector import DetectionResult
+from app.core.linter import LinterOrchestrator, lint_config_paths
+from app.core.reviewer import PRFile, ReviewCheckpoint, ReviewEngine, patch_sha
+from app.git import GitCloner, SandboxManager
+from app.linters import LintIssue, LintResult
+
+
+PATCH = "@@ -1,3 +1,4 @@\n import os\n+import sys\n x = 1\n-y = 2\n+y = 3"
+
+
+class FakeLinter:
+    """Linter that records the files it is given and reports fixed issues."""
+
+    cacheable = True
+    weight = 1
+
+    def __init__(self, name, languages, issues=(), error=None):
+        self.name = name
+        self.languages = languages
+        self.issues = list(issues)
+        self.error = error
+        self.calls = []
+
+    async def lint(self, path, files=None):
+        self.calls.append(files)
+        return LintResult(linter=self.name, success=not self.issues, issues=list(self.issues),
+                          error=self.error)
+
+    async def scan_added_lines(self, added, config_path=None):
+        self.calls.append(added)
+        return LintResult(linter=self.name, success=not self.issues, issues=list(self.issues))
+
+
+def _orchestrator(*linters) -> LinterOrchestrator:
+    orchestrator = LinterOrchestrator()
+    for linter in linters:
+        orchestrator._linter_cache[linter.name] = linter
+    return orchestrator
+
+
+def _issue(file: str, line: int, rule: str = "F401") -> LintIssue:
+    return LintIssue(file=file, line=line, column=1, severity="error", rule_id=rule,
+                     message=f"{rule} at {line}")
+
+
+class TestPatchAddedLines:
+    """Test changed line extraction."""
+
+    def test_only_added_lines(self):
+        assert patch_added_lines(PATCH) == {2, 4}
+
+    def test_multiple_hunks(self):
+        patch = "@@ -1 +1 @@\n-a\n+b\n@@ -10,2 +10,3 @@\n c\n+d\n e"
+
+        assert patch_added_lines(patch) == {1, 11}
+
+
+class TestOrchestratorFiles:
+    """Test routing changed files to linters."""
+
+    def test_files_routed_by_language(self, tmp_path):
+        python = FakeLinter("python", ["python"])
+        go = FakeLinter("go", ["go"])
+        security = FakeLinter("security", ["all"])
+        detection = DetectionResult(
+            languages={"python": 0.5, "go": 0.5},
+            file_mapping={"app/main.py": "python", "cmd/main.go": "go"},
+        )
+
+        asyncio.run(_orchestrator(python, go, security).run_linters(
+            tmp_path, detection, files=["app/main.py", "cmd/main.go"]
+        ))
+
+        assert python.calls == [[str(tmp_path / "app/main.py")]]
+        assert go.calls == [[str(tmp_path / "cmd/main.go")]]
+        assert len(security.calls[0]) == 2
+
+    def test_linter_without_files_is_skipped(self, tmp_path):
+        python = FakeLinter("python", ["python"])
+        detection = DetectionResult(languages={"python": 1.0}, file_mapping={"a.py": "python"})
+
+        result = asyncio.run(_orchestrator(python).run_linters(
+            tmp_path, detection, files=["README.md"], include_security=False
+        ))
+
+        assert python.calls == []
+        assert result.results == []
+
+
+class TestLintConfigPaths:
+    """Test the config files checked out next to linted paths."""
+
+    def test_root_and_parent_directories(self):
+        paths = lint_config_paths(["web/src/App.tsx", ".flake8"])
+
+        assert ".flake8" not in paths
+        assert {"setup.cfg", "pyproject.toml", ".tflint.hcl"} <= set(paths)
+        assert ".github/actionlint.yaml" in paths
+        assert {"web/.eslintrc.json", "web/src/package.json", "web/src/.golangci.yml"} <= set(paths)
+
+
+class TestLintPRFiles:
+    """Test PR-mode linting in the review engine."""
+
+    def _review(self, repo_path, engine, checkpoint=None, patch=PATCH):
+        pr_file = PRFile(path="app.py", status="modified", additions=2, deletions=1, patch=patch)
+        checkouts = []
+
+        @asynccontextmanager
+        async def checkout(paths):
+            checkouts.append(paths)
+            yield repo_path
+
+        async def pages():
+            yield [pr_file]
+
+        result = asyncio.run(engine.review_pr_stream(
+            platform="github",
+            repository="acme/app",
+            pages=pages(),
+            config={"categories": ["linter"]},
+            checkpoint=checkpoint,
+            lint_checkout=checkout,
+        ))
+        return result, checkouts
+
+    def _engine(self, repo_path, issues, secrets=()):
+        (repo_path / "app.py").write_text("import os\nimport sys\nx = 1\ny = 3\n")
+        engine = ReviewEngine()
+        engine.linter_orchestrator = _orchestrator(
+            FakeLinter("python", ["python"], issues), FakeLinter("security", ["all"], secrets)
+        )
+        return engine
+
+    def test_only_issues_on_added_lines(self, tmp_path):
+        repo_path = tmp_path / "repo"
+        repo_path.mkdir()
+        engine = self._engine(repo_path, [
+            _issue(str(repo_path / "app.py"), 1),  # unchanged line
+            _issue(str(repo_path / "app.py"), 2),
+            _issue("repo/app.py", 4, "E501"),  # relative to the linter's cwd
+        ])
+        stored = []
+
+        result, checkouts = self._review(repo_path, engine, ReviewCheckpoint(
+            on_unit_complete=lambda f, category, comments: stored.append((category, comments))
+        ))
+
+        assert checkouts == [["app.py"]]
+        assert [(c.file_path, c.line_start) for c in result.comments] == [
+            ("app.py", 2), ("app.py", 4)
+        ]
+        assert all(c.fingerprint and c.source == "linter" for c in result.comments)
+        assert [(category, len(comments)) for category, comments in stored] == [("linter", 2)]
+
+    def test_secrets_scanned_in_added_lines_only(self, tmp_path):
+        repo_path = tmp_path / "repo"
+        repo_path.mkdir()
+        engine = self._engine(repo_path, [], secrets=[_issue("app.py", 4, "generic-api-key")])
+        security = engine.linter_orchestrator._linter_cache["security"]
+
+        result, _ = self._review(repo_path, engine)
+
+        assert security.calls == [{"app.py": [(2, "import sys"), (4, "y = 3")]}]
+        assert [(c.file_path, c.line_start, c.linter_rule_id) for c in result.comments] == [
+            ("app.py", 4, "generic-api-key")
+        ]
+
+    def test_checkpointed_files_are_not_linted_again(self, tmp_path):
+        repo_path = tmp_path / "repo"
+        repo_path.mkdir()
+        engine = self._engine(repo_path, [_issue("app.py", 2)])
+        checkpoint = ReviewCheckpoint(completed={("app.py", "linter"): patch_sha(PATCH)})
+
+        result, checkouts = self._review(repo_path, engine, checkpoint)
+
+        assert checkouts == []
+        assert result.comments == []
+
+    def test_failed_linter_is_not_checkpointed(self, tmp_path):
+        repo_path = tmp_path / "repo"
+        repo_path.mkdir()
+        engine = self._engine(repo_path, [_issue("app.py", 2)])
+        engine.linter_orchestrator._linter_cache["python"].error = "flake8 crashed"
+        completed, kept = [], []
+
+        result, _ = self._review(repo_path, engine, ReviewCheckpoint(
+            on_unit_complete=lambda f, category, comments: completed.append(category),
+            on_unit_comments=lambda f, category, comments: kept.append(len(comments)),
+        ))
+
+        assert completed == []
+        assert kept == [1]
+        assert result.errors == ["python: flake8 crashed"]
+
+    def test_failed_checkout_skips_linting(self, tmp_path):
+        engine = self._engine(tmp_path, [_issue("app.py", 2)])
+
+        result, _ = self._review(None, engine)
+
+        assert result.comments == []
+
+
+class PlainCredentials:
+    """Credential manager for a local repository that needs no token."""
+
+    def build_auth_url(self, url, token):
+        return url
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+def test_sparse_checkout_materializes_only_requested_paths(tmp_path):
+    source = tmp_path / "source"
+    (source / "pkg").mkdir(parents=True)
+    (source / "pkg" / "a.py").write_text("a = 1\n")
+    (source / "pkg" / "b.py").write_text("b = 1\n")
+    (source / "c [1].py").write_text("c = 1\n")
+
+    def git(*args):
+        return subprocess.run(
+            ["git", "-C", str(source), *args], check=True, capture_output=True, text=True
+        ).stdout.strip()
+
+    git("init", "--quiet")
+    git("add", ".")
+    git("-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "--quiet", "-m", "init")
+    git("config", "uploadpack.allowFilter", "true")
+    git("config", "uploadpack.allowAnySHA1InWant", "true")
+    head_sha = git("rev-parse", "HEAD")
+
+    async def checkout():
+        manager = SandboxManager(str(tmp_path / "sandboxes"), 60)
+        sandbox = await manager.create()
+        return await GitCloner(manager, PlainCredentials()).sparse_checkout_with_token(
+            source.as_uri(), "token", sandbox, head_sha, ["pkg/a.py", "c [1].py"]
+        )
+
+    result = asyncio.run(checkout())
+
+    assert result.success, result.error
+    assert (result.repo_path / "pkg" / "a.py").read_text() == "a = 1\n"
+    assert (result.repo_path / "c [1].py").exists()
+    assert not (result.repo_path / "pkg" / "b.py").exists()
@@ -0,0 +1,136 @@
+"""Unit tests and benchmark for the in-process Python lint engine."""
+
+import asyncio
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add Flask backend to path
+flask_backend_path = Path(__file__).parent.parent.parent / "services" / "flask-backend"
+sys.path.insert(0, str(flask_backend_path))
+
+from app.linters import PythonLinter
+from app.linters import python_engine
+
+pytestmark = pytest.mark.skipif(
+    not python_engine.available(), reason="pyflakes/pycodestyle not installed"
+)
+
+SAMPLE = """import os, sys
+def f( x ):
+    l = [1,2]  # noqa: E231
+    return undefined_name
+very_long = "aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa"
+import re  # noqa
+"""
+
+
+def _found(issues) -> list[tuple[int, str]]:
+    return sorted((i.line, i.rule_id) for i in issues)
+
+
+class TestEngine:
+    """Test findings, selection and noqa handling."""
+
+    def test_default_options(self):
+        issues = python_engine.lint_source("a.py", SAMPLE.encode(), python_engine.EngineOptions())
+
+        assert _found(issues) == [
+            (1, "E401"), (1, "F401"), (1, "F401"), (2, "E201"), (2, "E202"), (2, "E302"),
+            (3, "E741"), (3, "F841"), (4, "F821"), (5, "E305"), (5, "E501"),
+        ]
+        assert {i.severity for i in issues if i.rule_id.startswith("F")} == {"error"}
+        assert {i.severity for i in issues if i.rule_id.startswith("E")} == {"warning"}
+
+    def test_repository_config(self, tmp_path):
+        (tmp_path / "tox.ini").write_text(
+            "[flake8]\nmax-line-length = 120\nextend-ignore = E2,E741\nselect = E,F,W\n"
+        )
+
+        options = python_engine.load_options(tmp_path)
+        issues = python_engine.lint_source("a.py", SAMPLE.encode(), options)
+
+        assert _found(issues) == [
+            (1, "E401"), (1, "F401"), (1, "F401"), (2, "E302"), (3, "F841"), (4, "F821"),
+            (5, "E305"),
+        ]
+
+    def test_unsupported_config_falls_back_to_flake8(self, tmp_path):
+        (tmp_path / ".flake8").write_text("[flake8]\nper-file-ignores = a.py:F401\n")
+
+        assert python_engine.load_options(tmp_path) is None
+
+    def test_syntax_error_and_file_noqa(self):
+        options = python_engine.EngineOptions()
+
+        broken = python_engine.lint_source("b.py", b"def broken(:\n    pass\n", options)
+        skipped = python_engine.lint_source("c.py", b"# flake8: noqa\nimport os\n", options)
+
+        assert _found(broken) == [(1, "E999")]
+        assert skipped == []
+
+    def test_linter_lints_in_pool(self, tmp_path):
+        (tmp_path / "a.py").write_text(SAMPLE)
+        (tmp_path / "clean.py").write_text("x = 1\n")
+        (tmp_path / ".tox").mkdir()
+        (tmp_path / ".tox" / "skipped.py").write_text("import os\n")
+
+        result = asyncio.run(PythonLinter().lint(tmp_path))
+
+        assert result.error is None
+        assert {Path(i.file).name for i in result.issues} == {"a.py"}
+        assert len(result.issues) == 11
+
+
+    def test_pool_sized_to_linter_slots(self, monkeypatch):
+        from app.core import linter_scheduler
+
+        created = []
+
+        class Pool:
+            def __init__(self, max_workers, mp_context):
+                created.append(max_workers)
+
+        monkeypatch.setattr(python_engine, "ProcessPoolExecutor", Pool)
+        monkeypatch.setattr(python_engine, "_executor", None)
+        monkeypatch.setattr(python_engine, "_executor_pid", None)
+        monkeypatch.setattr(
+            linter_scheduler, "_default_scheduler", linter_scheduler.LinterScheduler(3)
+        )
+
+        assert python_engine._pool() is python_engine._pool()
+        assert created == [3]
+
+@pytest.mark.skipif(shutil.which("flake8") is None, reason="flake8 not installed")
+def test_benchmark_against_flake8_subprocess(tmp_path, monkeypatch):
+    """Same findings as the flake8 subprocess, in less time for a PR-sized change."""
+    files = []
+    for i in range(5):
+        file = tmp_path / f"module_{i}.py"
+        file.write_text(SAMPLE * 20)
+        files.append(str(file))
+    linter = PythonLinter()
+
+    async def timed(runs=3):
+        await linter.lint(tmp_path, files)  # warm up (pool start, imports)
+        start = time.perf_counter()
+        for _ in range(runs):
+            result = await linter.lint(tmp_path, files)
+        return result, (time.perf_counter() - start) / runs
+
+    engine, engine_seconds = asyncio.run(timed())
+    monkeypatch.setattr(python_engine, "load_options", lambda path: None)
+    flake8, flake8_seconds = asyncio.run(timed())
+    print(f"\nengine {engine_seconds * 1000:.0f} ms, flake8 {flake8_seconds * 1000:.0f} ms "
+          f"for {len(files)} files")
+
+    def key(issue):
+        return (issue.file, issue.line, issue.rule_id)
+
+    assert flake8.error is None
+    assert sorted(map(key, engine.issues)) == sorted(map(key, flake8.issues))
+    # flake8's interpreter start-up and plugin loading dominate small runs
+    assert engine_seconds < flake8_seconds
@@ -0,0 +1,112 @@
+"""Unit tests for checkpointed, resumable reviews."""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add Flask backend to path
+flask_backend_path = Path(__file__).parent.parent.parent / "services" / "flask-backend"
+sys.path.insert(0, str(flask_backend_path))
+
+from app.core.detector import DetectionResult
+from app.core.reviewer import PRFile, ReviewCheckpoint, ReviewEngine, patch_sha
+from app.providers.base import AIResponse
+
+
+PATCH = "@@ -1,2 +1,3 @@\n line one\n+eval(user_input)\n line two"
+
+
+class FakeProvider:
+    """AI provider that returns one finding per call and records the calls."""
+
+    name = "fake"
+
+    def __init__(self, fail_on: str | None = None):
+        self.calls = []
+        self.fail_on = fail_on
+
+    async def complete(self, prompt, system_prompt=None):
+        self.calls.append(prompt)
+        if self.fail_on and len(self.calls) == 2:
+            raise RuntimeError(self.fail_on)
+        finding = {"line_start": 2, "severity": "major", "title": f"Finding {len(self.calls)}",
+                   "body": "Do not eval input"}
+        return AIResponse(
+            content=json.dumps([finding]),
+            model="fake-1",
+            prompt_tokens=10,
+            completion_tokens=5,
+            total_tokens=15,
+            latency_ms=1,
+            finish_reason="stop",
+        )
+
+    def estimate_cost(self, prompt_tokens, completion_tokens):
+        return 0.0
+
+
+def _detection() -> DetectionResult:
+    return ReviewEngine().detector.detect_from_files(["app.py"])
+
+
+def _review(engine, provider, checkpoint, categories=("security", "best_practices")):
+    pr_file = PRFile(path="app.py", status="modified", additions=1, deletions=0, patch=PATCH)
+    return asyncio.run(engine._review_file_with_ai(
+        pr_file, _detection(), list(categories), provider, None, checkpoint
+    ))
+
+
+class TestCheckpointHook:
+    """Test that units are reported and skipped."""
+
+    def test_each_unit_reported_with_fingerprints(self):
+        stored = []
+        checkpoint = ReviewCheckpoint(
+            on_unit_complete=lambda f, category, comments: stored.append((f.path, category, comments))
+        )
+
+        comments = _review(ReviewEngine(), FakeProvider(), checkpoint)
+
+        assert [(path, category) for path, category, _ in stored] == [
+            ("app.py", "security"),
+            ("app.py", "best_practices"),
+        ]
+        assert all(c.fingerprint for _, _, unit in stored for c in unit)
+        assert len(comments) == 2
+
+    def test_completed_units_are_not_sent_again(self):
+        provider = FakeProvider()
+        checkpoint = ReviewCheckpoint(completed={("app.py", "security"): patch_sha(PATCH)})
+
+        comments = _review(ReviewEngine(), provider, checkpoint)
+
+        assert len(provider.calls) == 1
+        assert [c.category for c in comments] == ["best_practices"]
+
+    def test_failed_unit_is_not_checkpointed(self):
+        stored = []
+        checkpoint = ReviewCheckpoint(
+            on_unit_complete=lambda f, category, comments: stored.append(category)
+        )
+
+        _review(ReviewEngine(), FakeProvider(fail_on="timeout"), checkpoint)
+
+        assert stored == ["security"]
+
+
+class TestIsDone:
+    """Test unit matching against the reviewed patch."""
+
+    def test_changed_patch_is_reviewed_again(self):
+        pr_file = PRFile(path="app.py", status="modified", additions=1, deletions=0, patch=PATCH)
+        checkpoint = ReviewCheckpoint(completed={("app.py", "security"): patch_sha("old diff")})
+
+        assert not checkpoint.is_done(pr_file, "security")
+
+    def test_unknown_patch_hash_counts_as_done(self):
+        pr_file = PRFile(path="app.py", status="modified", additions=1, deletions=0, patch=PATCH)
+        checkpoint = ReviewCheckpoint(completed={("app.py", "security"): None})
+
+        assert checkpoint.is_done(pr_file, "security")
+        assert not checkpoint.is_done(pr_file, "best_practices")
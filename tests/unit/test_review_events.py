@@ -0,0 +1,243 @@
+"""Unit tests for review progress event streams."""
+
+import importlib.util
+import json
+import sys
+import threading
+import types
+from pathlib import Path
+
+from flask import Flask
+import pytest
+import redis
+
+# Add Flask backend to path
+flask_backend_path = Path(__file__).parent.parent.parent / "services" / "flask-backend"
+sys.path.insert(0, str(flask_backend_path))
+
+from app.core.review_events import ReviewEvent, ReviewEvents
+
+
+class FakeRedis:
+    """In-memory stand-in for the publish script, history and pub/sub."""
+
+    def __init__(self):
+        self.seq = 0
+        self.history = []
+        self.pending = []  # messages delivered to the next subscriber read
+        self.down = False
+
+    def register_script(self, script):
+        def run(keys, args):
+            if self.down:
+                raise redis.ConnectionError("down")
+            event, data, size = args[0], args[1], int(args[2])
+            self.seq += 1
+            payload = json.dumps({"id": self.seq, "event": event, "data": json.loads(data)})
+            self.history = (self.history + [(self.seq, payload)])[-size:]
+            self.pending.append(payload)
+            return self.seq
+
+        return run
+
+    def zrangebyscore(self, key, low, high):
+        after = int(low.lstrip("("))
+        return [payload.encode() for seq, payload in self.history if seq > after]
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return FakePubSub(self)
+
+
+class FakePubSub:
+    def __init__(self, client):
+        self.client = client
+        self.closed = False
+
+    def subscribe(self, channel):
+        pass
+
+    def get_message(self, timeout=None):
+        if self.client.pending:
+            return {"type": "message", "data": self.client.pending.pop(0).encode()}
+        return None
+
+    def close(self):
+        self.closed = True
+
+
+class TestPublish:
+    """Test sequencing, history and failure handling."""
+
+    def test_sequence_ids_and_history(self):
+        client = FakeRedis()
+        events = ReviewEvents(client, history=2)
+
+        assert events.publish(7, "unit", {"file_path": "a.py"}) == 1
+        assert events.publish(7, "unit", {"file_path": "b.py"}) == 2
+        assert events.publish(7, "file", {"file_path": "b.py"}) == 3
+
+        assert [e.id for e in events.history(7)] == [2, 3]
+        assert [e.id for e in events.history(7, after=2)] == [3]
+
+    def test_publish_fails_open(self):
+        client = FakeRedis()
+        client.down = True
+
+        assert ReviewEvents(client).publish(7, "status", {"status": "in_progress"}) is None
+
+
+class TestFollow:
+    """Test replay after reconnect and live delivery."""
+
+    def test_replays_missed_events_without_duplicates(self):
+        client = FakeRedis()
+        events = ReviewEvents(client)
+        events.publish(7, "unit", {"file_path": "a.py"})
+        events.publish(7, "unit", {"file_path": "b.py"})
+        events.publish(7, "status", {"status": "completed"})
+
+        # The same events are also waiting on the channel
+        seen = [e.id for e in events.follow(7, after=1, max_seconds=1, heartbeat_seconds=0.01)]
+
+        assert seen == [2, 3]
+
+    def test_live_events_until_terminal_status(self):
+        client = FakeRedis()
+        events = ReviewEvents(client)
+        stream = events.follow(7, max_seconds=1, heartbeat_seconds=0.01)
+        events.publish(7, "unit", {"file_path": "a.py"})
+        events.publish(7, "status", {"status": "failed"})
+        events.publish(7, "unit", {"file_path": "late.py"})
+
+        seen = [e.id for e in stream if e is not None]
+
+        assert seen == [1, 2]
+
+    def test_idle_stream_sends_heartbeats_and_ends(self):
+        events = ReviewEvents(FakeRedis())
+
+        ticks = list(events.follow(7, max_seconds=0.05, heartbeat_seconds=0.01))
+
+        assert ticks and all(tick is None for tick in ticks)
+
+
+class TestFormat:
+    """Test the SSE wire format."""
+
+    def test_to_sse(self):
+        event = ReviewEvent(4, "status", {"status": "completed"})
+
+        assert event.to_sse() == 'id: 4\nevent: status\ndata: {"status": "completed"}\n\n'
+        assert event.is_terminal
+
+    def test_snapshot_without_id(self):
+        assert ReviewEvent(0, "status", {"status": "queued"}).to_sse().startswith("event: status")
+
+
+def test_superseded_reviews_publish_cancelled(monkeypatch):
+    from pydal import DAL, Field
+
+    from app import models
+
+    db = DAL("sqlite:memory")
+    db.define_table(
+        "reviews",
+        Field("platform"), Field("repository"), Field("pull_request_id", "integer"),
+        Field("status"), Field("error_message"), Field("completed_at", "datetime"),
+        Field("files_reviewed", "integer", default=0),
+        Field("comments_posted", "integer", default=0),
+    )
+    for status in ("queued", "in_progress", "queued"):
+        db.reviews.insert(platform="github", repository="o/r", pull_request_id=1, status=status)
+    keep = db.reviews.insert(platform="github", repository="o/r", pull_request_id=1,
+                             status="queued")
+    published = []
+    monkeypatch.setattr(models, "get_db", lambda: db)
+    monkeypatch.setattr(
+        models, "_publish_review_event",
+        lambda review_id, event, data: published.append((review_id, data["status"])),
+    )
+
+    assert models.supersede_queued_reviews("github", "o/r", 1, keep) == 2
+    assert published == [(1, "cancelled"), (3, "cancelled")]
+
+
+@pytest.fixture
+def reviews_api(monkeypatch):
+    """The reviews blueprint in a bare Flask app, with a fake event store.
+
+    app.middleware imports an auth module this tree doesn't ship, so the
+    blueprint module is loaded on its own with pass-through auth decorators.
+    """
+    middleware = types.ModuleType("app.middleware")
+    middleware.auth_required = lambda view: view
+    middleware.role_required = lambda *roles: lambda view: view
+    monkeypatch.setitem(sys.modules, "app.middleware", middleware)
+    spec = importlib.util.spec_from_file_location(
+        "app.api.v1.reviews", flask_backend_path / "app" / "api" / "v1" / "reviews.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    events = ReviewEvents(FakeRedis())
+    review = {"id": 7, "status": "in_progress", "files_reviewed": 2, "comments_posted": 1}
+    monkeypatch.setattr(module, "get_review_events", lambda: events)
+    monkeypatch.setattr(module, "get_review_by_id", lambda review_id: review)
+    monkeypatch.setattr(module, "_stream_slots", threading.BoundedSemaphore(1))
+
+    app = Flask(__name__)
+    app.register_blueprint(module.reviews_bp)
+    return types.SimpleNamespace(
+        module=module, events=events, review=review, client=app.test_client()
+    )
+
+
+def _event_ids(body: str) -> list[int]:
+    return [int(line[4:]) for line in body.splitlines() if line.startswith("id: ")]
+
+
+class TestEventsEndpoint:
+    """Test GET /api/v1/reviews/<id>/events."""
+
+    def test_follows_live_review_until_terminal(self, reviews_api):
+        reviews_api.events.publish(7, "unit", {"file_path": "a.py"})
+        reviews_api.events.publish(7, "status", {"status": "completed"})
+
+        body = reviews_api.client.get("/api/v1/reviews/7/events").get_data(as_text=True)
+
+        assert body.startswith("retry: 3000")
+        assert _event_ids(body) == [1, 2]
+        # The stream gave its slot back
+        assert reviews_api.module._stream_slots.acquire(blocking=False)
+
+    def test_over_cap_replays_and_asks_to_retry(self, reviews_api):
+        reviews_api.events.publish(7, "unit", {"file_path": "a.py"})
+        reviews_api.events.publish(7, "unit", {"file_path": "b.py"})
+        reviews_api.module._stream_slots.acquire()
+
+        response = reviews_api.client.get("/api/v1/reviews/7/events?last_event_id=1")
+        body = response.get_data(as_text=True)
+
+        retry_ms = reviews_api.module.Config.REVIEW_EVENTS_BUSY_RETRY_MS
+        assert body.startswith(f"retry: {retry_ms}")
+        assert _event_ids(body) == [2]
+
+    def test_resumes_from_last_event_id(self, reviews_api):
+        for path in ("a.py", "b.py"):
+            reviews_api.events.publish(7, "unit", {"file_path": path})
+        reviews_api.review["status"] = "completed"
+
+        body = reviews_api.client.get(
+            "/api/v1/reviews/7/events", headers={"Last-Event-ID": "1"}
+        ).get_data(as_text=True)
+
+        assert _event_ids(body) == [2]
+        # A final snapshot, without an ID, closes a finished review's stream
+        assert body.rstrip().endswith('"comments_posted": 1}')
+
+    def test_rejects_malformed_last_event_id(self, reviews_api):
+        response = reviews_api.client.get(
+            "/api/v1/reviews/7/events", headers={"Last-Event-ID": "abc"}
+        )
+
+        assert response.status_code == 400
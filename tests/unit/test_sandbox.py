@@ -0,0 +1,125 @@
+"""Unit tests for sandbox lifecycle: removal, reaping and quota."""
+
+import asyncio
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add Flask backend to path
+flask_backend_path = Path(__file__).parent.parent.parent / "services" / "flask-backend"
+sys.path.insert(0, str(flask_backend_path))
+
+from app.git import sandbox as sandbox_module
+from app.git.sandbox import EXPIRES_FILE, TRASH_DIR, SandboxManager, SandboxQuotaError
+
+
+def _fill(path: Path, files: int = 3, size: int = 1000) -> None:
+    (path / "repo").mkdir()
+    for i in range(files):
+        (path / "repo" / f"f{i}").write_bytes(b"x" * size)
+
+
+class TestCleanup:
+    """Test removing sandboxes."""
+
+    def test_removal_runs_off_the_event_loop(self, tmp_path, monkeypatch):
+        manager = SandboxManager(str(tmp_path), 60)
+        removed_in = []
+        rmtree = sandbox_module.shutil.rmtree
+
+        def tracking_rmtree(path, ignore_errors=False):
+            removed_in.append(threading.current_thread() is threading.main_thread())
+            rmtree(path, ignore_errors)
+
+        monkeypatch.setattr(sandbox_module.shutil, "rmtree", tracking_rmtree)
+
+        async def main():
+            sandbox = await manager.create()
+            _fill(sandbox.path)
+            return sandbox, await manager.cleanup(sandbox)
+
+        sandbox, cleaned = asyncio.run(main())
+
+        assert cleaned is True
+        assert removed_in == [False]
+        assert not sandbox.path.exists()
+        assert list((tmp_path / TRASH_DIR).iterdir()) == []
+
+    def test_cleanup_of_removed_sandbox_succeeds(self, tmp_path):
+        manager = SandboxManager(str(tmp_path), 60)
+
+        async def main():
+            sandbox = await manager.create()
+            await manager.cleanup(sandbox)
+            return await manager.cleanup(sandbox)
+
+        assert asyncio.run(main()) is True
+
+    def test_tmpfs_falls_back_to_directories(self, tmp_path, monkeypatch):
+        calls = []
+
+        async def failing_run(command, timeout=30):
+            calls.append(command[0])
+            return 32, "", "mount: permission denied"
+
+        monkeypatch.setattr(sandbox_module, "_run", failing_run)
+        manager = SandboxManager(str(tmp_path), 60, tmpfs_mb=64)
+
+        async def main():
+            return [await manager.create() for _ in range(2)]
+
+        sandboxes = asyncio.run(main())
+
+        assert calls == ["mount"]
+        assert all((s.path / EXPIRES_FILE).exists() for s in sandboxes)
+
+
+class TestReap:
+    """Test the background reaper."""
+
+    def test_reaps_expired_and_interrupted_removals(self, tmp_path):
+        manager = SandboxManager(str(tmp_path), 60)
+        (tmp_path / "mirrors").mkdir()
+        (tmp_path / TRASH_DIR / "interrupted").mkdir(parents=True)
+
+        async def main():
+            expired = await manager.create()
+            live = await manager.create(timeout=3600)
+            _fill(live.path)
+            past = datetime.utcnow() - timedelta(seconds=1)
+            (expired.path / EXPIRES_FILE).write_text(past.isoformat())
+            return expired, live, await manager.reap()
+
+        expired, live, stats = asyncio.run(main())
+
+        expires_bytes = (live.path / EXPIRES_FILE).stat().st_size
+        assert stats == {"sandboxes": 2, "reaped": 1, "size_bytes": 3000 + expires_bytes}
+        assert not expired.path.exists()
+        assert live.path.exists()
+        assert (tmp_path / "mirrors").exists()
+        assert list((tmp_path / TRASH_DIR).iterdir()) == []
+
+    def test_legacy_sandboxes_expire_by_age(self, tmp_path):
+        manager = SandboxManager(str(tmp_path), 0)
+        legacy = tmp_path / "0b0c3f8a-52c4-4a76-9a2e-4f7b4e0c1d2e"
+        legacy.mkdir()
+
+        assert asyncio.run(manager.cleanup_expired()) == 1
+        assert not legacy.exists()
+
+
+def test_quota_refuses_new_sandboxes(tmp_path):
+    manager = SandboxManager(str(tmp_path), 60, max_bytes=2500)
+
+    async def main():
+        first = await manager.create()
+        _fill(first.path)
+        with pytest.raises(SandboxQuotaError):
+            await manager.create()
+        await manager.cleanup(first)
+        return await manager.create()
+
+    assert asyncio.run(main()).path.exists()
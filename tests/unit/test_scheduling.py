@@ -0,0 +1,136 @@
+"""Unit tests for review lanes and lane metrics."""
+
+import json
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add Flask backend to path
+flask_backend_path = Path(__file__).parent.parent.parent / "services" / "flask-backend"
+sys.path.insert(0, str(flask_backend_path))
+
+import redis
+
+from app.core.scheduling import (
+    LANE_INTERACTIVE,
+    LANE_SYNC,
+    LANE_WHOLE,
+    TRIGGER_SYNC,
+    LaneCollector,
+    TenantFairShare,
+    _message_enqueued_at,
+    record_task_wait,
+    review_lane,
+)
+
+
+class FakePipeline:
+    def __init__(self, results=None, error=None):
+        self.results = results or []
+        self.error = error
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args))
+
+    def execute(self):
+        if self.error:
+            raise self.error
+        return self.results
+
+
+class FakeRedis:
+    def __init__(self, pipeline):
+        self._pipeline = pipeline
+        self.zadds = []
+
+    def zadd(self, key, mapping, xx=False):
+        self.zadds.append((key, list(mapping), xx))
+
+    def pipeline(self):
+        return self._pipeline
+
+    def register_script(self, script):
+        def run(keys, args):
+            raise redis.ConnectionError("down")
+
+        return run
+
+
+class TestLanes:
+    """Test lane selection."""
+
+    def test_lane_by_type_and_trigger(self):
+        assert review_lane({"review_type": "differential"}) == LANE_INTERACTIVE
+        assert review_lane({"review_type": "differential"}, TRIGGER_SYNC) == LANE_SYNC
+        assert review_lane({"review_type": "whole"}, TRIGGER_SYNC) == LANE_WHOLE
+
+
+class TestFairShare:
+    """Test tenant limits."""
+
+    def test_weighted_limit(self):
+        share = TenantFairShare(FakeRedis(FakePipeline()), max_active=4)
+
+        assert share.limit_for(1.0) == 4
+        assert share.limit_for(0.5) == 2
+        assert share.limit_for(0.01) == 1
+
+    def test_untenanted_and_redis_down_run(self):
+        share = TenantFairShare(FakeRedis(FakePipeline()), max_active=4)
+
+        assert share.acquire(None, 1)
+        assert share.acquire(7, 1)  # fails open
+
+    def test_renew_extends_only_held_slots(self):
+        client = FakeRedis(FakePipeline())
+        share = TenantFairShare(client, max_active=4)
+
+        share.renew(None, 1)
+        share.renew(7, 3)
+
+        assert client.zadds == [("darwin:tenant-active:7", [3], True)]
+
+
+class TestLaneMetrics:
+    """Test wait recording and the /metrics collector."""
+
+    def test_record_task_wait(self):
+        pipe = FakePipeline()
+        request = SimpleNamespace(
+            enqueued_at=time.time() - 5, delivery_info={"routing_key": "reviews-sync"}
+        )
+
+        record_task_wait(FakeRedis(pipe), request)
+
+        (_, sum_args), (_, count_args) = pipe.calls
+        assert sum_args[1] == "reviews-sync:sum" and sum_args[2] >= 5
+        assert count_args[1:] == ("reviews-sync:count", 1)
+
+    def test_message_header(self):
+        raw = json.dumps({"headers": {"enqueued_at": 1700000000.5}, "body": "..."})
+
+        assert _message_enqueued_at(raw.encode()) == 1700000000.5
+        assert _message_enqueued_at(None) is None
+        assert _message_enqueued_at(b"garbage") is None
+
+    def test_collector(self):
+        tail = json.dumps({"headers": {"enqueued_at": time.time() - 30}})
+        pipe = FakePipeline(
+            results=[3, tail.encode(), 0, None, {b"reviews:sum": b"12.5", b"reviews:count": b"5"}]
+        )
+
+        families = list(LaneCollector(FakeRedis(pipe), lanes=("reviews", "plans")).collect())
+        samples = {(s.name, s.labels["lane"]): s.value for f in families for s in f.samples}
+
+        assert samples[("darwin_queue_depth", "reviews")] == 3
+        assert samples[("darwin_queue_oldest_wait_seconds", "reviews")] >= 30
+        assert samples[("darwin_queue_oldest_wait_seconds", "plans")] == 0
+        assert samples[("darwin_queue_wait_seconds_count", "reviews")] == 5
+        assert samples[("darwin_queue_wait_seconds_sum", "reviews")] == 12.5
+
+    def test_collector_redis_down(self):
+        pipe = FakePipeline(error=redis.ConnectionError("down"))
+
+        assert list(LaneCollector(FakeRedis(pipe)).collect()) == []
@@ -0,0 +1,106 @@
+"""Unit tests for gitleaks report handling in the security linter."""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add Flask backend to path
+flask_backend_path = Path(__file__).parent.parent.parent / "services" / "flask-backend"
+sys.path.insert(0, str(flask_backend_path))
+
+from app.linters import SecurityLinter
+from app.linters import security_linter
+
+
+def _leak(file: str, line: int, rule: str = "aws-access-token") -> dict:
+    return {"File": file, "StartLine": line, "StartColumn": 5, "RuleID": rule,
+            "Description": "AWS access token", "Match": "REDACTED"}
+
+
+class FakeGitleaks(SecurityLinter):
+    """Writes canned findings to whatever report path gitleaks is given."""
+
+    def __init__(self, leaks_for):
+        self._available = True
+        self.leaks_for = leaks_for
+        self.runs: list[tuple[list[str], bytes | None]] = []
+
+    async def _run_command(self, cmd, cwd, timeout=120, stdin=None):
+        self.runs.append((cmd, stdin))
+        report = Path(cmd[cmd.index("--report-path") + 1])
+        await asyncio.sleep(0.01)  # let concurrent scans interleave
+        leaks = self.leaks_for(cmd, stdin)
+        report.write_text(json.dumps(leaks))
+        return (1 if leaks else 0), "", ""
+
+
+class TestReport:
+    """Test reading reports."""
+
+    def test_streams_findings(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(security_linter, "REPORT_CHUNK_SIZE", 7)
+        leaks = [_leak(f"f{i}.py", i) for i in range(20)]
+        report = tmp_path / "report.json"
+        report.write_text(json.dumps(leaks, indent=1))
+
+        assert list(security_linter.iter_report(report)) == leaks
+
+    def test_empty_report(self, tmp_path):
+        report = tmp_path / "report.json"
+        report.write_text("[]\n")
+
+        assert list(security_linter.iter_report(report)) == []
+
+    def test_concurrent_scans_use_private_reports(self, tmp_path):
+        sandboxes = []
+        for name in ("one", "two"):
+            repo = tmp_path / name / "repo"
+            repo.mkdir(parents=True)
+            sandboxes.append(repo)
+        linter = FakeGitleaks(lambda cmd, stdin: [_leak(f"{Path(cmd[3]).parent.name}.env", 1)])
+
+        async def main():
+            return await asyncio.gather(*(linter.lint(repo) for repo in sandboxes))
+
+        results = asyncio.run(main())
+
+        assert [[i.file for i in r.issues] for r in results] == [["one.env"], ["two.env"]]
+        reports = [cmd[cmd.index("--report-path") + 1] for cmd, _ in linter.runs]
+        assert Path(reports[0]).parent == tmp_path / "one"
+        assert reports[0] != reports[1]
+        assert not any(Path(report).exists() for report in reports)
+
+
+class TestAddedLines:
+    """Test scanning only a change's added lines."""
+
+    def test_findings_map_back_to_file_lines(self):
+        def leaks_for(cmd, stdin):
+            lines = stdin.decode().splitlines()
+            return [_leak("", i + 1) for i, text in enumerate(lines) if "AKIA" in text]
+
+        linter = FakeGitleaks(leaks_for)
+        result = asyncio.run(linter.scan_added_lines({
+            "config.py": [(3, "key = 'AKIAEXAMPLE'"), (4, "region = 'eu'")],
+            "empty.py": [],
+            "deploy.sh": [(10, "export AWS_KEY=AKIAOTHER")],
+        }))
+
+        cmd, stdin = linter.runs[0]
+        assert "--pipe" in cmd and "--redact" in cmd
+        assert stdin.decode().splitlines() == [
+            "key = 'AKIAEXAMPLE'", "region = 'eu'", "", "export AWS_KEY=AKIAOTHER"
+        ]
+        assert [(i.file, i.line, i.rule_id) for i in result.issues] == [
+            ("config.py", 3, "aws-access-token"), ("deploy.sh", 10, "aws-access-token")
+        ]
+        assert result.success is False and result.error is None
+
+    def test_nothing_added_runs_nothing(self):
+        linter = FakeGitleaks(lambda cmd, stdin: [])
+
+        result = asyncio.run(linter.scan_added_lines({"removed.py": []}))
+
+        assert result.success is True
+        assert linter.runs == []
@@ -0,0 +1,88 @@
+"""Unit tests for review shard planning."""
+
+import sys
+from pathlib import Path
+
+# Add Flask backend to path
+flask_backend_path = Path(__file__).parent.parent.parent / "services" / "flask-backend"
+sys.path.insert(0, str(flask_backend_path))
+
+from app.core.reviewer import PRFile
+from app.core.sharding import (
+    PROMPT_OVERHEAD_TOKENS,
+    estimate_tokens,
+    files_from_payload,
+    plan_shards,
+)
+
+
+def _file(path: str, patch_chars: int, status: str = "modified") -> PRFile:
+    return PRFile(path=path, status=status, additions=1, deletions=0, patch="x" * patch_chars)
+
+
+class TestEstimate:
+    """Test prompt token estimates."""
+
+    def test_scales_with_patch_and_categories(self):
+        assert estimate_tokens(_file("a.py", 4000), 2) == (1000 + PROMPT_OVERHEAD_TOKENS) * 2
+
+    def test_deleted_and_empty_files_are_free(self):
+        assert estimate_tokens(_file("a.py", 4000, status="deleted"), 2) == 0
+        assert estimate_tokens(_file("a.py", 0), 2) == 0
+
+
+class TestPlanShards:
+    """Test grouping files into shards."""
+
+    def test_small_review_is_one_shard(self):
+        files = [_file(f"f{i}.py", 400) for i in range(3)]
+
+        shards = plan_shards(files, 1, token_budget=100_000)
+
+        assert len(shards) == 1
+        assert shards[0].files == files
+
+    def test_disabled_budget_is_one_shard(self):
+        files = [_file(f"f{i}.py", 400_000) for i in range(3)]
+
+        assert len(plan_shards(files, 1, token_budget=0)) == 1
+
+    def test_splits_in_listing_order_within_budget(self):
+        # Each file estimates to 1000 + overhead = 1800 tokens
+        files = [_file(f"f{i}.py", 4000) for i in range(5)]
+
+        shards = plan_shards(files, 1, token_budget=4000)
+
+        assert [[f.path for f in s.files] for s in shards] == [
+            ["f0.py", "f1.py"],
+            ["f2.py", "f3.py"],
+            ["f4.py"],
+        ]
+        assert [s.index for s in shards] == [0, 1, 2]
+        assert all(s.estimated_tokens <= 4000 for s in shards)
+
+    def test_oversized_file_gets_own_shard(self):
+        files = [_file("small.py", 400), _file("huge.py", 100_000), _file("tail.py", 400)]
+
+        shards = plan_shards(files, 1, token_budget=5000)
+
+        assert [[f.path for f in s.files] for s in shards] == [
+            ["small.py"],
+            ["huge.py"],
+            ["tail.py"],
+        ]
+
+    def test_max_shards_is_respected(self):
+        files = [_file(f"f{i}.py", 4000) for i in range(40)]
+
+        shards = plan_shards(files, 1, token_budget=1000, max_shards=4)
+
+        assert len(shards) <= 4
+        assert sum(len(s.files) for s in shards) == 40
+
+    def test_payload_round_trip(self):
+        files = [PRFile(path="b.py", status="renamed", additions=2, deletions=1,
+                        patch="@@ -1 +1 @@", old_path="a.py")]
+        shard = plan_shards(files, 1, token_budget=10)[0]
+
+        assert files_from_payload(shard.to_payload()) == files
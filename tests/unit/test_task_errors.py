@@ -0,0 +1,110 @@
+"""Unit tests for compact task error records and Redis memory metrics."""
+
+import sys
+from pathlib import Path
+
+# Add Flask backend to path
+flask_backend_path = Path(__file__).parent.parent.parent / "services" / "flask-backend"
+sys.path.insert(0, str(flask_backend_path))
+
+from app.metrics import RedisMemoryCollector
+from app.tasks.errors import MAX_MESSAGE_CHARS, MAX_TRACEBACK_CHARS, compact_error
+
+
+def _raise(message: str) -> BaseException:
+    try:
+        raise RuntimeError(message)
+    except RuntimeError as e:
+        return e
+
+
+def _recurse(depth: int) -> None:
+    if depth == 0:
+        raise ValueError("bottom")
+    _recurse(depth - 1)
+
+
+class TestCompactError:
+    """Test truncation and fingerprinting."""
+
+    def test_summary_and_location(self):
+        record = compact_error(_raise("Rate limited,\n retry   later"))
+
+        assert record.summary == "RuntimeError: Rate limited, retry later"
+        assert record.location.endswith(":_raise")
+
+    def test_same_error_with_different_ids_shares_fingerprint(self):
+        first = compact_error(_raise("Review 12 timed out after 30s (req 9f3a2b1c4d5e6f70)"))
+        second = compact_error(_raise("Review 431 timed out after 45s (req 0a1b2c3d4e5f6789)"))
+
+        assert first.fingerprint == second.fingerprint
+
+    def test_different_messages_differ(self):
+        assert compact_error(_raise("timeout")).fingerprint != compact_error(
+            _raise("bad credentials")
+        ).fingerprint
+
+    def test_message_and_traceback_truncated(self):
+        try:
+            _recurse(200)
+        except ValueError as e:
+            record = compact_error(e)
+
+        assert len(record.traceback) <= MAX_TRACEBACK_CHARS
+        assert record.traceback.rstrip().endswith("ValueError: bottom")
+        assert len(compact_error(_raise("x" * 5000)).message) == MAX_MESSAGE_CHARS
+
+
+class FakeRedis:
+    """Enough of Redis for the memory collector."""
+
+    def __init__(self, result_keys: int):
+        self.keys = [f"celery-task-meta-{i}".encode() for i in range(result_keys)]
+
+    def info(self, section):
+        return {"used_memory": 1_000_000}
+
+    def pipeline(self):
+        return FakePipeline()
+
+    def scan_iter(self, match=None, count=None):
+        return iter(self.keys)
+
+
+class FakePipeline:
+    def __init__(self):
+        self.keys = []
+
+    def memory_usage(self, key):
+        self.keys.append(key)
+
+    def execute(self):
+        # Queues that don't exist report None
+        return [None if key == "publish" else 200 for key in self.keys]
+
+
+class TestRedisMemoryCollector:
+    """Test the exported values."""
+
+    def _samples(self, collector):
+        return {
+            (metric.name, tuple(sample.labels.values())): sample.value
+            for metric in collector.collect()
+            for sample in metric.samples
+        }
+
+    def test_estimates_result_memory_from_sample(self):
+        collector = RedisMemoryCollector(FakeRedis(120), ("reviews", "publish"), sample_size=10)
+
+        samples = self._samples(collector)
+
+        assert samples[("darwin_redis_used_memory_bytes", ())] == 1_000_000
+        assert samples[("darwin_celery_queue_memory_bytes", ("reviews",))] == 200
+        assert samples[("darwin_celery_queue_memory_bytes", ("publish",))] == 0
+        assert samples[("darwin_celery_result_keys", ())] == 120
+        assert samples[("darwin_celery_result_memory_bytes", ())] == 200 * 120
+
+    def test_scan_is_bounded(self):
+        collector = RedisMemoryCollector(FakeRedis(500), ("reviews",), scan_limit=100)
+
+        assert self._samples(collector)[("darwin_celery_result_keys", ())] == 100
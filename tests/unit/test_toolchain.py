@@ -0,0 +1,135 @@
+"""Unit tests for the linter toolchain registry."""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add Flask backend to path
+flask_backend_path = Path(__file__).parent.parent.parent / "services" / "flask-backend"
+sys.path.insert(0, str(flask_backend_path))
+
+from app.core.detector import DetectionResult
+from app.core.linter import LinterOrchestrator
+from app.core.toolchain import ToolchainRegistry, publish_inventory, read_inventories
+from app.linters import BaseLinter, LintResult
+
+
+class ProbedLinter(BaseLinter):
+    """Linter whose commands are recorded instead of run."""
+
+    name = "python"
+    languages = ["python"]
+    version_command = ["fakelint", "--version"]
+    installed = True
+    commands: list[list[str]] = []
+
+    async def _run_command(self, cmd, cwd, timeout=120):
+        self.commands.append(cmd)
+        await asyncio.sleep(0.05)
+        if not self.installed:
+            return -1, "", "No such file or directory"
+        return 0, "fakelint 2.1.0\nextra details\n", ""
+
+    async def lint(self, path, files=None):
+        result = LintResult(linter=self.name, success=False)
+        if not await self.is_available():
+            result.error = "fakelint not installed"
+            return result
+        await self._run_command(["fakelint", *(files or [])], path)
+        result.success = True
+        return result
+
+
+class MissingLinter(ProbedLinter):
+    name = "go"
+    languages = ["go"]
+    version_command = ["missinglint", "version"]
+    installed = False
+
+
+def _registry() -> ToolchainRegistry:
+    ProbedLinter.commands = []
+    return ToolchainRegistry({"python": ProbedLinter, "go": MissingLinter})
+
+
+class TestProbe:
+    """Test probing tools once, in parallel."""
+
+    def test_probes_all_tools_concurrently(self):
+        registry = _registry()
+
+        async def timed():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            tools = await registry.probe()
+            return tools, loop.time() - start
+
+        tools, elapsed = asyncio.run(timed())
+
+        assert [(t.linter, t.tool, t.available, t.version) for t in tools] == [
+            ("go", "missinglint", False, ""),
+            ("python", "fakelint", True, "fakelint 2.1.0"),
+        ]
+        assert elapsed < 0.1  # both 50 ms probes overlapped
+
+    def test_lint_runs_do_not_probe_again(self, tmp_path):
+        registry = _registry()
+        asyncio.run(registry.probe())
+        detection = DetectionResult(languages={"python": 1.0}, file_mapping={"a.py": "python"})
+
+        for _ in range(3):
+            orchestrator = LinterOrchestrator(toolchain=registry)
+            asyncio.run(orchestrator.run_linters(
+                tmp_path, detection, files=["a.py"], include_security=False
+            ))
+
+        version_calls = [c for c in ProbedLinter.commands if c[-1] in ("--version", "version")]
+        assert len(version_calls) == 2  # one per tool, from the start-up probe
+        assert len(ProbedLinter.commands) == 2 + 3
+
+    def test_missing_tool_is_skipped_without_running(self, tmp_path):
+        registry = _registry()
+        asyncio.run(registry.probe())
+        detection = DetectionResult(languages={"go": 1.0}, file_mapping={"main.go": "go"})
+        ProbedLinter.commands = []
+
+        result = asyncio.run(LinterOrchestrator(toolchain=registry).run_linters(
+            tmp_path, detection, files=["main.go"], include_security=False
+        ))
+
+        assert result.results[0].error == "fakelint not installed"
+        assert ProbedLinter.commands == []
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode()
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def scan_iter(self, match=None, count=None):
+        prefix = match.rstrip("*")
+        return iter([key for key in self.data if key.startswith(prefix)])
+
+
+class TestInventory:
+    """Test publishing and reading host inventories."""
+
+    def test_round_trip(self):
+        registry = _registry()
+        client = FakeRedis()
+        client.data["darwin:toolchain:broken"] = b"{not json"
+
+        publish_inventory(client, asyncio.run(registry.probe()))
+        hosts = read_inventories(client)
+
+        assert len(hosts) == 1
+        assert {t["linter"]: t["available"] for t in hosts[0]["tools"]} == {
+            "go": False, "python": True
+        }
+        assert json.loads(json.dumps(hosts[0]))["probed_at"]
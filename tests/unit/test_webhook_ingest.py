@@ -0,0 +1,288 @@
+"""Unit tests for webhook event stream decoding and event routing."""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Add Flask backend to path
+flask_backend_path = Path(__file__).parent.parent.parent / "services" / "flask-backend"
+sys.path.insert(0, str(flask_backend_path))
+
+from app.core import webhook_events
+from app.core.webhook_events import WebhookEvent, WebhookEventQueue
+from app.tasks import ingest_worker
+
+
+def _fields(delivery_id: str) -> dict:
+    return {
+        b"platform": b"github",
+        b"event_type": b"pull_request",
+        b"delivery_id": delivery_id.encode(),
+        b"repository": b"org/repo",
+        b"body": b"{}",
+        b"received_at": b"2024-01-01T12:00:00",
+    }
+
+
+class FakeStreamRedis:
+    """Consumer-group reads over a fixed pending list, recording writes."""
+
+    def __init__(self, claimed, new, times_delivered):
+        self.claimed = claimed
+        self.new = new
+        self.times_delivered = times_delivered
+        self.calls = []
+
+    def xgroup_create(self, *args, **kwargs):
+        pass
+
+    def xautoclaim(self, *args, **kwargs):
+        return [b"0-0", self.claimed, []]
+
+    def xreadgroup(self, *args, **kwargs):
+        return [(webhook_events.STREAM_KEY, self.new)] if self.new else []
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.results = []
+
+    def xpending_range(self, name, group, min, max, count):
+        delivered = self.client.times_delivered[min]
+        self.results.append([{"message_id": min, "times_delivered": delivered}])
+
+    def __getattr__(self, command):
+        def record(*args, **kwargs):
+            self.client.calls.append((command, args))
+            self.results.append(None)
+        return record
+
+    def execute(self):
+        return self.results
+
+
+class TestStreamDecoding:
+    """Test conversion of raw stream entries to events."""
+
+    def test_bytes_fields(self):
+        body = json.dumps({"action": "opened"}).encode()
+        event = WebhookEventQueue._to_event(
+            b"1700000000000-0",
+            {
+                b"platform": b"github",
+                b"event_type": b"pull_request",
+                b"delivery_id": b"abc-123",
+                b"repository": b"org/repo",
+                b"body": body,
+                b"received_at": b"2024-01-01T12:00:00",
+            },
+        )
+
+        assert event.stream_id == "1700000000000-0"
+        assert event.platform == "github"
+        assert event.delivery_id == "abc-123"
+        assert event.body == body
+        assert event.received_at.year == 2024
+
+
+class TestRetries:
+    """Test that failed events are retried, then dead-lettered."""
+
+    def test_only_processed_events_are_acked(self, monkeypatch):
+        events = [
+            WebhookEvent(f"{i}-0", "github", "pull_request", f"d{i}", "org/repo", b"{}",
+                         datetime(2024, 1, 1))
+            for i in range(3)
+        ]
+        acked = []
+
+        class Queue:
+            def read_batch(self, consumer, count):
+                return events if not acked else []
+
+            def ack(self, batch):
+                acked.append([event.stream_id for event in batch])
+
+        def handle(event_type, data, repo_config, resolve_user):
+            if data.get("fail"):
+                raise RuntimeError("database down")
+
+        events[1].body = b'{"fail": true}'
+        monkeypatch.setattr(ingest_worker, "get_event_queue", Queue)
+        monkeypatch.setattr(ingest_worker, "get_repo_config", lambda *_: {"id": 1, "enabled": True})
+        monkeypatch.setattr(ingest_worker, "record_webhook_delivery", lambda repo_id: None)
+        monkeypatch.setattr(ingest_worker, "handle_github_event", handle)
+
+        totals = ingest_worker.consume_webhook_events()
+
+        assert acked[0] == ["0-0", "2-0"]
+        assert (totals["processed"], totals["failed"]) == (2, 1)
+
+    def test_events_past_delivery_limit_are_dead_lettered(self):
+        client = FakeStreamRedis(
+            claimed=[("1-0", _fields("retry")), ("2-0", _fields("poison"))],
+            new=[("3-0", _fields("fresh"))],
+            times_delivered={"1-0": 3, "2-0": 6},
+        )
+        queue = WebhookEventQueue(client, max_deliveries=5)
+
+        events = queue.read_batch("worker-1")
+
+        assert [(e.delivery_id, e.deliveries) for e in events] == [
+            ("retry", 3), ("fresh", 1)
+        ]
+        commands = [command for command, _ in client.calls]
+        assert commands == ["xadd", "xack", "xdel"]
+        assert client.calls[0][1][0] == webhook_events.DEAD_LETTER_KEY
+        assert client.calls[1][1][2:] == ("2-0",)
+
+
+def test_publish_never_trims_the_stream():
+    """Trimming by length could drop events not yet delivered or still pending."""
+    appended = []
+
+    class Client:
+        def set(self, *args, **kwargs):
+            return True
+
+        def xadd(self, name, fields, **kwargs):
+            appended.append((name, kwargs))
+
+    queue = WebhookEventQueue(Client())
+
+    assert queue.publish("github", "pull_request", "d1", "org/repo", b"{}")
+    assert appended == [(webhook_events.STREAM_KEY, {})]
+
+
+class TestEventRouting:
+    """Test which webhook events queue reviews."""
+
+    def _capture(self, monkeypatch):
+        queued = []
+        monkeypatch.setattr(
+            ingest_worker,
+            "_queue_review",
+            lambda repo_config, triggered_by, **kwargs: queued.append(kwargs) or "queued",
+        )
+        return queued
+
+    def test_github_synchronize_uses_head_sha(self, monkeypatch):
+        queued = self._capture(monkeypatch)
+        data = {
+            "action": "synchronize",
+            "repository": {"full_name": "org/repo"},
+            "sender": {"login": "octocat"},
+            "pull_request": {
+                "id": 9,
+                "number": 3,
+                "base": {"sha": "base1"},
+                "head": {"sha": "head1"},
+            },
+        }
+
+        result = ingest_worker.handle_github_event(
+            "pull_request", data, {"review_on_sync": True}, lambda *_: None
+        )
+
+        assert result == "queued"
+        assert queued[0]["head_sha"] == "head1"
+        assert queued[0]["base_sha"] == "base1"
+
+    def test_gitlab_update_uses_commit_shas(self, monkeypatch):
+        queued = self._capture(monkeypatch)
+        data = {
+            "project": {"path_with_namespace": "group/proj"},
+            "user": {"username": "dev"},
+            "object_attributes": {
+                "action": "update",
+                "id": 5,
+                "iid": 2,
+                "last_commit": {"id": "head2"},
+                "diff_refs": {"base_sha": "base2"},
+            },
+        }
+
+        ingest_worker.handle_gitlab_event(
+            "Merge Request Hook", data, {"review_on_sync": True}, lambda *_: None
+        )
+
+        assert queued[0]["head_sha"] == "head2"
+        assert queued[0]["base_sha"] == "base2"
+
+    def test_disabled_trigger_ignored(self, monkeypatch):
+        queued = self._capture(monkeypatch)
+        data = {"action": "opened", "pull_request": {"id": 1}}
+
+        result = ingest_worker.handle_github_event("pull_request", data, {}, lambda *_: None)
+
+        assert result is None
+        assert queued == []
+
+
+class TestSyncCoalescing:
+    """Test debouncing and superseding of push-triggered reviews."""
+
+    def _patch_models(self, monkeypatch, existing=None):
+        scheduled = []
+        monkeypatch.setattr(ingest_worker, "get_review_by_external_id", lambda _: existing)
+        monkeypatch.setattr(
+            ingest_worker,
+            "create_review",
+            lambda **fields: {"id": 11, **fields},
+        )
+        monkeypatch.setattr(ingest_worker, "supersede_queued_reviews", lambda *_: 2)
+        monkeypatch.setattr(
+            ingest_worker,
+            "enqueue_review",
+            lambda review, trigger, countdown=None: scheduled.append(
+                (review["id"], trigger, countdown)
+            ),
+        )
+        return scheduled
+
+    def test_push_review_debounced_and_supersedes(self, monkeypatch):
+        scheduled = self._patch_models(monkeypatch)
+        monkeypatch.setattr(ingest_worker.Config, "SYNC_DEBOUNCE_SECONDS", 45)
+
+        result = ingest_worker._queue_review(
+            {"id": 1},
+            None,
+            debounce=True,
+            external_id="github-9-head1",
+            platform="github",
+            repository="org/repo",
+            pull_request_id=3,
+        )
+
+        assert scheduled == [(11, "sync", 45)]
+        assert "superseding 2" in result
+
+    def test_known_head_not_requeued(self, monkeypatch):
+        scheduled = self._patch_models(monkeypatch, existing={"id": 5})
+
+        result = ingest_worker._queue_review(
+            {"id": 1}, None, external_id="github-9-head1", pull_request_id=3
+        )
+
+        assert scheduled == []
+        assert "already exists" in result
+
+
+class TestHeadCheck:
+    """Test that stale reviews stop before reaching the AI provider."""
+
+    def test_moved_head_raises(self):
+        from app.tasks.review_worker import ReviewSuperseded, _ensure_current_head
+
+        _ensure_current_head({"head_sha": "a" * 40}, "a" * 40)
+        _ensure_current_head({"head_sha": None}, "b" * 40)
+
+        with pytest.raises(ReviewSuperseded, match="aaaaaaaaaaaa"):
+            _ensure_current_head({"head_sha": "a" * 40}, "b" * 40)
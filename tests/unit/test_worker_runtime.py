@@ -0,0 +1,108 @@
+"""Unit tests for the worker-lifetime asyncio runtime."""
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+from flask import Flask, current_app
+import pytest
+
+# Add Flask backend to path
+flask_backend_path = Path(__file__).parent.parent.parent / "services" / "flask-backend"
+sys.path.insert(0, str(flask_backend_path))
+
+from app.tasks.runtime import WorkerRuntime
+
+
+@pytest.fixture
+def runtime():
+    rt = WorkerRuntime()
+    yield rt
+    rt.stop()
+
+
+class TestWorkerRuntime:
+    """Test the shared loop and client pool."""
+
+    def test_tasks_share_one_loop(self, runtime):
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        assert runtime.run(current_loop()) is runtime.run(current_loop())
+
+    def test_exceptions_propagate(self, runtime):
+        async def boom():
+            raise ValueError("bad")
+
+        with pytest.raises(ValueError, match="bad"):
+            runtime.run(boom())
+
+    def test_clients_pooled_per_credential(self, runtime):
+        async def borrow(credential):
+            async with runtime.github(credential) as client:
+                return client
+
+        first = runtime.run(borrow({"token": "a"}))
+        again = runtime.run(borrow({"token": "a"}))
+        other = runtime.run(borrow({"token": "b"}))
+
+        assert first is again
+        assert first is not other
+        assert first._client is not None and not first._client.is_closed
+
+    def test_idle_clients_evicted_beyond_limit(self):
+        runtime = WorkerRuntime(max_clients=1)
+
+        async def borrow(credential):
+            async with runtime.github(credential) as client:
+                return client
+
+        first = runtime.run(borrow({"token": "a"}))
+        second = runtime.run(borrow({"token": "b"}))
+
+        assert first._client.is_closed
+        assert not second._client.is_closed
+        assert runtime.run(borrow({"token": "a"})) is not first
+        runtime.stop()
+
+    def test_borrowed_clients_not_evicted(self):
+        runtime = WorkerRuntime(max_clients=1)
+
+        async def borrow_both():
+            async with runtime.github({"token": "a"}) as first:
+                async with runtime.github({"token": "b"}):
+                    return first, first._client.is_closed
+
+        first, closed_while_borrowed = runtime.run(borrow_both())
+
+        assert not closed_while_borrowed
+        runtime.stop()
+
+    def test_blocking_calls_run_off_loop_in_app_context(self, runtime):
+        app = Flask("test")
+
+        def blocking():
+            return current_app.name
+
+        async def call():
+            loop_thread = threading.get_ident()
+            name = await runtime.run_blocking(blocking)
+            thread = await runtime.run_blocking(threading.get_ident)
+            return name, thread != loop_thread
+
+        with app.app_context():
+            assert runtime.run(call()) == ("test", True)
+
+    def test_stop_closes_clients(self):
+        runtime = WorkerRuntime()
+
+        async def borrow():
+            async with runtime.gitlab({"token": "t", "base_url": "https://gl.example"}) as client:
+                return client
+
+        client = runtime.run(borrow())
+        runtime.stop()
+
+        assert client._client.is_closed
+        assert runtime.loop is None